@@ -0,0 +1,5 @@
+"""Performance benchmarks for nanobot (not shipped with the package).
+
+Run everything with ``python -m benchmarks`` (see ``benchmarks/__main__.py``)
+or one suite with ``python -m benchmarks.<module>``.
+"""
@@ -0,0 +1,189 @@
+"""Run every benchmark suite and write one JSON report, optionally compared to a baseline.
+
+    python -m benchmarks                         # full run, JSON to stdout
+    python -m benchmarks --quick -o run.json     # smaller sizes, written to run.json
+    python -m benchmarks --baseline main.json    # flag metrics that got worse
+
+Rows are matched against the baseline by their parameters (every top-level
+field that is not a metric).  Metric names carry their direction: ``*_per_s``
+is better when higher; ``*_ms``, ``*_s`` and ``*_kib`` are better when lower.
+Informational counters live under each row's ``counts`` and are not compared.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from benchmarks import (
+    agent_e2e,
+    bus_journal,
+    request_conversion,
+    startup,
+    stream_parser,
+    stream_render,
+)
+
+SUITES = (
+    "stream_parser", "request_conversion", "startup", "agent_e2e", "bus_journal",
+    "stream_render",
+)
+
+_QUICK_E2E = [
+    "--sessions", "1", "10", "100", "--history", "10", "1000",
+    "--consolidation", "200", "--stream-sessions", "1", "--turns", "2",
+]
+
+
+def _tokenizer_available() -> bool:
+    """Whether tiktoken's encoding is loadable (offline runs otherwise retry a download)."""
+    try:
+        import tiktoken
+
+        tiktoken.get_encoding("cl100k_base")
+        return True
+    except Exception:
+        return False
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _quiet(fn: Any, argv: list[str]) -> list[dict[str, Any]]:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(argv)
+
+
+def run_suites(quick: bool, only: list[str] | None) -> dict[str, list[dict[str, Any]]]:
+    suites = {
+        "stream_parser": lambda: _quiet(
+            stream_parser.main, ["--chunks", "1000"] if quick else [],
+        ),
+        "request_conversion": lambda: _quiet(
+            request_conversion.main, ["--turns", "25", "--calls", "20"] if quick else [],
+        ),
+        "startup": lambda: _quiet(startup.main, ["--repeat", "3"] if quick else []),
+        "agent_e2e": lambda: asyncio.run(
+            agent_e2e.run(agent_e2e.build_parser().parse_args(_QUICK_E2E if quick else []))
+        ),
+        "bus_journal": lambda: asyncio.run(bus_journal.run(bus_journal.build_parser().parse_args(
+            ["--messages", "1000", "--publishers", "1", "32"] if quick else []
+        ))),
+        "stream_render": lambda: _quiet(
+            stream_render.main, ["--chars", "5000"] if quick else [],
+        ),
+    }
+    results = {}
+    for name, fn in suites.items():
+        if only and name not in only:
+            continue
+        started = time.perf_counter()
+        print(f"running {name}...", file=sys.stderr)
+        results[name] = fn()
+        print(f"  {name} done in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return results
+
+
+def _direction(key: str) -> int:
+    """+1 when higher is better, -1 when lower is better, 0 for non-metrics."""
+    if key.endswith("_per_s"):
+        return 1
+    if key.endswith(("_ms", "_s", "_kib")):
+        return -1
+    return 0
+
+
+def _identity(row: dict[str, Any]) -> tuple:
+    return tuple(sorted(
+        (k, v) for k, v in row.items() if k != "counts" and not _direction(k)
+    ))
+
+
+def compare(
+    current: dict[str, list[dict[str, Any]]],
+    baseline: dict[str, list[dict[str, Any]]],
+    threshold: float,
+) -> list[dict[str, Any]]:
+    """Metrics that are worse than *baseline* by more than *threshold* (a fraction)."""
+    regressions = []
+    for suite, rows in current.items():
+        previous = {_identity(r): r for r in baseline.get(suite, [])}
+        for row in rows:
+            old = previous.get(_identity(row))
+            if old is None:
+                continue
+            for key, value in row.items():
+                sign = _direction(key)
+                before = old.get(key)
+                if not sign or not isinstance(before, (int, float)) or not before:
+                    continue
+                change = (value - before) / before * sign
+                if change < -threshold:
+                    regressions.append({
+                        "suite": suite,
+                        "params": dict(_identity(row)),
+                        "metric": key,
+                        "baseline": before,
+                        "current": value,
+                        "change_pct": round(change * 100, 1),
+                    })
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="smaller sizes (about a minute)")
+    parser.add_argument("--only", nargs="+", choices=SUITES)
+    parser.add_argument("-o", "--output", type=Path, help="write the report here instead of stdout")
+    parser.add_argument("--baseline", type=Path, help="earlier report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative change that counts as a regression (default 0.25)")
+    args = parser.parse_args(argv)
+
+    report: dict[str, Any] = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "tokenizer_available": _tokenizer_available(),
+        },
+    }
+    if not report["meta"]["tokenizer_available"]:
+        print("warning: tiktoken encoding unavailable; token estimates fall back "
+              "and may add download retries to latencies", file=sys.stderr)
+    report["results"] = run_suites(args.quick, args.only)
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        report["regressions"] = compare(report["results"], baseline["results"], args.threshold)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    for r in report.get("regressions", []):
+        print(f"REGRESSION {r['suite']} {r['params']} {r['metric']}: "
+              f"{r['baseline']} -> {r['current']} ({r['change_pct']}%)", file=sys.stderr)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""End-to-end agent throughput and latency with an offline mock provider.
+
+Drives the real ``AgentLoop`` through ``ChannelManager`` and an in-memory
+channel (see :mod:`benchmarks.harness`).  The mock provider answers
+instantly unless ``--ttft-ms``/``--tokens-per-s`` say otherwise, so the
+numbers are nanobot's own overhead:
+
+* ``concurrency`` — N sessions sending turns back to back: messages/s and
+  p50/p99 turn latency;
+* ``history`` — one turn on a session that already holds N messages;
+* ``tools`` — turns where the model calls K tools before answering;
+* ``consolidation`` — token estimation plus archiving of an oversized session;
+* ``streaming`` — deltas produced per turn vs delivered to the channel.
+
+Run with ``python -m benchmarks.agent_e2e``; prints JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any
+
+from benchmarks.harness import BenchAgent, percentiles
+from nanobot.providers.mock_provider import MockProvider
+
+SCENARIOS = ("concurrency", "history", "tools", "consolidation", "streaming")
+
+# Large enough that history benchmarks never trigger consolidation.
+_NO_CONSOLIDATION = 100_000_000
+
+
+def _provider(args: argparse.Namespace, **kwargs: Any) -> MockProvider:
+    return MockProvider(ttft_s=args.ttft_ms / 1000, tokens_per_s=args.tokens_per_s, **kwargs)
+
+
+async def concurrency(args: argparse.Namespace, sessions: int) -> dict[str, Any]:
+    async with BenchAgent(_provider(args)) as bench:
+        latencies: list[float] = []
+
+        async def _session(i: int) -> None:
+            for turn in range(args.turns):
+                latencies.append(await bench.channel.turn(f"chat-{i}", f"message {turn}"))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_session(i) for i in range(sessions)))
+        elapsed = time.perf_counter() - started
+    return {
+        "scenario": "concurrency",
+        "sessions": sessions,
+        "messages_per_s": round(len(latencies) / elapsed, 2),
+        **percentiles(latencies),
+        "counts": {"turns": len(latencies)},
+    }
+
+
+async def history(args: argparse.Namespace, size: int) -> dict[str, Any]:
+    async with BenchAgent(_provider(args), context_window_tokens=_NO_CONSOLIDATION) as bench:
+        session = bench.loop.sessions.get_or_create("bench:history")
+        for i in range(size // 2):
+            session.add_message("user", f"question {i}: " + "lorem ipsum " * 10)
+            session.add_message("assistant", f"answer {i}: " + "dolor sit amet " * 10)
+        bench.loop.sessions.save(session)
+        latencies = [await bench.channel.turn("history", f"follow-up {t}") for t in range(args.turns)]
+    return {
+        "scenario": "history",
+        "messages": size,
+        **percentiles(latencies),
+        "counts": {"turns": len(latencies)},
+    }
+
+
+async def tools(args: argparse.Namespace, calls: int) -> dict[str, Any]:
+    script = [
+        {"content": "Looking around.", "tool_calls": [
+            {"name": "list_dir", "arguments": {"path": "."}} for _ in range(calls)
+        ]},
+        {"content": "Done."},
+    ]
+    async with BenchAgent(_provider(args, script=script)) as bench:
+        started = time.perf_counter()
+        latencies = [await bench.channel.turn("tools", f"inspect {t}") for t in range(args.turns)]
+        elapsed = time.perf_counter() - started
+    return {
+        "scenario": "tools",
+        "tool_calls_per_turn": calls,
+        "tool_calls_per_s": round(calls * len(latencies) / elapsed, 2),
+        **percentiles(latencies),
+        "counts": {"turns": len(latencies)},
+    }
+
+
+async def consolidation(args: argparse.Namespace, size: int) -> dict[str, Any]:
+    async with BenchAgent(_provider(args), context_window_tokens=16_384) as bench:
+        consolidator = bench.loop.consolidator
+        session = bench.loop.sessions.get_or_create("bench:consolidation")
+        for i in range(size // 2):
+            session.add_message("user", f"question {i}: " + "lorem ipsum " * 20)
+            session.add_message("assistant", f"answer {i}: " + "dolor sit amet " * 20)
+
+        started = time.perf_counter()
+        consolidator.estimate_session_prompt_tokens(session)
+        estimate_s = time.perf_counter() - started
+
+        before = session.last_consolidated
+        started = time.perf_counter()
+        await consolidator.maybe_consolidate_by_tokens(session)
+        consolidate_s = time.perf_counter() - started
+    return {
+        "scenario": "consolidation",
+        "messages": size,
+        "estimate_ms": round(estimate_s * 1000, 3),
+        "consolidate_ms": round(consolidate_s * 1000, 3),
+        "counts": {
+            "archived_messages": session.last_consolidated - before,
+            "llm_calls": bench.provider.calls,
+        },
+    }
+
+
+async def streaming(args: argparse.Namespace, sessions: int) -> dict[str, Any]:
+    reply = " ".join(["streamed words"] * max(1, args.reply_chars // 15))
+    provider = _provider(args, script=[{"content": reply}], chunk_tokens=1)
+    async with BenchAgent(provider, streaming=True) as bench:
+        latencies: list[float] = []
+
+        async def _session(i: int) -> None:
+            for turn in range(args.turns):
+                latencies.append(await bench.channel.turn(f"stream-{i}", f"tell me {turn}"))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_session(i) for i in range(sessions)))
+        elapsed = time.perf_counter() - started
+        channel = bench.channel
+    produced = len(latencies) * -(-len(reply) // 4)
+    return {
+        "scenario": "streaming",
+        "sessions": sessions,
+        "reply_chars": args.reply_chars,
+        "deltas_per_s": round(produced / elapsed, 2),
+        **percentiles(latencies),
+        "counts": {
+            "turns": len(latencies),
+            "deltas_produced": produced,
+            # ChannelManager coalesces queued deltas before sending.
+            "deltas_delivered": channel.deltas,
+            "all_text_delivered": channel.delta_chars == len(reply) * len(latencies),
+        },
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--history", type=int, nargs="+", default=[10, 100, 1000, 10_000])
+    parser.add_argument("--tool-calls", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--consolidation", type=int, nargs="+", default=[200, 2000])
+    parser.add_argument("--stream-sessions", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--reply-chars", type=int, default=4000)
+    parser.add_argument("--turns", type=int, default=3, help="turns per session")
+    parser.add_argument("--ttft-ms", type=float, default=0.0)
+    parser.add_argument("--tokens-per-s", type=float, default=0.0, help="0 = instant")
+    return parser
+
+
+async def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    plan = {
+        "concurrency": (concurrency, args.sessions),
+        "history": (history, args.history),
+        "tools": (tools, args.tool_calls),
+        "consolidation": (consolidation, args.consolidation),
+        "streaming": (streaming, args.stream_sessions),
+    }
+    results = []
+    for name in args.scenarios:
+        fn, values = plan[name]
+        for value in values:
+            results.append(await fn(args, value))
+    return results
+
+
+def main(argv: list[str] | None = None) -> list[dict[str, Any]]:
+    args = build_parser().parse_args(argv)
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
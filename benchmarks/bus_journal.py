@@ -0,0 +1,90 @@
+"""Message bus throughput: in-memory vs durable (SQLite journal with group commit).
+
+Each row pushes ``--messages`` inbound messages through the bus from
+``--publishers`` concurrent publishers while one consumer takes and
+acknowledges them, and reports messages per second and the publish latency
+(which includes the journal commit for the durable bus).  ``counts`` has the
+number of journal commits, i.e. fsyncs shared between publishers.
+
+Run with ``python -m benchmarks.bus_journal``; prints JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.journal import BusJournal
+from nanobot.bus.queue import MessageBus
+
+
+async def _measure(backend: str, publishers: int, messages: int, workdir: Path) -> dict[str, Any]:
+    journal = BusJournal(workdir / f"{backend}-{publishers}.sqlite3") if backend == "sqlite" else None
+    bus = MessageBus(journal=journal)
+    latencies: list[float] = []
+    per_publisher = messages // publishers
+
+    async def publish(p: int) -> None:
+        for i in range(per_publisher):
+            msg = InboundMessage(
+                channel="bench", sender_id=f"u{p}", chat_id=f"c{p}", content=f"message {i}",
+                metadata={"message_id": f"{p}-{i}"},
+            )
+            started = time.perf_counter()
+            await bus.publish_inbound(msg)
+            latencies.append(time.perf_counter() - started)
+
+    async def consume(total: int) -> None:
+        for _ in range(total):
+            bus.ack(await bus.consume_inbound())
+
+    started = time.perf_counter()
+    await asyncio.gather(consume(per_publisher * publishers), *(publish(p) for p in range(publishers)))
+    if journal is not None:
+        await journal.flush()
+    elapsed = time.perf_counter() - started
+    await bus.close()
+
+    latencies.sort()
+    return {
+        "backend": backend,
+        "publishers": publishers,
+        "messages": len(latencies),
+        "throughput_per_s": round(len(latencies) / elapsed),
+        "publish_p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "publish_p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 3),
+        "counts": {"commits": journal.commits if journal is not None else 0},
+    }
+
+
+async def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for publishers in args.publishers:
+            for backend in ("memory", "sqlite"):
+                results.append(await _measure(backend, publishers, args.messages, Path(tmp)))
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--publishers", type=int, nargs="+", default=[1, 16, 128])
+    return parser
+
+
+def main(argv: list[str] | None = None) -> list[dict[str, Any]]:
+    results = asyncio.run(run(build_parser().parse_args(argv)))
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Shared pieces for end-to-end benchmarks: an in-memory channel and a mock-backed agent."""
+
+from __future__ import annotations
+
+import asyncio
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel
+from nanobot.channels.manager import ChannelManager
+from nanobot.config.schema import Config
+from nanobot.providers.mock_provider import MockProvider
+
+
+def percentiles(values: list[float], scale: float = 1000.0) -> dict[str, float]:
+    """p50/p99/max of *values* (seconds), reported in milliseconds by default."""
+    if not values:
+        return {"p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * scale, 3)
+
+    return {"p50_ms": pick(0.50), "p99_ms": pick(0.99), "max_ms": round(ordered[-1] * scale, 3)}
+
+
+class MemoryChannel(BaseChannel):
+    """Channel that keeps everything in memory and reports when each turn finishes.
+
+    A turn is finished by its final message: a regular send (progress
+    messages excluded) or, when streaming, the closing ``_stream_end``.
+    """
+
+    name = "bench"
+    display_name = "Benchmark"
+
+    def __init__(self, bus: MessageBus, *, streaming: bool = False):
+        super().__init__({"enabled": True, "allow_from": ["*"], "streaming": streaming}, bus)
+        self.sends = 0
+        self.deltas = 0
+        self.delta_chars = 0
+        self._waiters: dict[str, asyncio.Future[float]] = {}
+
+    async def start(self) -> None:
+        self._running = True
+
+    async def stop(self) -> None:
+        self._running = False
+
+    def _finish(self, chat_id: str) -> None:
+        waiter = self._waiters.pop(chat_id, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(time.perf_counter())
+
+    async def send(self, msg: OutboundMessage) -> None:
+        self.sends += 1
+        if not msg.metadata.get("_progress"):
+            self._finish(msg.chat_id)
+
+    async def send_delta(self, chat_id: str, delta: str, metadata: dict[str, Any] | None = None) -> None:
+        meta = metadata or {}
+        if meta.get("_stream_delta"):
+            self.deltas += 1
+            self.delta_chars += len(delta)
+        if meta.get("_stream_end") and not meta.get("_resuming"):
+            self._finish(chat_id)
+
+    async def turn(self, chat_id: str, content: str, sender_id: str = "bench-user") -> float:
+        """Send *content* as a user message and return the seconds until the reply lands."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[chat_id] = waiter
+        started = time.perf_counter()
+        await self._handle_message(sender_id, chat_id, content)
+        return await waiter - started
+
+
+class BenchAgent:
+    """``AgentLoop`` + ``ChannelManager`` + :class:`MemoryChannel` on a throwaway workspace.
+
+    Usage::
+
+        async with BenchAgent(MockProvider()) as bench:
+            latency = await bench.channel.turn("chat-1", "hello")
+    """
+
+    def __init__(self, provider: MockProvider, *, streaming: bool = False, **loop_kwargs: Any):
+        self.provider = provider
+        self.streaming = streaming
+        self.loop_kwargs = loop_kwargs
+        self.workspace = Path(tempfile.mkdtemp(prefix="nanobot-bench-"))
+        self.bus = MessageBus()
+        self.channel = MemoryChannel(self.bus, streaming=streaming)
+        self.loop: AgentLoop | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    async def __aenter__(self) -> BenchAgent:
+        logger.disable("nanobot")
+        self.loop = AgentLoop(
+            bus=self.bus, provider=self.provider, workspace=self.workspace, **self.loop_kwargs,
+        )
+        self.manager = ChannelManager(Config(), self.bus)
+        self.manager.channels[self.channel.name] = self.channel
+        await self.manager.start_all()
+        self._tasks.append(asyncio.create_task(self.loop.run()))
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self.loop.stop()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.loop.close_mcp()
+        await self.manager.stop_all()
+        logger.enable("nanobot")
+        shutil.rmtree(self.workspace, ignore_errors=True)
@@ -0,0 +1,96 @@
+"""Per-call cost of converting session history into a provider request.
+
+Builds a synthetic long session (user turns, assistant tool calls with JSON
+arguments, tool results) and times one request conversion per LLM call:
+
+* ``uncached`` — the full sanitize/convert pipeline over every message;
+* ``memoized`` — ``_prepare_messages``, which reuses per-message conversions
+  from earlier calls and only converts the newly appended messages.
+
+Run with ``python -m benchmarks.request_conversion``; prints JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+from nanobot.providers.anthropic_provider import AnthropicProvider
+from nanobot.providers.openai_compat_provider import OpenAICompatProvider
+
+
+def session(turns: int) -> list[dict[str, Any]]:
+    """A system prompt followed by *turns* tool-using exchanges."""
+    messages: list[dict[str, Any]] = [{"role": "system", "content": "You are nanobot. " * 200}]
+    for i in range(turns):
+        call_id = f"call_{i:020d}"
+        messages += [
+            {"role": "user", "content": f"Please update file {i}.", "timestamp": "2026-01-01T00:00:00"},
+            {"role": "assistant", "content": "On it.", "tool_calls": [{
+                "id": call_id, "type": "function",
+                "function": {"name": "edit_file", "arguments": json.dumps({
+                    "path": f"src/module_{i}.py", "old_text": "x = 1\n" * 20, "new_text": "x = 2\n" * 20,
+                })},
+            }]},
+            {"role": "tool", "tool_call_id": call_id, "name": "edit_file", "content": "ok\n" * 50},
+            {"role": "assistant", "content": f"Updated module {i}."},
+        ]
+    return messages
+
+
+def _openai_uncached(p: OpenAICompatProvider, msgs: list[dict[str, Any]]) -> Any:
+    return p._sanitize_messages(p._sanitize_empty_content(msgs))
+
+
+def _anthropic_uncached(p: AnthropicProvider, msgs: list[dict[str, Any]]) -> Any:
+    return p._convert_messages(p._sanitize_empty_content(msgs))
+
+
+def _providers() -> dict[str, tuple[Any, Callable[[Any, list], Any]]]:
+    return {
+        "openai_compat": (OpenAICompatProvider(default_model="gpt-4o"), _openai_uncached),
+        "anthropic": (AnthropicProvider(api_key="sk-bench"), _anthropic_uncached),
+    }
+
+
+def measure(turns: int, calls: int) -> list[dict[str, Any]]:
+    """Simulate *calls* consecutive LLM calls on a growing *turns*-turn session."""
+    history = session(turns)
+    results = []
+    for name, (provider, uncached) in _providers().items():
+        for strategy, fn in (("uncached", lambda m: uncached(provider, m)),
+                             ("memoized", provider._prepare_messages)):
+            fn(history)  # warm-up: the session already exists before these calls
+            msgs = list(history)
+            elapsed = 0.0
+            for i in range(calls):
+                msgs.append({"role": "user", "content": f"follow-up {i}"})
+                # Session.get_history() hands out fresh dicts around the same values.
+                request = [dict(m) for m in msgs]
+                started = time.perf_counter()
+                fn(request)
+                elapsed += time.perf_counter() - started
+            results.append({
+                "provider": name,
+                "strategy": strategy,
+                "messages": len(history),
+                "per_call_ms": round(elapsed / calls * 1000, 3),
+            })
+    return results
+
+
+def main(argv: list[str] | None = None) -> list[dict[str, Any]]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, nargs="+", default=[25, 100])
+    parser.add_argument("--calls", type=int, default=50)
+    args = parser.parse_args(argv)
+    results = [row for turns in args.turns for row in measure(turns, args.calls)]
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""CLI startup cost: wall time and ``-X importtime`` of the entry points.
+
+Each target runs in a fresh interpreter:
+
+* ``import_cli`` — ``import nanobot.cli.commands`` (what every ``nanobot`` command pays);
+* ``help`` — ``nanobot --help``;
+* ``channel_catalog`` — listing every channel's metadata (``nanobot channels status``).
+
+Reports the median wall time over ``--repeat`` runs, the cumulative
+``-X importtime`` of the target and its slowest direct imports.
+
+Run with ``python -m benchmarks.startup``; prints JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+
+TARGETS = {
+    "import_cli": "import nanobot.cli.commands",
+    "help": (
+        "import sys\n"
+        "from nanobot.cli.commands import app\n"
+        "sys.argv = ['nanobot', '--help']\n"
+        "try:\n"
+        "    app()\n"
+        "except SystemExit:\n"
+        "    pass"
+    ),
+    "channel_catalog": (
+        "from nanobot.channels.registry import channel_catalog\n"
+        "channel_catalog()"
+    ),
+}
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def _wall(code: str) -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+    return time.perf_counter() - started
+
+
+def _import_profile(code: str, top: int) -> tuple[int, list[tuple[str, int]]]:
+    """Total cumulative import time (µs) and the *top* slowest imports one level down.
+
+    Interpreter startup (``site``, ``encodings``, ...) runs before *code* and
+    is left out.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        check=True, capture_output=True, text=True,
+    )
+    rows = [
+        (m.group(4), int(m.group(2)), len(m.group(3)))
+        for line in result.stderr.splitlines()
+        if (m := _LINE.match(line))
+    ]
+    # Everything up to and including ``site`` is interpreter startup.
+    start = next((i + 1 for i, (name, _, _) in enumerate(rows) if name == "site"), 0)
+    rows = rows[start:]
+    total = sum(us for _, us, depth in rows if depth == 0)
+    children = [(name, us) for name, us, depth in rows if depth == 2]
+    return total, sorted(children, key=lambda r: -r[1])[:top]
+
+
+def measure(name: str, repeat: int, top: int) -> dict[str, Any]:
+    code = TARGETS[name]
+    walls = [_wall(code) for _ in range(repeat)]
+    import_us, slowest = _import_profile(code, top)
+    return {
+        "target": name,
+        "wall_ms": round(statistics.median(walls) * 1000, 1),
+        "import_ms": round(import_us / 1000, 1),
+        "counts": {"slowest_imports_ms": {n: round(us / 1000, 1) for n, us in slowest}},
+    }
+
+
+def main(argv: list[str] | None = None) -> list[dict[str, Any]]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="slowest imports to list")
+    args = parser.parse_args(argv)
+    results = [measure(name, args.repeat, args.top) for name in args.targets]
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Buffered vs incremental assembly of OpenAI-compatible chat streams.
+
+Replays synthetic recorded streams (SDK ``ChatCompletionChunk`` objects
+produced lazily, as a network stream would) through two strategies:
+
+* ``buffered`` — collect every chunk, then ``OpenAICompatProvider._parse_chunks``
+  (what the streaming path did before ``ChatStreamAssembler``);
+* ``incremental`` — ``ChatStreamAssembler.feed`` each chunk on arrival.
+
+Run with ``python -m benchmarks.stream_parser``; prints JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from openai.types.chat import ChatCompletionChunk
+
+from nanobot.providers.openai_compat_provider import ChatStreamAssembler, OpenAICompatProvider
+
+
+def _chunk(delta: dict[str, Any], finish: str | None = None) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate({
+        "id": "chatcmpl-bench",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "bench",
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+    })
+
+
+def text_stream(n_chunks: int) -> Iterator[ChatCompletionChunk]:
+    """A long plain-text generation, one token-sized delta per chunk."""
+    for i in range(n_chunks):
+        yield _chunk({"content": f"token{i % 97} "})
+    yield _chunk({}, finish="stop")
+
+
+def tool_call_stream(n_chunks: int) -> Iterator[ChatCompletionChunk]:
+    """A single tool call whose JSON arguments arrive in small fragments."""
+    yield _chunk({"tool_calls": [{
+        "index": 0, "id": "call_bench", "type": "function",
+        "function": {"name": "write_file", "arguments": '{"path": "out.txt", "content": "'},
+    }]})
+    for i in range(n_chunks):
+        yield _chunk({"tool_calls": [{"index": 0, "function": {"arguments": f"line {i}\\n"}}]})
+    yield _chunk({"tool_calls": [{"index": 0, "function": {"arguments": '"}'}}]})
+    yield _chunk({}, finish="tool_calls")
+
+
+def _buffered(stream: Iterator[Any]) -> Any:
+    chunks = list(stream)
+    return OpenAICompatProvider._parse_chunks(chunks)
+
+
+def _incremental(stream: Iterator[Any]) -> Any:
+    assembler = ChatStreamAssembler()
+    for chunk in stream:
+        assembler.feed(chunk)
+    return assembler.result()
+
+
+STRATEGIES: dict[str, Callable[[Iterator[Any]], Any]] = {
+    "buffered": _buffered,
+    "incremental": _incremental,
+}
+STREAMS: dict[str, Callable[[int], Iterator[Any]]] = {
+    "text": text_stream,
+    "tool_call": tool_call_stream,
+}
+
+
+def measure(stream: str, strategy: str, n_chunks: int, repeat: int) -> dict[str, Any]:
+    make, run = STREAMS[stream], STRATEGIES[strategy]
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(make(n_chunks))
+        times.append(time.perf_counter() - started)
+    tracemalloc.start()
+    run(make(n_chunks))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "stream": stream,
+        "strategy": strategy,
+        "chunks": n_chunks,
+        "best_s": round(min(times), 4),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def main(argv: list[str] | None = None) -> list[dict[str, Any]]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    results = [
+        measure(stream, strategy, n, args.repeat)
+        for stream in STREAMS
+        for n in args.chunks
+        for strategy in STRATEGIES
+    ]
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
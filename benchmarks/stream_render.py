@@ -0,0 +1,119 @@
+"""Markdown rendering of streamed edits: full re-render vs IncrementalRenderer.
+
+A synthetic ``--chars``-character answer (paragraphs, lists, tables, code
+blocks) arrives in ``--delta``-character deltas and is rendered after each
+one, as a channel editing its message would:
+
+* ``full`` — the converter over the whole buffer on every edit;
+* ``incremental`` — :class:`IncrementalRenderer`, which re-renders only the
+  blocks after the last stable boundary.
+
+``counts.rendered_chars`` is the number of characters passed to the
+converter and ``counts.identical`` whether every edit matched the full
+render.  Matrix rows need the ``matrix`` extra.
+
+Run with ``python -m benchmarks.stream_render``; prints JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+from benchmarks.harness import percentiles
+from nanobot.channels.telegram import _HTML_RENDER_PROBE, _markdown_to_telegram_html
+from nanobot.utils.stream_render import IncrementalRenderer
+
+_BLOCKS = [
+    "The **gateway** keeps one `MessageBus` per process, and every channel "
+    "publishes to it; see [the docs](https://example.com/docs/bus_limits) for "
+    "the _priority lanes_ and how ~~old~~ limits apply.\n\n",
+    "1. Check the `config.json` section\n2. Restart the gateway\n3. Watch `/status`\n\n",
+    "- **latency** stays flat\n- throughput grows with publishers\n- no lost messages\n\n",
+    "```python\nasync def handler(msg):\n    await bus.publish_inbound(msg)\n\n"
+    "    return msg.session_key\n```\n\n",
+    "| metric | before | after |\n|---|---|---|\n| p50 | 12 ms | 3 ms |\n| p99 | 80 ms | 9 ms |\n\n",
+    "## Next steps\n\n",
+    "> Note: streaming edits are throttled per chat.\n\n",
+]
+
+
+def answer(chars: int, seed: int = 0) -> str:
+    """A markdown answer of about *chars* characters."""
+    rng = random.Random(seed)
+    parts: list[str] = []
+    size = 0
+    while size < chars:
+        parts.append(rng.choice(_BLOCKS))
+        size += len(parts[-1])
+    return "".join(parts)[:chars]
+
+
+def _converters() -> dict[str, tuple[Callable[[str], str], str]]:
+    converters = {"telegram": (_markdown_to_telegram_html, _HTML_RENDER_PROBE)}
+    try:
+        from nanobot.channels.matrix import _markdown_to_matrix_html
+    except ImportError:
+        pass
+    else:
+        converters["matrix"] = (_markdown_to_matrix_html, "")
+    return converters
+
+
+def measure(converter: str, strategy: str, chars: int, delta: int) -> dict[str, Any]:
+    render, probe = _converters()[converter]
+    text = answer(chars)
+    renderer = IncrementalRenderer(render, probe) if strategy == "incremental" else None
+    rendered_chars = 0
+    timings: list[float] = []
+    outputs: list[str] = []
+    for end in range(delta, len(text) + delta, delta):
+        partial = text[:end]
+        started = time.perf_counter()
+        if renderer is not None:
+            outputs.append(renderer.render(partial))
+        else:
+            rendered_chars += len(partial)
+            outputs.append(render(partial))
+        timings.append(time.perf_counter() - started)
+    if renderer is not None:
+        rendered_chars = renderer.rendered_chars
+    identical = all(
+        out == render(text[:end]) for out, end in zip(outputs, range(delta, len(text) + delta, delta))
+    )
+    return {
+        "converter": converter,
+        "strategy": strategy,
+        "chars": len(text),
+        "delta": delta,
+        "total_ms": round(sum(timings) * 1000, 3),
+        **percentiles(timings),
+        "counts": {"edits": len(timings), "rendered_chars": rendered_chars, "identical": identical},
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chars", type=int, nargs="+", default=[2000, 20000])
+    parser.add_argument("--delta", type=int, default=40, help="characters per streamed delta")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> list[dict[str, Any]]:
+    args = build_parser().parse_args(argv)
+    results = [
+        measure(converter, strategy, chars, args.delta)
+        for converter in _converters()
+        for chars in args.chars
+        for strategy in ("full", "incremental")
+    ]
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,13 @@ def _resolve_version() -> str:
 __version__ = _resolve_version()
 __logo__ = "🐈"
 
-from nanobot.nanobot import Nanobot, RunResult
-
 __all__ = ["Nanobot", "RunResult"]
+
+
+def __getattr__(name: str):
+    """Import the SDK facade on first use; it pulls in the whole agent stack."""
+    if name in __all__:
+        from nanobot import nanobot as _facade
+
+        return getattr(_facade, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,208 @@
+"""Coalesce bursts of inbound messages from one sender into a single turn.
+
+People often type one thought as several quick messages ("hey", "can you",
+"check the logs").  Dispatched one by one, the first starts an LLM turn and
+the rest are injected into it, each costing another model call.  With a
+debounce window, :class:`BurstCoalescer` holds a session's first message and
+waits for the sender to go quiet, then hands over one message with the
+combined text and media.  Only one sender's messages in one chat are merged:
+in a group chat, or a unified session spanning several chats, each sender
+and chat has a burst of its own.
+
+The window adapts per channel: it is twice the typical gap between
+follow-up messages seen on that channel, between a quarter of the configured
+window and the window itself.  *max_wait_s* caps how long the first message
+of a burst may wait.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import time
+from collections.abc import Callable
+from typing import Any
+
+from loguru import logger
+
+from nanobot.bus.events import InboundMessage
+from nanobot.providers.metrics import metric_header
+
+_GAP_ALPHA = 0.2  # weight of the newest gap in the moving average
+
+
+@dataclasses.dataclass
+class _Burst:
+    messages: list[InboundMessage]
+    started_at: float
+    timer: asyncio.TimerHandle | None = None
+
+
+def merge_messages(messages: list[InboundMessage]) -> InboundMessage:
+    """One message with the texts (newline-separated) and media of *messages*.
+
+    Metadata comes from the last message, so replies thread under it.
+    """
+    last = messages[-1]
+    if len(messages) == 1:
+        return last
+    return dataclasses.replace(
+        last,
+        content="\n".join(m.content for m in messages if m.content),
+        media=[path for m in messages for path in m.media],
+        metadata={**last.metadata, "_coalesced": len(messages)},
+    )
+
+
+def _origin(msg: InboundMessage) -> tuple[str, str, str]:
+    return msg.channel, msg.chat_id, msg.sender_id
+
+
+class BurstCoalescer:
+    """Per-session debounce of inbound messages.
+
+    :meth:`offer` buffers a message; when its sender has been quiet for the
+    channel's window (or *max_wait_s* after the burst began) the buffered
+    messages are passed to *dispatch* together with the session key (see
+    :func:`merge_messages`).  Each sender in each chat of a session has a
+    burst of its own.
+    """
+
+    def __init__(
+        self,
+        window_s: float,
+        max_wait_s: float,
+        dispatch: Callable[[list[InboundMessage], str], None],
+        window_for: Callable[[str], float] | None = None,
+    ):
+        self.window_s = window_s
+        self.max_wait_s = max_wait_s
+        self._dispatch = dispatch
+        # Per-channel ceiling, e.g. from the channel's own config section.
+        self._window_for = window_for or (lambda _channel: self.window_s)
+        # One burst per sender and chat: (session key, channel, chat id, sender id).
+        self._bursts: dict[tuple[str, str, str, str], _Burst] = {}
+        self._sessions: dict[str, int] = {}  # session key -> bursts waiting
+        self._last_seen: dict[tuple[str, str, str, str], float] = {}
+        self._gaps: dict[str, float] = {}
+        self.bursts = 0
+        self.coalesced = 0
+        self.extra_wait_s = 0.0
+
+    def enabled(self, channel: str) -> bool:
+        return channel != "system" and self._window_for(channel) > 0
+
+    def window(self, channel: str) -> float:
+        """Current debounce window for *channel* in seconds."""
+        ceiling = self._window_for(channel)
+        gap = self._gaps.get(channel)
+        if gap is None:
+            return ceiling
+        return min(ceiling, max(ceiling / 4, 2 * gap))
+
+    def __contains__(self, key: str) -> bool:
+        """Whether session *key* has a burst waiting (from any sender)."""
+        return key in self._sessions
+
+    def offer(self, key: str, msg: InboundMessage) -> None:
+        """Add *msg* to its sender's burst in session *key* and (re)arm the flush timer."""
+        now = time.monotonic()
+        burst_key = (key, *_origin(msg))
+        self._observe_gap(burst_key, msg.channel, now)
+        burst = self._bursts.get(burst_key)
+        if burst is None:
+            burst = self._bursts[burst_key] = _Burst([msg], now)
+            self._sessions[key] = self._sessions.get(key, 0) + 1
+        else:
+            burst.messages.append(msg)
+            burst.timer.cancel()
+        due = min(now + self.window(msg.channel), burst.started_at + self.max_wait_s)
+        burst.timer = asyncio.get_running_loop().call_later(
+            max(due - now, 0), self._flush, burst_key,
+        )
+
+    def flush(self, key: str) -> None:
+        """Dispatch session *key*'s bursts now (no-op if it has none)."""
+        for burst_key in [k for k in self._bursts if k[0] == key]:
+            self._flush(burst_key)
+
+    def discard(self, key: str) -> list[InboundMessage]:
+        """Drop session *key*'s bursts without dispatching them; returns their messages."""
+        messages: list[InboundMessage] = []
+        for burst_key in [k for k in self._bursts if k[0] == key]:
+            burst = self._pop(burst_key)
+            burst.timer.cancel()
+            messages.extend(burst.messages)
+        return messages
+
+    def _flush(self, burst_key: tuple[str, str, str, str]) -> None:
+        burst = self._pop(burst_key)
+        if burst is None:
+            return
+        if burst.timer is not None:
+            burst.timer.cancel()
+        self.bursts += 1
+        self.coalesced += len(burst.messages) - 1
+        self.extra_wait_s += time.monotonic() - burst.started_at
+        key = burst_key[0]
+        if len(burst.messages) > 1:
+            logger.info("Coalesced {} messages for session {}", len(burst.messages), key)
+        self._dispatch(burst.messages, key)
+
+    def _pop(self, burst_key: tuple[str, str, str, str]) -> _Burst | None:
+        burst = self._bursts.pop(burst_key, None)
+        if burst is not None:
+            key = burst_key[0]
+            self._sessions[key] -= 1
+            if not self._sessions[key]:
+                del self._sessions[key]
+        return burst
+
+    def _observe_gap(self, key: tuple[str, str, str, str], channel: str, now: float) -> None:
+        last = self._last_seen.pop(key, None)
+        self._last_seen[key] = now
+        if len(self._last_seen) > 4096:
+            # Forget the least recently seen senders (the dict is in arrival order).
+            for stale in list(self._last_seen)[:1024]:
+                del self._last_seen[stale]
+        if last is None or now - last > self.max_wait_s:
+            return
+        gap = now - last
+        previous = self._gaps.get(channel)
+        self._gaps[channel] = gap if previous is None else (
+            (1 - _GAP_ALPHA) * previous + _GAP_ALPHA * gap
+        )
+
+    # -- telemetry -------------------------------------------------------------
+
+    def status_line(self) -> str | None:
+        if not self.coalesced:
+            return None
+        return (
+            f"\U0001f9e9 Bursts: {self.coalesced} message(s) merged into "
+            f"{self.bursts} turn(s), ~{self.coalesced} LLM call(s) saved"
+        )
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "bursts": self.bursts,
+            "coalesced": self.coalesced,
+            "llm_calls_saved": self.coalesced,
+            "pending": len(self._bursts),
+            "avg_wait_s": self.extra_wait_s / self.bursts if self.bursts else 0.0,
+            "windows_s": {channel: self.window(channel) for channel in self._gaps},
+        }
+
+    def render_prometheus(self) -> str:
+        out: list[str] = []
+        for name, value, help_text in (
+            ("bursts_total", f"{self.bursts}", "Turns started after the debounce window"),
+            ("coalesced_messages_total", f"{self.coalesced}",
+             "Messages merged into an earlier message of the same burst "
+             "(each saves at least one LLM call)"),
+            ("debounce_wait_seconds_total", f"{self.extra_wait_s:g}",
+             "Time first messages waited for their burst to end"),
+        ):
+            metric = metric_header(out, f"nanobot_agent_{name}", "counter", help_text)
+            out.append(f"{metric} {value}")
+        return "\n".join(out) + "\n"
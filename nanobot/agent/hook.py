@@ -8,6 +8,7 @@ from typing import Any
 from loguru import logger
 
 from nanobot.providers.base import LLMResponse, ToolCallRequest
+from nanobot.providers.metrics import LLMCallMetrics
 
 
 @dataclass(slots=True)
@@ -18,6 +19,7 @@ class AgentHookContext:
     messages: list[dict[str, Any]]
     response: LLMResponse | None = None
     usage: dict[str, int] = field(default_factory=dict)
+    llm_call: LLMCallMetrics | None = None  # timing of the call behind ``response``
     tool_calls: list[ToolCallRequest] = field(default_factory=list)
     tool_results: list[Any] = field(default_factory=list)
     tool_events: list[dict[str, str]] = field(default_factory=list)
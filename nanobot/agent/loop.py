@@ -7,13 +7,14 @@ import dataclasses
 import json
 import os
 import time
-from contextlib import AsyncExitStack, nullcontext
+from contextlib import nullcontext
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
 from loguru import logger
 
 from nanobot.agent.autocompact import AutoCompact
+from nanobot.agent.burst import BurstCoalescer, merge_messages
 from nanobot.agent.context import ContextBuilder
 from nanobot.agent.hook import AgentHook, AgentHookContext, CompositeHook
 from nanobot.agent.memory import Consolidator, Dream
@@ -34,13 +35,16 @@ from nanobot.bus.queue import MessageBus
 from nanobot.command import CommandContext, CommandRouter, register_builtin_commands
 from nanobot.config.schema import AgentDefaults
 from nanobot.providers.base import LLMProvider
+from nanobot.providers.metrics import metrics_session, no_metrics_session
 from nanobot.session.manager import Session, SessionManager
-from nanobot.utils.document import extract_documents
-from nanobot.utils.helpers import image_placeholder_text
+from nanobot.utils.document import get_document_extractor
+from nanobot.utils.helpers import ThinkStripper, image_placeholder_text
 from nanobot.utils.helpers import truncate_text as truncate_text_fn
+from nanobot.utils.image import ImageLimits, ImagePipeline
 from nanobot.utils.runtime import EMPTY_FINAL_RESPONSE_MESSAGE
 
 if TYPE_CHECKING:
+    from nanobot.agent.tools.mcp import MCPConnectionManager
     from nanobot.config.schema import ChannelsConfig, ExecToolConfig, WebToolsConfig
     from nanobot.cron.service import CronService
 
@@ -70,25 +74,22 @@ class _LoopHook(AgentHook):
         self._channel = channel
         self._chat_id = chat_id
         self._message_id = message_id
-        self._stream_buf = ""
+        self._think = ThinkStripper()
 
     def wants_streaming(self) -> bool:
         return self._on_stream is not None
 
     async def on_stream(self, context: AgentHookContext, delta: str) -> None:
-        from nanobot.utils.helpers import strip_think
-
-        prev_clean = strip_think(self._stream_buf)
-        self._stream_buf += delta
-        new_clean = strip_think(self._stream_buf)
-        incremental = new_clean[len(prev_clean) :]
+        incremental = self._think.feed(delta)
         if incremental and self._on_stream:
             await self._on_stream(incremental)
 
     async def on_stream_end(self, context: AgentHookContext, *, resuming: bool) -> None:
+        # Text held back as a possible tag turned out to be literal.
+        if (rest := self._think.flush()) and self._on_stream:
+            await self._on_stream(rest)
         if self._on_stream_end:
             await self._on_stream_end(resuming=resuming)
-        self._stream_buf = ""
 
     async def before_execute_tools(self, context: AgentHookContext) -> None:
         if self._on_progress:
@@ -188,7 +189,12 @@ class AgentLoop:
         self._last_usage: dict[str, int] = {}
         self._extra_hooks: list[AgentHook] = hooks or []
 
-        self.context = ContextBuilder(workspace, timezone=timezone, disabled_skills=disabled_skills)
+        limits = getattr(provider, "image_limits", None)
+        self.images = ImagePipeline(limits if isinstance(limits, ImageLimits) else None)
+        self.context = ContextBuilder(
+            workspace, timezone=timezone, disabled_skills=disabled_skills, images=self.images,
+        )
+        self.documents = get_document_extractor()
         self.sessions = session_manager or SessionManager(workspace)
         self.tools = ToolRegistry()
         self.runner = AgentRunner(provider)
@@ -206,9 +212,7 @@ class AgentLoop:
         self._unified_session = unified_session
         self._running = False
         self._mcp_servers = mcp_servers or {}
-        self._mcp_stacks: dict[str, AsyncExitStack] = {}
-        self._mcp_connected = False
-        self._mcp_connecting = False
+        self._mcp_manager: MCPConnectionManager | None = None
         self._active_tasks: dict[str, list[asyncio.Task]] = {}  # session_key -> tasks
         self._background_tasks: list[asyncio.Task] = []
         self._session_locks: dict[str, asyncio.Lock] = {}
@@ -216,6 +220,15 @@ class AgentLoop:
         # When a session has an active task, new messages for that session
         # are routed here instead of creating a new task.
         self._pending_queues: dict[str, asyncio.Queue] = {}
+        # Optional debounce: quick successive messages of a session become one turn.
+        self.bursts = BurstCoalescer(
+            window_s=(channels_config.debounce_ms / 1000) if channels_config else 0.0,
+            max_wait_s=(channels_config.debounce_max_wait_ms / 1000) if channels_config else 0.0,
+            dispatch=self._dispatch_burst,
+            window_for=self._debounce_window,
+        )
+        # Journal entries of merged-away messages, acknowledged with the merged one.
+        self._burst_parts: dict[int, list[InboundMessage]] = {}
         # NANOBOT_MAX_CONCURRENT_REQUESTS: <=0 means unlimited; default 3.
         _max = int(os.environ.get("NANOBOT_MAX_CONCURRENT_REQUESTS", "3"))
         self._concurrency_gate: asyncio.Semaphore | None = (
@@ -226,7 +239,7 @@ class AgentLoop:
             provider=provider,
             model=self.model,
             sessions=self.sessions,
-            context_window_tokens=context_window_tokens,
+            context_window_tokens=self.context_window_tokens,
             build_messages=self.context.build_messages,
             get_tool_definitions=self.tools.get_definitions,
             max_completion_tokens=provider.generation.max_tokens,
@@ -244,6 +257,8 @@ class AgentLoop:
         self._register_default_tools()
         self.commands = CommandRouter()
         register_builtin_commands(self.commands)
+        # Let the bus fast-path priority commands ahead of any backlog.
+        self.bus.is_control = self.commands.is_priority
 
     def _register_default_tools(self) -> None:
         """Register the default set of tools."""
@@ -253,7 +268,10 @@ class AgentLoop:
         extra_read = [BUILTIN_SKILLS_DIR] if allowed_dir else None
         self.tools.register(
             ReadFileTool(
-                workspace=self.workspace, allowed_dir=allowed_dir, extra_allowed_dirs=extra_read
+                workspace=self.workspace,
+                allowed_dir=allowed_dir,
+                extra_allowed_dirs=extra_read,
+                images=self.images,
             )
         )
         for cls in (WriteFileTool, EditFileTool, ListDirTool):
@@ -285,26 +303,35 @@ class AgentLoop:
             )
 
     async def _connect_mcp(self) -> None:
-        """Connect to configured MCP servers (one-time, lazy)."""
-        if self._mcp_connected or self._mcp_connecting or not self._mcp_servers:
+        """Start the MCP connection manager (one-time, lazy).
+
+        Servers connect in parallel; this waits only for each server's first
+        attempt.  Servers that fail keep retrying in the background and their
+        tools appear in the registry once they come up.
+        """
+        if self._mcp_manager is not None or not self._mcp_servers:
             return
-        self._mcp_connecting = True
-        from nanobot.agent.tools.mcp import connect_mcp_servers
+        from nanobot.agent.tools.mcp import MCPConnectionManager
 
+        self._mcp_manager = MCPConnectionManager(self._mcp_servers, self.tools)
         try:
-            self._mcp_stacks = await connect_mcp_servers(self._mcp_servers, self.tools)
-            if self._mcp_stacks:
-                self._mcp_connected = True
-            else:
-                logger.warning("No MCP servers connected successfully (will retry next message)")
+            await self._mcp_manager.start()
         except asyncio.CancelledError:
-            logger.warning("MCP connection cancelled (will retry next message)")
-            self._mcp_stacks.clear()
-        except BaseException as e:
-            logger.error("Failed to connect MCP servers (will retry next message): {}", e)
-            self._mcp_stacks.clear()
-        finally:
-            self._mcp_connecting = False
+            logger.warning("Waiting for MCP servers cancelled (they keep connecting in background)")
+        if not self._mcp_manager.connected:
+            logger.warning("No MCP servers connected yet (retrying in background)")
+
+    @property
+    def mcp_stats(self) -> dict[str, Any]:
+        """Per-server MCP connection and call counters."""
+        return self._mcp_manager.stats if self._mcp_manager is not None else {}
+
+    def mcp_status_lines(self) -> list[str]:
+        """Per-server MCP lines for ``/status`` (none before MCP is connected)."""
+        return self._mcp_manager.status_lines() if self._mcp_manager is not None else []
+
+    def render_mcp_prometheus(self) -> str:
+        return self._mcp_manager.render_prometheus() if self._mcp_manager is not None else ""
 
     def _set_tool_context(self, channel: str, chat_id: str, message_id: str | None = None) -> None:
         """Update context for all tools that need routing info."""
@@ -329,6 +356,26 @@ class AgentLoop:
 
         return format_tool_hints(tool_calls)
 
+    def _debounce_window(self, channel: str) -> float:
+        """Debounce ceiling in seconds: the channel's ``debounceMs``, else the global one."""
+        if self.channels_config is None:
+            return 0.0
+        sections = getattr(self.channels_config, "model_extra", None) or {}
+        section = sections.get(channel)
+        value = None
+        if isinstance(section, dict):
+            value = section.get("debounceMs", section.get("debounce_ms"))
+        if value is None:
+            value = self.channels_config.debounce_ms
+        return max(float(value), 0.0) / 1000
+
+    def _ack(self, msg: InboundMessage) -> None:
+        """Acknowledge *msg* on the bus, with any messages merged into it."""
+        if msg.delivery_id is not None:
+            for part in self._burst_parts.pop(msg.delivery_id, ()):
+                self.bus.ack(part)
+        self.bus.ack(msg)
+
     def _effective_session_key(self, msg: InboundMessage) -> str:
         """Return the session key used for task routing and mid-turn injections."""
         if self._unified_session and not msg.session_key_override:
@@ -385,11 +432,14 @@ class AgentLoop:
                     pending_msg = pending_queue.get_nowait()
                 except asyncio.QueueEmpty:
                     break
+                # From here on the follow-up lives in the session's checkpoint.
+                self._ack(pending_msg)
                 content = pending_msg.content
                 media = pending_msg.media if pending_msg.media else None
                 if media:
-                    content, media = extract_documents(content, media)
+                    content, media = await self.documents.extract_documents(content, media)
                     media = media or None
+                    await self.images.prepare(media)
                 user_content = self.context._build_user_content(content, media)
                 runtime_ctx = self.context._build_runtime_context(
                     pending_msg.channel,
@@ -457,43 +507,67 @@ class AgentLoop:
             if self.commands.is_priority(raw):
                 ctx = CommandContext(msg=msg, session=None, key=msg.session_key, raw=raw, loop=self)
                 result = await self.commands.dispatch_priority(ctx)
+                self._ack(msg)
                 if result:
                     await self.bus.publish_outbound(result)
                 continue
             effective_key = self._effective_session_key(msg)
-            # If this session already has an active pending queue (i.e. a task
-            # is processing this session), route the message there for mid-turn
-            # injection instead of creating a competing task.
-            if effective_key in self._pending_queues:
-                pending_msg = msg
-                if effective_key != msg.session_key:
-                    pending_msg = dataclasses.replace(
-                        msg,
-                        session_key_override=effective_key,
-                    )
-                try:
-                    self._pending_queues[effective_key].put_nowait(pending_msg)
-                except asyncio.QueueFull:
-                    logger.warning(
-                        "Pending queue full for session {}, falling back to queued task",
-                        effective_key,
-                    )
-                else:
-                    logger.info(
-                        "Routed follow-up message to pending queue for session {}",
-                        effective_key,
-                    )
-                    continue
-            # Compute the effective session key before dispatching
-            # This ensures /stop command can find tasks correctly when unified session is enabled
-            task = asyncio.create_task(self._dispatch(msg))
-            self._active_tasks.setdefault(effective_key, []).append(task)
-            task.add_done_callback(
-                lambda t, k=effective_key: self._active_tasks.get(k, [])
-                and self._active_tasks[k].remove(t)
-                if t in self._active_tasks.get(k, [])
-                else None
-            )
+            # With debouncing, an idle session's message waits briefly for
+            # follow-ups so a burst becomes one turn (see _dispatch_burst).
+            if effective_key in self.bursts or (
+                effective_key not in self._pending_queues and self.bursts.enabled(msg.channel)
+            ):
+                self.bursts.offer(effective_key, msg)
+                continue
+            self._route_inbound(msg, effective_key)
+
+    def _dispatch_burst(self, messages: list[InboundMessage], effective_key: str) -> None:
+        """Route a finished burst as one message; its parts are acknowledged with it."""
+        merged = merge_messages(messages)
+        earlier = [m for m in messages[:-1] if m.delivery_id is not None]
+        if earlier:
+            if merged.delivery_id is None:
+                for part in earlier:
+                    self.bus.ack(part)
+            else:
+                self._burst_parts[merged.delivery_id] = earlier
+        self._route_inbound(merged, effective_key)
+
+    def _route_inbound(self, msg: InboundMessage, effective_key: str) -> None:
+        """Inject *msg* into the session's running turn, or start a turn for it."""
+        # If this session already has an active pending queue (i.e. a task
+        # is processing this session), route the message there for mid-turn
+        # injection instead of creating a competing task.
+        if effective_key in self._pending_queues:
+            pending_msg = msg
+            if effective_key != msg.session_key:
+                pending_msg = dataclasses.replace(
+                    msg,
+                    session_key_override=effective_key,
+                )
+            try:
+                self._pending_queues[effective_key].put_nowait(pending_msg)
+            except asyncio.QueueFull:
+                logger.warning(
+                    "Pending queue full for session {}, falling back to queued task",
+                    effective_key,
+                )
+            else:
+                logger.info(
+                    "Routed follow-up message to pending queue for session {}",
+                    effective_key,
+                )
+                return
+        # Compute the effective session key before dispatching
+        # This ensures /stop command can find tasks correctly when unified session is enabled
+        task = asyncio.create_task(self._dispatch(msg))
+        self._active_tasks.setdefault(effective_key, []).append(task)
+        task.add_done_callback(
+            lambda t, k=effective_key: self._active_tasks.get(k, [])
+            and self._active_tasks[k].remove(t)
+            if t in self._active_tasks.get(k, [])
+            else None
+        )
 
     async def _dispatch(self, msg: InboundMessage) -> None:
         """Process a message: per-session serial, cross-session concurrent."""
@@ -543,10 +617,11 @@ class AgentLoop:
                             ))
                             stream_segment += 1
 
-                    response = await self._process_message(
-                        msg, on_stream=on_stream, on_stream_end=on_stream_end,
-                        pending_queue=pending,
-                    )
+                    with metrics_session(session_key):
+                        response = await self._process_message(
+                            msg, on_stream=on_stream, on_stream_end=on_stream_end,
+                            pending_queue=pending,
+                        )
                     if response is not None:
                         await self.bus.publish_outbound(response)
                     elif msg.channel == "cli":
@@ -556,6 +631,9 @@ class AgentLoop:
                         ))
                 except asyncio.CancelledError:
                     logger.info("Task cancelled for session {}", session_key)
+                    # /stop settles the message; a shutdown leaves it for replay.
+                    if self._running:
+                        self._ack(msg)
                     raise
                 except Exception:
                     logger.exception("Error processing message for session {}", session_key)
@@ -563,6 +641,7 @@ class AgentLoop:
                         channel=msg.channel, chat_id=msg.chat_id,
                         content="Sorry, I encountered an error.",
                     ))
+                self._ack(msg)
         finally:
             # Drain any messages still in the pending queue and re-publish
             # them to the bus so they are processed as fresh inbound messages
@@ -575,7 +654,7 @@ class AgentLoop:
                         item = queue.get_nowait()
                     except asyncio.QueueEmpty:
                         break
-                    await self.bus.publish_inbound(item)
+                    await self.bus.requeue_inbound(item)
                     leftover += 1
                 if leftover:
                     logger.info(
@@ -588,16 +667,23 @@ class AgentLoop:
         if self._background_tasks:
             await asyncio.gather(*self._background_tasks, return_exceptions=True)
             self._background_tasks.clear()
-        for name, stack in self._mcp_stacks.items():
-            try:
-                await stack.aclose()
-            except (RuntimeError, BaseExceptionGroup):
-                logger.debug("MCP server '{}' cleanup error (can be ignored)", name)
-        self._mcp_stacks.clear()
+        if self._mcp_manager is not None:
+            await self._mcp_manager.close()
+            self._mcp_manager = None
 
     def _schedule_background(self, coro) -> None:
-        """Schedule a coroutine as a tracked background task (drained on shutdown)."""
-        task = asyncio.create_task(coro)
+        """Schedule a coroutine as a tracked background task (drained on shutdown).
+
+        The task runs outside the current metrics session so its LLM calls
+        (consolidation, archiving) do not disturb that session's prompt-cache
+        state or per-session totals.
+        """
+
+        async def _detached():
+            with no_metrics_session():
+                return await coro
+
+        task = asyncio.create_task(_detached())
         self._background_tasks.append(task)
         task.add_done_callback(self._background_tasks.remove)
 
@@ -631,7 +717,8 @@ class AgentLoop:
 
             session, pending = self.auto_compact.prepare_session(session, key)
 
-            await self.consolidator.maybe_consolidate_by_tokens(session)
+            with no_metrics_session():
+                await self.consolidator.maybe_consolidate_by_tokens(session)
             self._set_tool_context(channel, chat_id, msg.metadata.get("message_id"))
             history = session.get_history(max_messages=0)
             current_role = "assistant" if msg.sender_id == "subagent" else "user"
@@ -659,8 +746,11 @@ class AgentLoop:
         # Extract document text from media at the processing boundary so all
         # channels benefit without format-specific logic in ContextBuilder.
         if msg.media:
-            new_content, image_only = extract_documents(msg.content, msg.media)
+            new_content, image_only = await self.documents.extract_documents(
+                msg.content, msg.media,
+            )
             msg = dataclasses.replace(msg, content=new_content, media=image_only)
+            await self.images.prepare(msg.media)
 
         preview = msg.content[:80] + "..." if len(msg.content) > 80 else msg.content
         logger.info("Processing message from {}:{}: {}", msg.channel, msg.sender_id, preview)
@@ -680,7 +770,9 @@ class AgentLoop:
         if result := await self.commands.dispatch(ctx):
             return result
 
-        await self.consolidator.maybe_consolidate_by_tokens(session)
+        # Summarising is not part of the conversation's prompt-cache prefix.
+        with no_metrics_session():
+            await self.consolidator.maybe_consolidate_by_tokens(session)
 
         self._set_tool_context(msg.channel, msg.chat_id, msg.metadata.get("message_id"))
         if message_tool := self.tools.get("message"):
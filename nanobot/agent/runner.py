@@ -14,6 +14,7 @@ from nanobot.agent.hook import AgentHook, AgentHookContext
 from nanobot.utils.prompt_templates import render_template
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.providers.base import LLMProvider, ToolCallRequest
+from nanobot.providers.metrics import metrics_session
 from nanobot.utils.helpers import (
     build_assistant_message,
     estimate_message_tokens,
@@ -270,6 +271,7 @@ class AgentRunner:
             raw_usage = self._usage_dict(response.usage)
             context.response = response
             context.usage = dict(raw_usage)
+            context.llm_call = response.call_metrics
             context.tool_calls = list(response.tool_calls)
             self._accumulate_usage(usage, raw_usage)
 
@@ -391,6 +393,7 @@ class AgentRunner:
                 raw_usage = self._merge_usage(raw_usage, retry_usage)
                 context.response = response
                 context.usage = dict(raw_usage)
+                context.llm_call = response.call_metrics
                 context.tool_calls = list(response.tool_calls)
                 clean = hook.finalize_content(context, response.content)
 
@@ -571,11 +574,13 @@ class AgentRunner:
             async def _stream(delta: str) -> None:
                 await hook.on_stream(context, delta)
 
-            return await self.provider.chat_stream_with_retry(
-                **kwargs,
-                on_content_delta=_stream,
-            )
-        return await self.provider.chat_with_retry(**kwargs)
+            with metrics_session(spec.session_key):
+                return await self.provider.chat_stream_with_retry(
+                    **kwargs,
+                    on_content_delta=_stream,
+                )
+        with metrics_session(spec.session_key):
+            return await self.provider.chat_with_retry(**kwargs)
 
     async def _request_finalization_retry(
         self,
@@ -585,7 +590,8 @@ class AgentRunner:
         retry_messages = list(messages)
         retry_messages.append(build_finalization_retry_message())
         kwargs = self._build_request_kwargs(spec, retry_messages, tools=None)
-        return await self.provider.chat_with_retry(**kwargs)
+        with metrics_session(spec.session_key):
+            return await self.provider.chat_with_retry(**kwargs)
 
     @staticmethod
     def _usage_dict(usage: dict[str, Any] | None) -> dict[str, int]:
@@ -1,5 +1,6 @@
 """File system tools: read, write, edit, list."""
 
+import asyncio
 import difflib
 import mimetypes
 from dataclasses import dataclass
@@ -9,8 +10,10 @@ from typing import Any
 from nanobot.agent.tools.base import Tool, tool_parameters
 from nanobot.agent.tools.schema import BooleanSchema, IntegerSchema, StringSchema, tool_parameters_schema
 from nanobot.agent.tools import file_state
-from nanobot.utils.helpers import build_image_content_blocks, detect_image_mime
+from nanobot.utils.helpers import detect_image_mime
 from nanobot.config.paths import get_media_dir
+from nanobot.utils.document import DocumentExtractor, get_document_extractor
+from nanobot.utils.image import ImagePipeline, get_image_pipeline
 
 
 def _resolve_path(
@@ -116,6 +119,18 @@ class ReadFileTool(_FsTool):
     _DEFAULT_LIMIT = 2000
     _MAX_PDF_PAGES = 20
 
+    def __init__(
+        self,
+        workspace: Path | None = None,
+        allowed_dir: Path | None = None,
+        extra_allowed_dirs: list[Path] | None = None,
+        extractor: DocumentExtractor | None = None,
+        images: ImagePipeline | None = None,
+    ):
+        super().__init__(workspace, allowed_dir, extra_allowed_dirs)
+        self._extractor = extractor or get_document_extractor()
+        self._images = images or get_image_pipeline()
+
     @property
     def name(self) -> str:
         return "read_file"
@@ -153,7 +168,7 @@ class ReadFileTool(_FsTool):
 
             # PDF support
             if fp.suffix.lower() == ".pdf":
-                return self._read_pdf(fp, pages)
+                return await self._read_pdf(fp, pages)
 
             raw = fp.read_bytes()
             if not raw:
@@ -161,7 +176,9 @@ class ReadFileTool(_FsTool):
 
             mime = detect_image_mime(raw) or mimetypes.guess_type(path)[0]
             if mime and mime.startswith("image/"):
-                return build_image_content_blocks(raw, mime, str(fp), f"(Image file: {path})")
+                return await asyncio.to_thread(
+                    self._images.content_blocks, raw, mime, str(fp), f"(Image file: {path})",
+                )
 
             # Read dedup: same path + offset + limit + unchanged mtime → stub
             if file_state.is_unchanged(fp, offset=offset, limit=limit):
@@ -206,26 +223,26 @@ class ReadFileTool(_FsTool):
         except Exception as e:
             return f"Error reading file: {e}"
 
-    def _read_pdf(self, fp: Path, pages: str | None) -> str:
+    async def _read_pdf(self, fp: Path, pages: str | None) -> str:
         try:
-            import fitz  # pymupdf
+            import fitz  # noqa: F401  # pymupdf
         except ImportError:
             return "Error: PDF reading requires pymupdf. Install with: pip install pymupdf"
 
+        # Pages are parsed off the event loop once and cached by content
+        # hash, so follow-up ``pages=`` requests are served from the cache.
         try:
-            doc = fitz.open(str(fp))
+            page_texts = await self._extractor.segments(fp, "pdf_pages")
         except Exception as e:
             return f"Error reading PDF: {e}"
 
-        total_pages = len(doc)
+        total_pages = len(page_texts)
         if pages:
             try:
                 start, end = _parse_page_range(pages, total_pages)
             except (ValueError, IndexError):
-                doc.close()
                 return f"Error: Invalid page range '{pages}'. Use format like '1-5'."
             if start > end or start >= total_pages:
-                doc.close()
                 return f"Error: Page range '{pages}' is out of bounds (document has {total_pages} pages)."
         else:
             start = 0
@@ -236,11 +253,9 @@ class ReadFileTool(_FsTool):
 
         parts: list[str] = []
         for i in range(start, end + 1):
-            page = doc[i]
-            text = page.get_text().strip()
+            text = page_texts[i]
             if text:
                 parts.append(f"--- Page {i + 1} ---\n{text}")
-        doc.close()
 
         if not parts:
             return f"(PDF has no extractable text: {fp})"
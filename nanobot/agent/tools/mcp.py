@@ -1,7 +1,10 @@
 """MCP client: connects to MCP servers and wraps their tools as native nanobot tools."""
 
 import asyncio
+import time
+from abc import abstractmethod
 from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
 from typing import Any
 
 import httpx
@@ -9,6 +12,7 @@ from loguru import logger
 
 from nanobot.agent.tools.base import Tool
 from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.providers.metrics import label_value, metric_header
 
 
 def _extract_nullable_branch(options: Any) -> tuple[dict[str, Any], bool] | None:
@@ -72,17 +76,75 @@ def _normalize_schema_for_openai(schema: Any) -> dict[str, Any]:
     return normalized
 
 
-class MCPToolWrapper(Tool):
-    """Wraps a single MCP server tool as a nanobot Tool."""
+@dataclass
+class MCPServerStats:
+    """Connection and call counters for one MCP server."""
+
+    connected: bool = False
+    connects: int = 0
+    reconnects: int = 0
+    connect_failures: int = 0
+    health_failures: int = 0
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    connect_latency_ms: float | None = None
+    last_latency_ms: float | None = None
+    total_latency_ms: float = 0.0
+    last_error: str | None = None
+    # Set by wrappers when a call fails so the manager health-checks early.
+    suspect: asyncio.Event = field(default_factory=asyncio.Event, repr=False, compare=False)
 
-    def __init__(self, session, server_name: str, tool_def, tool_timeout: int = 30):
+    @property
+    def avg_latency_ms(self) -> float | None:
+        return self.total_latency_ms / self.calls if self.calls else None
+
+    def record_call(
+        self,
+        started: float,
+        *,
+        error: str | None = None,
+        timeout: bool = False,
+        server_replied: bool = False,
+    ) -> None:
+        elapsed = (time.perf_counter() - started) * 1000
+        self.calls += 1
+        self.last_latency_ms = elapsed
+        self.total_latency_ms += elapsed
+        if timeout:
+            self.timeouts += 1
+        if error is not None or timeout:
+            self.errors += 1
+            self.last_error = error or "timeout"
+            if not server_replied:
+                self.suspect.set()
+
+
+def _record(stats: MCPServerStats | None, started: float, **kwargs: Any) -> None:
+    if stats is not None:
+        stats.record_call(started, **kwargs)
+
+
+class _MCPWrapper(Tool):
+    """Shared plumbing for tools backed by one MCP server session.
+
+    Calls to the same server share *limiter*, an ``asyncio.Semaphore`` that
+    caps how many requests are in flight at once even when the runner
+    batches several concurrency-safe MCP calls together.
+    """
+
+    _session: Any
+    _name: str
+    _description: str
+    _parameters: dict[str, Any]
+    _stats: MCPServerStats | None = None
+    _limiter: asyncio.Semaphore | None = None
+
+    def rebind(self, session) -> None:
+        """Point this wrapper at a reconnected session."""
         self._session = session
-        self._original_name = tool_def.name
-        self._name = f"mcp_{server_name}_{tool_def.name}"
-        self._description = tool_def.description or tool_def.name
-        raw_schema = tool_def.inputSchema or {"type": "object", "properties": {}}
-        self._parameters = _normalize_schema_for_openai(raw_schema)
-        self._tool_timeout = tool_timeout
 
     @property
     def name(self) -> str:
@@ -97,14 +159,88 @@ class MCPToolWrapper(Tool):
         return self._parameters
 
     async def execute(self, **kwargs: Any) -> str:
+        if self._limiter is None:
+            return await self._call(**kwargs)
+        async with self._limiter:
+            if self._stats is not None:
+                self._stats.in_flight += 1
+                self._stats.peak_in_flight = max(self._stats.peak_in_flight, self._stats.in_flight)
+            try:
+                return await self._call(**kwargs)
+            finally:
+                if self._stats is not None:
+                    self._stats.in_flight -= 1
+
+    @abstractmethod
+    async def _call(self, **kwargs: Any) -> str: ...
+
+
+def _matches(names: set[str], raw: str, wrapped: str) -> bool:
+    return "*" in names or raw in names or wrapped in names
+
+
+class MCPToolWrapper(_MCPWrapper):
+    """Wraps a single MCP server tool as a nanobot Tool.
+
+    Concurrency flags come from the server's tool annotations:
+    ``readOnlyHint`` makes the tool read-only, and an ``idempotentHint`` tool
+    that is not ``destructiveHint`` may run alongside other safe tools.
+    *read_only* / *concurrency_safe* override the annotations when given.
+    """
+
+    def __init__(
+        self,
+        session,
+        server_name: str,
+        tool_def,
+        tool_timeout: int = 30,
+        stats: MCPServerStats | None = None,
+        *,
+        limiter: asyncio.Semaphore | None = None,
+        read_only: bool | None = None,
+        concurrency_safe: bool | None = None,
+    ):
+        self._session = session
+        self._stats = stats
+        self._limiter = limiter
+        self._original_name = tool_def.name
+        self._name = f"mcp_{server_name}_{tool_def.name}"
+        self._description = tool_def.description or tool_def.name
+        raw_schema = tool_def.inputSchema or {"type": "object", "properties": {}}
+        self._parameters = _normalize_schema_for_openai(raw_schema)
+        self._tool_timeout = tool_timeout
+
+        annotations = getattr(tool_def, "annotations", None)
+        hinted_read_only = getattr(annotations, "readOnlyHint", None) is True
+        # destructiveHint defaults to true in the MCP spec, so it must be explicitly false.
+        hinted_idempotent = (
+            getattr(annotations, "idempotentHint", None) is True
+            and getattr(annotations, "destructiveHint", None) is False
+        )
+        self._read_only = hinted_read_only if read_only is None else read_only
+        self._concurrency_safe = (
+            (self._read_only or hinted_idempotent) if concurrency_safe is None else concurrency_safe
+        )
+
+    @property
+    def read_only(self) -> bool:
+        return self._read_only
+
+    @property
+    def concurrency_safe(self) -> bool:
+        return self._concurrency_safe
+
+    async def _call(self, **kwargs: Any) -> str:
         from mcp import types
 
+        started = time.perf_counter()
         try:
             result = await asyncio.wait_for(
                 self._session.call_tool(self._original_name, arguments=kwargs),
                 timeout=self._tool_timeout,
             )
         except asyncio.TimeoutError:
+            _record(self._stats, started, timeout=True)
             logger.warning("MCP tool '{}' timed out after {}s", self._name, self._tool_timeout)
             return f"(MCP tool call timed out after {self._tool_timeout}s)"
         except asyncio.CancelledError:
@@ -113,9 +249,11 @@ class MCPToolWrapper(Tool):
             task = asyncio.current_task()
             if task is not None and task.cancelling() > 0:
                 raise
+            _record(self._stats, started, error="cancelled")
             logger.warning("MCP tool '{}' was cancelled by server/SDK", self._name)
             return "(MCP tool call was cancelled)"
         except Exception as exc:
+            _record(self._stats, started, error=type(exc).__name__)
             logger.exception(
                 "MCP tool '{}' failed: {}: {}",
                 self._name,
@@ -123,6 +261,7 @@ class MCPToolWrapper(Tool):
                 exc,
             )
             return f"(MCP tool call failed: {type(exc).__name__})"
+        _record(self._stats, started)
 
         parts = []
         for block in result.content:
@@ -133,11 +272,22 @@ class MCPToolWrapper(Tool):
         return "\n".join(parts) or "(no output)"
 
 
-class MCPResourceWrapper(Tool):
+class MCPResourceWrapper(_MCPWrapper):
     """Wraps an MCP resource URI as a read-only nanobot Tool."""
 
-    def __init__(self, session, server_name: str, resource_def, resource_timeout: int = 30):
+    def __init__(
+        self,
+        session,
+        server_name: str,
+        resource_def,
+        resource_timeout: int = 30,
+        stats: MCPServerStats | None = None,
+        *,
+        limiter: asyncio.Semaphore | None = None,
+    ):
         self._session = session
+        self._stats = stats
+        self._limiter = limiter
         self._uri = resource_def.uri
         self._name = f"mcp_{server_name}_resource_{resource_def.name}"
         desc = resource_def.description or resource_def.name
@@ -149,31 +299,21 @@ class MCPResourceWrapper(Tool):
         }
         self._resource_timeout = resource_timeout
 
-    @property
-    def name(self) -> str:
-        return self._name
-
-    @property
-    def description(self) -> str:
-        return self._description
-
-    @property
-    def parameters(self) -> dict[str, Any]:
-        return self._parameters
-
     @property
     def read_only(self) -> bool:
         return True
 
-    async def execute(self, **kwargs: Any) -> str:
+    async def _call(self, **kwargs: Any) -> str:
         from mcp import types
 
+        started = time.perf_counter()
         try:
             result = await asyncio.wait_for(
                 self._session.read_resource(self._uri),
                 timeout=self._resource_timeout,
             )
         except asyncio.TimeoutError:
+            _record(self._stats, started, timeout=True)
             logger.warning(
                 "MCP resource '{}' timed out after {}s", self._name, self._resource_timeout
             )
@@ -182,9 +322,11 @@ class MCPResourceWrapper(Tool):
             task = asyncio.current_task()
             if task is not None and task.cancelling() > 0:
                 raise
+            _record(self._stats, started, error="cancelled")
             logger.warning("MCP resource '{}' was cancelled by server/SDK", self._name)
             return "(MCP resource read was cancelled)"
         except Exception as exc:
+            _record(self._stats, started, error=type(exc).__name__)
             logger.exception(
                 "MCP resource '{}' failed: {}: {}",
                 self._name,
@@ -192,6 +334,7 @@ class MCPResourceWrapper(Tool):
                 exc,
             )
             return f"(MCP resource read failed: {type(exc).__name__})"
+        _record(self._stats, started)
 
         parts: list[str] = []
         for block in result.contents:
@@ -204,11 +347,22 @@ class MCPResourceWrapper(Tool):
         return "\n".join(parts) or "(no output)"
 
 
-class MCPPromptWrapper(Tool):
+class MCPPromptWrapper(_MCPWrapper):
     """Wraps an MCP prompt as a read-only nanobot Tool."""
 
-    def __init__(self, session, server_name: str, prompt_def, prompt_timeout: int = 30):
+    def __init__(
+        self,
+        session,
+        server_name: str,
+        prompt_def,
+        prompt_timeout: int = 30,
+        stats: MCPServerStats | None = None,
+        *,
+        limiter: asyncio.Semaphore | None = None,
+    ):
         self._session = session
+        self._stats = stats
+        self._limiter = limiter
         self._prompt_name = prompt_def.name
         self._name = f"mcp_{server_name}_prompt_{prompt_def.name}"
         desc = prompt_def.description or prompt_def.name
@@ -234,41 +388,33 @@ class MCPPromptWrapper(Tool):
             "required": required,
         }
 
-    @property
-    def name(self) -> str:
-        return self._name
-
-    @property
-    def description(self) -> str:
-        return self._description
-
-    @property
-    def parameters(self) -> dict[str, Any]:
-        return self._parameters
-
     @property
     def read_only(self) -> bool:
         return True
 
-    async def execute(self, **kwargs: Any) -> str:
+    async def _call(self, **kwargs: Any) -> str:
         from mcp import types
         from mcp.shared.exceptions import McpError
 
+        started = time.perf_counter()
         try:
             result = await asyncio.wait_for(
                 self._session.get_prompt(self._prompt_name, arguments=kwargs),
                 timeout=self._prompt_timeout,
             )
         except asyncio.TimeoutError:
+            _record(self._stats, started, timeout=True)
             logger.warning("MCP prompt '{}' timed out after {}s", self._name, self._prompt_timeout)
             return f"(MCP prompt call timed out after {self._prompt_timeout}s)"
         except asyncio.CancelledError:
             task = asyncio.current_task()
             if task is not None and task.cancelling() > 0:
                 raise
+            _record(self._stats, started, error="cancelled")
             logger.warning("MCP prompt '{}' was cancelled by server/SDK", self._name)
             return "(MCP prompt call was cancelled)"
         except McpError as exc:
+            _record(self._stats, started, error=exc.error.message, server_replied=True)
             logger.error(
                 "MCP prompt '{}' failed: code={} message={}",
                 self._name,
@@ -277,6 +423,7 @@ class MCPPromptWrapper(Tool):
             )
             return f"(MCP prompt call failed: {exc.error.message} [code {exc.error.code}])"
         except Exception as exc:
+            _record(self._stats, started, error=type(exc).__name__)
             logger.exception(
                 "MCP prompt '{}' failed: {}: {}",
                 self._name,
@@ -285,6 +432,7 @@ class MCPPromptWrapper(Tool):
             )
             return f"(MCP prompt call failed: {type(exc).__name__})"
 
+        _record(self._stats, started)
         parts: list[str] = []
         for message in result.messages:
             content = message.content
@@ -302,6 +450,193 @@ class MCPPromptWrapper(Tool):
         return "\n".join(parts) or "(no output)"
 
 
+def _transport_type(name: str, cfg) -> str | None:
+    if cfg.type:
+        return cfg.type
+    if cfg.command:
+        return "stdio"
+    if cfg.url:
+        return "sse" if cfg.url.rstrip("/").endswith("/sse") else "streamableHttp"
+    logger.warning("MCP server '{}': no command or url configured, skipping", name)
+    return None
+
+
+async def _open_session(stack: AsyncExitStack, name: str, cfg):
+    """Open the transport and an initialized ClientSession on *stack*.
+
+    Returns None when the server is misconfigured (nothing to retry).
+    """
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.sse import sse_client
+    from mcp.client.stdio import stdio_client
+    from mcp.client.streamable_http import streamable_http_client
+
+    transport_type = _transport_type(name, cfg)
+    if transport_type is None:
+        return None
+
+    if transport_type == "stdio":
+        params = StdioServerParameters(command=cfg.command, args=cfg.args, env=cfg.env or None)
+        read, write = await stack.enter_async_context(stdio_client(params))
+    elif transport_type == "sse":
+
+        def httpx_client_factory(
+            headers: dict[str, str] | None = None,
+            timeout: httpx.Timeout | None = None,
+            auth: httpx.Auth | None = None,
+        ) -> httpx.AsyncClient:
+            merged_headers = {
+                "Accept": "application/json, text/event-stream",
+                **(cfg.headers or {}),
+                **(headers or {}),
+            }
+            return httpx.AsyncClient(
+                headers=merged_headers or None,
+                follow_redirects=True,
+                timeout=timeout,
+                auth=auth,
+            )
+
+        read, write = await stack.enter_async_context(
+            sse_client(cfg.url, httpx_client_factory=httpx_client_factory)
+        )
+    elif transport_type == "streamableHttp":
+        http_client = await stack.enter_async_context(
+            httpx.AsyncClient(
+                headers=cfg.headers or None,
+                follow_redirects=True,
+                timeout=None,
+            )
+        )
+        read, write, _ = await stack.enter_async_context(
+            streamable_http_client(cfg.url, http_client=http_client)
+        )
+    else:
+        logger.warning("MCP server '{}': unknown transport type '{}'", name, transport_type)
+        return None
+
+    session = await stack.enter_async_context(ClientSession(read, write))
+    await session.initialize()
+    return session
+
+
+async def _build_wrappers(
+    session,
+    name: str,
+    cfg,
+    stats: MCPServerStats | None = None,
+    limiter: asyncio.Semaphore | None = None,
+) -> list[Tool]:
+    """List the server's tools, resources and prompts and wrap the enabled ones."""
+    wrappers: list[Tool] = []
+    read_only_tools = set(cfg.read_only_tools)
+    serial_tools = set(cfg.serial_tools)
+    tools = await session.list_tools()
+    enabled_tools = set(cfg.enabled_tools)
+    allow_all_tools = "*" in enabled_tools
+    matched_enabled_tools: set[str] = set()
+    available_raw_names = [tool_def.name for tool_def in tools.tools]
+    available_wrapped_names = [f"mcp_{name}_{tool_def.name}" for tool_def in tools.tools]
+    for tool_def in tools.tools:
+        wrapped_name = f"mcp_{name}_{tool_def.name}"
+        if (
+            not allow_all_tools
+            and tool_def.name not in enabled_tools
+            and wrapped_name not in enabled_tools
+        ):
+            logger.debug(
+                "MCP: skipping tool '{}' from server '{}' (not in enabledTools)",
+                wrapped_name,
+                name,
+            )
+            continue
+        read_only = True if _matches(read_only_tools, tool_def.name, wrapped_name) else None
+        wrappers.append(
+            MCPToolWrapper(
+                session,
+                name,
+                tool_def,
+                tool_timeout=cfg.tool_timeout,
+                stats=stats,
+                limiter=limiter,
+                read_only=read_only,
+                concurrency_safe=(
+                    False if _matches(serial_tools, tool_def.name, wrapped_name) else None
+                ),
+            )
+        )
+        if enabled_tools:
+            if tool_def.name in enabled_tools:
+                matched_enabled_tools.add(tool_def.name)
+            if wrapped_name in enabled_tools:
+                matched_enabled_tools.add(wrapped_name)
+
+    if enabled_tools and not allow_all_tools:
+        unmatched_enabled_tools = sorted(enabled_tools - matched_enabled_tools)
+        if unmatched_enabled_tools:
+            logger.warning(
+                "MCP server '{}': enabledTools entries not found: {}. Available raw names: {}. "
+                "Available wrapped names: {}",
+                name,
+                ", ".join(unmatched_enabled_tools),
+                ", ".join(available_raw_names) or "(none)",
+                ", ".join(available_wrapped_names) or "(none)",
+            )
+
+    try:
+        resources_result = await session.list_resources()
+        for resource in resources_result.resources:
+            wrappers.append(
+                MCPResourceWrapper(
+                    session,
+                    name,
+                    resource,
+                    resource_timeout=cfg.tool_timeout,
+                    stats=stats,
+                    limiter=limiter,
+                )
+            )
+    except Exception as e:
+        logger.debug("MCP server '{}': resources not supported or failed: {}", name, e)
+
+    try:
+        prompts_result = await session.list_prompts()
+        for prompt in prompts_result.prompts:
+            wrappers.append(
+                MCPPromptWrapper(
+                    session,
+                    name,
+                    prompt,
+                    prompt_timeout=cfg.tool_timeout,
+                    stats=stats,
+                    limiter=limiter,
+                )
+            )
+    except Exception as e:
+        logger.debug("MCP server '{}': prompts not supported or failed: {}", name, e)
+
+    return wrappers
+
+
+def _connect_error_hint(e: BaseException) -> str:
+    text = str(e).lower()
+    if any(
+        marker in text
+        for marker in (
+            "parse error",
+            "invalid json",
+            "unexpected token",
+            "jsonrpc",
+            "content-length",
+        )
+    ):
+        return (
+            " Hint: this looks like stdio protocol pollution. Make sure the MCP server writes "
+            "only JSON-RPC to stdout and sends logs/debug output to stderr instead."
+        )
+    return ""
+
+
 async def connect_mcp_servers(
     mcp_servers: dict, registry: ToolRegistry
 ) -> dict[str, AsyncExitStack]:
@@ -310,167 +645,33 @@ async def connect_mcp_servers(
     Returns a dict mapping server name -> its dedicated AsyncExitStack.
     Each server gets its own stack and runs in its own task to prevent
     cancel scope conflicts when multiple MCP servers are configured.
+
+    This is a one-shot connect; :class:`MCPConnectionManager` additionally
+    health-checks and reconnects servers.
     """
-    from mcp import ClientSession, StdioServerParameters
-    from mcp.client.sse import sse_client
-    from mcp.client.stdio import stdio_client
-    from mcp.client.streamable_http import streamable_http_client
 
     async def connect_single_server(name: str, cfg) -> tuple[str, AsyncExitStack | None]:
         server_stack = AsyncExitStack()
         await server_stack.__aenter__()
 
         try:
-            transport_type = cfg.type
-            if not transport_type:
-                if cfg.command:
-                    transport_type = "stdio"
-                elif cfg.url:
-                    transport_type = (
-                        "sse" if cfg.url.rstrip("/").endswith("/sse") else "streamableHttp"
-                    )
-                else:
-                    logger.warning("MCP server '{}': no command or url configured, skipping", name)
-                    await server_stack.aclose()
-                    return name, None
-
-            if transport_type == "stdio":
-                params = StdioServerParameters(
-                    command=cfg.command, args=cfg.args, env=cfg.env or None
-                )
-                read, write = await server_stack.enter_async_context(stdio_client(params))
-            elif transport_type == "sse":
-
-                def httpx_client_factory(
-                    headers: dict[str, str] | None = None,
-                    timeout: httpx.Timeout | None = None,
-                    auth: httpx.Auth | None = None,
-                ) -> httpx.AsyncClient:
-                    merged_headers = {
-                        "Accept": "application/json, text/event-stream",
-                        **(cfg.headers or {}),
-                        **(headers or {}),
-                    }
-                    return httpx.AsyncClient(
-                        headers=merged_headers or None,
-                        follow_redirects=True,
-                        timeout=timeout,
-                        auth=auth,
-                    )
-
-                read, write = await server_stack.enter_async_context(
-                    sse_client(cfg.url, httpx_client_factory=httpx_client_factory)
-                )
-            elif transport_type == "streamableHttp":
-                http_client = await server_stack.enter_async_context(
-                    httpx.AsyncClient(
-                        headers=cfg.headers or None,
-                        follow_redirects=True,
-                        timeout=None,
-                    )
-                )
-                read, write, _ = await server_stack.enter_async_context(
-                    streamable_http_client(cfg.url, http_client=http_client)
-                )
-            else:
-                logger.warning("MCP server '{}': unknown transport type '{}'", name, transport_type)
+            session = await _open_session(server_stack, name, cfg)
+            if session is None:
                 await server_stack.aclose()
                 return name, None
 
-            session = await server_stack.enter_async_context(ClientSession(read, write))
-            await session.initialize()
-
-            tools = await session.list_tools()
-            enabled_tools = set(cfg.enabled_tools)
-            allow_all_tools = "*" in enabled_tools
-            registered_count = 0
-            matched_enabled_tools: set[str] = set()
-            available_raw_names = [tool_def.name for tool_def in tools.tools]
-            available_wrapped_names = [f"mcp_{name}_{tool_def.name}" for tool_def in tools.tools]
-            for tool_def in tools.tools:
-                wrapped_name = f"mcp_{name}_{tool_def.name}"
-                if (
-                    not allow_all_tools
-                    and tool_def.name not in enabled_tools
-                    and wrapped_name not in enabled_tools
-                ):
-                    logger.debug(
-                        "MCP: skipping tool '{}' from server '{}' (not in enabledTools)",
-                        wrapped_name,
-                        name,
-                    )
-                    continue
-                wrapper = MCPToolWrapper(session, name, tool_def, tool_timeout=cfg.tool_timeout)
+            limiter = asyncio.Semaphore(cfg.max_concurrent_calls)
+            wrappers = await _build_wrappers(session, name, cfg, limiter=limiter)
+            for wrapper in wrappers:
                 registry.register(wrapper)
-                logger.debug("MCP: registered tool '{}' from server '{}'", wrapper.name, name)
-                registered_count += 1
-                if enabled_tools:
-                    if tool_def.name in enabled_tools:
-                        matched_enabled_tools.add(tool_def.name)
-                    if wrapped_name in enabled_tools:
-                        matched_enabled_tools.add(wrapped_name)
-
-            if enabled_tools and not allow_all_tools:
-                unmatched_enabled_tools = sorted(enabled_tools - matched_enabled_tools)
-                if unmatched_enabled_tools:
-                    logger.warning(
-                        "MCP server '{}': enabledTools entries not found: {}. Available raw names: {}. "
-                        "Available wrapped names: {}",
-                        name,
-                        ", ".join(unmatched_enabled_tools),
-                        ", ".join(available_raw_names) or "(none)",
-                        ", ".join(available_wrapped_names) or "(none)",
-                    )
-
-            try:
-                resources_result = await session.list_resources()
-                for resource in resources_result.resources:
-                    wrapper = MCPResourceWrapper(
-                        session, name, resource, resource_timeout=cfg.tool_timeout
-                    )
-                    registry.register(wrapper)
-                    registered_count += 1
-                    logger.debug(
-                        "MCP: registered resource '{}' from server '{}'", wrapper.name, name
-                    )
-            except Exception as e:
-                logger.debug("MCP server '{}': resources not supported or failed: {}", name, e)
-
-            try:
-                prompts_result = await session.list_prompts()
-                for prompt in prompts_result.prompts:
-                    wrapper = MCPPromptWrapper(
-                        session, name, prompt, prompt_timeout=cfg.tool_timeout
-                    )
-                    registry.register(wrapper)
-                    registered_count += 1
-                    logger.debug("MCP: registered prompt '{}' from server '{}'", wrapper.name, name)
-            except Exception as e:
-                logger.debug("MCP server '{}': prompts not supported or failed: {}", name, e)
-
+                logger.debug("MCP: registered '{}' from server '{}'", wrapper.name, name)
             logger.info(
-                "MCP server '{}': connected, {} capabilities registered", name, registered_count
+                "MCP server '{}': connected, {} capabilities registered", name, len(wrappers)
             )
             return name, server_stack
 
         except Exception as e:
-            hint = ""
-            text = str(e).lower()
-            if any(
-                marker in text
-                for marker in (
-                    "parse error",
-                    "invalid json",
-                    "unexpected token",
-                    "jsonrpc",
-                    "content-length",
-                )
-            ):
-                hint = (
-                    " Hint: this looks like stdio protocol pollution. Make sure the MCP server writes "
-                    "only JSON-RPC to stdout and sends logs/debug output to stderr instead."
-                )
-            logger.error("MCP server '{}': failed to connect: {}{}", name, e, hint)
+            logger.error("MCP server '{}': failed to connect: {}{}", name, e, _connect_error_hint(e))
             try:
                 await server_stack.aclose()
             except Exception:
@@ -495,3 +696,217 @@ async def connect_mcp_servers(
             server_stacks[result[0]] = result[1]
 
     return server_stacks
+
+
+class _HealthCheckError(Exception):
+    pass
+
+
+@dataclass
+class _ServerState:
+    name: str
+    cfg: Any
+    stats: MCPServerStats = field(default_factory=MCPServerStats)
+    wrappers: dict[str, Tool] = field(default_factory=dict)
+    settled: asyncio.Event = field(default_factory=asyncio.Event)
+    task: asyncio.Task | None = None
+    # One limiter per server for its whole lifetime, so rebound and newly
+    # registered wrappers share the same in-flight budget.
+    limiter: asyncio.Semaphore = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.limiter = asyncio.Semaphore(self.cfg.max_concurrent_calls)
+
+
+class MCPConnectionManager:
+    """Keep MCP server sessions alive for the lifetime of the agent.
+
+    Every server is owned by a supervisor task that connects (bounded by the
+    server's ``connect_timeout``), registers its capabilities as soon as the
+    session is ready, then pings it every ``health_check_interval`` seconds
+    — or right away after a failed call.  When a session dies the supervisor
+    reconnects with exponential backoff and rebinds the existing wrappers to
+    the new session in one synchronous step, so the registry never exposes a
+    half-swapped server.  The transport's exit stack is entered and closed in
+    the same task, which keeps anyio cancel scopes happy.
+    """
+
+    def __init__(
+        self,
+        servers: dict,
+        registry: ToolRegistry,
+        *,
+        backoff_base: float = 1.0,
+        backoff_max: float = 300.0,
+    ):
+        self.registry = registry
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._servers = {name: _ServerState(name, cfg) for name, cfg in servers.items()}
+        self._closing = False
+
+    @property
+    def stats(self) -> dict[str, MCPServerStats]:
+        return {name: state.stats for name, state in self._servers.items()}
+
+    @property
+    def connected(self) -> list[str]:
+        return [name for name, state in self._servers.items() if state.stats.connected]
+
+    def status_lines(self) -> list[str]:
+        """One line per server for ``/status``: state, calls, errors and latency."""
+        lines = []
+        for name, stats in sorted(self.stats.items()):
+            parts = ["connected" if stats.connected else "disconnected", f"{stats.calls} calls"]
+            if stats.errors:
+                parts.append(f"{stats.errors} errors ({stats.timeouts} timeouts)")
+            if stats.avg_latency_ms is not None:
+                parts.append(f"avg {stats.avg_latency_ms:.0f}ms")
+            if stats.reconnects:
+                parts.append(f"{stats.reconnects} reconnects")
+            if not stats.connected and stats.last_error:
+                parts.append(f"last error: {stats.last_error}")
+            lines.append(f"{name}: " + ", ".join(parts))
+        return lines
+
+    def render_prometheus(self) -> str:
+        """Prometheus text for per-server connection state, calls, errors and latency."""
+        out: list[str] = []
+        servers = sorted(self.stats.items())
+        for name, kind, value, help_text in (
+            ("connected", "gauge", lambda s: int(s.connected), "Whether the session is up"),
+            ("in_flight", "gauge", lambda s: s.in_flight, "Tool calls in flight"),
+            ("connects_total", "counter", lambda s: s.connects, "Successful connects"),
+            ("reconnects_total", "counter", lambda s: s.reconnects, "Reconnects after a drop"),
+            ("connect_failures_total", "counter", lambda s: s.connect_failures,
+             "Failed connect attempts"),
+            ("health_failures_total", "counter", lambda s: s.health_failures,
+             "Failed health checks"),
+            ("calls_total", "counter", lambda s: s.calls, "Tool, resource and prompt calls"),
+            ("errors_total", "counter", lambda s: s.errors, "Calls that failed or timed out"),
+            ("timeouts_total", "counter", lambda s: s.timeouts, "Calls that timed out"),
+            ("call_seconds_total", "counter", lambda s: s.total_latency_ms / 1000,
+             "Time spent in calls"),
+        ):
+            metric = metric_header(out, f"nanobot_mcp_{name}", kind, help_text)
+            for server, stats in servers:
+                out.append(f'{metric}{{server="{label_value(server)}"}} {value(stats):g}')
+        return "\n".join(out) + "\n"
+
+    async def start(self) -> None:
+        """Start all supervisors and wait until each has made its first attempt."""
+        for state in self._servers.values():
+            if state.task is None:
+                state.task = asyncio.create_task(
+                    self._supervise(state), name=f"mcp-{state.name}"
+                )
+        await asyncio.gather(*(state.settled.wait() for state in self._servers.values()))
+
+    async def close(self) -> None:
+        """Stop supervisors; each closes its own transport on the way out."""
+        self._closing = True
+        tasks = [state.task for state in self._servers.values() if state.task is not None]
+        for task in tasks:
+            task.cancel()
+        for state, result in zip(
+            self._servers.values(), await asyncio.gather(*tasks, return_exceptions=True)
+        ):
+            if isinstance(result, BaseException) and not isinstance(
+                result, asyncio.CancelledError
+            ):
+                logger.debug("MCP server '{}' cleanup error (can be ignored): {}", state.name, result)
+            state.task = None
+            state.stats.connected = False
+
+    def _install(self, state: _ServerState, session, wrappers: list[Tool]) -> None:
+        fresh = {wrapper.name: wrapper for wrapper in wrappers}
+        for name, wrapper in fresh.items():
+            current = state.wrappers.get(name)
+            if (
+                current is not None
+                and current.parameters == wrapper.parameters
+                and current.description == wrapper.description
+            ):
+                current.rebind(session)
+                continue
+            self.registry.register(wrapper)
+            state.wrappers[name] = wrapper
+            logger.debug("MCP: registered '{}' from server '{}'", name, state.name)
+        for name in set(state.wrappers) - set(fresh):
+            self.registry.unregister(name)
+            del state.wrappers[name]
+            logger.debug("MCP: unregistered '{}' (gone from server '{}')", name, state.name)
+
+    async def _monitor(self, state: _ServerState, session) -> None:
+        """Return only by raising once the session stops answering pings."""
+        interval = state.cfg.health_check_interval or None
+        stats = state.stats
+        while True:
+            try:
+                await asyncio.wait_for(stats.suspect.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            stats.suspect.clear()
+            try:
+                async with asyncio.timeout(state.cfg.tool_timeout):
+                    await session.send_ping()
+            except Exception as e:
+                stats.health_failures += 1
+                raise _HealthCheckError(f"health check failed: {type(e).__name__}: {e}") from e
+
+    async def _supervise(self, state: _ServerState) -> None:
+        stats = state.stats
+        failures = 0
+        delay = self.backoff_base
+        while not self._closing:
+            started = time.perf_counter()
+            try:
+                async with AsyncExitStack() as stack:
+                    async with asyncio.timeout(state.cfg.connect_timeout):
+                        session = await _open_session(stack, state.name, state.cfg)
+                        if session is None:
+                            state.settled.set()
+                            return
+                        wrappers = await _build_wrappers(
+                            session, state.name, state.cfg, stats, state.limiter
+                        )
+                    self._install(state, session, wrappers)
+                    stats.connect_latency_ms = (time.perf_counter() - started) * 1000
+                    stats.reconnects += int(stats.connects > 0)
+                    stats.connects += 1
+                    stats.connected = True
+                    stats.suspect.clear()
+                    failures, delay = 0, self.backoff_base
+                    state.settled.set()
+                    logger.info(
+                        "MCP server '{}': connected in {:.0f}ms, {} capabilities registered",
+                        state.name,
+                        stats.connect_latency_ms,
+                        len(state.wrappers),
+                    )
+                    await self._monitor(state, session)
+            except (Exception, asyncio.CancelledError, BaseExceptionGroup) as e:
+                task = asyncio.current_task()
+                if self._closing or (task is not None and task.cancelling() > 0):
+                    raise
+                was_connected = stats.connected
+                stats.connected = False
+                stats.last_error = f"{type(e).__name__}: {e}"
+                if isinstance(e, TimeoutError) and not was_connected:
+                    stats.last_error = f"connect timed out after {state.cfg.connect_timeout}s"
+                if not was_connected:
+                    stats.connect_failures += 1
+                failures += 1
+                delay = min(self.backoff_max, self.backoff_base * 2 ** (failures - 1))
+                if was_connected:
+                    logger.warning(
+                        "MCP server '{}': connection lost ({}), reconnecting in {:.0f}s",
+                        state.name, stats.last_error, delay,
+                    )
+                else:
+                    logger.error(
+                        "MCP server '{}': failed to connect: {}{} (retrying in {:.0f}s)",
+                        state.name, stats.last_error, _connect_error_hint(e), delay,
+                    )
+            state.settled.set()
+            await asyncio.sleep(delay)
@@ -116,6 +116,10 @@ class ExecTool(Tool):
             if requested != workspace_root and workspace_root not in requested.parents:
                 return "Error: working_dir is outside the configured workspace"
 
+        from nanobot.security.network import prefetch_command_hosts
+
+        # Resolve URL hosts off the event loop so the guard's checks hit the DNS cache.
+        await prefetch_command_hosts(command)
         guard_error = self._guard_command(command, cwd)
         if guard_error:
             return guard_error
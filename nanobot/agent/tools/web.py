@@ -53,10 +53,10 @@ def _validate_url(url: str) -> tuple[bool, str]:
         return False, str(e)
 
 
-def _validate_url_safe(url: str) -> tuple[bool, str]:
+async def _validate_url_safe(url: str) -> tuple[bool, str]:
     """Validate URL with SSRF protection: scheme, domain, and resolved IP check."""
-    from nanobot.security.network import validate_url_target
-    return validate_url_target(url)
+    from nanobot.security.network import avalidate_url_target
+    return await avalidate_url_target(url)
 
 
 def _format_results(query: str, items: list[dict[str, Any]], n: int) -> str:
@@ -309,15 +309,25 @@ class WebFetchTool(Tool):
     def read_only(self) -> bool:
         return True
 
+    def _transport(self) -> httpx.AsyncBaseTransport | None:
+        """Pin direct connections to the IPs vetted by the SSRF check.
+
+        Through a proxy the proxy resolves the target, so nothing to pin.
+        """
+        if self.proxy:
+            return None
+        from nanobot.security.network import pinned_transport
+        return pinned_transport()
+
     async def execute(self, url: str, extractMode: str = "markdown", maxChars: int | None = None, **kwargs: Any) -> Any:
         max_chars = maxChars or self.max_chars
-        is_valid, error_msg = _validate_url_safe(url)
+        is_valid, error_msg = await _validate_url_safe(url)
         if not is_valid:
             return json.dumps({"error": f"URL validation failed: {error_msg}", "url": url}, ensure_ascii=False)
 
         # Detect and fetch images directly to avoid Jina's textual image captioning
         try:
-            async with httpx.AsyncClient(proxy=self.proxy, follow_redirects=True, max_redirects=MAX_REDIRECTS, timeout=15.0) as client:
+            async with httpx.AsyncClient(proxy=self.proxy, follow_redirects=True, max_redirects=MAX_REDIRECTS, timeout=15.0, transport=self._transport()) as client:
                 async with client.stream("GET", url, headers={"User-Agent": USER_AGENT}) as r:
                     from nanobot.security.network import validate_resolved_url
 
@@ -384,6 +394,7 @@ class WebFetchTool(Tool):
                 max_redirects=MAX_REDIRECTS,
                 timeout=30.0,
                 proxy=self.proxy,
+                transport=self._transport(),
             ) as client:
                 r = await client.get(url, headers={"User-Agent": USER_AGENT})
                 r.raise_for_status()
@@ -17,6 +17,7 @@ class InboundMessage:
     media: list[str] = field(default_factory=list)  # Media URLs
     metadata: dict[str, Any] = field(default_factory=dict)  # Channel-specific data
     session_key_override: str | None = None  # Optional override for thread-scoped sessions
+    delivery_id: int | None = None  # Journal row to acknowledge (durable bus only)
 
     @property
     def session_key(self) -> str:
@@ -34,5 +35,6 @@ class OutboundMessage:
     reply_to: str | None = None
     media: list[str] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
+    delivery_id: int | None = None  # Journal row to acknowledge (durable bus only)
 
 
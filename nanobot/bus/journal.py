@@ -0,0 +1,270 @@
+"""Durable journal for bus messages: SQLite with acknowledgements and group commit.
+
+Every durable message is written to the journal before it is queued, and
+marked acknowledged once it has been handled (inbound: the agent finished
+the turn; outbound: the channel delivered it or gave up).  On startup the
+unacknowledged rows are replayed, so a crash or restart loses nothing that
+was accepted: delivery is at least once.
+
+Writes from concurrent publishers are batched into one transaction (group
+commit).  The writer waits up to ``flush_interval_s`` for more work before
+committing, so one fsync covers the whole batch.  Acknowledgements ride
+along with the next batch and are not awaited.
+
+Inbound rows carry an idempotency key built from the channel's message id;
+a second message with the same key is refused while its row is retained
+(``retention_s`` after acknowledgement).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Literal
+
+from loguru import logger
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+
+Direction = Literal["inbound", "outbound"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    direction TEXT NOT NULL,
+    idem_key TEXT,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    acked_at REAL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS messages_idem ON messages(direction, idem_key);
+CREATE INDEX IF NOT EXISTS messages_unacked ON messages(direction, acked_at);
+"""
+
+_PRUNE_EVERY_S = 60.0
+
+
+def encode_message(msg: InboundMessage | OutboundMessage) -> str:
+    data = dataclasses.asdict(msg)
+    data.pop("delivery_id", None)
+    if isinstance(msg, InboundMessage):
+        data["timestamp"] = msg.timestamp.isoformat()
+    return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def decode_message(direction: Direction, payload: str) -> InboundMessage | OutboundMessage:
+    data = json.loads(payload)
+    if direction == "inbound":
+        data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+        return InboundMessage(**data)
+    return OutboundMessage(**data)
+
+
+def idempotency_key(msg: InboundMessage) -> str | None:
+    """``channel:chat:message_id`` when the channel reported a message id."""
+    message_id = (msg.metadata or {}).get("message_id")
+    if message_id in (None, ""):
+        return None
+    return f"{msg.channel}:{msg.chat_id}:{message_id}"
+
+
+class BusJournal:
+    """Append-only message log in SQLite (WAL, ``synchronous=FULL``).
+
+    The database is opened on first use.  All SQLite work runs in a worker
+    thread, one batch at a time.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        flush_interval_s: float = 0.002,
+        max_batch: int = 512,
+        retention_s: float = 86400.0,
+    ):
+        self.path = Path(path)
+        self.flush_interval_s = flush_interval_s
+        self.max_batch = max_batch
+        self.retention_s = retention_s
+        self._conn: sqlite3.Connection | None = None
+        self._lock = asyncio.Lock()
+        self._appends: list[tuple[Direction, str | None, str, asyncio.Future[int | None]]] = []
+        self._acks: list[int] = []
+        self._discards: list[int] = []
+        self._wakeup = asyncio.Event()
+        self._writer: asyncio.Task[None] | None = None
+        self._closing = False
+        self._last_prune = 0.0
+        self.commits = 0
+        self.appended = 0
+
+    # -- public API -----------------------------------------------------------
+
+    async def append(
+        self, direction: Direction, msg: InboundMessage | OutboundMessage, key: str | None = None,
+    ) -> int | None:
+        """Durably record *msg*; returns its id, or None if *key* was seen before."""
+        future: asyncio.Future[int | None] = asyncio.get_running_loop().create_future()
+        self._appends.append((direction, key, encode_message(msg), future))
+        self._kick()
+        return await future
+
+    def ack(self, delivery_id: int) -> None:
+        """Mark a message handled; committed with the next batch."""
+        self._acks.append(delivery_id)
+        self._kick()
+
+    def discard(self, delivery_id: int) -> None:
+        """Forget a message that was never accepted, freeing its idempotency key."""
+        self._discards.append(delivery_id)
+        self._kick()
+
+    async def unacked(self, direction: Direction) -> list[tuple[int, InboundMessage | OutboundMessage]]:
+        """Messages recorded but not acknowledged, oldest first."""
+        rows = await self._run(
+            lambda conn: conn.execute(
+                "SELECT id, payload FROM messages "
+                "WHERE direction = ? AND acked_at IS NULL ORDER BY id",
+                (direction,),
+            ).fetchall()
+        )
+        out = []
+        for row_id, payload in rows:
+            try:
+                out.append((row_id, decode_message(direction, payload)))
+            except Exception as e:
+                logger.warning("Skipping unreadable journal row {}: {}", row_id, e)
+                self.ack(row_id)
+        return out
+
+    async def flush(self) -> None:
+        """Commit everything queued so far."""
+        while self._appends or self._acks or self._discards:
+            await self._commit_batch()
+
+    async def close(self) -> None:
+        """Let the writer drain what is queued, then close the database.
+
+        The writer is never cancelled mid-commit: that would leave publishers
+        waiting in :meth:`append` forever and drop the batch's acks.
+        """
+        self._closing = True
+        if self._writer is not None:
+            self._wakeup.set()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            self._writer = None
+        await self.flush()
+        async with self._lock:  # no commit thread is using the connection
+            if self._conn is not None:
+                conn, self._conn = self._conn, None
+                await asyncio.to_thread(conn.close)
+
+    # -- internals ------------------------------------------------------------
+
+    def _kick(self) -> None:
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._write_loop())
+        self._wakeup.set()
+
+    def _pending(self) -> bool:
+        return bool(self._appends or self._acks or self._discards)
+
+    async def _write_loop(self) -> None:
+        while not self._closing or self._pending():
+            await self._wakeup.wait()
+            # Give concurrent publishers a moment to join this commit.
+            if len(self._appends) < self.max_batch and not self._closing:
+                await asyncio.sleep(self.flush_interval_s)
+            self._wakeup.clear()
+            if self._pending():
+                try:
+                    await self._commit_batch()
+                except Exception as e:
+                    logger.error("Bus journal commit failed: {}", e)
+                    if self._closing:
+                        return  # close() flushes once more and reports the error
+            if self._pending():
+                self._wakeup.set()
+
+    async def _commit_batch(self) -> None:
+        appends, self._appends = self._appends[:self.max_batch], self._appends[self.max_batch:]
+        acks, self._acks = self._acks, []
+        discards, self._discards = self._discards, []
+        now = time.time()
+        prune = now - self._last_prune > _PRUNE_EVERY_S
+        if prune:
+            self._last_prune = now
+
+        def _commit(conn: sqlite3.Connection) -> list[int | None]:
+            ids: list[int | None] = []
+            with conn:
+                if acks:
+                    conn.executemany(
+                        "UPDATE messages SET acked_at = ? WHERE id = ?",
+                        [(now, i) for i in acks],
+                    )
+                if discards:
+                    conn.executemany(
+                        "DELETE FROM messages WHERE id = ?", [(i,) for i in discards],
+                    )
+                if prune:
+                    conn.execute(
+                        "DELETE FROM messages WHERE acked_at IS NOT NULL AND acked_at < ?",
+                        (now - self.retention_s,),
+                    )
+                # After the discards, so a refused message's key can be reused.
+                for direction, key, payload, _ in appends:
+                    cur = conn.execute(
+                        "INSERT OR IGNORE INTO messages (direction, idem_key, payload, created_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        (direction, key, payload, now),
+                    )
+                    ids.append(cur.lastrowid if cur.rowcount else None)
+            return ids
+
+        try:
+            ids = await self._run(_commit)
+        except BaseException as e:
+            # Never leave a publisher waiting in append(), even when cancelled.
+            for *_, future in appends:
+                if future.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+            self._acks[:0] = acks
+            self._discards[:0] = discards
+            raise
+        self.commits += 1
+        self.appended += len(appends)
+        for (*_, future), row_id in zip(appends, ids):
+            if not future.done():
+                future.set_result(row_id)
+
+    def _open(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        conn.executescript(_SCHEMA)
+        # Explicit transactions via ``with conn``.
+        conn.isolation_level = "DEFERRED"
+        return conn
+
+    async def _run(self, fn: Any) -> Any:
+        async with self._lock:
+            if self._conn is None:
+                self._conn = await asyncio.to_thread(self._open)
+            work = asyncio.ensure_future(asyncio.to_thread(fn, self._conn))
+            try:
+                return await asyncio.shield(work)
+            except asyncio.CancelledError:
+                # The thread keeps using the connection; hold the lock until it is done.
+                await asyncio.wait([work])
+                raise
@@ -1,8 +1,320 @@
 """Async message queue for decoupled channel-agent communication."""
 
+from __future__ import annotations
+
 import asyncio
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from enum import IntEnum
+from pathlib import Path
+from typing import Any, Generic, Literal, TypeVar
+
+from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.journal import BusJournal, idempotency_key
+from nanobot.providers.metrics import Histogram, metric_header, render_histogram
+
+OverflowPolicy = Literal["block", "drop_oldest", "reject"]
+
+# Priority commands known before the agent loop registers its own router.
+CONTROL_COMMANDS = frozenset({"/stop", "/restart", "/status"})
+
+_WAIT_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_OVERLOAD_NOTICE = (
+    "I'm receiving too many messages right now and couldn't queue yours. "
+    "Please send it again in a moment."
+)
+
+
+class Lane(IntEnum):
+    """Priority lanes, served in this order."""
+
+    CONTROL = 0  # /stop, /restart, /status: ahead of everything, never dropped
+    INTERACTIVE = 1  # user messages and replies
+    STREAM = 2  # streamed reply deltas
+    BACKGROUND = 3  # cron, heartbeat, subagent announcements
+
+
+T = TypeVar("T")
+Flow = tuple[str, str]  # (group, member), e.g. (channel, sender_id)
+
+
+class _Entry(Generic[T]):
+    __slots__ = ("item", "lane", "enqueued_at")
+
+    def __init__(self, item: T, lane: Lane):
+        self.item = item
+        self.lane = lane
+        self.enqueued_at = time.monotonic()
+
+
+class LaneQueue(Generic[T]):
+    """Bounded priority queue with per-flow FIFO order and round-robin fairness.
+
+    Every item belongs to a lane and a flow ``(group, member)``.  Items of one
+    flow leave in the order they arrived.  :meth:`get` returns control items
+    first; otherwise it serves the flow whose oldest item sits in the most
+    urgent lane, rotating between groups and then between the members of a
+    group, so one busy sender or channel cannot starve the others.
+
+    *maxsize* bounds everything except control items (0 means unbounded).
+    When full, ``put`` follows *overflow*: ``block`` waits for space,
+    ``drop_oldest`` evicts the oldest item of the least urgent lane that is
+    not more urgent than the new one (passing it to *on_evict*), and
+    ``reject`` refuses the new item and calls *on_reject* with it.
+
+    The method names mirror :class:`asyncio.Queue`.
+    """
+
+    def __init__(
+        self,
+        classify: Callable[[T], Lane],
+        flow: Callable[[T], Flow],
+        maxsize: int = 0,
+        overflow: OverflowPolicy = "block",
+        on_reject: Callable[[T], Awaitable[None]] | None = None,
+        on_evict: Callable[[T], None] | None = None,
+    ):
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.on_reject = on_reject
+        self.on_evict = on_evict
+        self._classify = classify
+        self._flow = flow
+        self._control: deque[_Entry[T]] = deque()
+        self._flows: dict[Flow, deque[_Entry[T]]] = {}
+        # Lane → group → flows of that group whose oldest item is in the lane.
+        self._ready: dict[Lane, OrderedDict[str, deque[Flow]]] = {
+            lane: OrderedDict() for lane in Lane if lane is not Lane.CONTROL
+        }
+        self._size = 0
+        self._getters: deque[asyncio.Future[None]] = deque()
+        self._putters: deque[asyncio.Future[None]] = deque()
+        self._overflowing = False
+        self.depth = {lane: 0 for lane in Lane}
+        self.waits = {lane: Histogram(_WAIT_BUCKETS) for lane in Lane}
+        self.dropped = 0
+        self.rejected = 0
+
+    # -- asyncio.Queue-compatible surface ---------------------------------
+
+    def qsize(self) -> int:
+        return self._size + len(self._control)
+
+    def empty(self) -> bool:
+        return not self.qsize()
+
+    def full(self) -> bool:
+        return bool(self.maxsize) and self._size >= self.maxsize
+
+    def put_nowait(self, item: T, *, force: bool = False) -> None:
+        """Queue *item*, evicting under ``drop_oldest``; raise ``asyncio.QueueFull`` otherwise.
+
+        *force* admits the item regardless of capacity (for items that were
+        already admitted once and are being requeued).
+        """
+        lane = self._classify(item)
+        entry = _Entry(item, lane)
+        if lane is Lane.CONTROL:
+            self._control.append(entry)
+        else:
+            if self.full() and not force and not (
+                self.overflow == "drop_oldest" and self._evict(lane)
+            ):
+                if not self._overflowing:
+                    self._overflowing = True
+                    logger.warning("Message queue full ({} items, policy {})",
+                                   self._size, self.overflow)
+                raise asyncio.QueueFull
+            key = self._flow(item)
+            flow = self._flows.get(key)
+            if flow is None:
+                flow = self._flows[key] = deque()
+            flow.append(entry)
+            if len(flow) == 1:
+                self._schedule(key, lane)
+            self._size += 1
+        self.depth[lane] += 1
+        self._wakeup(self._getters)
+
+    async def put(self, item: T, *, force: bool = False) -> bool:
+        """Queue *item* following the overflow policy; False if it was dropped or rejected."""
+        while True:
+            try:
+                self.put_nowait(item, force=force)
+                return True
+            except asyncio.QueueFull:
+                pass
+            if self.overflow == "block":
+                await self._wait(self._putters, self.full)
+                continue
+            if self.overflow == "drop_oldest":
+                # Everything queued is more urgent than the newcomer.
+                self.dropped += 1
+                return False
+            self.rejected += 1
+            if self.on_reject is not None:
+                await self.on_reject(item)
+            return False
+
+    def get_nowait(self) -> T:
+        if self._control:
+            entry = self._control.popleft()
+        else:
+            entry = self._pop_ready()
+            self._size -= 1
+            if self._overflowing and not self.full():
+                self._overflowing = False
+            self._wakeup(self._putters)
+        self.depth[entry.lane] -= 1
+        self.waits[entry.lane].observe(time.monotonic() - entry.enqueued_at)
+        return entry.item
+
+    async def get(self) -> T:
+        await self._wait(self._getters, self.empty)
+        return self.get_nowait()
+
+    # -- scheduling ---------------------------------------------------------
+
+    def _schedule(self, key: Flow, lane: Lane) -> None:
+        groups = self._ready[lane]
+        members = groups.get(key[0])
+        if members is None:
+            groups[key[0]] = deque([key])
+        else:
+            members.append(key)
+
+    def _unschedule(self, key: Flow, lane: Lane) -> None:
+        groups = self._ready[lane]
+        members = groups[key[0]]
+        members.remove(key)
+        if not members:
+            del groups[key[0]]
+
+    def _pop_ready(self) -> _Entry[T]:
+        for groups in self._ready.values():
+            if groups:
+                break
+        else:
+            raise asyncio.QueueEmpty
+        group, members = next(iter(groups.items()))
+        key = members.popleft()
+        if members:
+            groups.move_to_end(group)
+        else:
+            del groups[group]
+        flow = self._flows[key]
+        entry = flow.popleft()
+        if flow:
+            self._schedule(key, flow[0].lane)
+        else:
+            del self._flows[key]
+        return entry
+
+    def _evict(self, incoming: Lane) -> bool:
+        """Drop the oldest item of the least urgent lane no more urgent than *incoming*."""
+        for lane in sorted(self._ready, reverse=True):
+            if lane < incoming:
+                break
+            if not self.depth[lane]:
+                continue
+            key, index = min(
+                (
+                    (k, i)
+                    for k, flow in self._flows.items()
+                    for i, e in enumerate(flow)
+                    if e.lane is lane
+                ),
+                key=lambda ki: self._flows[ki[0]][ki[1]].enqueued_at,
+            )
+            flow = self._flows[key]
+            if index == 0:
+                self._unschedule(key, lane)
+            evicted = flow[index]
+            del flow[index]
+            if not flow:
+                del self._flows[key]
+            elif index == 0:
+                self._schedule(key, flow[0].lane)
+            self._size -= 1
+            self.depth[lane] -= 1
+            self.dropped += 1
+            if self.on_evict is not None:
+                self.on_evict(evicted.item)
+            return True
+        return False
+
+    # -- waiting ------------------------------------------------------------
+
+    @staticmethod
+    def _wakeup(waiters: deque[asyncio.Future[None]]) -> None:
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    async def _wait(
+        self, waiters: deque[asyncio.Future[None]], blocked: Callable[[], bool],
+    ) -> None:
+        while blocked():
+            waiter = asyncio.get_running_loop().create_future()
+            waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                waiter.cancel()
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                elif not blocked():
+                    # We were woken but are leaving; pass the wakeup on.
+                    self._wakeup(waiters)
+                raise
+
+    def snapshot(self) -> dict[str, Any]:
+        lanes = {}
+        for lane in Lane:
+            hist = self.waits[lane]
+            lanes[lane.name.lower()] = {
+                "depth": self.depth[lane],
+                "served": hist.count,
+                "wait_p50_s": hist.quantile(0.5),
+                "wait_p95_s": hist.quantile(0.95),
+            }
+        return {
+            "size": self.qsize(),
+            "capacity": self.maxsize,
+            "overflow": self.overflow,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "lanes": lanes,
+        }
+
+
+def _is_control_command(text: str) -> bool:
+    return text.strip().lower() in CONTROL_COMMANDS
+
+
+def _journal_path(configured: str) -> Path:
+    if configured:
+        return Path(configured).expanduser()
+    from nanobot.config.paths import get_runtime_subdir
+
+    return get_runtime_subdir("bus") / "journal.sqlite3"
+
+
+def _transient(msg: OutboundMessage) -> bool:
+    """Outbound messages not worth replaying: stream pieces and progress updates."""
+    metadata = msg.metadata or {}
+    return any(metadata.get(k) for k in ("_stream_delta", "_stream_end", "_progress", "_streamed"))
+
+
+def _lane_hint(metadata: dict[str, Any] | None) -> Lane | None:
+    hint = (metadata or {}).get("_lane")
+    return Lane[hint.upper()] if isinstance(hint, str) and hint.upper() in Lane.__members__ else None
 
 
 class MessageBus:
@@ -11,28 +323,158 @@ class MessageBus:
 
     Channels push messages to the inbound queue, and the agent processes
     them and pushes responses to the outbound queue.
+
+    Both queues are :class:`LaneQueue` instances.  Inbound messages are
+    prioritised as control commands (see :attr:`is_control`), interactive
+    messages and background work (``system`` channel, or ``_lane`` metadata),
+    and shared fairly between channels and senders.  Outbound messages keep
+    per-chat order; stream deltas yield to final replies of other chats.
+    When the inbound queue overflows under the ``reject`` policy, the sender
+    is told to retry.
+
+    With *durable* (or an explicit *journal*) the bus is durable: accepted messages are recorded
+    before they are queued and must be acknowledged with :meth:`ack` once
+    handled; :meth:`replay` requeues whatever a previous run left
+    unacknowledged.  Control commands and transient outbound messages
+    (stream deltas, progress updates) are not journaled.  Inbound messages
+    whose channel message id was already recorded are dropped as duplicates.
     """
 
-    def __init__(self):
-        self.inbound: asyncio.Queue[InboundMessage] = asyncio.Queue()
-        self.outbound: asyncio.Queue[OutboundMessage] = asyncio.Queue()
+    def __init__(
+        self,
+        inbound_capacity: int = 0,
+        outbound_capacity: int = 0,
+        inbound_overflow: OverflowPolicy = "reject",
+        outbound_overflow: OverflowPolicy = "block",
+        durable: bool = False,
+        journal_path: str = "",
+        journal: BusJournal | None = None,
+    ):
+        # The agent loop replaces this with its command router's priority check.
+        self.is_control: Callable[[str], bool] = _is_control_command
+        if journal is None and durable:
+            journal = BusJournal(_journal_path(journal_path))
+        self.journal = journal
+        self.duplicates = 0
+        self.inbound: LaneQueue[InboundMessage] = LaneQueue(
+            self._classify_inbound,
+            lambda m: (m.channel, m.sender_id),
+            maxsize=inbound_capacity,
+            overflow=inbound_overflow,
+            on_reject=self._notify_rejected,
+            on_evict=self.ack,
+        )
+        self.outbound: LaneQueue[OutboundMessage] = LaneQueue(
+            self._classify_outbound,
+            lambda m: (m.channel, m.chat_id),
+            maxsize=outbound_capacity,
+            overflow=outbound_overflow,
+            on_evict=self.ack,
+        )
+        self._notified: set[tuple[str, str]] = set()
+
+    def _classify_inbound(self, msg: InboundMessage) -> Lane:
+        if self.is_control(msg.content):
+            return Lane.CONTROL
+        hint = _lane_hint(msg.metadata)
+        if hint is not None:
+            return hint
+        return Lane.BACKGROUND if msg.channel == "system" else Lane.INTERACTIVE
+
+    @staticmethod
+    def _classify_outbound(msg: OutboundMessage) -> Lane:
+        metadata = msg.metadata or {}
+        if metadata.get("_stream_delta") or metadata.get("_stream_end"):
+            return Lane.STREAM
+        return _lane_hint(msg.metadata) or Lane.INTERACTIVE
 
-    async def publish_inbound(self, msg: InboundMessage) -> None:
-        """Publish a message from a channel to the agent."""
-        await self.inbound.put(msg)
+    async def _notify_rejected(self, msg: InboundMessage) -> None:
+        """Tell the sender once per overload that their message was not queued."""
+        logger.warning("Inbound queue full; rejected message from {}:{}", msg.channel, msg.sender_id)
+        if not self.inbound.full():
+            self._notified.clear()
+        target = (msg.channel, msg.chat_id)
+        if msg.channel == "system" or target in self._notified:
+            return
+        self._notified.add(target)
+        try:
+            self.outbound.put_nowait(OutboundMessage(
+                channel=msg.channel, chat_id=msg.chat_id, content=_OVERLOAD_NOTICE,
+            ))
+        except asyncio.QueueFull:
+            pass
+
+    async def publish_inbound(self, msg: InboundMessage) -> bool:
+        """Publish a message from a channel to the agent; False if it was dropped."""
+        if self.journal is not None and msg.delivery_id is None and not self.is_control(msg.content):
+            msg.delivery_id = await self.journal.append("inbound", msg, idempotency_key(msg))
+            if msg.delivery_id is None:
+                self.duplicates += 1
+                logger.debug("Dropping duplicate inbound message {}", idempotency_key(msg))
+                return False
+        accepted = await self.inbound.put(msg)
+        if not accepted:
+            self._discard(msg)
+        elif self._notified and not self.inbound.full():
+            self._notified.clear()
+        return accepted
+
+    async def requeue_inbound(self, msg: InboundMessage) -> None:
+        """Put an already accepted message back on the bus, regardless of capacity."""
+        self.inbound.put_nowait(msg, force=True)
 
     async def consume_inbound(self) -> InboundMessage:
         """Consume the next inbound message (blocks until available)."""
         return await self.inbound.get()
 
-    async def publish_outbound(self, msg: OutboundMessage) -> None:
-        """Publish a response from the agent to channels."""
-        await self.outbound.put(msg)
+    async def publish_outbound(self, msg: OutboundMessage) -> bool:
+        """Publish a response from the agent to channels; False if it was dropped."""
+        if self.journal is not None and msg.delivery_id is None and not _transient(msg):
+            msg.delivery_id = await self.journal.append("outbound", msg)
+        accepted = await self.outbound.put(msg)
+        if not accepted:
+            self._discard(msg)
+        return accepted
 
     async def consume_outbound(self) -> OutboundMessage:
         """Consume the next outbound message (blocks until available)."""
         return await self.outbound.get()
 
+    def ack(self, msg: InboundMessage | OutboundMessage) -> None:
+        """Mark *msg* as handled so it is not replayed (no-op without a journal)."""
+        if self.journal is not None and msg.delivery_id is not None:
+            self.journal.ack(msg.delivery_id)
+            msg.delivery_id = None
+
+    async def close(self) -> None:
+        """Commit pending journal writes and close it."""
+        if self.journal is not None:
+            await self.journal.close()
+
+    def _discard(self, msg: InboundMessage | OutboundMessage) -> None:
+        if self.journal is not None and msg.delivery_id is not None:
+            self.journal.discard(msg.delivery_id)
+            msg.delivery_id = None
+
+    async def replay(self) -> tuple[int, int]:
+        """Requeue messages a previous run accepted but never acknowledged.
+
+        Returns the number of inbound and outbound messages requeued.
+        """
+        if self.journal is None:
+            return 0, 0
+        counts = []
+        for direction, queue in (("inbound", self.inbound), ("outbound", self.outbound)):
+            pending = await self.journal.unacked(direction)
+            for delivery_id, msg in pending:
+                msg.delivery_id = delivery_id
+                queue.put_nowait(msg, force=True)
+            counts.append(len(pending))
+        if any(counts):
+            logger.info("Replayed {} inbound and {} outbound message(s) from the bus journal",
+                        *counts)
+        return counts[0], counts[1]
+
     @property
     def inbound_size(self) -> int:
         """Number of pending inbound messages."""
@@ -42,3 +484,45 @@ class MessageBus:
     def outbound_size(self) -> int:
         """Number of pending outbound messages."""
         return self.outbound.qsize()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Depth, drop and wait-time statistics of both queues."""
+        snap: dict[str, Any] = {
+            "inbound": self.inbound.snapshot(),
+            "outbound": self.outbound.snapshot(),
+        }
+        if self.journal is not None:
+            snap["journal"] = {
+                "path": str(self.journal.path),
+                "commits": self.journal.commits,
+                "appended": self.journal.appended,
+                "duplicates": self.duplicates,
+            }
+        return snap
+
+    def render_prometheus(self) -> str:
+        """Prometheus text for queue depth, drops and per-lane wait times."""
+        queues = (("inbound", self.inbound), ("outbound", self.outbound))
+        out: list[str] = []
+
+        def _metric(name: str, kind: str, help_text: str) -> str:
+            return metric_header(out, f"nanobot_bus_{name}", kind, help_text)
+
+        metric = _metric("queue_depth", "gauge", "Messages waiting on the bus")
+        for name, queue in queues:
+            for lane in Lane:
+                lane_name = lane.name.lower()
+                out.append(f'{metric}{{queue="{name}",lane="{lane_name}"}} {queue.depth[lane]}')
+        for counter, attr, help_text in (
+            ("dropped_total", "dropped", "Messages dropped on overflow"),
+            ("rejected_total", "rejected", "Messages rejected on overflow"),
+        ):
+            metric = _metric(counter, "counter", help_text)
+            for name, queue in queues:
+                out.append(f'{metric}{{queue="{name}"}} {getattr(queue, attr)}')
+        metric = _metric("wait_seconds", "histogram", "Time messages spent on the bus")
+        for name, queue in queues:
+            for lane in Lane:
+                labels = f'queue="{name}",lane="{lane.name.lower()}"'
+                out.extend(render_histogram(metric, labels, queue.waits[lane]))
+        return "\n".join(out) + "\n"
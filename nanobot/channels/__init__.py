@@ -1,6 +1,26 @@
 """Chat channels module with plugin architecture."""
 
-from nanobot.channels.base import BaseChannel
-from nanobot.channels.manager import ChannelManager
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING
 
 __all__ = ["BaseChannel", "ChannelManager"]
+
+_LAZY_IMPORTS = {
+    "BaseChannel": ".base",
+    "ChannelManager": ".manager",
+}
+
+if TYPE_CHECKING:
+    from nanobot.channels.base import BaseChannel
+    from nanobot.channels.manager import ChannelManager
+
+
+def __getattr__(name: str):
+    """Lazily expose channel classes so the registry can be read without importing them."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = import_module(module_name, __name__)
+    return getattr(module, name)
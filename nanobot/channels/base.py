@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -10,6 +13,24 @@ from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
+from nanobot.channels.media import MediaService
+from nanobot.channels.ratelimit import OutboundLimiter, RateLimits
+
+_LATENCY_ALPHA = 0.2  # weight of the newest edit latency in the moving average
+
+
+@dataclass
+class StreamBuffer:
+    """State of one progressively edited message (see :meth:`BaseChannel.send_delta`)."""
+
+    text: str = ""
+    message_id: Any = None  # whatever _stream_create returned: an id or a message object
+    last_edit: float = 0.0
+    stream_id: str | None = None
+    flushed: int = 0  # len(text) when the platform last saw it
+    renderer: Any = field(default=None, repr=False, compare=False)  # channel's markup cache
+    timer: asyncio.Task | None = field(default=None, repr=False, compare=False)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False, compare=False)
 
 
 class BaseChannel(ABC):
@@ -25,6 +46,18 @@ class BaseChannel(ABC):
     transcription_provider: str = "groq"
     transcription_api_key: str = ""
 
+    # Streaming edits (see send_delta): the edit interval starts at
+    # stream_edit_interval and grows with the platform's edit latency and
+    # after rate limits, up to stream_max_interval.  A backlog of
+    # stream_flush_chars unsent characters may go out after half an interval.
+    stream_edit_interval: float = 1.0
+    stream_max_interval: float = 10.0
+    stream_flush_chars: int = 400
+
+    # Platform API quotas (see nanobot.channels.ratelimit); None leaves calls
+    # unthrottled.  A channel section's "rateLimit" overrides single fields.
+    rate_limits: RateLimits | None = None
+
     def __init__(self, config: Any, bus: MessageBus):
         """
         Initialize the channel.
@@ -36,6 +69,11 @@ class BaseChannel(ABC):
         self.config = config
         self.bus = bus
         self._running = False
+        self._stream_bufs: dict[str, StreamBuffer] = {}  # chat_id -> streaming state
+        self._stream_latency: float | None = None
+        self._stream_backoff = 0.0
+        self.rate_limiter = OutboundLimiter(self.rate_limits) if self.rate_limits else None
+        self.media = MediaService()  # inbound attachment downloads
 
     async def transcribe_audio(self, file_path: str | Path) -> str:
         """Transcribe an audio file via Whisper (OpenAI or Groq). Returns empty string on failure."""
@@ -98,21 +136,197 @@ class BaseChannel(ABC):
     async def send_delta(self, chat_id: str, delta: str, metadata: dict[str, Any] | None = None) -> None:
         """Deliver a streaming text chunk.
 
-        Override in subclasses to enable streaming. Implementations should
-        raise on delivery failure so the channel manager can retry.
+        Channels that edit one message as the answer grows only implement
+        :meth:`_stream_create`, :meth:`_stream_update` and
+        :meth:`_stream_finalize`; this method then buffers the deltas per
+        chat and decides when to call them.  Other channels override
+        ``send_delta`` itself.  Implementations should raise on delivery
+        failure so the channel manager can retry.
 
         Streaming contract: ``_stream_delta`` is a chunk, ``_stream_end`` ends
         the current segment, and stateful implementations must key buffers by
         ``_stream_id`` rather than only by ``chat_id``.
         """
-        pass
+        if self._edits_streams():
+            await self._stream_delta(chat_id, delta, metadata or {})
 
     @property
     def supports_streaming(self) -> bool:
         """True when config enables streaming AND this subclass implements send_delta."""
         cfg = self.config
         streaming = cfg.get("streaming", False) if isinstance(cfg, dict) else getattr(cfg, "streaming", False)
-        return bool(streaming) and type(self).send_delta is not BaseChannel.send_delta
+        implemented = type(self).send_delta is not BaseChannel.send_delta or self._edits_streams()
+        return bool(streaming) and implemented
+
+    # -- streaming engine ---------------------------------------------------
+
+    @classmethod
+    def _edits_streams(cls) -> bool:
+        """True when the subclass implements both engine hooks it cannot do without."""
+        return (
+            cls._stream_create is not BaseChannel._stream_create
+            and cls._stream_update is not BaseChannel._stream_update
+        )
+
+    async def _stream_create(self, chat_id: str, buf: StreamBuffer, meta: dict[str, Any]) -> Any:
+        """Post ``buf.text`` as a new message; return its id (stored in ``buf.message_id``)."""
+        raise NotImplementedError
+
+    async def _stream_update(self, chat_id: str, buf: StreamBuffer, meta: dict[str, Any]) -> None:
+        """Replace the streamed message's text with ``buf.text`` (an intermediate edit)."""
+        raise NotImplementedError
+
+    async def _stream_finalize(self, chat_id: str, buf: StreamBuffer, meta: dict[str, Any]) -> None:
+        """Render the complete ``buf.text`` into the streamed message (and any overflow)."""
+        await self._stream_update(chat_id, buf, meta)
+
+    def _stream_edit_interval(self) -> float:
+        """Configured minimum seconds between edits; channels may read their config."""
+        return self.stream_edit_interval
+
+    def _stream_not_modified(self, exc: Exception) -> bool:
+        """Whether *exc* only says the edit changed nothing (treated as success)."""
+        return False
+
+    def _retry_after(self, exc: Exception) -> float | None:
+        """Seconds to back off if *exc* is a platform rate limit, else None."""
+        retry_after = getattr(exc, "retry_after", None)
+        if retry_after is not None:
+            seconds = getattr(retry_after, "total_seconds", None)
+            return float(seconds() if seconds else retry_after)
+        if 429 in (getattr(exc, "status", None), getattr(exc, "status_code", None)):
+            return 0.0
+        return None
+
+    def note_rate_limit(self, chat_id: str, exc: Exception) -> float | None:
+        """If *exc* is a rate limit, pause *chat_id*'s sends; return the wait or None."""
+        retry_after = self._retry_after(exc)
+        if retry_after is not None and self.rate_limiter is not None:
+            self.rate_limiter.pause(retry_after, chat_id)
+        return retry_after
+
+    async def _throttle(self, chat_id: str, method: str = "send") -> None:
+        """Wait until *chat_id* is within the platform's quota for a *method* call."""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(chat_id, method)
+
+    def _stream_interval(self) -> float:
+        """Current seconds between edits, adapted to latency and rate limits."""
+        latency = self._stream_latency or 0.0
+        interval = max(self._stream_edit_interval(), 2 * latency, self._stream_backoff)
+        return min(interval, self.stream_max_interval)
+
+    async def _stream_delta(self, chat_id: str, delta: str, meta: dict[str, Any]) -> None:
+        stream_id = meta.get("_stream_id")
+        buf = self._stream_bufs.get(chat_id)
+
+        if meta.get("_stream_end"):
+            if not buf or buf.message_id is None:
+                return
+            if stream_id is not None and buf.stream_id is not None and buf.stream_id != stream_id:
+                return
+            buf.text += delta
+            if not buf.text:
+                return
+            self._cancel_stream_timer(buf)
+            async with buf.lock:
+                await self._throttle(chat_id, "edit")
+                await self._stream_finalize(chat_id, buf, meta)
+            if self._stream_bufs.get(chat_id) is buf:
+                del self._stream_bufs[chat_id]
+            return
+
+        if buf is None or (
+            stream_id is not None and buf.stream_id is not None and buf.stream_id != stream_id
+        ):
+            if buf is not None:
+                self._cancel_stream_timer(buf)
+            buf = self._stream_bufs[chat_id] = StreamBuffer(stream_id=stream_id)
+        elif buf.stream_id is None:
+            buf.stream_id = stream_id
+        buf.text += delta
+        if not buf.text.strip():
+            return
+
+        async with buf.lock:
+            now = time.monotonic()
+            if buf.message_id is None:
+                await self._throttle(chat_id)
+                buf.message_id = await self._stream_create(chat_id, buf, meta)
+                buf.last_edit = now
+                buf.flushed = len(buf.text)
+                return
+            interval = self._stream_interval()
+            elapsed = now - buf.last_edit
+            backlog = len(buf.text) - buf.flushed
+            if elapsed >= interval or (backlog >= self.stream_flush_chars and elapsed >= interval / 2):
+                await self._stream_push(chat_id, buf, meta, now)
+            elif backlog > 0:
+                self._arm_stream_timer(chat_id, buf, meta, buf.last_edit + interval - now)
+
+    async def _stream_push(
+        self, chat_id: str, buf: StreamBuffer, meta: dict[str, Any], now: float,
+    ) -> None:
+        """One intermediate edit; on a rate limit, back off and retry from a timer."""
+        if self.rate_limiter is not None:
+            # Over quota: the trailing timer sends the edit once there is budget.
+            if (wait := self.rate_limiter.try_acquire(chat_id, "edit")) > 0:
+                self._arm_stream_timer(chat_id, buf, meta, wait)
+                return
+        started = time.perf_counter()
+        try:
+            await self._stream_update(chat_id, buf, meta)
+        except Exception as e:
+            retry_after = self.note_rate_limit(chat_id, e)
+            if retry_after is None:
+                if not self._stream_not_modified(e):
+                    raise
+            else:
+                self._stream_backoff = min(
+                    max(retry_after, 2 * self._stream_interval()), self.stream_max_interval,
+                )
+                logger.debug("{}: stream edit rate limited; next edit in {:.1f}s",
+                             self.name, self._stream_backoff)
+                buf.last_edit = now
+                self._arm_stream_timer(chat_id, buf, meta, self._stream_backoff)
+                return
+        else:
+            latency = time.perf_counter() - started
+            self._stream_latency = latency if self._stream_latency is None else (
+                (1 - _LATENCY_ALPHA) * self._stream_latency + _LATENCY_ALPHA * latency
+            )
+            self._stream_backoff /= 2
+        buf.last_edit = now
+        buf.flushed = len(buf.text)
+
+    def _arm_stream_timer(
+        self, chat_id: str, buf: StreamBuffer, meta: dict[str, Any], delay: float,
+    ) -> None:
+        """Flush whatever is still unsent once *delay* has passed (trailing edge)."""
+        if buf.timer is not None and not buf.timer.done():
+            return
+
+        async def _trailing() -> None:
+            await asyncio.sleep(max(delay, 0.0))
+            buf.timer = None
+            if self._stream_bufs.get(chat_id) is not buf:
+                return
+            async with buf.lock:
+                if len(buf.text) <= buf.flushed:
+                    return
+                try:
+                    await self._stream_push(chat_id, buf, meta, time.monotonic())
+                except Exception as e:
+                    # The next delta or the final edit carries the text anyway.
+                    logger.warning("{}: trailing stream edit failed: {}", self.name, e)
+
+        buf.timer = asyncio.create_task(_trailing())
+
+    @staticmethod
+    def _cancel_stream_timer(buf: StreamBuffer) -> None:
+        if buf.timer is not None:
+            buf.timer.cancel()
+            buf.timer = None
 
     def is_allowed(self, sender_id: str) -> bool:
         """Check if *sender_id* is permitted.  Empty list → deny all; ``"*"`` → allow all."""
@@ -579,6 +579,8 @@ class DingTalkChannel(BaseChannel):
         """Download a DingTalk file to the media directory, return local path."""
         from nanobot.config.paths import get_media_dir
 
+        if (cached := self.media.cached(download_code)) is not None:
+            return str(cached)
         try:
             token = await self._get_access_token()
             if not token or not self._http:
@@ -600,17 +602,15 @@ class DingTalkChannel(BaseChannel):
                 logger.error("DingTalk download URL not found in response: {}", result)
                 return None
 
-            # Step 2: Download the file content
-            file_resp = await self._http.get(download_url, follow_redirects=True)
-            if file_resp.status_code != 200:
-                logger.error("DingTalk file download failed: status={}", file_resp.status_code)
-                return None
-
-            # Save to media directory (accessible under workspace)
-            download_dir = get_media_dir("dingtalk") / sender_id
-            download_dir.mkdir(parents=True, exist_ok=True)
-            file_path = download_dir / filename
-            await asyncio.to_thread(file_path.write_bytes, file_resp.content)
+            # Step 2: Stream the file to the media directory (accessible under workspace)
+            file_path = await self.media.download(
+                get_media_dir("dingtalk") / sender_id,
+                self._http,
+                download_url,
+                filename,
+                key=download_code,
+                follow_redirects=True,
+            )
             logger.info("DingTalk file saved: {}", file_path)
             return str(file_path)
         except Exception as e:
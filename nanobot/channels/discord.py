@@ -4,8 +4,6 @@ from __future__ import annotations
 
 import asyncio
 import importlib.util
-import time
-from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal
 
@@ -14,7 +12,9 @@ from pydantic import Field
 
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.channels.base import BaseChannel
+from nanobot.channels.base import BaseChannel, StreamBuffer
+from nanobot.channels.media import MediaTooLargeError
+from nanobot.channels.ratelimit import RateLimits
 from nanobot.command.builtin import build_help_text
 from nanobot.config.paths import get_media_dir
 from nanobot.config.schema import Base
@@ -37,14 +37,7 @@ MAX_MESSAGE_LEN = 2000  # Discord message character limit
 TYPING_INTERVAL_S = 8
 
 
-@dataclass
-class _StreamBuf:
-    """Per-chat streaming accumulator for progressive Discord message edits."""
-
-    text: str = ""
-    message: Any | None = None
-    last_edit: float = 0.0
-    stream_id: str | None = None
+_StreamBuf = StreamBuffer  # message_id holds the discord.Message being edited
 
 
 class DiscordConfig(Base):
@@ -269,7 +262,9 @@ class DiscordChannel(BaseChannel):
 
     name = "discord"
     display_name = "Discord"
-    _STREAM_EDIT_INTERVAL = 0.8
+    # 50 requests a second per bot; five messages per channel every five seconds.
+    rate_limits = RateLimits(per_second=50, chat_per_second=1, chat_burst=5)
+    stream_edit_interval = 0.8
 
     @classmethod
     def default_config(cls) -> dict[str, Any]:
@@ -291,7 +286,6 @@ class DiscordChannel(BaseChannel):
         self._bot_user_id: str | None = None
         self._pending_reactions: dict[str, Any] = {}  # chat_id -> message object
         self._working_emoji_tasks: dict[str, asyncio.Task[None]] = {}
-        self._stream_bufs: dict[str, _StreamBuf] = {}
 
     async def start(self) -> None:
         """Start the Discord client."""
@@ -380,53 +374,25 @@ class DiscordChannel(BaseChannel):
         if client is None or not client.is_ready():
             logger.warning("Discord client not ready; dropping stream delta")
             return
+        await super().send_delta(chat_id, delta, metadata)
 
-        meta = metadata or {}
-        stream_id = meta.get("_stream_id")
-
-        if meta.get("_stream_end"):
-            buf = self._stream_bufs.get(chat_id)
-            if not buf or buf.message is None or not buf.text:
-                return
-            if stream_id is not None and buf.stream_id is not None and buf.stream_id != stream_id:
-                return
-            await self._finalize_stream(chat_id, buf)
-            return
-
-        buf = self._stream_bufs.get(chat_id)
-        if buf is None or (
-            stream_id is not None and buf.stream_id is not None and buf.stream_id != stream_id
-        ):
-            buf = _StreamBuf(stream_id=stream_id)
-            self._stream_bufs[chat_id] = buf
-        elif buf.stream_id is None:
-            buf.stream_id = stream_id
-
-        buf.text += delta
-        if not buf.text.strip():
-            return
-
+    async def _stream_create(self, chat_id: str, buf: _StreamBuf, meta: dict[str, Any]) -> Any:
         target = await self._resolve_channel(chat_id)
         if target is None:
             logger.warning("Discord stream target {} unavailable", chat_id)
-            return
-
-        now = time.monotonic()
-        if buf.message is None:
-            try:
-                buf.message = await target.send(content=buf.text)
-                buf.last_edit = now
-            except Exception as e:
-                logger.warning("Discord stream initial send failed: {}", e)
-                raise
-            return
-
-        if (now - buf.last_edit) < self._STREAM_EDIT_INTERVAL:
-            return
+            return None  # retried with the next delta
+        try:
+            return await target.send(content=buf.text)
+        except Exception as e:
+            logger.warning("Discord stream initial send failed: {}", e)
+            raise
 
+    async def _stream_update(self, chat_id: str, buf: _StreamBuf, meta: dict[str, Any]) -> None:
         try:
-            await buf.message.edit(content=DiscordBotClient._build_chunks(buf.text, [], False)[0])
-            buf.last_edit = now
+            # The first chunk never reaches past MAX_MESSAGE_LEN + 1 characters, so
+            # there is no need to split the whole (possibly long) buffer per edit.
+            head = buf.text[:MAX_MESSAGE_LEN + 1]
+            await buf.message_id.edit(content=DiscordBotClient._build_chunks(head, [], False)[0])
         except Exception as e:
             logger.warning("Discord stream edit failed: {}", e)
             raise
@@ -498,29 +464,26 @@ class DiscordChannel(BaseChannel):
             logger.warning("Discord channel {} unavailable: {}", chat_id, e)
             return None
 
-    async def _finalize_stream(self, chat_id: str, buf: _StreamBuf) -> None:
+    async def _stream_finalize(self, chat_id: str, buf: _StreamBuf, meta: dict[str, Any]) -> None:
         """Commit the final streamed content and flush overflow chunks."""
         chunks = DiscordBotClient._build_chunks(buf.text, [], False)
         if not chunks:
-            self._stream_bufs.pop(chat_id, None)
             return
 
         try:
-            await buf.message.edit(content=chunks[0])
+            await buf.message_id.edit(content=chunks[0])
         except Exception as e:
             logger.warning("Discord final stream edit failed: {}", e)
             raise
 
-        target = getattr(buf.message, "channel", None) or await self._resolve_channel(chat_id)
+        target = getattr(buf.message_id, "channel", None) or await self._resolve_channel(chat_id)
         if target is None:
             logger.warning("Discord stream follow-up target {} unavailable", chat_id)
-            self._stream_bufs.pop(chat_id, None)
             return
 
         for extra_chunk in chunks[1:]:
             await target.send(content=extra_chunk)
 
-        self._stream_bufs.pop(chat_id, None)
         await self._stop_typing(chat_id)
         await self._clear_reactions(chat_id)
 
@@ -541,28 +504,30 @@ class DiscordChannel(BaseChannel):
         self,
         attachments: list[discord.Attachment],
     ) -> tuple[list[str], list[str]]:
-        """Download supported attachments and return paths + display markers."""
-        media_paths: list[str] = []
-        markers: list[str] = []
+        """Download attachments concurrently and return paths + display markers."""
         media_dir = get_media_dir("discord")
 
-        for attachment in attachments:
+        async def _download(attachment: discord.Attachment) -> tuple[str | None, str]:
             filename = attachment.filename or "attachment"
-            if attachment.size and attachment.size > MAX_ATTACHMENT_BYTES:
-                markers.append(f"[attachment: {filename} - too large]")
-                continue
             try:
-                media_dir.mkdir(parents=True, exist_ok=True)
-                safe_name = safe_filename(filename)
-                file_path = media_dir / f"{attachment.id}_{safe_name}"
-                await attachment.save(file_path)
-                media_paths.append(str(file_path))
-                markers.append(f"[attachment: {file_path.name}]")
+                file_path = await self.media.fetch(
+                    media_dir,
+                    str(attachment.id),
+                    f"{attachment.id}_{safe_filename(filename)}",
+                    attachment.save,
+                    size=attachment.size or None,
+                    max_bytes=MAX_ATTACHMENT_BYTES,
+                )
+            except MediaTooLargeError:
+                return None, f"[attachment: {filename} - too large]"
             except Exception as e:
                 logger.warning("Failed to download Discord attachment: {}", e)
-                markers.append(f"[attachment: {filename} - download failed]")
+                return None, f"[attachment: {filename} - download failed]"
+            return str(file_path), f"[attachment: {file_path.name}]"
 
-        return media_paths, markers
+        results = await asyncio.gather(*(_download(a) for a in attachments))
+        media_paths = [path for path, _ in results if path]
+        return media_paths, [marker for _, marker in results]
 
     @staticmethod
     def _compose_inbound_content(content: str, attachment_markers: list[str]) -> str:
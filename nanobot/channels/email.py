@@ -1,11 +1,15 @@
-"""Email channel implementation using IMAP polling + SMTP replies."""
+"""Email channel implementation using IMAP IDLE (or polling) + SMTP replies."""
 
 import asyncio
 import html
 import imaplib
 import re
+import select
 import smtplib
 import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from email import policy
 from email.header import decode_header, make_header
@@ -49,6 +53,8 @@ class EmailConfig(Base):
     from_address: str = ""
 
     auto_reply_enabled: bool = True
+    imap_idle: bool = True  # Push mode on a persistent connection; polls if the server lacks IDLE
+    idle_refresh_seconds: int = 1500  # Re-issue IDLE before servers drop it (RFC 2177: 29 min)
     poll_interval_seconds: int = 30
     mark_seen: bool = True
     max_body_chars: int = 12000
@@ -64,17 +70,22 @@ class EmailConfig(Base):
     max_attachment_size: int = 2_000_000  # 2MB per attachment
     max_attachments_per_email: int = 5
 
+    smtp_pool_size: int = 2  # Logged-in SMTP connections kept for reuse (0 = connect per email)
+
 
 class EmailChannel(BaseChannel):
     """
     Email channel.
 
     Inbound:
-    - Poll IMAP mailbox for unread messages.
+    - Keep one IMAP connection open in a dedicated thread and wait with IDLE
+      for new mail, fetching only UIDs above the last one seen.  Servers
+      without IDLE are polled for unread messages instead.
     - Convert each message into an inbound event.
 
     Outbound:
-    - Send responses via SMTP back to the sender address.
+    - Send responses via SMTP back to the sender address, reusing logged-in
+      connections from a small pool.
     """
 
     name = "email"
@@ -108,6 +119,10 @@ class EmailChannel(BaseChannel):
         "can't open mailbox",
         "does not exist",
     )
+    _UID_FETCH_BATCH = 20
+    _IDLE_WAKE_SECONDS = 1.0  # how quickly an IDLE wait notices stop()
+    _RECONNECT_MAX_SECONDS = 300
+    _SMTP_MAX_IDLE_SECONDS = 240  # servers drop idle SMTP sessions after about five minutes
 
     @classmethod
     def default_config(cls) -> dict[str, Any]:
@@ -122,9 +137,16 @@ class EmailChannel(BaseChannel):
         self._last_message_id_by_chat: dict[str, str] = {}
         self._processed_uids: set[str] = set()  # Capped to prevent unbounded growth
         self._MAX_PROCESSED_UIDS = 100000
+        # Push mode: the persistent IMAP session and the mailbox position it has reached.
+        self._imap: Any = None
+        self._imap_thread: ThreadPoolExecutor | None = None
+        self._uid_validity: str | None = None
+        self._last_uid = 0
+        self._smtp_pool: list[tuple[Any, float]] = []  # (connection, last used)
+        self._smtp_lock = threading.Lock()
 
     async def start(self) -> None:
-        """Start polling IMAP for inbound emails."""
+        """Start receiving inbound emails (IMAP IDLE, or polling as a fallback)."""
         if not self.config.consent_granted:
             logger.warning(
                 "Email channel disabled: consent_granted is false. "
@@ -142,37 +164,80 @@ class EmailChannel(BaseChannel):
                 "Emails with spoofed From headers will be accepted. "
                 "Set verify_dkim=true and verify_spf=true for anti-spoofing protection."
             )
-        logger.info("Starting Email channel (IMAP polling mode)...")
+        if self.config.imap_idle:
+            logger.info("Starting Email channel (IMAP IDLE mode)...")
+            await self._run_idle()
+            if not self._running:
+                return
 
+        logger.info("Starting Email channel (IMAP polling mode)...")
         poll_seconds = max(5, int(self.config.poll_interval_seconds))
         while self._running:
             try:
-                inbound_items = await asyncio.to_thread(self._fetch_new_messages)
-                for item in inbound_items:
-                    sender = item["sender"]
-                    subject = item.get("subject", "")
-                    message_id = item.get("message_id", "")
-
-                    if subject:
-                        self._last_subject_by_chat[sender] = subject
-                    if message_id:
-                        self._last_message_id_by_chat[sender] = message_id
-
-                    await self._handle_message(
-                        sender_id=sender,
-                        chat_id=sender,
-                        content=item["content"],
-                        media=item.get("media") or None,
-                        metadata=item.get("metadata", {}),
-                    )
+                await self._deliver(await asyncio.to_thread(self._fetch_new_messages))
             except Exception as e:
                 logger.error("Email polling error: {}", e)
 
             await asyncio.sleep(poll_seconds)
 
     async def stop(self) -> None:
-        """Stop polling loop."""
+        """Stop receiving and close the IMAP session and pooled SMTP connections."""
         self._running = False
+        await asyncio.to_thread(self._close_smtp_pool)
+        if self._imap_thread is not None:
+            # The IDLE wait notices _running within a second; the logout queues behind it.
+            await asyncio.get_running_loop().run_in_executor(self._imap_thread, self._close_imap)
+            self._imap_thread.shutdown(wait=False)
+            self._imap_thread = None
+
+    async def _deliver(self, items: list[dict[str, Any]]) -> None:
+        for item in items:
+            sender = item["sender"]
+            subject = item.get("subject", "")
+            message_id = item.get("message_id", "")
+
+            if subject:
+                self._last_subject_by_chat[sender] = subject
+            if message_id:
+                self._last_message_id_by_chat[sender] = message_id
+
+            await self._handle_message(
+                sender_id=sender,
+                chat_id=sender,
+                content=item["content"],
+                media=item.get("media") or None,
+                metadata=item.get("metadata", {}),
+            )
+
+    async def _run_idle(self) -> None:
+        """Receive mail in push mode until stopped or the server turns out not to support IDLE.
+
+        Every IMAP call runs in one dedicated thread, so the session is never
+        used by two threads and a long IDLE does not hold a default executor
+        worker.  A dropped connection is re-opened with exponential backoff.
+        """
+        if self._imap_thread is None:
+            self._imap_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="email-imap")
+        loop = asyncio.get_running_loop()
+        backoff = 1.0
+        while self._running:
+            items: list[dict[str, Any]] = []
+            try:
+                supported = await loop.run_in_executor(self._imap_thread, self._idle_cycle, items)
+            except Exception as e:
+                await loop.run_in_executor(self._imap_thread, self._close_imap)
+                await self._deliver(items)
+                if not self._running:
+                    return
+                logger.warning("Email IMAP connection lost, reconnecting in {}s: {}", backoff, e)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self._RECONNECT_MAX_SECONDS)
+                continue
+            await self._deliver(items)
+            if not supported:
+                logger.info("Email IMAP server does not support IDLE; falling back to polling")
+                return
+            backoff = 1.0
 
     async def send(self, msg: OutboundMessage) -> None:
         """Send email via SMTP."""
@@ -243,22 +308,67 @@ class EmailChannel(BaseChannel):
         return True
 
     def _smtp_send(self, msg: EmailMessage) -> None:
+        smtp = self._smtp_checkout()
+        try:
+            smtp.send_message(msg)
+        except Exception:
+            self._smtp_close(smtp)
+            raise
+        self._smtp_checkin(smtp)
+
+    def _smtp_connect(self) -> Any:
         timeout = 30
         if self.config.smtp_use_ssl:
-            with smtplib.SMTP_SSL(
-                self.config.smtp_host,
-                self.config.smtp_port,
-                timeout=timeout,
-            ) as smtp:
-                smtp.login(self.config.smtp_username, self.config.smtp_password)
-                smtp.send_message(msg)
-            return
-
-        with smtplib.SMTP(self.config.smtp_host, self.config.smtp_port, timeout=timeout) as smtp:
-            if self.config.smtp_use_tls:
+            smtp = smtplib.SMTP_SSL(self.config.smtp_host, self.config.smtp_port, timeout=timeout)
+        else:
+            smtp = smtplib.SMTP(self.config.smtp_host, self.config.smtp_port, timeout=timeout)
+        try:
+            if not self.config.smtp_use_ssl and self.config.smtp_use_tls:
                 smtp.starttls(context=ssl.create_default_context())
             smtp.login(self.config.smtp_username, self.config.smtp_password)
-            smtp.send_message(msg)
+        except Exception:
+            self._smtp_close(smtp)
+            raise
+        return smtp
+
+    def _smtp_checkout(self) -> Any:
+        """A logged-in SMTP connection: a pooled one that still answers NOOP, or a new one."""
+        while True:
+            with self._smtp_lock:
+                if not self._smtp_pool:
+                    break
+                smtp, last_used = self._smtp_pool.pop()
+            if time.monotonic() - last_used < self._SMTP_MAX_IDLE_SECONDS:
+                try:
+                    if smtp.noop()[0] == 250:
+                        return smtp
+                except Exception:
+                    pass
+            self._smtp_close(smtp)
+        return self._smtp_connect()
+
+    def _smtp_checkin(self, smtp: Any) -> None:
+        with self._smtp_lock:
+            if len(self._smtp_pool) < self.config.smtp_pool_size:
+                self._smtp_pool.append((smtp, time.monotonic()))
+                return
+        self._smtp_close(smtp)
+
+    def _close_smtp_pool(self) -> None:
+        with self._smtp_lock:
+            pool, self._smtp_pool = self._smtp_pool, []
+        for smtp, _ in pool:
+            self._smtp_close(smtp)
+
+    @staticmethod
+    def _smtp_close(smtp: Any) -> None:
+        try:
+            smtp.quit()
+        except Exception:
+            try:
+                smtp.close()
+            except Exception:
+                pass
 
     def _fetch_new_messages(self) -> list[dict[str, Any]]:
         """Poll IMAP and return parsed unread messages."""
@@ -334,11 +444,7 @@ class EmailChannel(BaseChannel):
     ) -> None:
         """Fetch messages by arbitrary IMAP search criteria."""
         mailbox = self.config.imap_mailbox or "INBOX"
-
-        if self.config.imap_use_ssl:
-            client = imaplib.IMAP4_SSL(self.config.imap_host, self.config.imap_port)
-        else:
-            client = imaplib.IMAP4(self.config.imap_host, self.config.imap_port)
+        client = self._new_imap_client()
 
         try:
             client.login(self.config.imap_username, self.config.imap_password)
@@ -375,85 +481,15 @@ class EmailChannel(BaseChannel):
                 if dedupe and uid and uid in self._processed_uids:
                     continue
 
-                parsed = BytesParser(policy=policy.default).parsebytes(raw_bytes)
-                sender = parseaddr(parsed.get("From", ""))[1].strip().lower()
-                if not sender:
-                    continue
-
-                # --- Anti-spoofing: verify Authentication-Results ---
-                spf_pass, dkim_pass = self._check_authentication_results(parsed)
-                if self.config.verify_spf and not spf_pass:
-                    logger.warning(
-                        "Email from {} rejected: SPF verification failed "
-                        "(no 'spf=pass' in Authentication-Results header)",
-                        sender,
-                    )
-                    continue
-                if self.config.verify_dkim and not dkim_pass:
-                    logger.warning(
-                        "Email from {} rejected: DKIM verification failed "
-                        "(no 'dkim=pass' in Authentication-Results header)",
-                        sender,
-                    )
+                item = self._parse_message(raw_bytes, uid)
+                if item is None:
                     continue
-
-                subject = self._decode_header_value(parsed.get("Subject", ""))
-                date_value = parsed.get("Date", "")
-                message_id = parsed.get("Message-ID", "").strip()
-                body = self._extract_text_body(parsed)
-
-                if not body:
-                    body = "(empty email body)"
-
-                body = body[: self.config.max_body_chars]
-                content = (
-                    f"[EMAIL-CONTEXT] Email received.\n"
-                    f"From: {sender}\n"
-                    f"Subject: {subject}\n"
-                    f"Date: {date_value}\n\n"
-                    f"{body}"
-                )
-
-                # --- Attachment extraction ---
-                attachment_paths: list[str] = []
-                if self.config.allowed_attachment_types:
-                    saved = self._extract_attachments(
-                        parsed,
-                        uid or "noid",
-                        allowed_types=self.config.allowed_attachment_types,
-                        max_size=self.config.max_attachment_size,
-                        max_count=self.config.max_attachments_per_email,
-                    )
-                    for p in saved:
-                        attachment_paths.append(str(p))
-                        content += f"\n[attachment: {p.name} — saved to {p}]"
-
-                metadata = {
-                    "message_id": message_id,
-                    "subject": subject,
-                    "date": date_value,
-                    "sender_email": sender,
-                    "uid": uid,
-                }
-                messages.append(
-                    {
-                        "sender": sender,
-                        "subject": subject,
-                        "message_id": message_id,
-                        "content": content,
-                        "metadata": metadata,
-                        "media": attachment_paths,
-                    }
-                )
+                messages.append(item)
 
                 if uid:
                     cycle_uids.add(uid)
                 if dedupe and uid:
-                    self._processed_uids.add(uid)
-                    # mark_seen is the primary dedup; this set is a safety net
-                    if len(self._processed_uids) > self._MAX_PROCESSED_UIDS:
-                        # Evict a random half to cap memory; mark_seen is the primary dedup
-                        self._processed_uids = set(list(self._processed_uids)[len(self._processed_uids) // 2:])
+                    self._remember_uid(uid)
 
                 if mark_seen:
                     client.store(imap_id, "+FLAGS", "\\Seen")
@@ -463,6 +499,287 @@ class EmailChannel(BaseChannel):
             except Exception:
                 pass
 
+    def _new_imap_client(self) -> Any:
+        if self.config.imap_use_ssl:
+            return imaplib.IMAP4_SSL(self.config.imap_host, self.config.imap_port)
+        return imaplib.IMAP4(self.config.imap_host, self.config.imap_port)
+
+    def _parse_message(self, raw_bytes: bytes, uid: str) -> dict[str, Any] | None:
+        """Turn a raw message into an inbound item, or None if it is rejected."""
+        parsed = BytesParser(policy=policy.default).parsebytes(raw_bytes)
+        sender = parseaddr(parsed.get("From", ""))[1].strip().lower()
+        if not sender:
+            return None
+
+        # --- Anti-spoofing: verify Authentication-Results ---
+        spf_pass, dkim_pass = self._check_authentication_results(parsed)
+        if self.config.verify_spf and not spf_pass:
+            logger.warning(
+                "Email from {} rejected: SPF verification failed "
+                "(no 'spf=pass' in Authentication-Results header)",
+                sender,
+            )
+            return None
+        if self.config.verify_dkim and not dkim_pass:
+            logger.warning(
+                "Email from {} rejected: DKIM verification failed "
+                "(no 'dkim=pass' in Authentication-Results header)",
+                sender,
+            )
+            return None
+
+        subject = self._decode_header_value(parsed.get("Subject", ""))
+        date_value = parsed.get("Date", "")
+        message_id = parsed.get("Message-ID", "").strip()
+        body = self._extract_text_body(parsed)
+
+        if not body:
+            body = "(empty email body)"
+
+        body = body[: self.config.max_body_chars]
+        content = (
+            f"[EMAIL-CONTEXT] Email received.\n"
+            f"From: {sender}\n"
+            f"Subject: {subject}\n"
+            f"Date: {date_value}\n\n"
+            f"{body}"
+        )
+
+        # --- Attachment extraction ---
+        attachment_paths: list[str] = []
+        if self.config.allowed_attachment_types:
+            saved = self._extract_attachments(
+                parsed,
+                uid or "noid",
+                allowed_types=self.config.allowed_attachment_types,
+                max_size=self.config.max_attachment_size,
+                max_count=self.config.max_attachments_per_email,
+            )
+            for p in saved:
+                attachment_paths.append(str(p))
+                content += f"\n[attachment: {p.name} — saved to {p}]"
+
+        metadata = {
+            "message_id": message_id,
+            "subject": subject,
+            "date": date_value,
+            "sender_email": sender,
+            "uid": uid,
+        }
+        return {
+            "sender": sender,
+            "subject": subject,
+            "message_id": message_id,
+            "content": content,
+            "metadata": metadata,
+            "media": attachment_paths,
+        }
+
+    def _remember_uid(self, uid: str) -> None:
+        self._processed_uids.add(uid)
+        # mark_seen is the primary dedup; this set is a safety net
+        if len(self._processed_uids) > self._MAX_PROCESSED_UIDS:
+            # Evict a random half to cap memory; mark_seen is the primary dedup
+            self._processed_uids = set(list(self._processed_uids)[len(self._processed_uids) // 2:])
+
+    # ------------------------------------------------------------------
+    # Push mode (IMAP IDLE on a persistent connection)
+    # ------------------------------------------------------------------
+
+    def _idle_cycle(self, messages: list[dict[str, Any]]) -> bool:
+        """One round of push mode, run in the IMAP thread; False if the server can't IDLE.
+
+        Connects and catches up if there is no session yet, otherwise IDLEs
+        until the server reports new mail (then fetches it) or the refresh
+        interval ends (then the caller simply IDLEs again).
+        """
+        if self._imap is None:
+            client = self._imap_open()
+            if not self._supports_idle(client):
+                self._logout(client)
+                return False
+            self._imap = client
+            self._fetch_since_last_uid(client, messages)
+            return True
+        if self._idle_wait(self._imap, max(60, int(self.config.idle_refresh_seconds))):
+            self._fetch_since_last_uid(self._imap, messages)
+        return True
+
+    def _imap_open(self) -> Any:
+        """Log in, select the mailbox and reconcile UIDVALIDITY with what was seen before."""
+        mailbox = self.config.imap_mailbox or "INBOX"
+        client = self._new_imap_client()
+        try:
+            client.login(self.config.imap_username, self.config.imap_password)
+            status, _ = client.select(mailbox)
+            if status != "OK":
+                raise imaplib.IMAP4.error(f"select {mailbox} returned {status}")
+        except Exception:
+            self._logout(client)
+            raise
+
+        validity = self._response_code(client, "UIDVALIDITY")
+        if validity != self._uid_validity:
+            if self._uid_validity is not None:
+                # Old UIDs mean nothing in the new numbering.
+                logger.info("Email mailbox {} UIDVALIDITY changed, resyncing", mailbox)
+                self._processed_uids.clear()
+            self._uid_validity = validity
+            self._last_uid = 0
+        return client
+
+    def _fetch_since_last_uid(self, client: Any, messages: list[dict[str, Any]]) -> None:
+        """Fetch unread messages with a UID above the last one seen, in batches.
+
+        The first fetch after (re)selecting a mailbox with no known position
+        catches up on all unread mail; the position then starts below UIDNEXT.
+        """
+        if self._last_uid:
+            criteria: tuple[str, ...] = ("UID", f"{self._last_uid + 1}:*", "UNSEEN")
+            floor = self._last_uid
+        else:
+            criteria = ("UNSEEN",)
+            uid_next = self._response_code(client, "UIDNEXT")
+            floor = int(uid_next) - 1 if uid_next and uid_next.isdigit() else 0
+        status, data = client.uid("SEARCH", *criteria)
+        if status != "OK":
+            raise imaplib.IMAP4.error(f"UID SEARCH returned {status}")
+        found = {int(u) for u in (data[0] or b"").split() if u.isdigit()} if data else set()
+        # "n:*" always matches the highest UID, even one below n.
+        uids = sorted(u for u in found if u > self._last_uid)
+
+        for start in range(0, len(uids), self._UID_FETCH_BATCH):
+            batch = uids[start:start + self._UID_FETCH_BATCH]
+            status, fetched = client.uid("FETCH", ",".join(map(str, batch)), "(UID BODY.PEEK[])")
+            if status != "OK":
+                raise imaplib.IMAP4.error(f"UID FETCH returned {status}")
+            accepted: list[str] = []
+            for uid, raw_bytes in self._iter_fetched(fetched or []):
+                if uid in self._processed_uids:
+                    continue
+                item = self._parse_message(raw_bytes, uid)
+                if item is None:
+                    continue
+                messages.append(item)
+                self._remember_uid(uid)
+                accepted.append(uid)
+            if self.config.mark_seen and accepted:
+                client.uid("STORE", ",".join(accepted), "+FLAGS", "\\Seen")
+            self._last_uid = max(self._last_uid, batch[-1])
+        self._last_uid = max(self._last_uid, floor)
+
+    def _idle_wait(self, client: Any, timeout: float) -> bool:
+        """IDLE until the mailbox changes or *timeout* passes; True if it changed.
+
+        imaplib has no IDLE command (before Python 3.14), so this speaks it
+        directly: ``IDLE``, wait for untagged ``EXISTS``/``RECENT``, ``DONE``.
+        """
+        tag = client._new_tag()
+        client.send(tag + b" IDLE\r\n")
+        changed = False
+        line = client.readline()
+        while line.startswith(b"* "):  # untagged data sent before the continuation
+            changed = changed or self._is_mailbox_change(line)
+            line = client.readline()
+        if not line.startswith(b"+"):
+            raise imaplib.IMAP4.error(f"IDLE rejected: {line.decode(errors='replace').strip()}")
+
+        sock = client.socket()
+        deadline = time.monotonic() + timeout
+        while self._running and not changed:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if not self._has_buffered_input(client):
+                ready, _, _ = select.select([sock], [], [], min(remaining, self._IDLE_WAKE_SECONDS))
+                if not ready:
+                    continue
+            line = client.readline()
+            if not line or line.upper().startswith(b"* BYE"):
+                raise imaplib.IMAP4.abort("socket error: server closed the IDLE session")
+            changed = self._is_mailbox_change(line)
+
+        client.send(b"DONE\r\n")
+        while True:
+            line = client.readline()
+            if not line:
+                raise imaplib.IMAP4.abort("socket error: EOF while ending IDLE")
+            if line.startswith(tag + b" "):
+                if not line[len(tag) + 1:].upper().startswith(b"OK"):
+                    reason = line.decode(errors="replace").strip()
+                    raise imaplib.IMAP4.error(f"IDLE failed: {reason}")
+                return changed
+            changed = changed or self._is_mailbox_change(line)
+
+    @staticmethod
+    def _is_mailbox_change(line: bytes) -> bool:
+        """Whether an untagged response announces new mail (``* 12 EXISTS``)."""
+        return line.rstrip().upper().endswith((b" EXISTS", b" RECENT"))
+
+    @staticmethod
+    def _has_buffered_input(client: Any) -> bool:
+        """Whether response bytes were already read off the socket but not consumed.
+
+        ``select`` only sees the socket, not what imaplib's buffered reader or
+        the TLS layer already hold, so check those without blocking.
+        """
+        sock = client.socket()
+        if isinstance(sock, ssl.SSLSocket) and sock.pending():
+            return True
+        peek = getattr(client.file, "peek", None)
+        if peek is None:
+            return False
+        previous = sock.gettimeout()
+        sock.setblocking(False)
+        try:
+            return bool(peek(1))
+        except OSError:  # nothing to read (BlockingIOError, SSLWantReadError)
+            return False
+        finally:
+            sock.settimeout(previous)
+
+    @staticmethod
+    def _supports_idle(client: Any) -> bool:
+        try:
+            status, data = client.capability()
+        except Exception:
+            return False
+        if status != "OK" or not data:
+            return False
+        return b"IDLE" in b" ".join(d for d in data if isinstance(d, bytes)).upper().split()
+
+    @staticmethod
+    def _response_code(client: Any, name: str) -> str | None:
+        """Value of a response code from SELECT, e.g. ``[UIDVALIDITY 3857529045]``."""
+        _, data = client.response(name)
+        for value in data or []:
+            if isinstance(value, bytes) and value.strip():
+                return value.decode(errors="ignore").strip()
+        return None
+
+    @classmethod
+    def _iter_fetched(cls, fetched: list[Any]) -> list[tuple[str, bytes]]:
+        """(uid, raw message) pairs from a multi-message FETCH response."""
+        pairs: list[tuple[str, bytes]] = []
+        for item in fetched:
+            raw_bytes = cls._extract_message_bytes([item])
+            uid = cls._extract_uid([item])
+            if raw_bytes is not None and uid:
+                pairs.append((uid, raw_bytes))
+        return pairs
+
+    def _close_imap(self) -> None:
+        client, self._imap = self._imap, None
+        if client is not None:
+            self._logout(client)
+
+    @staticmethod
+    def _logout(client: Any) -> None:
+        try:
+            client.logout()
+        except Exception:
+            pass
+
     @classmethod
     def _is_stale_imap_error(cls, exc: Exception) -> bool:
         message = str(exc).lower()
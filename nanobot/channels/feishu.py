@@ -19,6 +19,8 @@ from pydantic import Field
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
+from nanobot.channels.media import MediaError
+from nanobot.channels.ratelimit import RateLimits
 from nanobot.config.paths import get_media_dir
 from nanobot.config.schema import Base
 
@@ -287,6 +289,8 @@ class FeishuChannel(BaseChannel):
 
     name = "feishu"
     display_name = "Feishu"
+    # Message API: 50 calls a second per app, five a second per chat.
+    rate_limits = RateLimits(per_second=50, chat_per_second=5, chat_burst=5)
 
     _STREAM_EDIT_INTERVAL = 0.5  # throttle between CardKit streaming updates
 
@@ -1008,6 +1012,9 @@ class FeishuChannel(BaseChannel):
         media_dir = get_media_dir("feishu")
 
         data, filename = None, None
+        resource_key = content_json.get("image_key" if msg_type == "image" else "file_key")
+        if resource_key and (cached := self.media.cached(resource_key)) is not None:
+            return str(cached), f"[{msg_type}: {cached.name}]"
 
         if msg_type == "image":
             image_key = content_json.get("image_key")
@@ -1045,10 +1052,13 @@ class FeishuChannel(BaseChannel):
                     filename = f"{filename}.ogg"
 
         if data and filename:
-            file_path = media_dir / filename
-            file_path.write_bytes(data)
+            try:
+                file_path = await self.media.fetch(media_dir, resource_key, filename, data)
+            except MediaError as e:
+                logger.warning("Feishu {} not saved: {}", msg_type, e)
+                return None, f"[{msg_type}: download failed]"
             logger.debug("Downloaded {} to {}", msg_type, file_path)
-            return str(file_path), f"[{msg_type}: {filename}]"
+            return str(file_path), f"[{msg_type}: {file_path.name}]"
 
         return None, f"[{msg_type}: download failed]"
 
@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from loguru import logger
@@ -10,12 +13,207 @@ from loguru import logger
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
+from nanobot.channels.ratelimit import OutboundLimiter, RateLimits
 from nanobot.config.schema import Config
+from nanobot.providers.metrics import Histogram, metric_header, render_histogram
 from nanobot.utils.restart import consume_restart_notice_from_env, format_restart_completed_message
 
 # Retry delays for message sending (exponential backoff: 1s, 2s, 4s)
 _SEND_RETRY_DELAYS = (1, 2, 4)
 
+_DELIVERY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _section_enabled(section: Any) -> bool:
+    if isinstance(section, dict):
+        return bool(section.get("enabled", False))
+    return bool(getattr(section, "enabled", False))
+
+
+def _is_send(msg: OutboundMessage) -> bool:
+    """Whether *msg* is a regular message (not a stream edit or an already streamed reply)."""
+    meta = msg.metadata
+    return not (meta.get("_stream_delta") or meta.get("_stream_end") or meta.get("_streamed"))
+
+
+def _extends_stream(metadata: dict[str, Any], nxt: OutboundMessage) -> bool:
+    """Whether *nxt* continues the delta stream whose merged metadata is *metadata*."""
+    return bool(
+        nxt.metadata and nxt.metadata.get("_stream_delta") and not metadata.get("_stream_end")
+    )
+
+
+def _continues_tail(tail: OutboundMessage, nxt: OutboundMessage) -> bool:
+    """Whether *nxt*, a delta or the end marker, belongs to the open delta stream *tail*."""
+    meta, nxt_meta = tail.metadata, nxt.metadata or {}
+    return bool(
+        meta.get("_stream_delta")
+        and not meta.get("_stream_end")
+        and (nxt_meta.get("_stream_delta") or nxt_meta.get("_stream_end"))
+        and nxt_meta.get("_stream_id") == meta.get("_stream_id")
+    )
+
+
+class _ChatQueue:
+    """FIFO of one chat's pending messages with their enqueue times."""
+
+    __slots__ = ("messages", "scheduled")
+
+    def __init__(self) -> None:
+        self.messages: deque[tuple[OutboundMessage, float]] = deque()
+        self.scheduled = False  # waiting in the ready queue or being sent
+
+
+class _ChannelOutbox:
+    """Outbound delivery for one channel: per-chat FIFO queues served by a worker pool.
+
+    A chat is handled by at most one worker at a time, so its messages go
+    out in order, while other chats proceed on the remaining workers; a chat
+    stuck in retry backoff only holds up itself.  After each send the chat
+    goes to the back of the ready queue, so busy chats take turns.  A chat
+    over the channel's rate limit is put back on the ready queue when it has
+    budget again, so the workers keep serving the other chats meanwhile.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        channel: BaseChannel,
+        send: Callable[[BaseChannel, OutboundMessage], Awaitable[bool]],
+        workers: int,
+        max_queue: int,
+        on_done: Callable[[OutboundMessage], None] | None = None,
+    ):
+        self.name = name
+        self.channel = channel
+        self._send = send
+        self._on_done = on_done
+        self.max_queue = max_queue
+        self._chats: dict[str, _ChatQueue] = {}
+        self._ready: asyncio.Queue[str] = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(workers)]
+        self.in_flight = 0
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.latency = Histogram(_DELIVERY_BUCKETS)
+
+    @property
+    def depth(self) -> int:
+        """Messages queued (not yet being sent) across all chats."""
+        return sum(len(chat.messages) for chat in self._chats.values())
+
+    def put(self, msg: OutboundMessage) -> bool:
+        """Queue *msg* behind its chat's earlier messages; False if it was rejected.
+
+        A stream delta, or the end marker, is merged into the chat's queued
+        tail delta of the same stream, so a stream takes one slot however
+        long the chat is stuck.  When the queue is full its oldest progress
+        update is dropped; if it holds none, an incoming progress update is
+        rejected, while replies and stream pieces are still queued so an
+        answer is never cut off.  Never waits, so one chat that cannot drain
+        does not hold up the router and every other chat.
+        """
+        chat = self._chats.get(msg.chat_id)
+        if chat is None:
+            chat = self._chats[msg.chat_id] = _ChatQueue()
+        if chat.messages and _continues_tail(tail := chat.messages[-1][0], msg):
+            merged = OutboundMessage(
+                channel=tail.channel, chat_id=tail.chat_id, content=tail.content + msg.content,
+                metadata={**tail.metadata, **msg.metadata, "_stream_delta": True},
+            )
+            chat.messages[-1] = (merged, chat.messages[-1][1])
+            return True
+        if (
+            len(chat.messages) >= self.max_queue
+            and not self._drop_progress(chat)
+            and msg.metadata.get("_progress")
+        ):
+            self.rejected += 1
+            logger.warning("Outbound queue full for {}:{}; rejected a progress update",
+                           self.name, msg.chat_id)
+            if self._on_done is not None:
+                self._on_done(msg)
+            return False
+        chat.messages.append((msg, time.monotonic()))
+        if not chat.scheduled:
+            chat.scheduled = True
+            self._ready.put_nowait(msg.chat_id)
+        return True
+
+    def _drop_progress(self, chat: _ChatQueue) -> bool:
+        for i, (queued, _) in enumerate(chat.messages):
+            if queued.metadata.get("_progress"):
+                del chat.messages[i]
+                self.dropped += 1
+                logger.warning("Outbound queue full for {}:{}; dropped a progress update",
+                               self.name, queued.chat_id)
+                return True
+        return False
+
+    def _rate_limited(self, chat_id: str, chat: _ChatQueue) -> bool:
+        """Use a send of *chat_id*'s budget, or reschedule the chat and return True."""
+        limiter = self.channel.rate_limiter
+        if limiter is None or not _is_send(chat.messages[0][0]):
+            return False
+        wait = limiter.try_acquire(chat_id)
+        if wait <= 0:
+            return False
+        asyncio.get_running_loop().call_later(wait, self._ready.put_nowait, chat_id)
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            chat_id = await self._ready.get()
+            chat = self._chats[chat_id]
+            if self._rate_limited(chat_id, chat):
+                continue
+            msg, enqueued_at = chat.messages.popleft()
+            self.in_flight += 1
+            try:
+                delivered = await self._send(self.channel, msg)
+            except Exception:
+                logger.exception("Outbound worker for {} failed", self.name)
+                delivered = False
+            finally:
+                self.in_flight -= 1
+            if delivered:
+                self.delivered += 1
+            else:
+                self.failed += 1
+            if self._on_done is not None:
+                # Retries are exhausted either way; don't replay it on restart.
+                self._on_done(msg)
+            self.latency.observe(time.monotonic() - enqueued_at)
+            if chat.messages:
+                self._ready.put_nowait(chat_id)
+            else:
+                chat.scheduled = False
+                del self._chats[chat_id]
+
+    async def close(self) -> None:
+        """Cancel the workers; messages still queued are discarded (a durable bus replays them)."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.depth:
+            logger.warning("Discarding {} queued outbound message(s) for {}",
+                           self.depth, self.name)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "queued": self.depth,
+            "chats": len(self._chats),
+            "in_flight": self.in_flight,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "latency_p50_s": self.latency.quantile(0.5),
+            "latency_p95_s": self.latency.quantile(0.95),
+        }
+
 
 class ChannelManager:
     """
@@ -24,7 +222,7 @@ class ChannelManager:
     Responsibilities:
     - Initialize enabled channels (Telegram, WhatsApp, etc.)
     - Start/stop channels
-    - Route outbound messages
+    - Route outbound messages to per-channel, per-chat delivery queues
     """
 
     def __init__(self, config: Config, bus: MessageBus):
@@ -32,31 +230,30 @@ class ChannelManager:
         self.bus = bus
         self.channels: dict[str, BaseChannel] = {}
         self._dispatch_task: asyncio.Task | None = None
+        self._outboxes: dict[str, _ChannelOutbox] = {}
 
         self._init_channels()
 
     def _init_channels(self) -> None:
-        """Initialize channels discovered via pkgutil scan + entry_points plugins."""
+        """Initialize enabled channels; only their modules are imported."""
         from nanobot.channels.registry import discover_all
 
         transcription_provider = self.config.channels.transcription_provider
         transcription_key = self._resolve_transcription_key(transcription_provider)
 
-        for name, cls in discover_all().items():
+        sections = getattr(self.config.channels, "model_extra", None) or {}
+        enabled = [name for name, section in sections.items() if _section_enabled(section)]
+
+        for name, cls in discover_all(enabled).items():
             section = getattr(self.config.channels, name, None)
-            if section is None:
-                continue
-            enabled = (
-                section.get("enabled", False)
-                if isinstance(section, dict)
-                else getattr(section, "enabled", False)
-            )
-            if not enabled:
+            if section is None or not _section_enabled(section):
                 continue
             try:
                 channel = cls(section, self.bus)
                 channel.transcription_provider = transcription_provider
                 channel.transcription_api_key = transcription_key
+                self._configure_media(channel)
+                channel.rate_limiter = self._rate_limiter(name, channel)
                 self.channels[name] = channel
                 logger.info("{} channel enabled", cls.display_name)
             except Exception as e:
@@ -64,6 +261,13 @@ class ChannelManager:
 
         self._validate_allow_from()
 
+    def _configure_media(self, channel: BaseChannel) -> None:
+        """Apply the attachment download limits from the channels config."""
+        cfg = self.config.channels
+        channel.media.max_bytes = cfg.media_max_mb * 1024 * 1024
+        channel.media.retention_s = cfg.media_retention_days * 86400.0
+        channel.media.quota_bytes = cfg.media_dir_max_mb * 1024 * 1024
+
     def _resolve_transcription_key(self, provider: str) -> str:
         """Pick the API key for the configured transcription provider."""
         try:
@@ -153,10 +357,55 @@ class ChannelManager:
             except Exception as e:
                 logger.error("Error stopping {}: {}", name, e)
 
+    def _send_concurrency(self, name: str) -> int:
+        """Parallel sends for channel *name*: its ``sendConcurrency`` or the global default."""
+        sections = getattr(self.config.channels, "model_extra", None) or {}
+        section = sections.get(name)
+        value = None
+        if isinstance(section, dict):
+            value = section.get("sendConcurrency", section.get("send_concurrency"))
+        return max(int(value or self.config.channels.send_concurrency), 1)
+
+    def _rate_limiter(self, name: str, channel: BaseChannel) -> OutboundLimiter | None:
+        """Limiter for channel *name*: its class quotas with the section's ``rateLimit`` applied."""
+        sections = getattr(self.config.channels, "model_extra", None) or {}
+        section = sections.get(name)
+        override = None
+        if isinstance(section, dict):
+            override = section.get("rateLimit", section.get("rate_limit"))
+        if override is None:
+            return channel.rate_limiter
+        limits = (channel.rate_limits or RateLimits()).merged(override)
+        return OutboundLimiter(limits) if limits is not None else None
+
+    def _outbox(self, name: str) -> _ChannelOutbox | None:
+        outbox = self._outboxes.get(name)
+        if outbox is None:
+            channel = self.channels.get(name)
+            if channel is None:
+                return None
+            outbox = self._outboxes[name] = _ChannelOutbox(
+                name,
+                channel,
+                self._send_with_retry,
+                workers=self._send_concurrency(name),
+                max_queue=self.config.channels.send_queue_size,
+                on_done=self.bus.ack,
+            )
+        return outbox
+
     async def _dispatch_outbound(self) -> None:
-        """Dispatch outbound messages to the appropriate channel."""
+        """Route outbound messages from the bus to each channel's per-chat queues."""
         logger.info("Outbound dispatcher started")
+        for name in self.channels:
+            self._outbox(name)
+        try:
+            await self._route_outbound()
+        finally:
+            outboxes, self._outboxes = self._outboxes, {}
+            await asyncio.gather(*(o.close() for o in outboxes.values()))
 
+    async def _route_outbound(self) -> None:
         # Buffer for messages that couldn't be processed during delta coalescing
         # (since asyncio.Queue doesn't support push_front)
         pending: list[OutboundMessage] = []
@@ -184,11 +433,12 @@ class ChannelManager:
                     msg, extra_pending = self._coalesce_stream_deltas(msg)
                     pending.extend(extra_pending)
 
-                channel = self.channels.get(msg.channel)
-                if channel:
-                    await self._send_with_retry(channel, msg)
+                outbox = self._outbox(msg.channel)
+                if outbox:
+                    outbox.put(msg)
                 else:
                     logger.warning("Unknown channel: {}", msg.channel)
+                    self.bus.ack(msg)
 
             except asyncio.TimeoutError:
                 continue
@@ -229,14 +479,12 @@ class ChannelManager:
 
             # Check if this message belongs to the same stream
             same_target = (next_msg.channel, next_msg.chat_id) == target_key
-            is_delta = next_msg.metadata and next_msg.metadata.get("_stream_delta")
-            is_end = next_msg.metadata and next_msg.metadata.get("_stream_end")
 
-            if same_target and is_delta and not final_metadata.get("_stream_end"):
+            if same_target and _extends_stream(final_metadata, next_msg):
                 # Accumulate content
                 combined_content += next_msg.content
                 # If we see _stream_end, remember it and stop coalescing this stream
-                if is_end:
+                if next_msg.metadata.get("_stream_end"):
                     final_metadata["_stream_end"] = True
                     # Stream ended - stop coalescing this stream
                     break
@@ -253,9 +501,12 @@ class ChannelManager:
         )
         return merged, non_matching
 
-    async def _send_with_retry(self, channel: BaseChannel, msg: OutboundMessage) -> None:
+    async def _send_with_retry(self, channel: BaseChannel, msg: OutboundMessage) -> bool:
         """Send a message with retry on failure using exponential backoff.
 
+        Returns whether the message was delivered.  The backoff sleeps only
+        hold up the calling chat worker.
+
         Note: CancelledError is re-raised to allow graceful shutdown.
         """
         max_attempts = max(self.config.channels.send_max_retries, 1)
@@ -263,17 +514,20 @@ class ChannelManager:
         for attempt in range(max_attempts):
             try:
                 await self._send_once(channel, msg)
-                return  # Send succeeded
+                return True
             except asyncio.CancelledError:
                 raise  # Propagate cancellation for graceful shutdown
             except Exception as e:
+                retry_after = channel.note_rate_limit(msg.chat_id, e)
                 if attempt == max_attempts - 1:
                     logger.error(
                         "Failed to send to {} after {} attempts: {} - {}",
                         msg.channel, max_attempts, type(e).__name__, e
                     )
-                    return
+                    return False
                 delay = _SEND_RETRY_DELAYS[min(attempt, len(_SEND_RETRY_DELAYS) - 1)]
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
                 logger.warning(
                     "Send to {} failed (attempt {}/{}): {}, retrying in {}s",
                     msg.channel, attempt + 1, max_attempts, type(e).__name__, delay
@@ -282,6 +536,7 @@ class ChannelManager:
                     await asyncio.sleep(delay)
                 except asyncio.CancelledError:
                     raise  # Propagate cancellation during sleep
+        return False
 
     def get_channel(self, name: str) -> BaseChannel | None:
         """Get a channel by name."""
@@ -289,13 +544,54 @@ class ChannelManager:
 
     def get_status(self) -> dict[str, Any]:
         """Get status of all channels."""
-        return {
-            name: {
-                "enabled": True,
-                "running": channel.is_running
-            }
-            for name, channel in self.channels.items()
-        }
+        status: dict[str, Any] = {}
+        for name, channel in self.channels.items():
+            status[name] = {"enabled": True, "running": channel.is_running}
+            outbox = self._outboxes.get(name)
+            if outbox is not None:
+                status[name]["outbound"] = outbox.snapshot()
+            if channel.rate_limiter is not None:
+                status[name]["rate_limit"] = channel.rate_limiter.snapshot()
+        return status
+
+    def render_prometheus(self) -> str:
+        """Prometheus text for outbound queue depth, delivery counts and latency."""
+        out: list[str] = []
+        outboxes = sorted(self._outboxes.items())
+
+        def _metric(name: str, kind: str, help_text: str) -> str:
+            return metric_header(out, f"nanobot_channel_{name}", kind, help_text)
+
+        for name, attr, kind, help_text in (
+            ("outbound_queue_depth", "depth", "gauge", "Outbound messages waiting to be sent"),
+            ("outbound_in_flight", "in_flight", "gauge", "Outbound messages being sent"),
+            ("delivered_total", "delivered", "counter", "Outbound messages delivered"),
+            ("failed_total", "failed", "counter", "Outbound messages that exhausted retries"),
+            ("dropped_total", "dropped", "counter", "Progress updates dropped on a full queue"),
+            ("rejected_total", "rejected", "counter", "Messages rejected on a full chat queue"),
+        ):
+            metric = _metric(name, kind, help_text)
+            for channel, outbox in outboxes:
+                out.append(f'{metric}{{channel="{channel}"}} {getattr(outbox, attr)}')
+        limiters = [
+            (name, channel.rate_limiter)
+            for name, channel in sorted(self.channels.items())
+            if channel.rate_limiter is not None
+        ]
+        for name, attr, help_text in (
+            ("rate_limited_total", "delayed", "Outbound calls held back by the rate limiter"),
+            ("rate_limit_wait_seconds_total", "wait_s", "Time outbound calls were held back"),
+            ("throttled_total", "throttled", "Rate-limit answers from the platform"),
+        ):
+            metric = _metric(name, "counter", help_text)
+            for channel, limiter in limiters:
+                out.append(f'{metric}{{channel="{channel}"}} {getattr(limiter, attr):g}')
+        metric = _metric(
+            "delivery_latency_seconds", "histogram", "Time from queueing to delivery attempt done",
+        )
+        for channel, outbox in outboxes:
+            out.extend(render_histogram(metric, f'channel="{channel}"', outbox.latency))
+        return "\n".join(out) + "\n"
 
     @property
     def enabled_channels(self) -> list[str]:
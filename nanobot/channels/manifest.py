@@ -0,0 +1,227 @@
+"""Static metadata for the built-in channels.
+
+Listing channels, showing their status and writing default config only need
+names, display names and default settings, but the channel modules import
+their SDKs (lark_oapi, python-telegram-bot, slack_sdk, ...) at the top.  The
+registry answers those questions from this table and imports a channel module
+only when that channel is started or logged into.
+
+Keep entries in sync with the modules: ``tests/channels/test_channel_manifest.py``
+checks every importable channel against its entry.
+"""
+
+from __future__ import annotations
+
+import copy
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True)
+class ChannelInfo:
+    """What the CLI needs to know about a channel without importing it."""
+
+    name: str
+    display_name: str
+    module: str
+    class_name: str
+    defaults: dict[str, Any] = field(default_factory=lambda: {"enabled": False})
+
+    def default_config(self) -> dict[str, Any]:
+        """Fresh copy of the default config section, as ``BaseChannel.default_config``."""
+        return copy.deepcopy(self.defaults)
+
+
+def _builtin(name: str, display_name: str, class_name: str, defaults: dict[str, Any]) -> ChannelInfo:
+    return ChannelInfo(name, display_name, f"nanobot.channels.{name}", class_name, defaults)
+
+
+BUILTIN_CHANNELS: dict[str, ChannelInfo] = {info.name: info for info in (
+    _builtin("dingtalk", "DingTalk", "DingTalkChannel", {
+        "enabled": False,
+        "clientId": "",
+        "clientSecret": "",
+        "allowFrom": [],
+    }),
+    _builtin("discord", "Discord", "DiscordChannel", {
+        "enabled": False,
+        "token": "",
+        "allowFrom": [],
+        "intents": 37377,
+        "groupPolicy": "mention",
+        "readReceiptEmoji": "👀",
+        "workingEmoji": "🔧",
+        "workingEmojiDelay": 2.0,
+        "streaming": True,
+        "proxy": None,
+        "proxyUsername": None,
+        "proxyPassword": None,
+    }),
+    _builtin("email", "Email", "EmailChannel", {
+        "enabled": False,
+        "consentGranted": False,
+        "imapHost": "",
+        "imapPort": 993,
+        "imapUsername": "",
+        "imapPassword": "",
+        "imapMailbox": "INBOX",
+        "imapUseSsl": True,
+        "smtpHost": "",
+        "smtpPort": 587,
+        "smtpUsername": "",
+        "smtpPassword": "",
+        "smtpUseTls": True,
+        "smtpUseSsl": False,
+        "fromAddress": "",
+        "autoReplyEnabled": True,
+        "imapIdle": True,
+        "idleRefreshSeconds": 1500,
+        "pollIntervalSeconds": 30,
+        "markSeen": True,
+        "maxBodyChars": 12000,
+        "subjectPrefix": "Re: ",
+        "allowFrom": [],
+        "verifyDkim": True,
+        "verifySpf": True,
+        "allowedAttachmentTypes": [],
+        "maxAttachmentSize": 2000000,
+        "maxAttachmentsPerEmail": 5,
+        "smtpPoolSize": 2,
+    }),
+    _builtin("feishu", "Feishu", "FeishuChannel", {
+        "enabled": False,
+        "appId": "",
+        "appSecret": "",
+        "encryptKey": "",
+        "verificationToken": "",
+        "allowFrom": [],
+        "reactEmoji": "THUMBSUP",
+        "doneEmoji": None,
+        "toolHintPrefix": "🔧",
+        "groupPolicy": "mention",
+        "replyToMessage": False,
+        "streaming": True,
+        "domain": "feishu",
+    }),
+    _builtin("matrix", "Matrix", "MatrixChannel", {
+        "enabled": False,
+        "homeserver": "https://matrix.org",
+        "userId": "",
+        "password": "",
+        "accessToken": "",
+        "deviceId": "",
+        "e2eeEnabled": True,
+        "syncStopGraceSeconds": 2,
+        "maxMediaBytes": 20971520,
+        "allowFrom": [],
+        "groupPolicy": "open",
+        "groupAllowFrom": [],
+        "allowRoomMentions": False,
+        "streaming": False,
+    }),
+    _builtin("mochat", "Mochat", "MochatChannel", {
+        "enabled": False,
+        "baseUrl": "https://mochat.io",
+        "socketUrl": "",
+        "socketPath": "/socket.io",
+        "socketDisableMsgpack": False,
+        "socketReconnectDelayMs": 1000,
+        "socketMaxReconnectDelayMs": 10000,
+        "socketConnectTimeoutMs": 10000,
+        "refreshIntervalMs": 30000,
+        "watchTimeoutMs": 25000,
+        "watchLimit": 100,
+        "retryDelayMs": 500,
+        "maxRetryAttempts": 0,
+        "clawToken": "",
+        "agentUserId": "",
+        "sessions": [],
+        "panels": [],
+        "allowFrom": [],
+        "mention": {"requireInGroups": False},
+        "groups": {},
+        "replyDelayMode": "non-mention",
+        "replyDelayMs": 120000,
+    }),
+    _builtin("qq", "QQ", "QQChannel", {
+        "enabled": False,
+        "appId": "",
+        "secret": "",
+        "allowFrom": [],
+        "msgFormat": "plain",
+        "ackMessage": "⏳ Processing...",
+        "mediaDir": "",
+        "downloadChunkSize": 262144,
+        "downloadMaxBytes": 209715200,
+    }),
+    _builtin("slack", "Slack", "SlackChannel", {
+        "enabled": False,
+        "mode": "socket",
+        "webhookPath": "/slack/events",
+        "botToken": "",
+        "appToken": "",
+        "userTokenReadOnly": True,
+        "replyInThread": True,
+        "reactEmoji": "eyes",
+        "doneEmoji": "white_check_mark",
+        "allowFrom": [],
+        "groupPolicy": "mention",
+        "groupAllowFrom": [],
+        "dm": {"enabled": True, "policy": "open", "allowFrom": []},
+    }),
+    _builtin("telegram", "Telegram", "TelegramChannel", {
+        "enabled": False,
+        "token": "",
+        "allowFrom": [],
+        "proxy": None,
+        "replyToMessage": False,
+        "reactEmoji": "👀",
+        "groupPolicy": "mention",
+        "connectionPoolSize": 32,
+        "poolTimeout": 5.0,
+        "streaming": True,
+        "streamEditInterval": 0.6,
+    }),
+    _builtin("websocket", "WebSocket", "WebSocketChannel", {
+        "enabled": False,
+        "host": "127.0.0.1",
+        "port": 8765,
+        "path": "/",
+        "token": "",
+        "tokenIssuePath": "",
+        "tokenIssueSecret": "",
+        "tokenTtlS": 300,
+        "websocketRequiresToken": True,
+        "allowFrom": ["*"],
+        "streaming": True,
+        "maxMessageBytes": 1048576,
+        "pingIntervalS": 20.0,
+        "pingTimeoutS": 20.0,
+        "sslCertfile": "",
+        "sslKeyfile": "",
+    }),
+    _builtin("wecom", "WeCom", "WecomChannel", {
+        "enabled": False,
+        "botId": "",
+        "secret": "",
+        "allowFrom": [],
+        "welcomeMessage": "",
+    }),
+    _builtin("weixin", "WeChat", "WeixinChannel", {
+        "enabled": False,
+        "allowFrom": [],
+        "baseUrl": "https://ilinkai.weixin.qq.com",
+        "cdnBaseUrl": "https://novac2c.cdn.weixin.qq.com/c2c",
+        "routeTag": None,
+        "token": "",
+        "stateDir": "",
+        "pollTimeout": 35,
+    }),
+    _builtin("whatsapp", "WhatsApp", "WhatsAppChannel", {
+        "enabled": False,
+        "bridgeUrl": "ws://localhost:3001",
+        "bridgeToken": "",
+        "allowFrom": [],
+        "groupPolicy": "open",
+    }),
+)}
@@ -43,9 +43,11 @@ except ImportError as e:
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
+from nanobot.channels.media import MediaError, MediaTooLargeError
 from nanobot.config.paths import get_data_dir, get_media_dir
 from nanobot.config.schema import Base
 from nanobot.utils.helpers import safe_filename
+from nanobot.utils.stream_render import IncrementalRenderer
 
 TYPING_NOTICE_TIMEOUT_MS = 30_000
 # Must stay below TYPING_NOTICE_TIMEOUT_MS so the indicator doesn't expire mid-processing.
@@ -112,15 +114,27 @@ class _StreamBuf:
     :type event_id: str | None
     :ivar last_edit: Timestamp of the most recent edit to the buffer.
     :type last_edit: float
+    :ivar renderer: Caches the HTML of finished blocks between edits.
+    :type renderer: IncrementalRenderer | None
     """
     text: str = ""
     event_id: str | None = None
     last_edit: float = 0.0
+    renderer: IncrementalRenderer | None = None
 
-def _render_markdown_html(text: str) -> str | None:
-    """Render markdown to sanitized HTML; returns None for plain text."""
+
+def _markdown_to_matrix_html(text: str) -> str:
+    return MATRIX_HTML_CLEANER.clean(MATRIX_MARKDOWN(text))
+
+
+def _render_markdown_html(text: str, renderer: IncrementalRenderer | None = None) -> str | None:
+    """Render markdown to sanitized HTML; returns None for plain text.
+
+    A streamed message passes its *renderer* so each edit only renders the
+    blocks that changed.
+    """
     try:
-        formatted = MATRIX_HTML_CLEANER.clean(MATRIX_MARKDOWN(text)).strip()
+        formatted = (renderer.render(text) if renderer else _markdown_to_matrix_html(text)).strip()
     except Exception:
         return None
     if not formatted:
@@ -137,6 +151,7 @@ def _build_matrix_text_content(
     text: str,
     event_id: str | None = None,
     thread_relates_to: dict[str, object] | None = None,
+    renderer: IncrementalRenderer | None = None,
 ) -> dict[str, object]:
     """
     Constructs and returns a dictionary representing the matrix text content with optional
@@ -152,12 +167,14 @@ def _build_matrix_text_content(
     :param thread_relates_to: Optional Matrix thread relation metadata. For edits this is
         stored in ``m.new_content`` so the replacement remains in the same thread.
     :type thread_relates_to: dict[str, object] | None
+    :param renderer: Optional incremental renderer of a streamed message.
+    :type renderer: IncrementalRenderer | None
     :return: A dictionary containing the matrix text content, potentially enriched with 
         HTML formatting and replacement metadata if applicable.
     :rtype: dict[str, object]
     """
     content: dict[str, object] = {"msgtype": "m.text", "body": text, "m.mentions": {}}
-    if html := _render_markdown_html(text):
+    if html := _render_markdown_html(text, renderer):
         content["format"] = MATRIX_HTML_FORMAT
         content["formatted_body"] = html
     if event_id:
@@ -214,7 +231,7 @@ class MatrixConfig(Base):
     allow_from: list[str] = Field(default_factory=list)
     group_policy: Literal["open", "mention", "allowlist"] = "open"
     group_allow_from: list[str] = Field(default_factory=list)
-    allow_room_mentions: bool = False,
+    allow_room_mentions: bool = False
     streaming: bool = False
 
 
@@ -539,13 +556,14 @@ class MatrixChannel(BaseChannel):
                 buf.text,
                 buf.event_id,
                 thread_relates_to=relates_to,
+                renderer=buf.renderer,
             )
             await self._send_room_content(chat_id, content)
             return
 
         buf = self._stream_bufs.get(chat_id)
         if buf is None:
-            buf = _StreamBuf()
+            buf = _StreamBuf(renderer=IncrementalRenderer(_markdown_to_matrix_html))
             self._stream_bufs[chat_id] = buf
         buf.text += delta
     
@@ -560,6 +578,7 @@ class MatrixChannel(BaseChannel):
                     buf.text,
                     buf.event_id,
                     thread_relates_to=relates_to,
+                    renderer=buf.renderer,
                 )
                 response = await self._send_room_content(chat_id, content)
                 buf.last_edit = now
@@ -813,29 +832,33 @@ class MatrixChannel(BaseChannel):
         if declared is not None and declared > limit_bytes:
             return None, _ATTACH_TOO_LARGE.format(filename)
 
-        downloaded = await self._download_media_bytes(mxc_url)
-        if downloaded is None:
-            return None, fail
-
         encrypted = self._is_encrypted_media_event(event)
-        data = downloaded
-        if encrypted:
-            if (data := self._decrypt_media_bytes(event, downloaded)) is None:
-                return None, fail
 
-        if len(data) > limit_bytes:
-            return None, _ATTACH_TOO_LARGE.format(filename)
+        async def _download(_path: Path) -> bytes:
+            downloaded = await self._download_media_bytes(mxc_url)
+            if downloaded is None:
+                raise MediaError(f"download failed: {mxc_url}")
+            if not encrypted:
+                return downloaded
+            if (data := self._decrypt_media_bytes(event, downloaded)) is None:
+                raise MediaError(f"decrypt failed: {mxc_url}")
+            return data
 
         path = self._build_attachment_path(event, atype, filename, mime)
         try:
-            path.write_bytes(data)
-        except OSError:
+            path = await self.media.fetch(
+                path.parent, mxc_url, path.name, _download, max_bytes=limit_bytes,
+            )
+            size_bytes = path.stat().st_size
+        except MediaTooLargeError:
+            return None, _ATTACH_TOO_LARGE.format(filename)
+        except (MediaError, OSError):
             return None, fail
 
         attachment = {
             "type": atype, "mime": mime, "filename": filename,
             "event_id": str(getattr(event, "event_id", "") or ""),
-            "encrypted": encrypted, "size_bytes": len(data),
+            "encrypted": encrypted, "size_bytes": size_bytes,
             "path": str(path), "mxc_url": mxc_url,
         }
         return attachment, _ATTACH_MARKER.format(path)
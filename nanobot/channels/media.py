@@ -0,0 +1,346 @@
+"""Shared download service for inbound attachments.
+
+Channels fetch attachments through :class:`MediaService` (``self.media`` on
+every channel) rather than buffering them by hand.  A download streams into
+a temporary file next to its destination while its size is counted and its
+content hashed.  It stops as soon as it passes the size limit, and it never
+starts when the declared size (``Content-Length`` or the platform's
+metadata) is already too large.  Content that is already in the media
+directory is not stored twice.  A platform file id seen again (a forwarded
+attachment, a reply to a media message) returns the earlier file without
+downloading it.  An optional retention policy removes old files.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from nanobot.utils.inflight import InflightTasks
+
+if TYPE_CHECKING:
+    import httpx
+
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+_CHUNK_SIZE = 256 * 1024
+_INDEX_NAME = ".media-index.json"
+_GC_INTERVAL_S = 3600.0
+_STALE_PART_S = 3600.0  # partial downloads older than this were abandoned
+_MAX_CACHED_IDS = 4096
+
+# What a download saves: the content, its chunks, or a callable run only on
+# a cache miss with the destination path.  The callable saves the file there
+# itself, or returns the content (bytes or chunks) to be saved.
+MediaSource = bytes | AsyncIterable[bytes] | Callable[[Path], Awaitable[Any]]
+
+
+class MediaError(Exception):
+    """An attachment could not be downloaded."""
+
+
+class MediaTooLargeError(MediaError):
+    """An attachment is larger than the size limit."""
+
+
+async def _single(data: bytes) -> AsyncIterator[bytes]:
+    yield data
+
+
+class MediaStore:
+    """The files of one media directory, indexed by content hash."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._digests: dict[str, str] | None = None  # sha256 -> file name, loaded lazily
+        self._last_gc: float | None = None
+        self.deduplicated = 0
+
+    async def save(self, chunks: AsyncIterable[bytes], filename: str, limit: int) -> Path:
+        """Stream *chunks* to *filename*; return it, or a file that has the same content."""
+        target = self.directory / filename
+        tmp = target.with_name(f".{target.name}.{secrets.token_hex(4)}.part")
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            f = await asyncio.to_thread(self._open, tmp)
+            try:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > limit:
+                        raise MediaTooLargeError(f"{filename} exceeds {limit} bytes")
+                    digest.update(chunk)
+                    await asyncio.to_thread(f.write, chunk)
+            finally:
+                await asyncio.to_thread(f.close)
+                if aclose := getattr(chunks, "aclose", None):
+                    await aclose()
+            return await self._commit(tmp, target, digest.hexdigest(), size)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    async def adopt(self, path: Path, limit: int) -> Path:
+        """Check and index a file that a platform SDK saved at *path* itself."""
+        result = await asyncio.to_thread(self._hash_file, path, limit)
+        if result is None:
+            return path  # the SDK reported success but left nothing to check
+        return await self._commit(path, path, *result)
+
+    async def collect_garbage(self, retention_s: float, quota_bytes: int) -> int:
+        """Apply the retention policy, at most once an hour; return files removed."""
+        if not (retention_s or quota_bytes):
+            return 0
+        now = time.monotonic()
+        if self._last_gc is not None and now - self._last_gc < _GC_INTERVAL_S:
+            return 0
+        self._last_gc = now
+        removed = await asyncio.to_thread(self._collect, retention_s, quota_bytes)
+        if removed:
+            logger.info("Removed {} old media file(s) from {}", len(removed), self.directory)
+            if self._digests:
+                for digest in [d for d, name in self._digests.items() if name in removed]:
+                    del self._digests[digest]
+                await asyncio.to_thread(self._save_index, dict(self._digests))
+        return len(removed)
+
+    async def _commit(self, src: Path, target: Path, digest: str, size: int) -> Path:
+        if self._digests is None:
+            self._digests = await asyncio.to_thread(self._load_index)
+        digests = self._digests
+        name = digests.get(digest)
+        if name is not None and name != target.name:
+            existing = self.directory / name
+            if await asyncio.to_thread(_has_size, existing, size):
+                await asyncio.to_thread(src.unlink, True)
+                self.deduplicated += 1
+                return existing
+        if src != target:
+            await asyncio.to_thread(os.replace, src, target)
+        for stale in [d for d, n in digests.items() if n == target.name]:
+            del digests[stale]
+        digests[digest] = target.name
+        await asyncio.to_thread(self._save_index, dict(digests))
+        return target
+
+    def _open(self, path: Path):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return open(path, "wb")  # noqa: SIM115
+
+    @staticmethod
+    def _hash_file(path: Path, limit: int) -> tuple[str, int] | None:
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return None
+        if size > limit:
+            path.unlink(missing_ok=True)
+            raise MediaTooLargeError(f"{path.name} exceeds {limit} bytes")
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(_CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest(), size
+
+    def _load_index(self) -> dict[str, str]:
+        try:
+            data = json.loads((self.directory / _INDEX_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {k: v for k, v in data.items() if isinstance(k, str) and isinstance(v, str)}
+
+    def _save_index(self, digests: dict[str, str]) -> None:
+        path = self.directory / _INDEX_NAME
+        tmp = path.with_name(f"{_INDEX_NAME}.{secrets.token_hex(4)}.tmp")
+        try:
+            tmp.write_text(json.dumps(digests), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as e:
+            tmp.unlink(missing_ok=True)
+            logger.warning("Could not save media index in {}: {}", self.directory, e)
+
+    def _collect(self, retention_s: float, quota_bytes: int) -> set[str]:
+        now = time.time()
+        removed: set[str] = set()
+        kept: list[tuple[float, int, Path]] = []
+        try:
+            entries = list(self.directory.iterdir())
+        except OSError:
+            return removed
+        for path in entries:
+            try:
+                if path.name == _INDEX_NAME or not path.is_file():
+                    continue
+                st = path.stat()
+                age = now - st.st_mtime
+                if (path.name.endswith(".part") and age > _STALE_PART_S) or (
+                    retention_s and age > retention_s
+                ):
+                    path.unlink()
+                    removed.add(path.name)
+                elif not path.name.endswith(".part"):
+                    kept.append((st.st_mtime, st.st_size, path))
+            except OSError:
+                continue
+        if quota_bytes:
+            total = sum(size for _, size, _ in kept)
+            for _, size, path in sorted(kept, key=lambda entry: entry[0]):
+                if total <= quota_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                removed.add(path.name)
+                total -= size
+        return removed
+
+
+def _has_size(path: Path, size: int) -> bool:
+    try:
+        return path.stat().st_size == size
+    except OSError:
+        return False
+
+
+_stores: dict[Path, MediaStore] = {}
+
+
+def media_store(directory: Path) -> MediaStore:
+    """The store for *directory*, shared by every channel that saves there."""
+    store = _stores.get(directory)
+    if store is None:
+        store = _stores[directory] = MediaStore(directory)
+    return store
+
+
+class MediaService:
+    """Attachment downloads for one channel: limits, concurrency and a file-id cache.
+
+    The manager sets the limits from the ``channels`` config.  Each call
+    passes the directory to save into, usually ``get_media_dir(channel)``.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        retention_s: float = 0.0,
+        quota_bytes: int = 0,
+        concurrency: int = 4,
+    ):
+        self.max_bytes = max_bytes
+        self.retention_s = retention_s  # 0 keeps files forever
+        self.quota_bytes = quota_bytes  # 0 means no cap on a media directory
+        self._slots = asyncio.Semaphore(concurrency)
+        self._paths: OrderedDict[str, Path] = OrderedDict()  # platform file id -> file
+        # Downloads shared by concurrent fetches of one file id; a cancelled
+        # fetch only stops waiting, the last one cancels the download.
+        self._inflight: InflightTasks[str, Path] = InflightTasks()
+        self.downloads = 0
+        self.reused = 0  # fetches answered from the cache or a concurrent download
+
+    def cached(self, key: str) -> Path | None:
+        """The file already fetched for platform file id *key*, if it still exists."""
+        path = self._paths.get(key)
+        if path is None:
+            return None
+        if not path.is_file():
+            del self._paths[key]
+            return None
+        self._paths.move_to_end(key)
+        self.reused += 1
+        return path
+
+    async def fetch(
+        self,
+        directory: Path,
+        key: str | None,
+        filename: str,
+        source: MediaSource,
+        *,
+        size: int | None = None,
+        max_bytes: int | None = None,
+    ) -> Path:
+        """Save *source* as *filename* in *directory*, unless *key* was fetched before.
+
+        *size* is the size the platform declared, checked before anything is
+        downloaded; *max_bytes* tightens the service's limit for this call.
+        Raises :class:`MediaTooLargeError` when either is exceeded.
+        """
+        if key is not None and (path := self.cached(key)) is not None:
+            return path
+        limit = self.max_bytes if max_bytes is None else min(self.max_bytes, max_bytes)
+        if key is not None and key in self._inflight:
+            self.reused += 1  # joins the running download below
+        elif size is not None and size > limit:
+            raise MediaTooLargeError(f"{filename}: {size} bytes exceeds the {limit}-byte limit")
+        if key is None:
+            return await self._fetch(Path(directory), filename, source, limit)
+
+        async def _fetch_and_remember() -> Path:
+            path = await self._fetch(Path(directory), filename, source, limit)
+            self._remember(key, path)
+            return path
+
+        return await self._inflight.run(key, _fetch_and_remember)
+
+    async def download(
+        self,
+        directory: Path,
+        client: httpx.AsyncClient,
+        url: str,
+        filename: str,
+        *,
+        key: str | None = None,
+        max_bytes: int | None = None,
+        **request_kwargs: Any,
+    ) -> Path:
+        """Stream *url* with *client* into *directory*; ``Content-Length`` is checked first."""
+        limit = self.max_bytes if max_bytes is None else min(self.max_bytes, max_bytes)
+
+        async def _chunks() -> AsyncIterator[bytes]:
+            async with client.stream("GET", url, **request_kwargs) as resp:
+                if resp.status_code != 200:
+                    raise MediaError(f"HTTP {resp.status_code} downloading {filename}")
+                declared = resp.headers.get("content-length")
+                if declared and declared.isdigit() and int(declared) > limit:
+                    raise MediaTooLargeError(
+                        f"{filename}: {declared} bytes exceeds the {limit}-byte limit"
+                    )
+                async for chunk in resp.aiter_bytes(_CHUNK_SIZE):
+                    yield chunk
+
+        async def _open(_path: Path) -> AsyncIterator[bytes]:
+            return _chunks()
+
+        return await self.fetch(directory, key or url, filename, _open, max_bytes=max_bytes)
+
+    async def _fetch(self, directory: Path, filename: str, source: MediaSource, limit: int) -> Path:
+        store = media_store(directory)
+        async with self._slots:
+            content = await source(directory / filename) if callable(source) else source
+            if isinstance(content, bytes | bytearray):
+                if len(content) > limit:
+                    raise MediaTooLargeError(f"{filename} exceeds {limit} bytes")
+                path = await store.save(_single(bytes(content)), filename, limit)
+            elif isinstance(content, AsyncIterable):
+                path = await store.save(content, filename, limit)
+            else:  # the source saved the file itself
+                path = await store.adopt(directory / filename, limit)
+        self.downloads += 1
+        await store.collect_garbage(self.retention_s, self.quota_bytes)
+        return path
+
+    def _remember(self, key: str, path: Path) -> None:
+        self._paths[key] = path
+        self._paths.move_to_end(key)
+        while len(self._paths) > _MAX_CACHED_IDS:
+            self._paths.popitem(last=False)
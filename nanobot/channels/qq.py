@@ -36,6 +36,7 @@ from pydantic import Field
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
+from nanobot.channels.media import MediaTooLargeError
 from nanobot.config.schema import Base
 from nanobot.security.network import validate_url_target
 
@@ -552,13 +553,20 @@ class QQChannel(BaseChannel):
             return media_paths, recv_lines, att_meta
 
         for att in attachments:
+            logger.info("Downloading file from QQ: {}",
+                        getattr(att, "filename", None) or getattr(att, "url", None))
+        local_paths = await asyncio.gather(*(
+            self._download_to_media_dir_chunked(
+                getattr(att, "url", None) or "", filename_hint=getattr(att, "filename", None) or "",
+            )
+            for att in attachments
+        ))
+
+        for att, local_path in zip(attachments, local_paths):
             url = getattr(att, "url", None) or ""
             filename = getattr(att, "filename", None) or ""
             ctype = getattr(att, "content_type", None) or ""
 
-            logger.info("Downloading file from QQ: {}", filename or url)
-            local_path = await self._download_to_media_dir_chunked(url, filename_hint=filename)
-
             att_meta.append(
                 {
                     "url": url,
@@ -583,22 +591,18 @@ class QQChannel(BaseChannel):
         url: str,
         filename_hint: str = "",
     ) -> str | None:
-        """Download an inbound attachment using streaming chunk write.
-
-        Uses chunked streaming to avoid loading large files into memory.
-        Enforces a max download size and writes to a .part temp file
-        that is atomically renamed on success.
-        """
+        """Stream an inbound attachment to the media directory via ``self.media``."""
         # Handle protocol-relative URLs (e.g. "//multimedia.nt.qq.com/...")
         if url.startswith("//"):
             url = f"https:{url}"
+        if (cached := self.media.cached(url)) is not None:
+            return str(cached)
 
         if not self._http:
             self._http = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=120))
 
         safe = _sanitize_filename(filename_hint)
         ts = int(time.time() * 1000)
-        tmp_path: Path | None = None
 
         try:
             async with self._http.get(
@@ -637,53 +641,28 @@ class QQChannel(BaseChannel):
                 else:
                     filename = f"qq_file_{ts}{ext}"
 
-                target = self._media_root / filename
-                if target.exists():
-                    target = self._media_root / f"{target.stem}_{ts}{target.suffix}"
-
-                tmp_path = target.with_suffix(target.suffix + ".part")
+                if (self._media_root / filename).exists():
+                    target = Path(filename)
+                    filename = f"{target.stem}_{ts}{target.suffix}"
 
-                # Stream write
-                downloaded = 0
                 chunk_size = max(1024, int(self.config.download_chunk_size or 262144))
                 max_bytes = max(
                     1024 * 1024, int(self.config.download_max_bytes or (200 * 1024 * 1024))
                 )
+                saved = await self.media.fetch(
+                    self._media_root,
+                    url,
+                    filename,
+                    resp.content.iter_chunked(chunk_size),
+                    size=resp.content_length,
+                    max_bytes=max_bytes,
+                )
+                logger.info("QQ file saved: {}", str(saved))
+                return str(saved)
 
-                def _open_tmp():
-                    tmp_path.parent.mkdir(parents=True, exist_ok=True)
-                    return open(tmp_path, "wb")  # noqa: SIM115
-
-                f = await asyncio.to_thread(_open_tmp)
-                try:
-                    async for chunk in resp.content.iter_chunked(chunk_size):
-                        if not chunk:
-                            continue
-                        downloaded += len(chunk)
-                        if downloaded > max_bytes:
-                            logger.warning(
-                                "QQ download exceeded max_bytes={} url={} -> abort",
-                                max_bytes,
-                                url,
-                            )
-                            return None
-                        await asyncio.to_thread(f.write, chunk)
-                finally:
-                    await asyncio.to_thread(f.close)
-
-                # Atomic rename
-                await asyncio.to_thread(os.replace, tmp_path, target)
-                tmp_path = None  # mark as moved
-                logger.info("QQ file saved: {}", str(target))
-                return str(target)
-
+        except MediaTooLargeError:
+            logger.warning("QQ download exceeded max_bytes url={} -> abort", url)
+            return None
         except Exception as e:
             logger.error("QQ download error: {}", e)
             return None
-        finally:
-            # Cleanup partial file
-            if tmp_path is not None:
-                try:
-                    tmp_path.unlink(missing_ok=True)
-                except Exception:
-                    pass
@@ -0,0 +1,156 @@
+"""Outbound rate limiting against platform API quotas.
+
+Platforms cap how fast a bot may call them.  Telegram allows about 30
+messages a second overall and one a second per chat, Discord about five per
+channel every five seconds, Slack about one per second per channel, and
+Feishu a few per second per chat.  A channel class declares its quotas as
+:class:`RateLimits`.  An :class:`OutboundLimiter` then keeps a token bucket
+for the whole channel, one per chat and one per API method, and says how
+long the next call has to wait, so sends are spaced out instead of failing
+with 429 and being retried.  A Retry-After answer from the platform pauses
+the chat it came from.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from nanobot.utils.token_bucket import TokenBucket
+
+# Per-chat buckets that are full again carry no state and are dropped.
+_MAX_IDLE_CHATS = 1024
+
+
+@dataclass(frozen=True)
+class RateLimits:
+    """Calls per second a channel may make; ``None`` means unlimited."""
+
+    per_second: float | None = None  # whole channel
+    chat_per_second: float | None = None  # each chat
+    chat_burst: int = 1  # calls a quiet chat may make at once
+    methods: Mapping[str, float] = field(default_factory=dict)  # e.g. {"edit": 20}
+
+    def merged(self, overrides: Any) -> RateLimits | None:
+        """These limits with a channel section's ``rateLimit`` applied.
+
+        ``false`` turns limiting off, a dict overrides single fields
+        (``perSecond``, ``chatPerSecond``, ``chatBurst``, ``methods``).
+        """
+        if overrides is False:
+            return None
+        if not isinstance(overrides, Mapping):
+            return self
+        changes: dict[str, Any] = {}
+        for key, name in (
+            ("perSecond", "per_second"),
+            ("chatPerSecond", "chat_per_second"),
+            ("chatBurst", "chat_burst"),
+            ("methods", "methods"),
+        ):
+            for spelling in (key, name):
+                if spelling in overrides:
+                    changes[name] = overrides[spelling]
+        return replace(self, **changes)
+
+
+class OutboundLimiter:
+    """Token buckets for one channel: overall, per chat and per API method.
+
+    :meth:`try_acquire` uses budget if there is some and otherwise says how
+    long to wait, so a scheduler can serve another chat meanwhile;
+    :meth:`acquire` waits until it can.  :meth:`pause` records a platform
+    Retry-After.
+    """
+
+    def __init__(self, limits: RateLimits, clock: Callable[[], float] = time.monotonic):
+        self.limits = limits
+        self._clock = clock
+        now = clock()
+        self._global = (
+            TokenBucket(limits.per_second, limits.per_second, now) if limits.per_second else None
+        )
+        self._methods = {
+            method: TokenBucket(rate, rate, now) for method, rate in limits.methods.items() if rate
+        }
+        self._chats: dict[str, TokenBucket] = {}
+        self._paused_until = 0.0
+        self._chat_paused: dict[str, float] = {}
+        self.admitted = 0
+        self.delayed = 0  # times a call was held back
+        self.wait_s = 0.0
+        self.throttled = 0  # Retry-After answers from the platform
+
+    def _chat_bucket(self, chat_id: str, now: float) -> TokenBucket | None:
+        rate = self.limits.chat_per_second
+        if not rate:
+            return None
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) >= _MAX_IDLE_CHATS:
+                self._forget_idle_chats(now)
+            bucket = self._chats[chat_id] = TokenBucket(rate, self.limits.chat_burst, now)
+        return bucket
+
+    def _forget_idle_chats(self, now: float) -> None:
+        for chat_id, bucket in list(self._chats.items()):
+            if bucket.wait_time(now) == 0 and bucket.level >= bucket.capacity:
+                del self._chats[chat_id]
+
+    def delay(self, chat_id: str, method: str = "send") -> float:
+        """Seconds until *chat_id* may make a *method* call; 0 if it may now."""
+        now = self._clock()
+        wait = max(self._paused_until, self._chat_paused.get(chat_id, 0.0)) - now
+        for bucket in (self._global, self._chat_bucket(chat_id, now), self._methods.get(method)):
+            if bucket is not None:
+                wait = max(wait, bucket.wait_time(now))
+        return max(wait, 0.0)
+
+    def take(self, chat_id: str, method: str = "send") -> None:
+        """Use one call of budget (after :meth:`delay` returned 0)."""
+        now = self._clock()
+        for bucket in (self._global, self._chat_bucket(chat_id, now), self._methods.get(method)):
+            if bucket is not None:
+                bucket.take()
+        self.admitted += 1
+
+    def try_acquire(self, chat_id: str, method: str = "send") -> float:
+        """Use a *method* call of *chat_id*'s budget and return 0, or return the wait."""
+        wait = self.delay(chat_id, method)
+        if wait > 0:
+            self.delayed += 1
+            self.wait_s += wait
+        else:
+            self.take(chat_id, method)
+        return wait
+
+    async def acquire(self, chat_id: str, method: str = "send") -> float:
+        """Wait until *chat_id* may make a *method* call, use it, return seconds waited."""
+        waited = 0.0
+        while (wait := self.try_acquire(chat_id, method)) > 0:
+            await asyncio.sleep(wait)
+            waited += wait
+        return waited
+
+    def pause(self, seconds: float, chat_id: str | None = None) -> None:
+        """Hold calls for *chat_id* (or the whole channel) for *seconds*."""
+        self.throttled += 1
+        until = self._clock() + seconds
+        if chat_id is None:
+            self._paused_until = max(self._paused_until, until)
+        else:
+            self._chat_paused[chat_id] = max(self._chat_paused.get(chat_id, 0.0), until)
+            if len(self._chat_paused) > _MAX_IDLE_CHATS:
+                now = self._clock()
+                self._chat_paused = {c: t for c, t in self._chat_paused.items() if t > now}
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "admitted": self.admitted,
+            "delayed": self.delayed,
+            "wait_s": round(self.wait_s, 3),
+            "throttled": self.throttled,
+        }
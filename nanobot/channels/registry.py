@@ -1,35 +1,38 @@
-"""Auto-discovery for built-in channel modules and external plugins."""
+"""Discovery for built-in channel modules and external plugins.
+
+Built-in channels are described by :mod:`nanobot.channels.manifest`, so their
+names, display names and default config are known without importing them.  A
+channel module (and the SDK it wraps) is imported only when its class is asked
+for, e.g. because the channel is enabled.
+"""
 
 from __future__ import annotations
 
 import importlib
-import pkgutil
+from collections.abc import Collection
 from typing import TYPE_CHECKING
 
 from loguru import logger
 
+from nanobot.channels.manifest import BUILTIN_CHANNELS, ChannelInfo
+
 if TYPE_CHECKING:
     from nanobot.channels.base import BaseChannel
 
-_INTERNAL = frozenset({"base", "manager", "registry"})
-
 
 def discover_channel_names() -> list[str]:
-    """Return all built-in channel module names by scanning the package (zero imports)."""
-    import nanobot.channels as pkg
-
-    return [
-        name
-        for _, name, ispkg in pkgutil.iter_modules(pkg.__path__)
-        if name not in _INTERNAL and not ispkg
-    ]
+    """Return all built-in channel names from the manifest (zero imports)."""
+    return list(BUILTIN_CHANNELS)
 
 
 def load_channel_class(module_name: str) -> type[BaseChannel]:
-    """Import *module_name* and return the first BaseChannel subclass found."""
+    """Import *module_name* and return its channel class."""
     from nanobot.channels.base import BaseChannel as _Base
 
-    mod = importlib.import_module(f"nanobot.channels.{module_name}")
+    info = BUILTIN_CHANNELS.get(module_name)
+    mod = importlib.import_module(info.module if info else f"nanobot.channels.{module_name}")
+    if info is not None:
+        return getattr(mod, info.class_name)
     for attr in dir(mod):
         obj = getattr(mod, attr)
         if isinstance(obj, type) and issubclass(obj, _Base) and obj is not _Base:
@@ -37,12 +40,17 @@ def load_channel_class(module_name: str) -> type[BaseChannel]:
     raise ImportError(f"No BaseChannel subclass in nanobot.channels.{module_name}")
 
 
-def discover_plugins() -> dict[str, type[BaseChannel]]:
-    """Discover external channel plugins registered via entry_points."""
+def discover_plugins(names: Collection[str] | None = None) -> dict[str, type[BaseChannel]]:
+    """Discover external channel plugins registered via entry_points.
+
+    With *names*, only those entry points are loaded.
+    """
     from importlib.metadata import entry_points
 
     plugins: dict[str, type[BaseChannel]] = {}
     for ep in entry_points(group="nanobot.channels"):
+        if names is not None and ep.name not in names:
+            continue
         try:
             cls = ep.load()
             plugins[ep.name] = cls
@@ -51,21 +59,47 @@ def discover_plugins() -> dict[str, type[BaseChannel]]:
     return plugins
 
 
-def discover_all() -> dict[str, type[BaseChannel]]:
-    """Return all channels: built-in (pkgutil) merged with external (entry_points).
+def discover_all(names: Collection[str] | None = None) -> dict[str, type[BaseChannel]]:
+    """Return channel classes: built-in (manifest) merged with external (entry_points).
 
-    Built-in channels take priority — an external plugin cannot shadow a built-in name.
+    Without *names* every channel module is imported; pass the channels you
+    actually need to import only those.  Built-in channels take priority — an
+    external plugin cannot shadow a built-in name.
     """
     builtin: dict[str, type[BaseChannel]] = {}
     for modname in discover_channel_names():
+        if names is not None and modname not in names:
+            continue
         try:
             builtin[modname] = load_channel_class(modname)
         except ImportError as e:
-            logger.debug("Skipping built-in channel '{}': {}", modname, e)
+            # A channel that was asked for by name is enabled; say why it is missing.
+            log = logger.debug if names is None else logger.warning
+            log("Skipping built-in channel '{}': {}", modname, e)
 
-    external = discover_plugins()
+    external = discover_plugins(names)
     shadowed = set(external) & set(builtin)
     if shadowed:
         logger.warning("Plugin(s) shadowed by built-in channels (ignored): {}", shadowed)
 
     return {**external, **builtin}
+
+
+def channel_catalog() -> dict[str, ChannelInfo]:
+    """Metadata for every channel without importing built-in channel modules.
+
+    External plugins are loaded, since their class is the only source of
+    their metadata.
+    """
+    catalog = {
+        name: ChannelInfo(
+            name=name,
+            display_name=cls.display_name,
+            module=cls.__module__,
+            class_name=cls.__name__,
+            defaults=cls.default_config(),
+        )
+        for name, cls in discover_plugins().items()
+    }
+    catalog.update(BUILTIN_CHANNELS)
+    return catalog
@@ -15,6 +15,7 @@ from slackify_markdown import slackify_markdown
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
+from nanobot.channels.ratelimit import RateLimits
 from nanobot.config.schema import Base
 
 
@@ -49,6 +50,8 @@ class SlackChannel(BaseChannel):
 
     name = "slack"
     display_name = "Slack"
+    # chat.postMessage: about one message a second per channel, short bursts allowed.
+    rate_limits = RateLimits(chat_per_second=1, chat_burst=3)
     _SLACK_ID_RE = re.compile(r"^[CDGUW][A-Z0-9]{2,}$")
     _SLACK_CHANNEL_REF_RE = re.compile(r"^<#([A-Z0-9]+)(?:\|[^>]+)?>$")
     _SLACK_USER_REF_RE = re.compile(r"^<@([A-Z0-9]+)(?:\|[^>]+)?>$")
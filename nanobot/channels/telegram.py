@@ -4,26 +4,27 @@ from __future__ import annotations
 
 import asyncio
 import re
-import time
 import unicodedata
-from dataclasses import dataclass
+from pathlib import Path
 from typing import Any, Literal
 
 from loguru import logger
 from pydantic import Field
 from telegram import BotCommand, ReactionTypeEmoji, ReplyParameters, Update
-from telegram.error import BadRequest, NetworkError, TimedOut
+from telegram.error import BadRequest, NetworkError, RetryAfter, TimedOut
 from telegram.ext import Application, ContextTypes, MessageHandler, filters
 from telegram.request import HTTPXRequest
 
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.channels.base import BaseChannel
+from nanobot.channels.base import BaseChannel, StreamBuffer
+from nanobot.channels.ratelimit import RateLimits
 from nanobot.command.builtin import build_help_text
 from nanobot.config.paths import get_media_dir
 from nanobot.config.schema import Base
 from nanobot.security.network import validate_url_target
 from nanobot.utils.helpers import split_message
+from nanobot.utils.stream_render import IncrementalRenderer
 
 TELEGRAM_MAX_MESSAGE_LEN = 4000  # Telegram message character limit
 TELEGRAM_REPLY_CONTEXT_MAX_LEN = TELEGRAM_MAX_MESSAGE_LEN  # Max length for reply context in user message
@@ -164,18 +165,24 @@ def _markdown_to_telegram_html(text: str) -> str:
     return text
 
 
+# Closes whatever a block may leave open for _markdown_to_telegram_html:
+# an inline code span, an italic run or a link's text or URL.
+_HTML_RENDER_PROBE = "\x01`\x01_\x01](\x01)\x01"
+
+
+def _stream_html(buf: StreamBuffer, text: str) -> str:
+    """Telegram HTML for *text*, re-rendering only what changed since the last edit."""
+    if buf.renderer is None:
+        buf.renderer = IncrementalRenderer(_markdown_to_telegram_html, _HTML_RENDER_PROBE)
+    return buf.renderer.render(text)
+
+
 _SEND_MAX_RETRIES = 3
 _SEND_RETRY_BASE_DELAY = 0.5  # seconds, doubled each retry
 _STREAM_EDIT_INTERVAL_DEFAULT = 0.6  # min seconds between edit_message_text calls
 
 
-@dataclass
-class _StreamBuf:
-    """Per-chat streaming accumulator for progressive message editing."""
-    text: str = ""
-    message_id: int | None = None
-    last_edit: float = 0.0
-    stream_id: str | None = None
+_StreamBuf = StreamBuffer  # per-chat streaming state, kept under its old name
 
 
 class TelegramConfig(Base):
@@ -203,6 +210,8 @@ class TelegramChannel(BaseChannel):
 
     name = "telegram"
     display_name = "Telegram"
+    # About 30 messages a second overall and one a second in each chat.
+    rate_limits = RateLimits(per_second=30, chat_per_second=1, chat_burst=3)
 
     # Commands registered with Telegram's command menu
     BOT_COMMANDS = [
@@ -234,7 +243,6 @@ class TelegramChannel(BaseChannel):
         self._message_threads: dict[tuple[str, int], int] = {}
         self._bot_user_id: int | None = None
         self._bot_username: str | None = None
-        self._stream_bufs: dict[str, _StreamBuf] = {}  # chat_id -> streaming state
 
     def is_allowed(self, sender_id: str) -> bool:
         """Preserve Telegram's legacy id|username allowlist matching."""
@@ -494,9 +502,11 @@ class TelegramChannel(BaseChannel):
                 )
                 await asyncio.sleep(delay)
             except RetryAfter as e:
+                if (chat_id := kwargs.get("chat_id")) is not None:
+                    self.note_rate_limit(str(chat_id), e)
                 if attempt == _SEND_MAX_RETRIES:
                     raise
-                delay = float(e.retry_after)
+                delay = self._retry_after(e)
                 logger.warning(
                     "Telegram Flood Control (attempt {}/{}), retrying in {:.1f}s",
                     attempt, _SEND_MAX_RETRIES, delay,
@@ -545,100 +555,98 @@ class TelegramChannel(BaseChannel):
         """Progressive message editing: send on first delta, edit on subsequent ones."""
         if not self._app:
             return
-        meta = metadata or {}
-        int_chat_id = int(chat_id)
-        stream_id = meta.get("_stream_id")
+        await super().send_delta(chat_id, delta, metadata)
 
-        if meta.get("_stream_end"):
-            buf = self._stream_bufs.get(chat_id)
-            if not buf or not buf.message_id or not buf.text:
-                return
-            if stream_id is not None and buf.stream_id is not None and buf.stream_id != stream_id:
-                return
-            self._stop_typing(chat_id)
-            if reply_to_message_id := meta.get("message_id"):
-                try:
-                    await self._remove_reaction(chat_id, int(reply_to_message_id))
-                except ValueError:
-                    pass
-            chunks = split_message(buf.text, TELEGRAM_MAX_MESSAGE_LEN)
-            primary_text = chunks[0] if chunks else buf.text
-            try:
-                html = _markdown_to_telegram_html(primary_text)
-                await self._call_with_retry(
-                    self._app.bot.edit_message_text,
-                    chat_id=int_chat_id, message_id=buf.message_id,
-                    text=html, parse_mode="HTML",
-                )
-            except BadRequest as e:
-                # Only fall back to plain text on actual HTML parse/format errors.
-                # Network errors (TimedOut, NetworkError) should propagate immediately
-                # to avoid doubling connection demand during pool exhaustion.
-                if self._is_not_modified_error(e):
-                    logger.debug("Final stream edit already applied for {}", chat_id)
-                    self._stream_bufs.pop(chat_id, None)
-                    return
-                logger.debug("Final stream edit failed (HTML), trying plain: {}", e)
-                try:
-                    await self._call_with_retry(
-                        self._app.bot.edit_message_text,
-                        chat_id=int_chat_id, message_id=buf.message_id,
-                        text=primary_text,
-                    )
-                except Exception as e2:
-                    if self._is_not_modified_error(e2):
-                        logger.debug("Final stream plain edit already applied for {}", chat_id)
-                    else:
-                        logger.warning("Final stream edit failed: {}", e2)
-                        raise  # Let ChannelManager handle retry
-            # If final content exceeds Telegram limit, keep the first chunk in
-            # the edited stream message and send the rest as follow-up messages.
-            for extra_chunk in chunks[1:]:
-                await self._send_text(int_chat_id, extra_chunk)
-            self._stream_bufs.pop(chat_id, None)
-            return
+    def _stream_edit_interval(self) -> float:
+        return self.config.stream_edit_interval
 
-        buf = self._stream_bufs.get(chat_id)
-        if buf is None or (stream_id is not None and buf.stream_id is not None and buf.stream_id != stream_id):
-            buf = _StreamBuf(stream_id=stream_id)
-            self._stream_bufs[chat_id] = buf
-        elif buf.stream_id is None:
-            buf.stream_id = stream_id
-        buf.text += delta
+    def _stream_not_modified(self, exc: Exception) -> bool:
+        return self._is_not_modified_error(exc)
 
-        if not buf.text.strip():
-            return
+    def _retry_after(self, exc: Exception) -> float | None:
+        if isinstance(exc, RetryAfter):
+            return super()._retry_after(exc)
+        return None
 
-        now = time.monotonic()
+    async def _stream_create(self, chat_id: str, buf: _StreamBuf, meta: dict[str, Any]) -> int:
         thread_kwargs = {}
         if message_thread_id := meta.get("message_thread_id"):
             thread_kwargs["message_thread_id"] = message_thread_id
-        if buf.message_id is None:
+        try:
+            sent = await self._call_with_retry(
+                self._app.bot.send_message,
+                chat_id=int(chat_id), text=buf.text[:TELEGRAM_MAX_MESSAGE_LEN],
+                **thread_kwargs,
+            )
+        except Exception as e:
+            logger.warning("Stream initial send failed: {}", e)
+            raise  # Let ChannelManager handle retry
+        return sent.message_id
+
+    async def _stream_update(self, chat_id: str, buf: _StreamBuf, meta: dict[str, Any]) -> None:
+        # No retry loop here: a later delta or the trailing flush carries the
+        # text, and flood control is handled by backing off the edit interval.
+        # Beyond the limit the edit would fail; the final edit splits.
+        text = buf.text[:TELEGRAM_MAX_MESSAGE_LEN]
+        try:
             try:
-                sent = await self._call_with_retry(
-                    self._app.bot.send_message,
-                    chat_id=int_chat_id, text=buf.text,
-                    **thread_kwargs,
+                await self._app.bot.edit_message_text(
+                    chat_id=int(chat_id), message_id=buf.message_id,
+                    text=_stream_html(buf, text), parse_mode="HTML",
                 )
-                buf.message_id = sent.message_id
-                buf.last_edit = now
-            except Exception as e:
-                logger.warning("Stream initial send failed: {}", e)
-                raise  # Let ChannelManager handle retry
-        elif (now - buf.last_edit) >= self.config.stream_edit_interval:
+            except BadRequest as e:
+                if self._is_not_modified_error(e):
+                    raise
+                logger.debug("Stream edit failed (HTML), trying plain: {}", e)
+                await self._app.bot.edit_message_text(
+                    chat_id=int(chat_id), message_id=buf.message_id, text=text,
+                )
+        except Exception as e:
+            if not self._is_not_modified_error(e) and not isinstance(e, RetryAfter):
+                logger.warning("Stream edit failed: {}", e)
+            raise  # Let the stream engine or ChannelManager handle it
+
+    async def _stream_finalize(self, chat_id: str, buf: _StreamBuf, meta: dict[str, Any]) -> None:
+        int_chat_id = int(chat_id)
+        self._stop_typing(chat_id)
+        if reply_to_message_id := meta.get("message_id"):
+            try:
+                await self._remove_reaction(chat_id, int(reply_to_message_id))
+            except ValueError:
+                pass
+        chunks = split_message(buf.text, TELEGRAM_MAX_MESSAGE_LEN)
+        primary_text = chunks[0] if chunks else buf.text
+        try:
+            html = _stream_html(buf, primary_text)
+            await self._call_with_retry(
+                self._app.bot.edit_message_text,
+                chat_id=int_chat_id, message_id=buf.message_id,
+                text=html, parse_mode="HTML",
+            )
+        except BadRequest as e:
+            # Only fall back to plain text on actual HTML parse/format errors.
+            # Network errors (TimedOut, NetworkError) should propagate immediately
+            # to avoid doubling connection demand during pool exhaustion.
+            if self._is_not_modified_error(e):
+                logger.debug("Final stream edit already applied for {}", chat_id)
+                return
+            logger.debug("Final stream edit failed (HTML), trying plain: {}", e)
             try:
                 await self._call_with_retry(
                     self._app.bot.edit_message_text,
                     chat_id=int_chat_id, message_id=buf.message_id,
-                    text=buf.text,
+                    text=primary_text,
                 )
-                buf.last_edit = now
-            except Exception as e:
-                if self._is_not_modified_error(e):
-                    buf.last_edit = now
-                    return
-                logger.warning("Stream edit failed: {}", e)
-                raise  # Let ChannelManager handle retry
+            except Exception as e2:
+                if self._is_not_modified_error(e2):
+                    logger.debug("Final stream plain edit already applied for {}", chat_id)
+                else:
+                    logger.warning("Final stream edit failed: {}", e2)
+                    raise  # Let ChannelManager handle retry
+        # If final content exceeds Telegram limit, keep the first chunk in
+        # the edited stream message and send the rest as follow-up messages.
+        for extra_chunk in chunks[1:]:
+            await self._send_text(int_chat_id, extra_chunk)
 
     async def _on_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /start command."""
@@ -740,17 +748,23 @@ class TelegramChannel(BaseChannel):
             media_type = "animation"
         if not media_file or not self._app:
             return [], []
+        bot = self._app.bot
+
+        async def _download(path: Path) -> None:
+            file = await bot.get_file(media_file.file_id)
+            await file.download_to_drive(str(path))
+
         try:
-            file = await self._app.bot.get_file(media_file.file_id)
             ext = self._get_extension(
                 media_type,
                 getattr(media_file, "mime_type", None),
                 getattr(media_file, "file_name", None),
             )
-            media_dir = get_media_dir("telegram")
             unique_id = getattr(media_file, "file_unique_id", media_file.file_id)
-            file_path = media_dir / f"{unique_id}{ext}"
-            await file.download_to_drive(str(file_path))
+            file_path = await self.media.fetch(
+                get_media_dir("telegram"), unique_id, f"{unique_id}{ext}", _download,
+                size=getattr(media_file, "file_size", None),
+            )
             path_str = str(file_path)
             if media_type in ("voice", "audio"):
                 transcription = await self.transcribe_audio(file_path)
@@ -896,9 +910,13 @@ class TelegramChannel(BaseChannel):
             lon = message.location.longitude
             content_parts.append(f"[location: {lat}, {lon}]")
 
-        # Download current message media
-        current_media_paths, current_media_parts = await self._download_message_media(
-            message, add_failure_content=True
+        # Download the message's media and the replied-to message's media concurrently
+        reply = getattr(message, "reply_to_message", None)
+        downloads = [self._download_message_media(message, add_failure_content=True)]
+        if reply is not None:
+            downloads.append(self._download_message_media(reply))
+        (current_media_paths, current_media_parts), *reply_download = await asyncio.gather(
+            *downloads
         )
         media_paths.extend(current_media_paths)
         content_parts.extend(current_media_parts)
@@ -906,10 +924,9 @@ class TelegramChannel(BaseChannel):
             logger.debug("Downloaded message media to {}", current_media_paths[0])
 
         # Reply context: text and/or media from the replied-to message
-        reply = getattr(message, "reply_to_message", None)
         if reply is not None:
             reply_ctx = await self._extract_reply_context(message)
-            reply_media, reply_media_parts = await self._download_message_media(reply)
+            reply_media, reply_media_parts = reply_download[0]
             if reply_media:
                 media_paths = reply_media + media_paths
                 logger.debug("Attached replied-to media: {}", reply_media[0])
@@ -15,6 +15,7 @@ from loguru import logger
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
+from nanobot.channels.media import MediaTooLargeError
 from nanobot.config.paths import get_media_dir
 from nanobot.config.schema import Base
 from pydantic import Field
@@ -361,6 +362,8 @@ class WecomChannel(BaseChannel):
         Returns:
             file_path or None if download failed
         """
+        if (cached := self.media.cached(file_url)) is not None:
+            return str(cached)
         try:
             data, fname = await self._client.download_file(file_url, aes_key)
 
@@ -368,24 +371,24 @@ class WecomChannel(BaseChannel):
                 logger.warning("Failed to download media from WeCom")
                 return None
 
-            if len(data) > WECOM_UPLOAD_MAX_BYTES:
-                logger.warning(
-                    "WeCom inbound media too large: {} bytes (max {})",
-                    len(data),
-                    WECOM_UPLOAD_MAX_BYTES,
-                )
-                return None
-
-            media_dir = get_media_dir("wecom")
             if not filename:
                 filename = fname or f"{media_type}_{hash(file_url) % 100000}"
             filename = _sanitize_filename(filename)
 
-            file_path = media_dir / filename
-            await asyncio.to_thread(file_path.write_bytes, data)
+            file_path = await self.media.fetch(
+                get_media_dir("wecom"), file_url, filename, data, max_bytes=WECOM_UPLOAD_MAX_BYTES,
+            )
             logger.debug("Downloaded {} to {}", media_type, file_path)
             return str(file_path)
 
+        except MediaTooLargeError:
+            logger.warning(
+                "WeCom inbound media too large: {} bytes (max {})",
+                len(data),
+                WECOM_UPLOAD_MAX_BYTES,
+            )
+            return None
+
         except Exception as e:
             logger.error("Error downloading media: {}", e)
             return None
@@ -793,6 +793,9 @@ class WeixinChannel(BaseChannel):
 
             if not encrypt_query_param and not full_url:
                 return None
+            media_key = encrypt_query_param or full_url
+            if (cached := self.media.cached(media_key)) is not None:
+                return str(cached)
 
             # Resolve AES key (media-download.ts:43-45, pic-decrypt.ts:40-52)
             # image_item.aeskey is a raw hex string (16 bytes as 32 hex chars).
@@ -856,16 +859,13 @@ class WeixinChannel(BaseChannel):
             if not data:
                 return None
 
-            media_dir = get_media_dir("weixin")
             ext = _ext_for_type(media_type)
             if not filename:
                 ts = int(time.time())
-                hash_seed = encrypt_query_param or full_url
-                h = abs(hash(hash_seed)) % 100000
+                h = abs(hash(media_key)) % 100000
                 filename = f"{media_type}_{ts}_{h}{ext}"
             safe_name = os.path.basename(filename)
-            file_path = media_dir / safe_name
-            file_path.write_bytes(data)
+            file_path = await self.media.fetch(get_media_dir("weixin"), media_key, safe_name, data)
             return str(file_path)
 
         except Exception as e:
@@ -7,7 +7,7 @@ import signal
 import sys
 from contextlib import nullcontext
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 # Force UTF-8 encoding for Windows console
 if sys.platform == "win32":
@@ -22,30 +22,11 @@ if sys.platform == "win32":
 
 import typer
 from loguru import logger
-from prompt_toolkit import PromptSession, print_formatted_text
-from prompt_toolkit.application import run_in_terminal
-from prompt_toolkit.formatted_text import ANSI, HTML
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.patch_stdout import patch_stdout
 from rich.console import Console
-from rich.markdown import Markdown
 from rich.table import Table
 from rich.text import Text
 
 from nanobot import __logo__, __version__
-
-
-class SafeFileHistory(FileHistory):
-    """FileHistory subclass that sanitizes surrogate characters on write.
-
-    On Windows, special Unicode input (emoji, mixed-script) can produce
-    surrogate characters that crash prompt_toolkit's file write.
-    See issue #2846.
-    """
-
-    def store_string(self, string: str) -> None:
-        safe = string.encode("utf-8", errors="surrogateescape").decode("utf-8", errors="replace")
-        super().store_string(safe)
 from nanobot.cli.stream import StreamRenderer, ThinkingSpinner
 from nanobot.config.paths import get_workspace_path, is_default_workspace
 from nanobot.config.schema import Config
@@ -56,6 +37,9 @@ from nanobot.utils.restart import (
     should_show_cli_restart_notice,
 )
 
+if TYPE_CHECKING:
+    from prompt_toolkit import PromptSession
+
 app = typer.Typer(
     name="nanobot",
     context_settings={"help_option_names": ["-h", "--help"]},
@@ -70,7 +54,8 @@ EXIT_COMMANDS = {"exit", "quit", "/exit", "/quit", ":q"}
 # CLI input: prompt_toolkit for editing, paste, history, and display
 # ---------------------------------------------------------------------------
 
-_PROMPT_SESSION: PromptSession | None = None
+# prompt_toolkit is only imported once interactive mode starts.
+_PROMPT_SESSION: "PromptSession | None" = None
 _SAVED_TERM_ATTRS = None  # original termios settings, restored on exit
 
 
@@ -126,6 +111,9 @@ def _init_prompt_session() -> None:
     except Exception:
         pass
 
+    from prompt_toolkit import PromptSession
+
+    from nanobot.cli.history import SafeFileHistory
     from nanobot.config.paths import get_cli_history_path
 
     history_file = get_cli_history_path()
@@ -175,11 +163,17 @@ def _response_renderable(content: str, render_markdown: bool, metadata: dict | N
         return Text(content)
     if (metadata or {}).get("render_as") == "text":
         return Text(content)
+    from rich.markdown import Markdown
+
     return Markdown(content)
 
 
 async def _print_interactive_line(text: str) -> None:
     """Print async interactive updates with prompt_toolkit-safe Rich styling."""
+    from prompt_toolkit import print_formatted_text
+    from prompt_toolkit.application import run_in_terminal
+    from prompt_toolkit.formatted_text import ANSI
+
     def _write() -> None:
         ansi = _render_interactive_ansi(
             lambda c: c.print(f"  [dim]↳ {text}[/dim]")
@@ -195,6 +189,10 @@ async def _print_interactive_response(
     metadata: dict | None = None,
 ) -> None:
     """Print async interactive replies with prompt_toolkit-safe Rich styling."""
+    from prompt_toolkit import print_formatted_text
+    from prompt_toolkit.application import run_in_terminal
+    from prompt_toolkit.formatted_text import ANSI
+
     def _write() -> None:
         content = response or ""
         ansi = _render_interactive_ansi(
@@ -237,6 +235,9 @@ async def _read_interactive_input_async() -> str:
     """
     if _PROMPT_SESSION is None:
         raise RuntimeError("Call _init_prompt_session() first")
+    from prompt_toolkit.formatted_text import HTML
+    from prompt_toolkit.patch_stdout import patch_stdout
+
     try:
         with patch_stdout():
             return await _PROMPT_SESSION.prompt_async(
@@ -383,9 +384,9 @@ def _onboard_plugins(config_path: Path) -> None:
     """Inject default config for all discovered channels (built-in + plugins)."""
     import json
 
-    from nanobot.channels.registry import discover_all
+    from nanobot.channels.registry import channel_catalog
 
-    all_channels = discover_all()
+    all_channels = channel_catalog()
     if not all_channels:
         return
 
@@ -406,26 +407,63 @@ def _onboard_plugins(config_path: Path) -> None:
 def _make_provider(config: Config):
     """Create the appropriate LLM provider from config.
 
+    A single model and key yields that provider directly; fallback models or
+    pooled API keys are wrapped in a :class:`RoutingProvider`.
+    """
+    from nanobot.config.paths import get_cache_dir
+    from nanobot.providers.metrics import ProviderMetrics
+    from nanobot.providers.response_cache import ResponseCache
+    from nanobot.providers.routing import RoutingProvider, routing_backends
+
+    backends = [
+        (label, _make_backend(config, model, api_key))
+        for label, model, api_key in routing_backends(config)
+    ]
+    if len(backends) == 1:
+        provider = backends[0][1]
+    else:
+        provider = RoutingProvider(backends, hedge=config.agents.defaults.hedge_requests)
+    # One registry for every backend, so /status and /metrics see all of them.
+    provider.metrics = ProviderMetrics()
+    for _, backend in backends:
+        backend.metrics = provider.metrics
+    cache_cfg = config.agents.defaults.response_cache
+    if cache_cfg.enabled:
+        provider.response_cache = ResponseCache(
+            get_cache_dir("llm"),
+            ttl_s=cache_cfg.ttl_hours * 3600,
+            max_bytes=cache_cfg.max_size_mb * 1024 * 1024,
+            interactive=cache_cfg.interactive,
+        )
+    return provider
+
+
+def _make_backend(config: Config, model: str, api_key: str | None = None):
+    """Create one LLM provider for *model*.
+
     Routing is driven by ``ProviderSpec.backend`` in the registry.
     """
     from nanobot.providers.base import GenerationSettings
+    from nanobot.providers.ratelimit import ProviderRateLimits
     from nanobot.providers.registry import find_by_name
+    from nanobot.utils.image import ImageLimits
 
-    model = config.agents.defaults.model
     provider_name = config.get_provider_name(model)
     p = config.get_provider(model)
     spec = find_by_name(provider_name) if provider_name else None
     backend = spec.backend if spec else "openai_compat"
+    if api_key is None and p:
+        api_key = p.api_key
 
     # --- validation ---
     if backend == "azure_openai":
-        if not p or not p.api_key or not p.api_base:
+        if not p or not api_key or not p.api_base:
             console.print("[red]Error: Azure OpenAI requires api_key and api_base.[/red]")
             console.print("Set them in ~/.nanobot/config.json under providers.azure_openai section")
             console.print("Use the model field to specify the deployment name.")
             raise typer.Exit(1)
     elif backend == "openai_compat" and not model.startswith("bedrock/"):
-        needs_key = not (p and p.api_key)
+        needs_key = not api_key
         exempt = spec and (spec.is_oauth or spec.is_local or spec.is_direct)
         if needs_key and not exempt:
             console.print("[red]Error: No API key configured.[/red]")
@@ -441,10 +479,22 @@ def _make_provider(config: Config):
         from nanobot.providers.azure_openai_provider import AzureOpenAIProvider
 
         provider = AzureOpenAIProvider(
-            api_key=p.api_key,
+            api_key=api_key,
             api_base=p.api_base,
             default_model=model,
         )
+    elif backend == "mock":
+        from nanobot.providers.mock_provider import MockProvider
+
+        provider = MockProvider(
+            default_model=model,
+            script=p.script or None,
+            ttft_s=p.ttft_ms / 1000,
+            tokens_per_s=p.tokens_per_s,
+            error_rate=p.error_rate,
+            rate_limit_rate=p.rate_limit_rate,
+            seed=p.seed,
+        )
     elif backend == "github_copilot":
         from nanobot.providers.github_copilot_provider import GitHubCopilotProvider
         provider = GitHubCopilotProvider(default_model=model)
@@ -452,7 +502,7 @@ def _make_provider(config: Config):
         from nanobot.providers.anthropic_provider import AnthropicProvider
 
         provider = AnthropicProvider(
-            api_key=p.api_key if p else None,
+            api_key=api_key,
             api_base=config.get_api_base(model),
             default_model=model,
             extra_headers=p.extra_headers if p else None,
@@ -461,7 +511,7 @@ def _make_provider(config: Config):
         from nanobot.providers.openai_compat_provider import OpenAICompatProvider
 
         provider = OpenAICompatProvider(
-            api_key=p.api_key if p else None,
+            api_key=api_key,
             api_base=config.get_api_base(model),
             default_model=model,
             extra_headers=p.extra_headers if p else None,
@@ -474,6 +524,16 @@ def _make_provider(config: Config):
         max_tokens=defaults.max_tokens,
         reasoning_effort=defaults.reasoning_effort,
     )
+    if p:
+        provider.image_limits = ImageLimits(
+            max_dimension=p.image_max_dimension,
+            max_bytes=p.image_max_bytes,
+        )
+    provider.rate_limits = ProviderRateLimits(
+        rpm=p.rpm_limit if p else None,
+        tpm=p.tpm_limit if p else None,
+    )
+    provider.metrics_label = provider_name or backend
     return provider
 
 
@@ -570,7 +630,8 @@ def serve(
     port = port if port is not None else api_cfg.port
     timeout = timeout if timeout is not None else api_cfg.timeout
     sync_workspace_templates(runtime_config.workspace_path)
-    bus = MessageBus()
+    # The gateway owns the bus journal; the API server's bus stays in memory.
+    bus = MessageBus(**runtime_config.gateway.bus.model_dump(exclude={"durable"}))
     provider = _make_provider(runtime_config)
     session_manager = SessionManager(runtime_config.workspace_path)
     agent_loop = AgentLoop(
@@ -653,7 +714,10 @@ def gateway(
 
     console.print(f"{__logo__} Starting nanobot gateway version {__version__} on port {port}...")
     sync_workspace_templates(config.workspace_path)
-    bus = MessageBus()
+    bus = MessageBus(**config.gateway.bus.model_dump())
+    durable_bus = config.gateway.bus.durable
+    if durable_bus:
+        console.print(f"[green]✓[/green] Durable bus: {bus.journal.path}")
     provider = _make_provider(config)
     session_manager = SessionManager(config.workspace_path)
 
@@ -742,6 +806,7 @@ def gateway(
                     channel=job.payload.channel or "cli",
                     chat_id=job.payload.to,
                     content=response,
+                    metadata={"_lane": "background"},
                 ))
         return response
 
@@ -796,7 +861,10 @@ def gateway(
         channel, chat_id = _pick_heartbeat_target()
         if channel == "cli":
             return  # No external channel available to deliver to
-        await bus.publish_outbound(OutboundMessage(channel=channel, chat_id=chat_id, content=response))
+        await bus.publish_outbound(OutboundMessage(
+            channel=channel, chat_id=chat_id, content=response,
+            metadata={"_lane": "background"},
+        ))
 
     hb_cfg = config.gateway.heartbeat
     heartbeat = HeartbeatService(
@@ -822,9 +890,11 @@ def gateway(
     console.print(f"[green]✓[/green] Heartbeat: every {hb_cfg.interval_s}s")
 
     async def _health_server(host: str, health_port: int):
-        """Lightweight HTTP health endpoint on the gateway port."""
+        """Lightweight HTTP health (and optional /metrics) endpoint on the gateway port."""
         import json as _json
 
+        metrics = provider.metrics if config.gateway.metrics else None
+
         async def handle(reader, writer):
             try:
                 data = await asyncio.wait_for(reader.read(4096), timeout=5)
@@ -846,6 +916,20 @@ def gateway(
                     f"Content-Length: {len(body)}\r\n"
                     f"\r\n{body}"
                 )
+            elif method == "GET" and path == "/metrics" and metrics is not None:
+                body = (
+                    metrics.render_prometheus()
+                    + bus.render_prometheus()
+                    + agent.bursts.render_prometheus()
+                    + agent.render_mcp_prometheus()
+                    + channels.render_prometheus()
+                )
+                resp = (
+                    f"HTTP/1.0 200 OK\r\n"
+                    f"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                    f"Content-Length: {len(body.encode())}\r\n"
+                    f"\r\n{body}"
+                )
             else:
                 body = "Not Found"
                 resp = (
@@ -861,6 +945,8 @@ def gateway(
 
         server = await asyncio.start_server(handle, host, health_port)
         console.print(f"[green]✓[/green] Health endpoint: http://{host}:{health_port}/health")
+        if metrics is not None:
+            console.print(f"[green]✓[/green] Metrics endpoint: http://{host}:{health_port}/metrics")
         async with server:
             await server.serve_forever()
     # Register Dream system job (always-on, idempotent on restart)
@@ -880,6 +966,8 @@ def gateway(
 
     async def run():
         try:
+            if durable_bus:
+                await bus.replay()
             await cron.start()
             await heartbeat.start()
             await asyncio.gather(
@@ -900,6 +988,8 @@ def gateway(
             cron.stop()
             agent.stop()
             await channels.stop_all()
+            if durable_bus:
+                await bus.close()
 
     asyncio.run(run())
 
@@ -1157,7 +1247,7 @@ def channels_status(
     config_path: str | None = typer.Option(None, "--config", "-c", help="Path to config file"),
 ):
     """Show channel status."""
-    from nanobot.channels.registry import discover_all
+    from nanobot.channels.registry import channel_catalog
     from nanobot.config.loader import load_config, set_config_path
 
     resolved_config_path = Path(config_path).expanduser().resolve() if config_path else None
@@ -1170,7 +1260,7 @@ def channels_status(
     table.add_column("Channel", style="cyan")
     table.add_column("Enabled")
 
-    for name, cls in sorted(discover_all().items()):
+    for name, info in sorted(channel_catalog().items()):
         section = getattr(config.channels, name, None)
         if section is None:
             enabled = False
@@ -1179,7 +1269,7 @@ def channels_status(
         else:
             enabled = getattr(section, "enabled", False)
         table.add_row(
-            cls.display_name,
+            info.display_name,
             "[green]\u2713[/green]" if enabled else "[dim]\u2717[/dim]",
         )
 
@@ -1254,7 +1344,7 @@ def channels_login(
     config_path: str | None = typer.Option(None, "--config", "-c", help="Path to config file"),
 ):
     """Authenticate with a channel via QR code or other interactive login."""
-    from nanobot.channels.registry import discover_all
+    from nanobot.channels.registry import channel_catalog, discover_all
     from nanobot.config.loader import load_config, set_config_path
 
     resolved_config_path = Path(config_path).expanduser().resolve() if config_path else None
@@ -1265,15 +1355,18 @@ def channels_login(
     channel_cfg = getattr(config.channels, channel_name, None) or {}
 
     # Validate channel exists
-    all_channels = discover_all()
-    if channel_name not in all_channels:
-        available = ", ".join(all_channels.keys())
+    catalog = channel_catalog()
+    if channel_name not in catalog:
+        available = ", ".join(catalog.keys())
         console.print(f"[red]Unknown channel: {channel_name}[/red]  Available: {available}")
         raise typer.Exit(1)
 
-    console.print(f"{__logo__} {all_channels[channel_name].display_name} Login\n")
+    console.print(f"{__logo__} {catalog[channel_name].display_name} Login\n")
 
-    channel_cls = all_channels[channel_name]
+    channel_cls = discover_all([channel_name]).get(channel_name)
+    if channel_cls is None:
+        console.print(f"[red]{catalog[channel_name].display_name} channel is not available[/red]")
+        raise typer.Exit(1)
     channel = channel_cls(channel_cfg, bus=None)
 
     success = asyncio.run(channel.login(force=force))
@@ -1293,12 +1386,12 @@ app.add_typer(plugins_app, name="plugins")
 @plugins_app.command("list")
 def plugins_list():
     """List all discovered channels (built-in and plugins)."""
-    from nanobot.channels.registry import discover_all, discover_channel_names
+    from nanobot.channels.registry import channel_catalog, discover_channel_names
     from nanobot.config.loader import load_config
 
     config = load_config()
     builtin_names = set(discover_channel_names())
-    all_channels = discover_all()
+    all_channels = channel_catalog()
 
     table = Table(title="Channel Plugins")
     table.add_column("Name", style="cyan")
@@ -1306,7 +1399,7 @@ def plugins_list():
     table.add_column("Enabled")
 
     for name in sorted(all_channels):
-        cls = all_channels[name]
+        info = all_channels[name]
         source = "builtin" if name in builtin_names else "plugin"
         section = getattr(config.channels, name, None)
         if section is None:
@@ -1316,7 +1409,7 @@ def plugins_list():
         else:
             enabled = getattr(section, "enabled", False)
         table.add_row(
-            cls.display_name,
+            info.display_name,
             source,
             "[green]yes[/green]" if enabled else "[dim]no[/dim]",
         )
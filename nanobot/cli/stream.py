@@ -11,7 +11,6 @@ import time
 
 from rich.console import Console
 from rich.live import Live
-from rich.markdown import Markdown
 from rich.text import Text
 
 from nanobot import __logo__
@@ -77,7 +76,11 @@ class StreamRenderer:
         self._start_spinner()
 
     def _render(self):
-        return Markdown(self._buf) if self._md and self._buf else Text(self._buf or "")
+        if self._md and self._buf:
+            from rich.markdown import Markdown  # markdown-it is slow to import
+
+            return Markdown(self._buf)
+        return Text(self._buf or "")
 
     def _start_spinner(self) -> None:
         if self._show_spinner:
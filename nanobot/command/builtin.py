@@ -19,6 +19,11 @@ async def cmd_stop(ctx: CommandContext) -> OutboundMessage:
     msg = ctx.msg
     tasks = loop._active_tasks.pop(msg.session_key, [])
     cancelled = sum(1 for t in tasks if not t.done() and t.cancel())
+    # Messages still waiting out the debounce window are dropped too.
+    buffered = loop.bursts.discard(loop._effective_session_key(msg))
+    for pending in buffered:
+        loop._ack(pending)
+    cancelled += bool(buffered)
     for t in tasks:
         try:
             await t
@@ -80,6 +85,12 @@ async def cmd_status(ctx: CommandContext) -> OutboundMessage:
         task_count += loop.subagents.get_running_count_by_session(ctx.key)
     except Exception:
         pass
+    metrics = getattr(loop.provider, "metrics", None)
+    llm_metrics_lines = metrics.status_lines(session=ctx.key) if metrics is not None else None
+    extra_lines = [f"\U0001f50c MCP {line}" for line in loop.mcp_status_lines()]
+    for line in (loop.images.status_line(), loop.bursts.status_line()):
+        if line:
+            extra_lines.append(line)
     return OutboundMessage(
         channel=ctx.msg.channel,
         chat_id=ctx.msg.chat_id,
@@ -91,6 +102,8 @@ async def cmd_status(ctx: CommandContext) -> OutboundMessage:
             context_tokens_estimate=ctx_est,
             search_usage_text=search_usage_text,
             active_task_count=task_count,
+            llm_metrics_lines=llm_metrics_lines,
+            extra_lines=extra_lines,
         ),
         metadata={**dict(ctx.msg.metadata or {}), "render_as": "text"},
     )
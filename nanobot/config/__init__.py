@@ -3,6 +3,7 @@
 from nanobot.config.loader import get_config_path, load_config
 from nanobot.config.paths import (
     get_bridge_install_dir,
+    get_cache_dir,
     get_cli_history_path,
     get_cron_dir,
     get_data_dir,
@@ -22,6 +23,7 @@ __all__ = [
     "get_data_dir",
     "get_runtime_subdir",
     "get_media_dir",
+    "get_cache_dir",
     "get_cron_dir",
     "get_logs_dir",
     "get_workspace_path",
@@ -24,6 +24,12 @@ def get_media_dir(channel: str | None = None) -> Path:
     return ensure_dir(base / channel) if channel else base
 
 
+def get_cache_dir(name: str | None = None) -> Path:
+    """Return the cache directory, optionally namespaced per cache kind."""
+    base = get_runtime_subdir("cache")
+    return ensure_dir(base / name) if name else base
+
+
 def get_cron_dir() -> Path:
     """Return the cron storage directory."""
     return get_runtime_subdir("cron")
@@ -28,7 +28,14 @@ class ChannelsConfig(Base):
     send_progress: bool = True  # stream agent's text progress to the channel
     send_tool_hints: bool = False  # stream tool-call hints (e.g. read_file("…"))
     send_max_retries: int = Field(default=3, ge=0, le=10)  # Max delivery attempts (initial send included)
+    send_concurrency: int = Field(default=4, ge=1, le=64)  # Chats sent to in parallel per channel
+    send_queue_size: int = Field(default=1000, ge=1)  # Max queued outbound messages per chat
+    debounce_ms: int = Field(default=0, ge=0)  # Merge a sender's quick successive messages (0 = off)
+    debounce_max_wait_ms: int = Field(default=2000, ge=0)  # Longest a message waits for its burst
     transcription_provider: str = "groq"  # Voice transcription backend: "groq" or "openai"
+    media_max_mb: int = Field(default=200, ge=1)  # Largest inbound attachment downloaded
+    media_retention_days: int = Field(default=0, ge=0)  # Delete older media files (0 = keep)
+    media_dir_max_mb: int = Field(default=0, ge=0)  # Cap per media directory (0 = no cap)
 
 
 class DreamConfig(Base):
@@ -59,6 +66,15 @@ class DreamConfig(Base):
         return f"every {hours}h"
 
 
+class ResponseCacheConfig(Base):
+    """On-disk cache of LLM responses for repeatable background calls."""
+
+    enabled: bool = False
+    ttl_hours: float = Field(default=24.0, ge=0)  # 0 = never expire (record/replay)
+    max_size_mb: int = Field(default=64, ge=1)
+    interactive: bool = False  # Also cache user-facing turns (not recommended)
+
+
 class AgentDefaults(Base):
     """Default agent configuration."""
 
@@ -75,6 +91,8 @@ class AgentDefaults(Base):
     max_tool_result_chars: int = 16_000
     provider_retry_mode: Literal["standard", "persistent"] = "standard"
     reasoning_effort: str | None = None  # low / medium / high / adaptive - enables LLM thinking mode
+    fallback_models: list[str] = Field(default_factory=list)  # Models (any configured provider) to fail over to
+    hedge_requests: bool = False  # Race a second backend when the first is slower than its p95
     timezone: str = "UTC"  # IANA timezone, e.g. "Asia/Shanghai", "America/New_York"
     unified_session: bool = False  # Share one session across all channels (single-user multi-device)
     disabled_skills: list[str] = Field(default_factory=list)  # Skill names to exclude from loading (e.g. ["summarize", "skill-creator"])
@@ -85,6 +103,7 @@ class AgentDefaults(Base):
         serialization_alias="idleCompactAfterMinutes",
     )  # Auto-compact idle threshold in minutes (0 = disabled)
     dream: DreamConfig = Field(default_factory=DreamConfig)
+    response_cache: ResponseCacheConfig = Field(default_factory=ResponseCacheConfig)
 
 
 class AgentsConfig(Base):
@@ -99,6 +118,22 @@ class ProviderConfig(Base):
     api_key: str | None = None
     api_base: str | None = None
     extra_headers: dict[str, str] | None = None  # Custom headers (e.g. APP-Code for AiHubMix)
+    image_max_dimension: int | None = Field(default=None, ge=64)  # Downscale images to this longest edge (px)
+    image_max_bytes: int | None = Field(default=None, ge=1024)  # Recompress images above this size
+    api_keys: list[str] = Field(default_factory=list)  # Extra keys pooled with api_key; calls fail over between them
+    rpm_limit: int | None = Field(default=None, ge=1)  # Client-side requests/minute cap (learned from headers if unset)
+    tpm_limit: int | None = Field(default=None, ge=1)  # Client-side tokens/minute cap (learned from headers if unset)
+
+
+class MockProviderConfig(ProviderConfig):
+    """Offline mock provider (model ``mock/<anything>``) for load tests."""
+
+    script: str = ""  # JSON/JSONL turns or a session file to replay; empty = echo
+    ttft_ms: int = Field(default=0, ge=0)
+    tokens_per_s: float = Field(default=0.0, ge=0)  # 0 = instant
+    error_rate: float = Field(default=0.0, ge=0, le=1)  # injected 500s
+    rate_limit_rate: float = Field(default=0.0, ge=0, le=1)  # injected 429s
+    seed: int = 0
 
 
 class ProvidersConfig(Base):
@@ -133,6 +168,7 @@ class ProvidersConfig(Base):
     openai_codex: ProviderConfig = Field(default_factory=ProviderConfig, exclude=True)  # OpenAI Codex (OAuth)
     github_copilot: ProviderConfig = Field(default_factory=ProviderConfig, exclude=True)  # Github Copilot (OAuth)
     qianfan: ProviderConfig = Field(default_factory=ProviderConfig)  # Qianfan (百度千帆)
+    mock: MockProviderConfig = Field(default_factory=MockProviderConfig, exclude=True)  # Offline mock
 
 
 class HeartbeatConfig(Base):
@@ -151,12 +187,25 @@ class ApiConfig(Base):
     timeout: float = 120.0  # Per-request timeout in seconds.
 
 
+class BusConfig(Base):
+    """Message bus capacity and overflow handling."""
+
+    inbound_capacity: int = Field(default=1000, ge=0)  # 0 = unbounded; control commands bypass it
+    outbound_capacity: int = Field(default=1000, ge=0)
+    inbound_overflow: Literal["block", "drop_oldest", "reject"] = "reject"  # reject tells the sender
+    outbound_overflow: Literal["block", "drop_oldest", "reject"] = "block"
+    durable: bool = False  # Journal messages to disk and replay unacknowledged ones on start
+    journal_path: str = ""  # Default: <data dir>/bus/journal.sqlite3
+
+
 class GatewayConfig(Base):
     """Gateway/server configuration."""
 
     host: str = "127.0.0.1"  # Safer default: local-only bind.
     port: int = 18790
     heartbeat: HeartbeatConfig = Field(default_factory=HeartbeatConfig)
+    metrics: bool = False  # Serve LLM latency metrics at GET /metrics (Prometheus format).
+    bus: BusConfig = Field(default_factory=BusConfig)
 
 
 class WebSearchConfig(Base):
@@ -198,6 +247,11 @@ class MCPServerConfig(Base):
     url: str = ""  # HTTP/SSE: endpoint URL
     headers: dict[str, str] = Field(default_factory=dict)  # HTTP/SSE: custom headers
     tool_timeout: int = 30  # seconds before a tool call is cancelled
+    connect_timeout: float = 30.0  # seconds allowed for connect + capability listing
+    health_check_interval: int = 60  # seconds between pings; 0 = only after failed calls
+    max_concurrent_calls: int = Field(default=4, ge=1)  # in-flight requests per server
+    read_only_tools: list[str] = Field(default_factory=list)  # Treat as read-only (parallel-safe) regardless of annotations; raw or wrapped names, ["*"] = all
+    serial_tools: list[str] = Field(default_factory=list)  # Never run in parallel, even if annotated read-only/idempotent; raw or wrapped names, ["*"] = all
     enabled_tools: list[str] = Field(default_factory=lambda: ["*"])  # Only register these tools; accepts raw MCP names or wrapped mcp_<server>_<tool> names; ["*"] = all tools; [] = no tools
 
 class ToolsConfig(Base):
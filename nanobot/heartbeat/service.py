@@ -8,6 +8,8 @@ from typing import TYPE_CHECKING, Any, Callable, Coroutine
 
 from loguru import logger
 
+from nanobot.providers.ratelimit import Priority, llm_priority
+
 if TYPE_CHECKING:
     from nanobot.providers.base import LLMProvider
 
@@ -91,18 +93,20 @@ class HeartbeatService:
         """
         from nanobot.utils.helpers import current_time_str
 
-        response = await self.provider.chat_with_retry(
-            messages=[
-                {"role": "system", "content": "You are a heartbeat agent. Call the heartbeat tool to report your decision."},
-                {"role": "user", "content": (
-                    f"Current Time: {current_time_str(self.timezone)}\n\n"
-                    "Review the following HEARTBEAT.md and decide whether there are active tasks.\n\n"
-                    f"{content}"
-                )},
-            ],
-            tools=_HEARTBEAT_TOOL,
-            model=self.model,
-        )
+        with llm_priority(Priority.BACKGROUND):
+            response = await self.provider.chat_with_retry(
+                messages=[
+                    {"role": "system", "content": "You are a heartbeat agent. Call the heartbeat tool to report your decision."},
+                    {"role": "user", "content": (
+                        f"Current Time: {current_time_str(self.timezone)}\n\n"
+                        "Review the following HEARTBEAT.md and decide whether there are active tasks.\n\n"
+                        f"{content}"
+                    )},
+                ],
+                tools=_HEARTBEAT_TOOL,
+                model=self.model,
+                cache=True,
+            )
 
         if not response.has_tool_calls:
             return "skip", ""
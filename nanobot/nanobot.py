@@ -118,20 +118,53 @@ class Nanobot:
 
 def _make_provider(config: Any) -> Any:
     """Create the LLM provider from config (extracted from CLI)."""
+    from nanobot.config.paths import get_cache_dir
+    from nanobot.providers.metrics import ProviderMetrics
+    from nanobot.providers.response_cache import ResponseCache
+    from nanobot.providers.routing import RoutingProvider, routing_backends
+
+    backends = [
+        (label, _make_backend(config, model, api_key))
+        for label, model, api_key in routing_backends(config)
+    ]
+    if len(backends) == 1:
+        provider = backends[0][1]
+    else:
+        provider = RoutingProvider(backends, hedge=config.agents.defaults.hedge_requests)
+    # One registry for every backend, so /status and /metrics see all of them.
+    provider.metrics = ProviderMetrics()
+    for _, backend in backends:
+        backend.metrics = provider.metrics
+    cache_cfg = config.agents.defaults.response_cache
+    if cache_cfg.enabled:
+        provider.response_cache = ResponseCache(
+            get_cache_dir("llm"),
+            ttl_s=cache_cfg.ttl_hours * 3600,
+            max_bytes=cache_cfg.max_size_mb * 1024 * 1024,
+            interactive=cache_cfg.interactive,
+        )
+    return provider
+
+
+def _make_backend(config: Any, model: str, api_key: str | None = None) -> Any:
+    """Create one LLM provider for *model*."""
     from nanobot.providers.base import GenerationSettings
+    from nanobot.providers.ratelimit import ProviderRateLimits
     from nanobot.providers.registry import find_by_name
+    from nanobot.utils.image import ImageLimits
 
-    model = config.agents.defaults.model
     provider_name = config.get_provider_name(model)
     p = config.get_provider(model)
     spec = find_by_name(provider_name) if provider_name else None
     backend = spec.backend if spec else "openai_compat"
+    if api_key is None and p:
+        api_key = p.api_key
 
     if backend == "azure_openai":
-        if not p or not p.api_key or not p.api_base:
+        if not p or not api_key or not p.api_base:
             raise ValueError("Azure OpenAI requires api_key and api_base in config.")
     elif backend == "openai_compat" and not model.startswith("bedrock/"):
-        needs_key = not (p and p.api_key)
+        needs_key = not api_key
         exempt = spec and (spec.is_oauth or spec.is_local or spec.is_direct)
         if needs_key and not exempt:
             raise ValueError(f"No API key configured for provider '{provider_name}'.")
@@ -140,6 +173,18 @@ def _make_provider(config: Any) -> Any:
         from nanobot.providers.openai_codex_provider import OpenAICodexProvider
 
         provider = OpenAICodexProvider(default_model=model)
+    elif backend == "mock":
+        from nanobot.providers.mock_provider import MockProvider
+
+        provider = MockProvider(
+            default_model=model,
+            script=p.script or None,
+            ttft_s=p.ttft_ms / 1000,
+            tokens_per_s=p.tokens_per_s,
+            error_rate=p.error_rate,
+            rate_limit_rate=p.rate_limit_rate,
+            seed=p.seed,
+        )
     elif backend == "github_copilot":
         from nanobot.providers.github_copilot_provider import GitHubCopilotProvider
 
@@ -148,13 +193,13 @@ def _make_provider(config: Any) -> Any:
         from nanobot.providers.azure_openai_provider import AzureOpenAIProvider
 
         provider = AzureOpenAIProvider(
-            api_key=p.api_key, api_base=p.api_base, default_model=model
+            api_key=api_key, api_base=p.api_base, default_model=model
         )
     elif backend == "anthropic":
         from nanobot.providers.anthropic_provider import AnthropicProvider
 
         provider = AnthropicProvider(
-            api_key=p.api_key if p else None,
+            api_key=api_key,
             api_base=config.get_api_base(model),
             default_model=model,
             extra_headers=p.extra_headers if p else None,
@@ -163,7 +208,7 @@ def _make_provider(config: Any) -> Any:
         from nanobot.providers.openai_compat_provider import OpenAICompatProvider
 
         provider = OpenAICompatProvider(
-            api_key=p.api_key if p else None,
+            api_key=api_key,
             api_base=config.get_api_base(model),
             default_model=model,
             extra_headers=p.extra_headers if p else None,
@@ -176,4 +221,14 @@ def _make_provider(config: Any) -> Any:
         max_tokens=defaults.max_tokens,
         reasoning_effort=defaults.reasoning_effort,
     )
+    if p:
+        provider.image_limits = ImageLimits(
+            max_dimension=p.image_max_dimension,
+            max_bytes=p.image_max_bytes,
+        )
+    provider.rate_limits = ProviderRateLimits(
+        rpm=p.rpm_limit if p else None,
+        tpm=p.tpm_limit if p else None,
+    )
+    provider.metrics_label = provider_name or backend
     return provider
@@ -13,6 +13,14 @@ from typing import Any
 import json_repair
 
 from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.metrics import current_session
+from nanobot.providers.prompt_cache import (
+    CachePlan,
+    Location,
+    PromptCacheOptimizer,
+    apply_cache_markers,
+    flatten_request,
+)
 
 _ALNUM = string.ascii_letters + string.digits
 
@@ -38,6 +46,7 @@ class AnthropicProvider(LLMProvider):
         super().__init__(api_key, api_base)
         self.default_model = default_model
         self.extra_headers = extra_headers or {}
+        self.prompt_cache = PromptCacheOptimizer()
 
         from anthropic import AsyncAnthropic
 
@@ -106,6 +115,7 @@ class AnthropicProvider(LLMProvider):
             error_code=error_code,
             error_retry_after_s=retry_after,
             error_should_retry=should_retry,
+            rate_limit_headers=cls._rate_limit_headers(headers),
         )
 
     @staticmethod
@@ -122,44 +132,71 @@ class AnthropicProvider(LLMProvider):
         self, messages: list[dict[str, Any]],
     ) -> tuple[str | list[dict[str, Any]], list[dict[str, Any]]]:
         """Return ``(system, anthropic_messages)``."""
+        return self._assemble_messages([self._convert_message(msg) for msg in messages])
+
+    def _convert_message(self, msg: dict[str, Any]) -> tuple[str, Any] | None:
+        """Convert one OpenAI-format message to ``(role, system/content/tool block)``."""
+        role = msg.get("role", "")
+        content = msg.get("content")
+        if role == "system":
+            return role, content if isinstance(content, (str, list)) else str(content or "")
+        if role == "tool":
+            return role, self._tool_result_block(msg)
+        if role == "assistant":
+            return role, self._assistant_blocks(msg)
+        if role == "user":
+            return role, self._convert_user_content(content)
+        return None
+
+    def _assemble_messages(
+        self, converted: list[tuple[str, Any] | None],
+    ) -> tuple[str | list[dict[str, Any]], list[dict[str, Any]]]:
+        """Join converted messages: fold tool results into user turns, merge roles.
+
+        Content lists are copied, since *converted* may be shared memoized values.
+        """
         system: str | list[dict[str, Any]] = ""
         raw: list[dict[str, Any]] = []
 
-        for msg in messages:
-            role = msg.get("role", "")
-            content = msg.get("content")
+        for item in converted:
+            if item is None:
+                continue
+            role, value = item
 
             if role == "system":
-                system = content if isinstance(content, (str, list)) else str(content or "")
+                system = value
                 continue
 
             if role == "tool":
-                block = self._tool_result_block(msg)
                 if raw and raw[-1]["role"] == "user":
                     prev_c = raw[-1]["content"]
                     if isinstance(prev_c, list):
-                        prev_c.append(block)
+                        prev_c.append(value)
                     else:
                         raw[-1]["content"] = [
-                            {"type": "text", "text": prev_c or ""}, block,
+                            {"type": "text", "text": prev_c or ""}, value,
                         ]
                 else:
-                    raw.append({"role": "user", "content": [block]})
+                    raw.append({"role": "user", "content": [value]})
                 continue
 
-            if role == "assistant":
-                raw.append({"role": "assistant", "content": self._assistant_blocks(msg)})
-                continue
-
-            if role == "user":
-                raw.append({
-                    "role": "user",
-                    "content": self._convert_user_content(content),
-                })
-                continue
+            raw.append({"role": role, "content": list(value) if isinstance(value, list) else value})
 
         return system, self._merge_consecutive(raw)
 
+    def _prepare_messages(
+        self, messages: list[dict[str, Any]],
+    ) -> tuple[str | list[dict[str, Any]], list[dict[str, Any]]]:
+        """``_convert_messages(_sanitize_empty_content(messages))``, memoized per message."""
+        conversions = self._message_conversions
+
+        def _convert(msg: dict[str, Any]) -> tuple[str, Any] | None:
+            return self._convert_message(self._sanitize_empty_message(msg))
+
+        return self._assemble_messages(
+            [conversions.convert("anthropic", msg, _convert) for msg in messages]
+        )
+
     @staticmethod
     def _tool_result_block(msg: dict[str, Any]) -> dict[str, Any]:
         content = msg.get("content")
@@ -344,6 +381,48 @@ class AnthropicProvider(LLMProvider):
 
         return system, new_msgs, new_tools
 
+    @classmethod
+    def _cache_anchors(
+        cls,
+        system: str | list[dict[str, Any]],
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+    ) -> list[Location]:
+        """The positions :meth:`_apply_cache_control` marks, most shared first."""
+        anchors: list[Location] = []
+        if system:
+            anchors.append(("system", 0, len(system) - 1 if isinstance(system, list) else 0))
+        for idx in cls._tool_cache_marker_indices(tools or []):
+            anchors.append(("tools", idx, -1))
+        if len(messages) >= 3:
+            c = messages[-2].get("content")
+            if c:
+                last = len(c) - 1 if isinstance(c, list) else 0
+                anchors.append(("messages", len(messages) - 2, last))
+        return anchors
+
+    def _place_cache_markers(
+        self,
+        system: str | list[dict[str, Any]],
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+    ) -> tuple[
+        str | list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]] | None,
+        CachePlan | None,
+    ]:
+        """Mark cache breakpoints, planned per session when a metrics session is active.
+
+        Returns the marked request and the plan to hand back to
+        ``prompt_cache.observe`` with the response (``None`` outside a session).
+        """
+        if current_session() is None:
+            return (*self._apply_cache_control(system, messages, tools), None)
+        plan = self.prompt_cache.plan(
+            flatten_request(system, messages, tools),
+            self._cache_anchors(system, messages, tools),
+        )
+        return (*apply_cache_markers(system, messages, tools, plan.locations), plan)
+
     # ------------------------------------------------------------------
     # Build API kwargs
     # ------------------------------------------------------------------
@@ -359,12 +438,30 @@ class AnthropicProvider(LLMProvider):
         tool_choice: str | dict[str, Any] | None,
         supports_caching: bool = True,
     ) -> dict[str, Any]:
+        return self._build_request(
+            messages, tools, model, max_tokens, temperature,
+            reasoning_effort, tool_choice, supports_caching,
+        )[0]
+
+    def _build_request(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+        reasoning_effort: str | None,
+        tool_choice: str | dict[str, Any] | None,
+        supports_caching: bool = True,
+    ) -> tuple[dict[str, Any], CachePlan | None]:
+        """Build API kwargs plus the cache plan this request must be observed with."""
         model_name = self._strip_prefix(model or self.default_model)
-        system, anthropic_msgs = self._convert_messages(self._sanitize_empty_content(messages))
+        system, anthropic_msgs = self._prepare_messages(messages)
         anthropic_tools = self._convert_tools(tools)
 
+        plan = None
         if supports_caching:
-            system, anthropic_msgs, anthropic_tools = self._apply_cache_control(
+            system, anthropic_msgs, anthropic_tools, plan = self._place_cache_markers(
                 system, anthropic_msgs, anthropic_tools,
             )
 
@@ -404,7 +501,11 @@ class AnthropicProvider(LLMProvider):
         if self.extra_headers:
             kwargs["extra_headers"] = self.extra_headers
 
-        return kwargs
+        return kwargs, plan
+
+    def _observe_cache(self, plan: CachePlan | None, parsed: LLMResponse) -> None:
+        if plan is not None:
+            self.prompt_cache.observe(plan, parsed.usage, failed=parsed.finish_reason == "error")
 
     # ------------------------------------------------------------------
     # Response parsing
@@ -476,15 +577,18 @@ class AnthropicProvider(LLMProvider):
         reasoning_effort: str | None = None,
         tool_choice: str | dict[str, Any] | None = None,
     ) -> LLMResponse:
-        kwargs = self._build_kwargs(
+        kwargs, plan = self._build_request(
             messages, tools, model, max_tokens, temperature,
             reasoning_effort, tool_choice,
         )
         try:
-            response = await self._client.messages.create(**kwargs)
-            return self._parse_response(response)
+            raw = await self._client.messages.with_raw_response.create(**kwargs)
+            parsed = self._parse_response(raw.parse())
+            parsed.rate_limit_headers = self._rate_limit_headers(raw.headers)
         except Exception as e:
-            return self._handle_error(e)
+            parsed = self._handle_error(e)
+        self._observe_cache(plan, parsed)
+        return parsed
 
     async def chat_stream(
         self,
@@ -497,7 +601,7 @@ class AnthropicProvider(LLMProvider):
         tool_choice: str | dict[str, Any] | None = None,
         on_content_delta: Callable[[str], Awaitable[None]] | None = None,
     ) -> LLMResponse:
-        kwargs = self._build_kwargs(
+        kwargs, plan = self._build_request(
             messages, tools, model, max_tokens, temperature,
             reasoning_effort, tool_choice,
         )
@@ -519,9 +623,11 @@ class AnthropicProvider(LLMProvider):
                     stream.get_final_message(),
                     timeout=idle_timeout_s,
                 )
-            return self._parse_response(response)
+                headers = getattr(getattr(stream, "response", None), "headers", None)
+            parsed = self._parse_response(response)
+            parsed.rate_limit_headers = self._rate_limit_headers(headers)
         except asyncio.TimeoutError:
-            return LLMResponse(
+            parsed = LLMResponse(
                 content=(
                     f"Error calling LLM: stream stalled for more than "
                     f"{idle_timeout_s} seconds"
@@ -530,7 +636,9 @@ class AnthropicProvider(LLMProvider):
                 error_kind="timeout",
             )
         except Exception as e:
-            return self._handle_error(e)
+            parsed = self._handle_error(e)
+        self._observe_cache(plan, parsed)
+        return parsed
 
     def get_default_model(self) -> str:
         return self.default_model
@@ -12,7 +12,12 @@ from typing import Any
 
 from loguru import logger
 
-from nanobot.utils.helpers import image_placeholder_text
+from nanobot.providers.message_cache import MessageConversionCache
+from nanobot.providers.metrics import CallTimer, LLMCallMetrics, ProviderMetrics, payload_size
+from nanobot.providers.ratelimit import ProviderRateLimits, RateLimiter
+from nanobot.providers.response_cache import ResponseCache, response_cache_key
+from nanobot.utils.helpers import estimate_prompt_tokens_chain, image_placeholder_text
+from nanobot.utils.image import ImageLimits
 
 
 @dataclass
@@ -61,6 +66,9 @@ class LLMResponse:
     error_code: str | None = None  # Provider/code semantic, e.g. rate_limit_exceeded.
     error_retry_after_s: float | None = None
     error_should_retry: bool | None = None
+    rate_limit_headers: dict[str, str] | None = None  # x-ratelimit-* etc., when available
+    # Timing of the attempt that produced this response (when metrics are enabled).
+    call_metrics: LLMCallMetrics | None = field(default=None, compare=False, repr=False)
 
     @property
     def has_tool_calls(self) -> bool:
@@ -146,60 +154,75 @@ class LLMProvider(ABC):
     )
 
     _SENTINEL = object()
+    # Wrappers that delegate to other providers (routing) leave per-call
+    # timing to the backends so each attempt is recorded once.
+    _records_calls = True
 
     def __init__(self, api_key: str | None = None, api_base: str | None = None):
         self.api_key = api_key
         self.api_base = api_base
         self.generation: GenerationSettings = GenerationSettings()
+        self.image_limits: ImageLimits = ImageLimits()
+        self.rate_limits: ProviderRateLimits | None = None
+        self.response_cache: ResponseCache | None = None
+        self.metrics: ProviderMetrics | None = None
+        self.metrics_label: str = type(self).__name__
 
-    @staticmethod
-    def _sanitize_empty_content(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    @classmethod
+    def _sanitize_empty_content(cls, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Sanitize message content: fix empty blocks, strip internal _meta fields."""
-        result: list[dict[str, Any]] = []
-        for msg in messages:
-            content = msg.get("content")
+        return [cls._sanitize_empty_message(msg) for msg in messages]
 
-            if isinstance(content, str) and not content:
+    @staticmethod
+    def _sanitize_empty_message(msg: dict[str, Any]) -> dict[str, Any]:
+        """Per-message body of :meth:`_sanitize_empty_content`; returns *msg* when unchanged."""
+        content = msg.get("content")
+
+        if isinstance(content, str) and not content:
+            clean = dict(msg)
+            clean["content"] = None if (msg.get("role") == "assistant" and msg.get("tool_calls")) else "(empty)"
+            return clean
+
+        if isinstance(content, list):
+            new_items: list[Any] = []
+            changed = False
+            for item in content:
+                if (
+                    isinstance(item, dict)
+                    and item.get("type") in ("text", "input_text", "output_text")
+                    and not item.get("text")
+                ):
+                    changed = True
+                    continue
+                if isinstance(item, dict) and "_meta" in item:
+                    new_items.append({k: v for k, v in item.items() if k != "_meta"})
+                    changed = True
+                else:
+                    new_items.append(item)
+            if changed:
                 clean = dict(msg)
-                clean["content"] = None if (msg.get("role") == "assistant" and msg.get("tool_calls")) else "(empty)"
-                result.append(clean)
-                continue
+                if new_items:
+                    clean["content"] = new_items
+                elif msg.get("role") == "assistant" and msg.get("tool_calls"):
+                    clean["content"] = None
+                else:
+                    clean["content"] = "(empty)"
+                return clean
 
-            if isinstance(content, list):
-                new_items: list[Any] = []
-                changed = False
-                for item in content:
-                    if (
-                        isinstance(item, dict)
-                        and item.get("type") in ("text", "input_text", "output_text")
-                        and not item.get("text")
-                    ):
-                        changed = True
-                        continue
-                    if isinstance(item, dict) and "_meta" in item:
-                        new_items.append({k: v for k, v in item.items() if k != "_meta"})
-                        changed = True
-                    else:
-                        new_items.append(item)
-                if changed:
-                    clean = dict(msg)
-                    if new_items:
-                        clean["content"] = new_items
-                    elif msg.get("role") == "assistant" and msg.get("tool_calls"):
-                        clean["content"] = None
-                    else:
-                        clean["content"] = "(empty)"
-                    result.append(clean)
-                    continue
+        if isinstance(content, dict):
+            clean = dict(msg)
+            clean["content"] = [content]
+            return clean
 
-            if isinstance(content, dict):
-                clean = dict(msg)
-                clean["content"] = [content]
-                result.append(clean)
-                continue
+        return msg
 
-            result.append(msg)
-        return result
+    @property
+    def _message_conversions(self) -> MessageConversionCache:
+        """Per-provider memo of converted history messages (created on first use)."""
+        cache = self.__dict__.get("_message_cache")
+        if cache is None:
+            cache = self.__dict__["_message_cache"] = MessageConversionCache()
+        return cache
 
     @staticmethod
     def _tool_name(tool: dict[str, Any]) -> str:
@@ -453,14 +476,76 @@ class LLMProvider(ABC):
                         found = True
         return found
 
+    @staticmethod
+    def _rate_limit_headers(headers: Any) -> dict[str, str] | None:
+        """Keep only the rate-limit related entries of a response's headers."""
+        if not headers or not hasattr(headers, "items"):
+            return None
+        kept = {
+            str(k).lower(): str(v)
+            for k, v in headers.items()
+            if "ratelimit" in str(k).lower() or str(k).lower().startswith("retry-after")
+        }
+        return kept or None
+
+    async def _admit(self, kw: dict[str, Any]) -> tuple[RateLimiter, int] | None:
+        """Wait for rate-limit admission; returns what :meth:`_settle` needs."""
+        if self.rate_limits is None:
+            return None
+        limiter = self.rate_limits.for_model(kw.get("model") or self.get_default_model())
+        cost = 0
+        if limiter.counts_tokens:
+            cost, _ = estimate_prompt_tokens_chain(
+                self, kw.get("model"), kw.get("messages") or [], kw.get("tools")
+            )
+        waited = await limiter.acquire(cost)
+        if waited >= 1:
+            logger.debug("LLM request queued {:.1f}s by client-side rate limit", waited)
+        return limiter, cost
+
+    def _settle(self, admission: tuple[RateLimiter, int] | None, response: LLMResponse) -> None:
+        if admission is None:
+            return
+        limiter, cost = admission
+        limiter.observe(response.rate_limit_headers)
+        if response.finish_reason == "error":
+            if response.error_status_code == 429 and self._is_retryable_429_response(response):
+                limiter.pause(self._extract_retry_after_from_response(response) or 1.0)
+            return
+        usage = response.usage or {}
+        limiter.settle(cost, usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0))
+
     async def _safe_chat(self, **kwargs: Any) -> LLMResponse:
         """Call chat() and convert unexpected exceptions to error responses."""
+        timer = CallTimer() if self.metrics is not None and self._records_calls else None
+        admission = await self._admit(kwargs)
+        if timer is not None:
+            timer.mark_admitted()
         try:
-            return await self.chat(**kwargs)
+            response = await self.chat(**kwargs)
         except asyncio.CancelledError:
             raise
         except Exception as exc:
-            return LLMResponse(content=f"Error calling LLM: {exc}", finish_reason="error")
+            response = LLMResponse(content=f"Error calling LLM: {exc}", finish_reason="error")
+        self._settle(admission, response)
+        if timer is not None:
+            self._record_call(timer, kwargs, response, streaming=False)
+        return response
+
+    def _record_call(
+        self, timer: CallTimer, kw: dict[str, Any], response: LLMResponse, *, streaming: bool,
+    ) -> None:
+        payload_bytes = payload_size(kw.get("messages")) + payload_size(kw.get("tools"))
+        response.call_metrics = timer.finish(
+            provider=self.metrics_label,
+            model=kw.get("model") or self.get_default_model(),
+            streaming=streaming,
+            payload_bytes=payload_bytes,
+            finish_reason=response.finish_reason,
+            usage=response.usage,
+            error_kind=response.error_kind,
+        )
+        self.metrics.record(response.call_metrics)
 
     async def chat_stream(
         self,
@@ -491,12 +576,23 @@ class LLMProvider(ABC):
 
     async def _safe_chat_stream(self, **kwargs: Any) -> LLMResponse:
         """Call chat_stream() and convert unexpected exceptions to error responses."""
+        timer = CallTimer() if self.metrics is not None and self._records_calls else None
+        admission = await self._admit(kwargs)
+        call_kw = kwargs
+        if timer is not None:
+            timer.mark_admitted()
+            if kwargs.get("on_content_delta") is not None:
+                call_kw = {**kwargs, "on_content_delta": timer.wrap(kwargs["on_content_delta"])}
         try:
-            return await self.chat_stream(**kwargs)
+            response = await self.chat_stream(**call_kw)
         except asyncio.CancelledError:
             raise
         except Exception as exc:
-            return LLMResponse(content=f"Error calling LLM: {exc}", finish_reason="error")
+            response = LLMResponse(content=f"Error calling LLM: {exc}", finish_reason="error")
+        self._settle(admission, response)
+        if timer is not None:
+            self._record_call(timer, kwargs, response, streaming=True)
+        return response
 
     async def chat_stream_with_retry(
         self,
@@ -510,8 +606,13 @@ class LLMProvider(ABC):
         on_content_delta: Callable[[str], Awaitable[None]] | None = None,
         retry_mode: str = "standard",
         on_retry_wait: Callable[[str], Awaitable[None]] | None = None,
+        cache: bool | None = None,
     ) -> LLMResponse:
-        """Call chat_stream() with retry on transient provider failures."""
+        """Call chat_stream() with retry on transient provider failures.
+
+        A response-cache hit (see :meth:`chat_with_retry`) is replayed as a
+        single content delta.
+        """
         if max_tokens is self._SENTINEL or max_tokens is None:
             max_tokens = self.generation.max_tokens
         if temperature is self._SENTINEL or temperature is None:
@@ -525,13 +626,23 @@ class LLMProvider(ABC):
             reasoning_effort=reasoning_effort, tool_choice=tool_choice,
             on_content_delta=on_content_delta,
         )
-        return await self._run_with_retry(
+        key = self._response_cache_key(kw, cache)
+        if key is not None:
+            cached = await asyncio.to_thread(self.response_cache.get, key)
+            if cached is not None:
+                if on_content_delta and cached.content:
+                    await on_content_delta(cached.content)
+                return cached
+        response = await self._run_with_retry(
             self._safe_chat_stream,
             kw,
             messages,
             retry_mode=retry_mode,
             on_retry_wait=on_retry_wait,
         )
+        if key is not None:
+            await asyncio.to_thread(self.response_cache.put, key, response)
+        return response
 
     async def chat_with_retry(
         self,
@@ -544,6 +655,7 @@ class LLMProvider(ABC):
         tool_choice: str | dict[str, Any] | None = None,
         retry_mode: str = "standard",
         on_retry_wait: Callable[[str], Awaitable[None]] | None = None,
+        cache: bool | None = None,
     ) -> LLMResponse:
         """Call chat() with retry on transient provider failures.
 
@@ -553,6 +665,10 @@ class LLMProvider(ABC):
         normalized to the provider's generation defaults so that downstream
         ``_build_kwargs`` never sees ``None`` for ``max_tokens`` / ``temperature``
         (which would crash ``max(1, max_tokens)``).
+
+        With a :attr:`response_cache` configured, ``cache=True`` serves
+        byte-identical requests from disk; ``cache=None`` follows the cache's
+        ``interactive`` setting and ``cache=False`` always bypasses it.
         """
         if max_tokens is self._SENTINEL or max_tokens is None:
             max_tokens = self.generation.max_tokens
@@ -566,13 +682,31 @@ class LLMProvider(ABC):
             max_tokens=max_tokens, temperature=temperature,
             reasoning_effort=reasoning_effort, tool_choice=tool_choice,
         )
-        return await self._run_with_retry(
+        key = self._response_cache_key(kw, cache)
+        if key is not None:
+            cached = await asyncio.to_thread(self.response_cache.get, key)
+            if cached is not None:
+                return cached
+        response = await self._run_with_retry(
             self._safe_chat,
             kw,
             messages,
             retry_mode=retry_mode,
             on_retry_wait=on_retry_wait,
         )
+        if key is not None:
+            await asyncio.to_thread(self.response_cache.put, key, response)
+        return response
+
+    def _response_cache_key(self, kw: dict[str, Any], cache: bool | None) -> str | None:
+        """Cache key for this request, or None when it should not be cached."""
+        if self.response_cache is None:
+            return None
+        if not (self.response_cache.interactive if cache is None else cache):
+            return None
+        request = {k: v for k, v in kw.items() if k != "on_content_delta"}
+        request["model"] = kw.get("model") or self.get_default_model()
+        return response_cache_key(f"{type(self).__name__}:{self.api_base or ''}", request)
 
     @classmethod
     def _extract_retry_after(cls, content: str | None) -> float | None:
@@ -751,6 +885,10 @@ class LLMProvider(ABC):
                 int(round(delay)),
                 (response.content or "")[:120].lower(),
             )
+            if self.metrics is not None:
+                self.metrics.record_retry_wait(
+                    self.metrics_label, kw.get("model") or self.get_default_model(), delay,
+                )
             await self._sleep_with_heartbeat(
                 delay,
                 attempt=attempt,
@@ -0,0 +1,78 @@
+"""Memoize per-message request conversions across LLM calls."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def message_key(msg: dict[str, Any]) -> tuple[Hashable, list[Any]]:
+    """Cheap cache key for *msg*, plus the objects the key refers to by id.
+
+    Scalars are keyed by value (a ``str`` caches its own hash, so re-sent
+    history costs O(number of keys)).  Containers are keyed by identity and,
+    for lists, the identity of each item, so replacing a block inside a
+    content list (as :meth:`LLMProvider._strip_image_content_inplace` does)
+    yields a new key.  The returned references must be kept alive for as
+    long as the key is stored, so that ids are never reused.
+    """
+    parts: list[Hashable] = []
+    refs: list[Any] = []
+    for k, v in msg.items():
+        if isinstance(v, _SCALARS):
+            parts.append((k, v))
+        elif isinstance(v, list):
+            parts.append((k, id(v), tuple(map(id, v))))
+            refs.append(v)
+            refs.extend(v)
+        else:
+            parts.append((k, id(v)))
+            refs.append(v)
+    return tuple(parts), refs
+
+
+@dataclass
+class MessageCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+class MessageConversionCache:
+    """LRU map from (pass, message key) to the converted message.
+
+    History messages are re-sent unchanged on every LLM call, so each
+    provider-specific conversion (sanitizing, tool-call normalization, format
+    translation) only has to run once per message.  See :func:`message_key`
+    for what counts as unchanged.
+
+    Converted values are shared between calls: callers must copy before
+    mutating them.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.stats = MessageCacheStats()
+        self._entries: OrderedDict[tuple[str, Hashable], tuple[list[Any], Any]] = OrderedDict()
+
+    def convert(self, tag: str, msg: dict[str, Any], fn: Callable[[dict[str, Any]], Any]) -> Any:
+        """Return ``fn(msg)``, reusing an earlier result for an unchanged message."""
+        parts, refs = message_key(msg)
+        key = (tag, parts)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[1]
+        self.stats.misses += 1
+        value = fn(msg)
+        self._entries[key] = (refs, value)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,415 @@
+"""Latency and throughput metrics for LLM calls (TTFT, tokens/s, stalls, retries)."""
+
+from __future__ import annotations
+
+import bisect
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+_SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+_RATE_BUCKETS = (1.0, 5.0, 10.0, 20.0, 50.0, 100.0, 200.0, 500.0)
+_BYTES_BUCKETS = (1e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 5e6, 1e7)
+
+_current_session: ContextVar[str | None] = ContextVar("llm_metrics_session", default=None)
+
+
+@contextmanager
+def metrics_session(session_key: str | None) -> Iterator[None]:
+    """Attribute LLM calls made inside this block to *session_key* (None keeps the outer one)."""
+    token = _current_session.set(session_key or _current_session.get())
+    try:
+        yield
+    finally:
+        _current_session.reset(token)
+
+
+@contextmanager
+def no_metrics_session() -> Iterator[None]:
+    """Run LLM calls made inside this block outside any session (background work)."""
+    token = _current_session.set(None)
+    try:
+        yield
+    finally:
+        _current_session.reset(token)
+
+
+def current_session() -> str | None:
+    """Session key set by the innermost :func:`metrics_session` block, if any."""
+    return _current_session.get()
+
+
+def payload_size(value: Any) -> int:
+    """Approximate serialized size of a request body: string lengths plus a little per value.
+
+    Cheap enough to run on every call: nothing is serialized, and a base64
+    image URL costs one ``len``.
+    """
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, dict):
+        return sum(len(k) + 4 + payload_size(v) for k, v in value.items()) + 2
+    if isinstance(value, list | tuple):
+        return sum(payload_size(item) + 1 for item in value) + 2
+    return 4 if value is None else len(str(value))
+
+
+@dataclass
+class LLMCallMetrics:
+    """Timing of one provider ``chat``/``chat_stream`` attempt."""
+
+    provider: str
+    model: str
+    streaming: bool
+    latency_s: float  # request sent → response complete
+    session: str | None = None
+    ttft_s: float | None = None  # time to first streamed text
+    max_gap_s: float | None = None  # longest pause between streamed deltas
+    stream_deltas: int = 0
+    output_tokens: int = 0
+    prompt_tokens: int = 0  # including cached and cache-written tokens
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    payload_bytes: int = 0  # approximate size of messages + tools
+    queue_wait_s: float = 0.0  # client-side rate-limit admission
+    finish_reason: str = "stop"
+    error_kind: str | None = None
+
+    @property
+    def tokens_per_s(self) -> float | None:
+        """Output throughput, measured from the first token when streaming."""
+        duration = self.latency_s - (self.ttft_s or 0.0)
+        if not self.output_tokens or duration <= 0:
+            return None
+        return self.output_tokens / duration
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the *q* quantile by interpolating inside its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * ((rank - seen) / n)
+            seen += n
+        return self.buckets[-1]
+
+
+def metric_header(out: list[str], metric: str, kind: str, help_text: str) -> str:
+    """Append the ``# HELP``/``# TYPE`` lines of *metric* to *out*; returns *metric*."""
+    out.append(f"# HELP {metric} {help_text}")
+    out.append(f"# TYPE {metric} {kind}")
+    return metric
+
+
+def label_value(value: str) -> str:
+    """Escape *value* for use inside a quoted Prometheus label."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_histogram(metric: str, labels: str, hist: Histogram) -> list[str]:
+    """Prometheus sample lines (buckets, sum, count) of *hist* under *labels* (``k="v",...``)."""
+    lines = []
+    cumulative = 0
+    for bound, n in zip((*hist.buckets, "+Inf"), hist.counts):
+        cumulative += n
+        le = bound if isinstance(bound, str) else f"{bound:g}"
+        lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {cumulative}')
+    lines.append(f"{metric}_sum{{{labels}}} {hist.sum:g}")
+    lines.append(f"{metric}_count{{{labels}}} {hist.count}")
+    return lines
+
+
+_HISTOGRAMS: dict[str, tuple[tuple[float, ...], str]] = {
+    "latency_seconds": (_SECONDS_BUCKETS, "LLM request latency"),
+    "ttft_seconds": (_SECONDS_BUCKETS, "Time to first streamed token"),
+    "stall_seconds": (_SECONDS_BUCKETS, "Longest gap between streamed deltas"),
+    "output_tokens_per_second": (_RATE_BUCKETS, "Output token throughput"),
+    "payload_bytes": (_BYTES_BUCKETS, "Approximate request size"),
+    "queue_wait_seconds": (_SECONDS_BUCKETS, "Client-side rate-limit wait"),
+    "retry_wait_seconds": (_SECONDS_BUCKETS, "Back-off sleep between retries"),
+}
+
+
+@dataclass
+class _SessionTotals:
+    calls: int = 0
+    errors: int = 0
+    latency_s: float = 0.0
+    retry_wait_s: float = 0.0
+    output_tokens: int = 0
+    prompt_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+
+
+@dataclass
+class _Series:
+    histograms: dict[str, Histogram] = field(default_factory=lambda: {
+        name: Histogram(buckets) for name, (buckets, _) in _HISTOGRAMS.items()
+    })
+    calls: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+
+
+def _cache_hit_line(prompt_tokens: int, read: int, written: int) -> str | None:
+    if not prompt_tokens or not (read or written):
+        return None
+    return f"cache {read / prompt_tokens:.0%} read, {written / prompt_tokens:.0%} written"
+
+
+class ProviderMetrics:
+    """In-process registry of :class:`LLMCallMetrics`, aggregated per (provider, model).
+
+    Per-session totals are kept for the most recent *max_sessions* sessions.
+    Listeners added with :meth:`subscribe` receive every call as it is
+    recorded; a failing listener is logged and skipped.
+    """
+
+    def __init__(self, max_sessions: int = 256):
+        self.max_sessions = max_sessions
+        self._series: dict[tuple[str, str], _Series] = {}
+        self._sessions: OrderedDict[str, _SessionTotals] = OrderedDict()
+        self._listeners: list[Callable[[LLMCallMetrics], None]] = []
+        self.started_at = time.time()
+
+    def subscribe(self, listener: Callable[[LLMCallMetrics], None]) -> Callable[[], None]:
+        """Call *listener* for every recorded call; returns an unsubscribe function."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _series_for(self, provider: str, model: str) -> _Series:
+        key = (provider, model)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series()
+        return series
+
+    def _session(self, key: str | None) -> _SessionTotals | None:
+        if not key:
+            return None
+        totals = self._sessions.get(key)
+        if totals is None:
+            totals = self._sessions[key] = _SessionTotals()
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(key)
+        return totals
+
+    def record(self, call: LLMCallMetrics) -> None:
+        if call.session is None:
+            call.session = _current_session.get()
+        series = self._series_for(call.provider, call.model)
+        h = series.histograms
+        series.calls += 1
+        failed = call.finish_reason == "error"
+        if failed:
+            series.errors += 1
+        series.prompt_tokens += call.prompt_tokens
+        series.cache_read_tokens += call.cache_read_tokens
+        series.cache_write_tokens += call.cache_write_tokens
+        h["latency_seconds"].observe(call.latency_s)
+        h["payload_bytes"].observe(call.payload_bytes)
+        h["queue_wait_seconds"].observe(call.queue_wait_s)
+        if call.ttft_s is not None:
+            h["ttft_seconds"].observe(call.ttft_s)
+        if call.max_gap_s is not None:
+            h["stall_seconds"].observe(call.max_gap_s)
+        if not failed and call.tokens_per_s is not None:
+            h["output_tokens_per_second"].observe(call.tokens_per_s)
+        totals = self._session(call.session)
+        if totals is not None:
+            totals.calls += 1
+            totals.errors += int(failed)
+            totals.latency_s += call.latency_s
+            totals.output_tokens += call.output_tokens
+            totals.prompt_tokens += call.prompt_tokens
+            totals.cache_read_tokens += call.cache_read_tokens
+            totals.cache_write_tokens += call.cache_write_tokens
+        for listener in list(self._listeners):
+            try:
+                listener(call)
+            except Exception:
+                logger.exception("LLM metrics listener failed")
+
+    def record_retry_wait(self, provider: str, model: str, seconds: float) -> None:
+        self._series_for(provider, model).histograms["retry_wait_seconds"].observe(seconds)
+        totals = self._session(_current_session.get())
+        if totals is not None:
+            totals.retry_wait_s += seconds
+
+    def snapshot(self) -> dict[str, Any]:
+        """JSON-friendly summary: per-series counts and p50/p95 estimates."""
+        series = []
+        for (provider, model), s in sorted(self._series.items()):
+            entry: dict[str, Any] = {
+                "provider": provider, "model": model, "calls": s.calls, "errors": s.errors,
+                "prompt_tokens": s.prompt_tokens,
+                "cache_read_tokens": s.cache_read_tokens,
+                "cache_write_tokens": s.cache_write_tokens,
+            }
+            for name, hist in s.histograms.items():
+                if hist.count:
+                    entry[name] = {
+                        "count": hist.count,
+                        "p50": hist.quantile(0.5),
+                        "p95": hist.quantile(0.95),
+                        "mean": hist.sum / hist.count,
+                    }
+            series.append(entry)
+        sessions = {key: vars(t).copy() for key, t in self._sessions.items()}
+        return {"series": series, "sessions": sessions}
+
+    def status_lines(self, model: str | None = None, session: str | None = None) -> list[str]:
+        """Short human-readable lines for ``/status``."""
+        lines = []
+        for (provider, series_model), s in sorted(self._series.items()):
+            if model and series_model != model:
+                continue
+            h = s.histograms
+            parts = [f"{s.calls} calls"]
+            if s.errors:
+                parts.append(f"{s.errors} errors")
+            for label, name, fmt in (
+                ("TTFT p50", "ttft_seconds", "{:.1f}s"),
+                ("p95", "ttft_seconds", "{:.1f}s"),
+                ("latency p95", "latency_seconds", "{:.1f}s"),
+                ("", "output_tokens_per_second", "{:.0f} tok/s"),
+            ):
+                hist = h[name]
+                if hist.count:
+                    value = hist.quantile(0.95 if "p95" in label else 0.5)
+                    parts.append(f"{label} {fmt.format(value)}".strip())
+            cache = _cache_hit_line(s.prompt_tokens, s.cache_read_tokens, s.cache_write_tokens)
+            if cache:
+                parts.append(cache)
+            lines.append(f"{provider}/{series_model}: " + ", ".join(parts))
+        totals = self._sessions.get(session) if session else None
+        if totals and totals.calls:
+            line = (
+                f"this session: {totals.calls} calls, "
+                f"{totals.latency_s / totals.calls:.1f}s avg"
+            )
+            if totals.retry_wait_s:
+                line += f", {totals.retry_wait_s:.0f}s retry wait"
+            cache = _cache_hit_line(
+                totals.prompt_tokens, totals.cache_read_tokens, totals.cache_write_tokens,
+            )
+            if cache:
+                line += f", {cache}"
+            lines.append(line)
+        return lines
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition of all histograms and counters."""
+        out: list[str] = []
+
+        def _labels(provider: str, model: str) -> str:
+            return f'provider="{label_value(provider)}",model="{label_value(model)}"'
+
+        for name, (_, help_text) in _HISTOGRAMS.items():
+            metric = metric_header(out, f"nanobot_llm_{name}", "histogram", help_text)
+            for (provider, model), s in sorted(self._series.items()):
+                out.extend(render_histogram(metric, _labels(provider, model), s.histograms[name]))
+        for name, attr, help_text in (
+            ("requests_total", "calls", "LLM requests"),
+            ("errors_total", "errors", "LLM requests that returned an error"),
+            ("prompt_tokens_total", "prompt_tokens", "Prompt tokens, cached ones included"),
+            ("cache_read_tokens_total", "cache_read_tokens", "Prompt tokens read from cache"),
+            ("cache_write_tokens_total", "cache_write_tokens", "Prompt tokens written to cache"),
+        ):
+            metric = metric_header(out, f"nanobot_llm_{name}", "counter", help_text)
+            for (provider, model), s in sorted(self._series.items()):
+                labels = _labels(provider, model)
+                out.append(f"{metric}{{{labels}}} {getattr(s, attr)}")
+        return "\n".join(out) + "\n"
+
+
+class CallTimer:
+    """Measure one call: admission wait, first streamed delta and the gaps between deltas."""
+
+    __slots__ = ("started", "admitted", "first", "last", "max_gap", "deltas")
+
+    def __init__(self) -> None:
+        self.started = self.admitted = time.monotonic()
+        self.first: float | None = None
+        self.last: float | None = None
+        self.max_gap = 0.0
+        self.deltas = 0
+
+    def mark_admitted(self) -> None:
+        self.admitted = time.monotonic()
+
+    def wrap(
+        self, on_delta: Callable[[str], Awaitable[None]]
+    ) -> Callable[[str], Awaitable[None]]:
+        async def _timed(text: str) -> None:
+            now = time.monotonic()
+            if self.first is None:
+                self.first = now
+            else:
+                self.max_gap = max(self.max_gap, now - self.last)
+            self.last = now
+            self.deltas += 1
+            await on_delta(text)
+
+        return _timed
+
+    def finish(
+        self, *, provider: str, model: str, streaming: bool, payload_bytes: int,
+        finish_reason: str, usage: dict[str, int] | None, error_kind: str | None = None,
+    ) -> LLMCallMetrics:
+        now = time.monotonic()
+        usage = usage or {}
+        return LLMCallMetrics(
+            provider=provider,
+            model=model,
+            streaming=streaming,
+            latency_s=now - self.admitted,
+            ttft_s=None if self.first is None else self.first - self.admitted,
+            max_gap_s=(
+                max(self.max_gap, now - self.last) if self.last is not None else None
+            ),
+            stream_deltas=self.deltas,
+            output_tokens=usage.get("completion_tokens", 0),
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            cache_read_tokens=usage.get(
+                "cache_read_input_tokens", usage.get("cached_tokens", 0),
+            ),
+            cache_write_tokens=usage.get("cache_creation_input_tokens", 0),
+            payload_bytes=payload_bytes,
+            queue_wait_s=self.admitted - self.started,
+            finish_reason=finish_reason,
+            error_kind=error_kind,
+        )
@@ -0,0 +1,241 @@
+"""Offline mock provider: replays scripted or recorded turns with simulated timing."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+
+def _approx_tokens(text: str) -> int:
+    return max(1, len(text) // 4) if text else 0
+
+
+def _turn_from_record(record: dict[str, Any]) -> dict[str, Any] | None:
+    """Normalize one script line into ``LLMResponse`` keyword arguments.
+
+    Accepts plain turns (``{"content": ..., "tool_calls": [{"name", "arguments"}]}``),
+    assistant messages in OpenAI format (as stored in session files) and
+    response-cache entries (``{"created": ..., "response": {...}}``).  Other
+    records (user/tool messages, session metadata) are skipped.
+    """
+    if "response" in record and "created" in record:
+        record = record["response"]
+    elif "role" in record:
+        if record["role"] != "assistant":
+            return None
+    elif record.get("_type"):
+        return None
+
+    tool_calls = []
+    for i, tc in enumerate(record.get("tool_calls") or []):
+        fn = tc.get("function") or tc
+        args = fn.get("arguments") or {}
+        if isinstance(args, str):
+            try:
+                args = json.loads(args) if args else {}
+            except ValueError:
+                args = {"raw": args}
+        tool_calls.append(ToolCallRequest(
+            id=tc.get("id") or f"call_mock_{i}", name=fn["name"], arguments=args,
+        ))
+    content = record.get("content")
+    if isinstance(content, list):
+        content = "".join(
+            b.get("text", "") for b in content if isinstance(b, dict) and b.get("type") == "text"
+        )
+    return {
+        "content": content,
+        "tool_calls": tool_calls,
+        "finish_reason": record.get("finish_reason") or ("tool_calls" if tool_calls else "stop"),
+        "usage": dict(record.get("usage") or {}),
+        "reasoning_content": record.get("reasoning_content"),
+        "error_status_code": record.get("error_status_code"),
+    }
+
+
+def load_script(path: str | Path) -> list[dict[str, Any]]:
+    """Read records from a JSON list or a JSONL file (e.g. a nanobot session file)."""
+    text = Path(path).expanduser().read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+class MockProvider(LLMProvider):
+    """Deterministic, fully offline provider for load tests and benchmarks.
+
+    Each call answers with script turn ``n % len(script)``, where *n* is the
+    number of assistant messages already in the request.  A conversation
+    therefore replays the same way no matter how many run concurrently or in
+    which order.  Without a script every call echoes the last user message.
+
+    Timing is simulated: *ttft_s* before the first token, then
+    *tokens_per_s* (0 = instant) for the rest, streamed in chunks of about
+    *chunk_tokens*.  *error_rate* and *rate_limit_rate* inject 500 and 429
+    responses from a seeded RNG.  Usage is taken from the turn when
+    recorded, otherwise estimated at four characters per token.
+    """
+
+    def __init__(
+        self,
+        default_model: str = "mock",
+        *,
+        script: list[dict[str, Any]] | str | Path | None = None,
+        ttft_s: float = 0.0,
+        tokens_per_s: float = 0.0,
+        chunk_tokens: int = 4,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after_s: float = 1.0,
+        seed: int = 0,
+    ):
+        super().__init__(api_key=None, api_base=None)
+        self.default_model = default_model
+        if isinstance(script, (str, Path)):
+            script = load_script(script)
+        self.script = [
+            turn for record in script or [] if (turn := _turn_from_record(record)) is not None
+        ]
+        self.ttft_s = ttft_s
+        self.tokens_per_s = tokens_per_s
+        self.chunk_tokens = max(1, chunk_tokens)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after_s = retry_after_s
+        self._rng = random.Random(seed)
+        self.calls = 0
+
+    def get_default_model(self) -> str:
+        return self.default_model
+
+    def _injected_error(self) -> LLMResponse | None:
+        roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            return LLMResponse(
+                content="Error calling LLM: 429 rate limit exceeded (mock)",
+                finish_reason="error",
+                error_status_code=429,
+                error_code="rate_limit_exceeded",
+                error_retry_after_s=self.retry_after_s,
+                rate_limit_headers={"retry-after": f"{self.retry_after_s:g}"},
+            )
+        if roll < self.rate_limit_rate + self.error_rate:
+            return LLMResponse(
+                content="Error calling LLM: 500 internal server error (mock)",
+                finish_reason="error",
+                error_status_code=500,
+            )
+        return None
+
+    def _next_turn(self, messages: list[dict[str, Any]]) -> dict[str, Any]:
+        if self.script:
+            index = sum(1 for m in messages if m.get("role") == "assistant")
+            return self.script[index % len(self.script)]
+        last_user = next(
+            (m.get("content") for m in reversed(messages) if m.get("role") == "user"), ""
+        )
+        if isinstance(last_user, list):
+            last_user = " ".join(
+                b.get("text", "") for b in last_user if isinstance(b, dict)
+            )
+        return {
+            "content": f"mock: {last_user}",
+            "tool_calls": [],
+            "finish_reason": "stop",
+            "usage": {},
+        }
+
+    def _respond(self, messages: list[dict[str, Any]]) -> LLMResponse:
+        self.calls += 1
+        turn = self._next_turn(messages)
+        if turn.get("error_status_code"):
+            return LLMResponse(
+                content=f"Error calling LLM: {turn['error_status_code']} (mock)",
+                finish_reason="error",
+                error_status_code=turn["error_status_code"],
+                error_retry_after_s=self.retry_after_s,
+            )
+        content = turn.get("content")
+        usage = dict(turn.get("usage") or {})
+        if not usage:
+            prompt = sum(_approx_tokens(str(m.get("content") or "")) for m in messages)
+            completion = _approx_tokens(content or "") + sum(
+                _approx_tokens(json.dumps(tc.arguments)) for tc in turn["tool_calls"]
+            )
+            usage = {
+                "prompt_tokens": prompt,
+                "completion_tokens": completion,
+                "total_tokens": prompt + completion,
+            }
+        return LLMResponse(
+            content=content,
+            tool_calls=[
+                # Replayed turns repeat; keep ids unique within a conversation.
+                ToolCallRequest(id=f"{tc.id}_{self.calls}", name=tc.name, arguments=dict(tc.arguments))
+                for tc in turn["tool_calls"]
+            ],
+            finish_reason=turn.get("finish_reason") or "stop",
+            usage=usage,
+            reasoning_content=turn.get("reasoning_content"),
+        )
+
+    def _generation_time(self, response: LLMResponse) -> float:
+        if self.tokens_per_s <= 0:
+            return 0.0
+        return response.usage.get("completion_tokens", 0) / self.tokens_per_s
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        reasoning_effort: str | None = None,
+        tool_choice: str | dict[str, Any] | None = None,
+    ) -> LLMResponse:
+        error = self._injected_error()
+        if error is not None:
+            await asyncio.sleep(self.ttft_s)
+            return error
+        response = self._respond(messages)
+        delay = self.ttft_s + self._generation_time(response)
+        if delay:
+            await asyncio.sleep(delay)
+        return response
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        reasoning_effort: str | None = None,
+        tool_choice: str | dict[str, Any] | None = None,
+        on_content_delta: Callable[[str], Awaitable[None]] | None = None,
+    ) -> LLMResponse:
+        error = self._injected_error()
+        if self.ttft_s:
+            await asyncio.sleep(self.ttft_s)
+        if error is not None:
+            return error
+        response = self._respond(messages)
+        text = response.content or ""
+        step = self.chunk_tokens * 4  # characters per delta
+        chunks = [text[i:i + step] for i in range(0, len(text), step)]
+        gap = self._generation_time(response) / max(1, len(chunks))
+        for i, chunk in enumerate(chunks):
+            if i and gap:
+                await asyncio.sleep(gap)
+            if on_content_delta:
+                await on_content_delta(chunk)
+        if not chunks and gap:
+            await asyncio.sleep(gap)
+        return response
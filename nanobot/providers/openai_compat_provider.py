@@ -7,6 +7,7 @@ import json
 import hashlib
 import importlib.util
 import os
+import re
 import secrets
 import string
 import uuid
@@ -266,42 +267,49 @@ class OpenAICompatProvider(LLMProvider):
 
     def _sanitize_messages(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Strip non-standard keys, normalize tool_call IDs."""
-        sanitized = LLMProvider._sanitize_request_messages(messages, _ALLOWED_MSG_KEYS)
-        id_map: dict[str, str] = {}
-
-        def map_id(value: Any) -> Any:
-            if not isinstance(value, str):
-                return value
-            return id_map.setdefault(value, self._normalize_tool_call_id(value))
-
-        for clean in sanitized:
-            if isinstance(clean.get("tool_calls"), list):
-                normalized = []
-                for tc in clean["tool_calls"]:
-                    if not isinstance(tc, dict):
-                        normalized.append(tc)
-                        continue
-                    tc_clean = dict(tc)
-                    tc_clean["id"] = map_id(tc_clean.get("id"))
-                    function = tc_clean.get("function")
-                    if isinstance(function, dict):
-                        function_clean = dict(function)
-                        if "arguments" in function_clean:
-                            function_clean["arguments"] = self._normalize_tool_call_arguments(
-                                function_clean.get("arguments")
-                            )
-                        else:
-                            function_clean["arguments"] = "{}"
-                        tc_clean["function"] = function_clean
-                    normalized.append(tc_clean)
-                clean["tool_calls"] = normalized
-                if clean.get("role") == "assistant":
-                    # Some OpenAI-compatible gateways reject assistant messages
-                    # that mix non-empty content with tool_calls.
-                    clean["content"] = None
-            if "tool_call_id" in clean and clean["tool_call_id"]:
-                clean["tool_call_id"] = map_id(clean["tool_call_id"])
-        return self._enforce_role_alternation(sanitized)
+        return self._enforce_role_alternation([self._sanitize_message(msg) for msg in messages])
+
+    def _sanitize_message(self, msg: dict[str, Any]) -> dict[str, Any]:
+        """Per-message body of :meth:`_sanitize_messages` (before role alternation)."""
+        clean = LLMProvider._sanitize_request_messages([msg], _ALLOWED_MSG_KEYS)[0]
+        if isinstance(clean.get("tool_calls"), list):
+            normalized = []
+            for tc in clean["tool_calls"]:
+                if not isinstance(tc, dict):
+                    normalized.append(tc)
+                    continue
+                tc_clean = dict(tc)
+                tc_clean["id"] = self._normalize_tool_call_id(tc_clean.get("id"))
+                function = tc_clean.get("function")
+                if isinstance(function, dict):
+                    function_clean = dict(function)
+                    if "arguments" in function_clean:
+                        function_clean["arguments"] = self._normalize_tool_call_arguments(
+                            function_clean.get("arguments")
+                        )
+                    else:
+                        function_clean["arguments"] = "{}"
+                    tc_clean["function"] = function_clean
+                normalized.append(tc_clean)
+            clean["tool_calls"] = normalized
+            if clean.get("role") == "assistant":
+                # Some OpenAI-compatible gateways reject assistant messages
+                # that mix non-empty content with tool_calls.
+                clean["content"] = None
+        if "tool_call_id" in clean and clean["tool_call_id"]:
+            clean["tool_call_id"] = self._normalize_tool_call_id(clean["tool_call_id"])
+        return clean
+
+    def _prepare_messages(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """``_sanitize_messages(_sanitize_empty_content(messages))``, memoized per message."""
+        conversions = self._message_conversions
+
+        def _convert(msg: dict[str, Any]) -> dict[str, Any]:
+            return self._sanitize_message(self._sanitize_empty_message(msg))
+
+        return self._enforce_role_alternation(
+            [conversions.convert("openai", msg, _convert) for msg in messages]
+        )
 
     # ------------------------------------------------------------------
     # Build kwargs
@@ -345,7 +353,7 @@ class OpenAICompatProvider(LLMProvider):
 
         kwargs: dict[str, Any] = {
             "model": model_name,
-            "messages": self._sanitize_messages(self._sanitize_empty_content(messages)),
+            "messages": self._prepare_messages(messages),
         }
 
         # GPT-5 and reasoning models (o1/o3/o4) reject temperature when
@@ -459,7 +467,7 @@ class OpenAICompatProvider(LLMProvider):
     ) -> dict[str, Any]:
         """Build a Responses API body for direct OpenAI requests."""
         model_name = model or self.default_model
-        sanitized_messages = self._sanitize_messages(self._sanitize_empty_content(messages))
+        sanitized_messages = self._prepare_messages(messages)
         instructions, input_items = convert_messages(sanitized_messages)
 
         body: dict[str, Any] = {
@@ -711,106 +719,10 @@ class OpenAICompatProvider(LLMProvider):
 
     @classmethod
     def _parse_chunks(cls, chunks: list[Any]) -> LLMResponse:
-        content_parts: list[str] = []
-        reasoning_parts: list[str] = []
-        tc_bufs: dict[int, dict[str, Any]] = {}
-        finish_reason = "stop"
-        usage: dict[str, int] = {}
-
-        def _accum_tc(tc: Any, idx_hint: int) -> None:
-            """Accumulate one streaming tool-call delta into *tc_bufs*."""
-            tc_index: int = _get(tc, "index") if _get(tc, "index") is not None else idx_hint
-            buf = tc_bufs.setdefault(tc_index, {
-                "id": "", "name": "", "arguments": "",
-                "extra_content": None, "prov": None, "fn_prov": None,
-            })
-            tc_id = _get(tc, "id")
-            if tc_id:
-                buf["id"] = str(tc_id)
-            fn = _get(tc, "function")
-            if fn is not None:
-                fn_name = _get(fn, "name")
-                if fn_name:
-                    buf["name"] = str(fn_name)
-                fn_args = _get(fn, "arguments")
-                if fn_args:
-                    buf["arguments"] += str(fn_args)
-            ec, prov, fn_prov = _extract_tc_extras(tc)
-            if ec:
-                buf["extra_content"] = ec
-            if prov:
-                buf["prov"] = prov
-            if fn_prov:
-                buf["fn_prov"] = fn_prov
-
+        assembler = ChatStreamAssembler()
         for chunk in chunks:
-            if isinstance(chunk, str):
-                content_parts.append(chunk)
-                continue
-
-            chunk_map = cls._maybe_mapping(chunk)
-            if chunk_map is not None:
-                choices = chunk_map.get("choices") or []
-                if not choices:
-                    usage = cls._extract_usage(chunk_map) or usage
-                    text = cls._extract_text_content(
-                        chunk_map.get("content") or chunk_map.get("output_text")
-                    )
-                    if text:
-                        content_parts.append(text)
-                    continue
-                choice = cls._maybe_mapping(choices[0]) or {}
-                if choice.get("finish_reason"):
-                    finish_reason = str(choice["finish_reason"])
-                delta = cls._maybe_mapping(choice.get("delta")) or {}
-                text = cls._extract_text_content(delta.get("content"))
-                if text:
-                    content_parts.append(text)
-                text = cls._extract_text_content(delta.get("reasoning_content"))
-                if not text:
-                    text = cls._extract_text_content(delta.get("reasoning"))
-                if text:
-                    reasoning_parts.append(text)
-                for idx, tc in enumerate(delta.get("tool_calls") or []):
-                    _accum_tc(tc, idx)
-                usage = cls._extract_usage(chunk_map) or usage
-                continue
-
-            if not chunk.choices:
-                usage = cls._extract_usage(chunk) or usage
-                continue
-            choice = chunk.choices[0]
-            if choice.finish_reason:
-                finish_reason = choice.finish_reason
-            delta = choice.delta
-            if delta and delta.content:
-                content_parts.append(delta.content)
-            if delta:
-                reasoning = getattr(delta, "reasoning_content", None)
-                if not reasoning:
-                    reasoning = getattr(delta, "reasoning", None)
-                if reasoning:
-                    reasoning_parts.append(reasoning)
-            for tc in (delta.tool_calls or []) if delta else []:
-                _accum_tc(tc, getattr(tc, "index", 0))
-
-        return LLMResponse(
-            content="".join(content_parts) or None,
-            tool_calls=[
-                ToolCallRequest(
-                    id=b["id"] or _short_tool_id(),
-                    name=b["name"],
-                    arguments=json_repair.loads(b["arguments"]) if b["arguments"] else {},
-                    extra_content=b.get("extra_content"),
-                    provider_specific_fields=b.get("prov"),
-                    function_provider_specific_fields=b.get("fn_prov"),
-                )
-                for b in tc_bufs.values()
-            ],
-            finish_reason=finish_reason,
-            usage=usage,
-            reasoning_content="".join(reasoning_parts) or None,
-        )
+            assembler.feed(chunk)
+        return assembler.result()
 
     @classmethod
     def _extract_error_metadata(cls, e: Exception) -> dict[str, Any]:
@@ -858,6 +770,7 @@ class OpenAICompatProvider(LLMProvider):
             "error_code": error_code,
             "error_retry_after_s": cls._extract_retry_after_from_headers(headers),
             "error_should_retry": should_retry,
+            "rate_limit_headers": cls._rate_limit_headers(headers),
         }
 
     @staticmethod
@@ -924,7 +837,10 @@ class OpenAICompatProvider(LLMProvider):
                 messages, tools, model, max_tokens, temperature,
                 reasoning_effort, tool_choice,
             )
-            return self._parse(await self._client.chat.completions.create(**kwargs))
+            raw = await self._client.chat.completions.with_raw_response.create(**kwargs)
+            resp = self._parse(raw.parse())
+            resp.rate_limit_headers = self._rate_limit_headers(raw.headers)
+            return resp
         except Exception as e:
             return self._handle_error(e, spec=self._spec, api_base=self.api_base)
 
@@ -983,7 +899,7 @@ class OpenAICompatProvider(LLMProvider):
             kwargs["stream"] = True
             kwargs["stream_options"] = {"include_usage": True}
             stream = await self._client.chat.completions.create(**kwargs)
-            chunks: list[Any] = []
+            assembler = ChatStreamAssembler()
             stream_iter = stream.__aiter__()
             while True:
                 try:
@@ -993,12 +909,14 @@ class OpenAICompatProvider(LLMProvider):
                     )
                 except StopAsyncIteration:
                     break
-                chunks.append(chunk)
-                if on_content_delta and chunk.choices:
-                    text = getattr(chunk.choices[0].delta, "content", None)
-                    if text:
-                        await on_content_delta(text)
-            return self._parse_chunks(chunks)
+                text = assembler.feed(chunk)
+                if on_content_delta and text:
+                    await on_content_delta(text)
+            resp = assembler.result()
+            resp.rate_limit_headers = self._rate_limit_headers(
+                getattr(getattr(stream, "response", None), "headers", None)
+            )
+            return resp
         except asyncio.TimeoutError:
             return LLMResponse(
                 content=(
@@ -1013,3 +931,188 @@ class OpenAICompatProvider(LLMProvider):
 
     def get_default_model(self) -> str:
         return self.default_model
+
+
+# ----------------------------------------------------------------------
+# Streaming
+# ----------------------------------------------------------------------
+
+_JSON_STRUCTURE = re.compile(r'[{}\[\]"\\]')
+
+
+class _ToolCallBuilder:
+    """One streamed tool call; tracks JSON nesting to tell when it is complete."""
+
+    __slots__ = (
+        "id", "name", "parts", "extra_content", "prov", "fn_prov",
+        "complete", "_depth", "_opened", "_in_string", "_escape",
+    )
+
+    def __init__(self) -> None:
+        self.id = ""
+        self.name = ""
+        self.parts: list[str] = []
+        self.extra_content: dict[str, Any] | None = None
+        self.prov: dict[str, Any] | None = None
+        self.fn_prov: dict[str, Any] | None = None
+        self.complete = False
+        self._depth = 0
+        self._opened = False
+        self._in_string = False
+        self._escape = False
+
+    def add_arguments(self, text: str) -> bool:
+        """Append an arguments fragment; return True when it closes the JSON value."""
+        self.parts.append(text)
+        if self.complete:
+            return False
+        # Only structural characters matter, so jump between them instead of
+        # walking the fragment one character at a time.
+        skip = 0 if self._escape else -1
+        self._escape = False
+        for m in _JSON_STRUCTURE.finditer(text):
+            i = m.start()
+            if i == skip:
+                continue
+            ch = text[i]
+            if self._in_string:
+                if ch == "\\":
+                    if i + 1 == len(text):
+                        self._escape = True
+                    skip = i + 1
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+                self._opened = True
+            else:
+                self._depth -= 1
+                if self._opened and self._depth == 0:
+                    self.complete = True
+                    return True
+        return False
+
+    def build(self) -> ToolCallRequest:
+        arguments = "".join(self.parts)
+        return ToolCallRequest(
+            id=self.id or _short_tool_id(),
+            name=self.name,
+            arguments=json_repair.loads(arguments) if arguments else {},
+            extra_content=self.extra_content,
+            provider_specific_fields=self.prov,
+            function_provider_specific_fields=self.fn_prov,
+        )
+
+
+class ChatStreamAssembler:
+    """Incrementally assemble a Chat Completions stream into an :class:`LLMResponse`.
+
+    Each chunk is folded into compact buffers as it arrives and can be
+    dropped by the caller straight away, so memory grows with the generated
+    text rather than with the number of chunk objects.  Accepts SDK chunk
+    objects, raw dict chunks and plain text chunks.
+    """
+
+    def __init__(self) -> None:
+        self._content: list[str] = []
+        self._reasoning: list[str] = []
+        self._tool_calls: dict[int, _ToolCallBuilder] = {}
+        self.completed: list[int] = []  # tool-call indices, in the order their JSON closed
+        self.finish_reason = "stop"
+        self.usage: dict[str, int] = {}
+
+    def tool_call_complete(self, index: int) -> bool:
+        builder = self._tool_calls.get(index)
+        return builder is not None and builder.complete
+
+    def _add_tool_call(self, tc: Any, idx_hint: int) -> None:
+        tc_index = _get(tc, "index")
+        index: int = tc_index if tc_index is not None else idx_hint
+        builder = self._tool_calls.get(index)
+        if builder is None:
+            builder = self._tool_calls[index] = _ToolCallBuilder()
+        tc_id = _get(tc, "id")
+        if tc_id:
+            builder.id = str(tc_id)
+        fn = _get(tc, "function")
+        if fn is not None:
+            fn_name = _get(fn, "name")
+            if fn_name:
+                builder.name = str(fn_name)
+            fn_args = _get(fn, "arguments")
+            if fn_args and builder.add_arguments(str(fn_args)):
+                self.completed.append(index)
+        ec, prov, fn_prov = _extract_tc_extras(tc)
+        if ec:
+            builder.extra_content = ec
+        if prov:
+            builder.prov = prov
+        if fn_prov:
+            builder.fn_prov = fn_prov
+
+    def feed(self, chunk: Any) -> str | None:
+        """Fold one chunk into the buffers; return its visible text delta, if any."""
+        parser = OpenAICompatProvider
+        if isinstance(chunk, str):
+            self._content.append(chunk)
+            return chunk
+
+        chunk_map = parser._maybe_mapping(chunk)
+        if chunk_map is not None:
+            choices = chunk_map.get("choices") or []
+            if not choices:
+                self.usage = parser._extract_usage(chunk_map) or self.usage
+                text = parser._extract_text_content(
+                    chunk_map.get("content") or chunk_map.get("output_text")
+                )
+                if text:
+                    self._content.append(text)
+                return text
+            choice = parser._maybe_mapping(choices[0]) or {}
+            if choice.get("finish_reason"):
+                self.finish_reason = str(choice["finish_reason"])
+            delta = parser._maybe_mapping(choice.get("delta")) or {}
+            text = parser._extract_text_content(delta.get("content"))
+            if text:
+                self._content.append(text)
+            reasoning = parser._extract_text_content(delta.get("reasoning_content"))
+            if not reasoning:
+                reasoning = parser._extract_text_content(delta.get("reasoning"))
+            if reasoning:
+                self._reasoning.append(reasoning)
+            for idx, tc in enumerate(delta.get("tool_calls") or []):
+                self._add_tool_call(tc, idx)
+            self.usage = parser._extract_usage(chunk_map) or self.usage
+            return text
+
+        if not chunk.choices:
+            self.usage = parser._extract_usage(chunk) or self.usage
+            return None
+        choice = chunk.choices[0]
+        if choice.finish_reason:
+            self.finish_reason = choice.finish_reason
+        delta = choice.delta
+        if not delta:
+            return None
+        text = delta.content or None
+        if text:
+            self._content.append(text)
+        reasoning = getattr(delta, "reasoning_content", None)
+        if not reasoning:
+            reasoning = getattr(delta, "reasoning", None)
+        if reasoning:
+            self._reasoning.append(reasoning)
+        for tc in delta.tool_calls or []:
+            self._add_tool_call(tc, getattr(tc, "index", 0))
+        return text
+
+    def result(self) -> LLMResponse:
+        return LLMResponse(
+            content="".join(self._content) or None,
+            tool_calls=[b.build() for b in self._tool_calls.values()],
+            finish_reason=self.finish_reason,
+            usage=self.usage,
+            reasoning_content="".join(self._reasoning) or None,
+        )
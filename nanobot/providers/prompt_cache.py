@@ -0,0 +1,282 @@
+"""Prompt-cache breakpoint placement for Anthropic ``cache_control`` markers.
+
+Anthropic caches the request prefix (tools, then system, then messages) up to
+each block marked with ``cache_control``; at most four markers are allowed.  A
+later request reads the cache only if its prefix is byte-identical up to a
+marked position, and a marker only finds entries written within the 20 blocks
+before it.
+
+Fixed positional rules (system tail, second-to-last message, tool tail) miss
+often in agent sessions.  Runtime context is stripped from the newest user
+message once it is saved, old tool results get microcompacted, and the
+second-to-last message moves every iteration.  :class:`PromptCacheOptimizer`
+remembers, per session, the prefix hashes of the previous request and of the
+positions it marked, and spends the markers on:
+
+1. the furthest position known to be cached (read it now);
+2. the end of the request (the next iteration of a turn appends to it);
+3. the end of the history before the newest user message (the next turn
+   strips that message's runtime context, so the prefix before it survives);
+4. the end of the prefix that stayed identical since the previous request.
+
+Remaining markers go to the structural anchors the provider passes in (system
+and tool boundaries, shared by every session).  Calls outside a session get
+exactly those anchors.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from nanobot.providers.metrics import current_session
+
+MAX_BREAKPOINTS = 4
+# Anthropic does not cache prefixes shorter than this (2048 for Haiku models).
+MIN_CACHE_TOKENS = 1024
+CACHE_TTL_S = 300.0
+
+# (section, item index, block index); block -1 marks the item itself (a tool).
+Location = tuple[str, int, int]
+
+_UNMARKABLE_TYPES = frozenset({"thinking", "redacted_thinking"})
+
+
+def _content_blocks(content: Any) -> list[Any]:
+    if isinstance(content, list):
+        return content
+    return [content] if isinstance(content, str) and content else []
+
+
+def _markable(block: Any) -> bool:
+    if isinstance(block, str):
+        return bool(block)
+    if not isinstance(block, dict) or block.get("type") in _UNMARKABLE_TYPES:
+        return False
+    return block.get("type") != "text" or bool(block.get("text"))
+
+
+def _fingerprint(value: Any) -> bytes:
+    if isinstance(value, dict) and "cache_control" in value:
+        value = {k: v for k, v in value.items() if k != "cache_control"}
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+
+
+@dataclass
+class _Prefix:
+    """The request flattened in cache order, with a hash chain over its blocks."""
+
+    locations: list[Location | None] = field(default_factory=list)  # None: not markable
+    hashes: list[bytes] = field(default_factory=list)
+    tokens: list[int] = field(default_factory=list)  # cumulative, ~4 bytes per token
+    last_user_start: int | None = None
+
+    def add(self, location: Location | None, value: Any, markable: bool = True) -> None:
+        data = _fingerprint(value)
+        prev = self.hashes[-1] if self.hashes else b""
+        self.hashes.append(hashlib.blake2b(prev + data, digest_size=16).digest())
+        self.tokens.append((self.tokens[-1] if self.tokens else 0) + len(data) // 4)
+        self.locations.append(location if markable else None)
+
+    def markable_at_or_before(self, index: int) -> int | None:
+        for i in range(index, -1, -1):
+            if self.locations[i] is not None:
+                return i
+        return None
+
+
+def flatten_request(
+    system: str | list[dict[str, Any]],
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+) -> _Prefix:
+    """Flatten an Anthropic request (tools → system → messages) into cache order."""
+    prefix = _Prefix()
+    for i, tool in enumerate(tools or []):
+        prefix.add(("tools", i, -1), tool)
+    for j, block in enumerate(_content_blocks(system)):
+        prefix.add(("system", 0, j), block, _markable(block))
+    for m, msg in enumerate(messages):
+        blocks = _content_blocks(msg.get("content"))
+        if msg.get("role") == "user" and any(
+            not (isinstance(b, dict) and b.get("type") == "tool_result") for b in blocks
+        ):
+            prefix.last_user_start = len(prefix.hashes)
+        # The role is part of the prefix: same text under another role is a miss.
+        prefix.add(None, msg.get("role"), markable=False)
+        for b, block in enumerate(blocks):
+            prefix.add(("messages", m, b), block, _markable(block))
+    return prefix
+
+
+@dataclass
+class CachePlan:
+    """Where to put ``cache_control`` markers, and what they are expected to read."""
+
+    locations: list[Location]
+    hashes: list[bytes] = field(default_factory=list)  # prefix hash at each marker
+    expected_read_tokens: int = 0
+    session: str | None = None
+    prefix: list[bytes] = field(default_factory=list, repr=False)  # full hash chain
+
+
+@dataclass
+class _SessionState:
+    previous: list[bytes] = field(default_factory=list)  # last completed request
+    written: dict[bytes, float] = field(default_factory=dict)  # prefix hash → expiry
+    requests: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    expected_read_tokens: int = 0
+
+
+class PromptCacheOptimizer:
+    """Per-session placement of up to four ``cache_control`` breakpoints.
+
+    Call :meth:`plan` while building a request and :meth:`observe` with that
+    plan and the response, so concurrent requests never see each other's
+    outcome.  Sessions are identified by
+    :func:`~nanobot.providers.metrics.metrics_session`; the most recent
+    *max_sessions* are remembered.
+    """
+
+    def __init__(self, ttl_s: float = CACHE_TTL_S, max_sessions: int = 256):
+        self.ttl_s = ttl_s
+        self.max_sessions = max_sessions
+        self._sessions: OrderedDict[str, _SessionState] = OrderedDict()
+
+    def _state(self, key: str) -> _SessionState:
+        state = self._sessions.get(key)
+        if state is None:
+            state = self._sessions[key] = _SessionState()
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(key)
+        return state
+
+    def plan(self, prefix: _Prefix, anchors: list[Location]) -> CachePlan:
+        """Choose breakpoints for the request described by *prefix*."""
+        key = current_session()
+        if key is None or not prefix.hashes:
+            return CachePlan(list(anchors[:MAX_BREAKPOINTS]))
+
+        state = self._state(key)
+        now = time.monotonic()
+        state.written = {h: exp for h, exp in state.written.items() if exp > now}
+        hashes = prefix.hashes
+        last = len(hashes) - 1
+
+        read = next((i for i in range(last, -1, -1) if hashes[i] in state.written), None)
+        stable = 0
+        for old, new in zip(state.previous, hashes):
+            if old != new:
+                break
+            stable += 1
+        turn_start = (prefix.last_user_start or 0) - 1
+
+        index_of = {loc: i for i, loc in enumerate(prefix.locations) if loc is not None}
+        candidates = [read, last, turn_start, stable - 1]
+        candidates += [index_of[a] for a in anchors if a in index_of]
+
+        chosen: list[int] = []
+        for i in candidates:
+            if i is None or i < 0:
+                continue
+            i = prefix.markable_at_or_before(i)
+            if i is None or i in chosen or prefix.tokens[i] < MIN_CACHE_TOKENS:
+                continue
+            chosen.append(i)
+            if len(chosen) == MAX_BREAKPOINTS:
+                break
+
+        chosen.sort()
+        expected = 0
+        if read is not None and (hit := prefix.markable_at_or_before(read)) in chosen:
+            expected = prefix.tokens[hit]
+        return CachePlan(
+            [prefix.locations[i] for i in chosen],
+            [hashes[i] for i in chosen],
+            expected,
+            session=key,
+            prefix=hashes,
+        )
+
+    def observe(
+        self, plan: CachePlan, usage: dict[str, int] | None, failed: bool = False,
+    ) -> None:
+        """Record the cache outcome of the request built from *plan*."""
+        key = plan.session
+        state = self._sessions.get(key) if key is not None else None
+        if state is None or failed:
+            return
+        state.previous = plan.prefix
+        usage = usage or {}
+        read = usage.get("cache_read_input_tokens", 0)
+        written = usage.get("cache_creation_input_tokens", 0)
+        expiry = time.monotonic() + self.ttl_s
+        for h in plan.hashes:
+            state.written[h] = expiry
+        state.requests += 1
+        state.cache_read_tokens += read
+        state.cache_write_tokens += written
+        state.expected_read_tokens += plan.expected_read_tokens
+        logger.debug(
+            "Prompt cache [{}]: {} breakpoints, expected read ~{}, read {}, written {}",
+            key, len(plan.locations), plan.expected_read_tokens, read, written,
+        )
+
+    def stats(self, session: str) -> dict[str, int]:
+        """Cumulative cache tokens for *session* (``{}`` when unknown)."""
+        state = self._sessions.get(session)
+        if state is None:
+            return {}
+        return {
+            "requests": state.requests,
+            "cache_read_tokens": state.cache_read_tokens,
+            "cache_write_tokens": state.cache_write_tokens,
+            "expected_read_tokens": state.expected_read_tokens,
+        }
+
+
+def apply_cache_markers(
+    system: str | list[dict[str, Any]],
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+    locations: list[Location],
+    marker: dict[str, Any] | None = None,
+) -> tuple[str | list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]] | None]:
+    """Return copies of *system*, *messages* and *tools* with *locations* marked.
+
+    Only the containers on the path to a marked block are copied; the inputs
+    may be shared memoized conversions.
+    """
+    marker = marker or {"type": "ephemeral"}
+
+    def _mark_block(block: Any) -> dict[str, Any]:
+        if isinstance(block, str):
+            return {"type": "text", "text": block, "cache_control": marker}
+        return {**block, "cache_control": marker}
+
+    def _mark_content(content: Any, index: int) -> list[Any]:
+        blocks = list(_content_blocks(content))
+        blocks[index] = _mark_block(blocks[index])
+        return blocks
+
+    new_msgs = list(messages)
+    new_tools = list(tools) if tools else tools
+    for section, item, block in locations:
+        if section == "tools":
+            new_tools[item] = _mark_block(new_tools[item])
+        elif section == "system":
+            system = _mark_content(system, block)
+        else:
+            msg = new_msgs[item]
+            new_msgs[item] = {**msg, "content": _mark_content(msg.get("content"), block)}
+    return system, new_msgs, new_tools
@@ -0,0 +1,236 @@
+"""Client-side token-bucket rate limiting and admission control for LLM calls."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any
+
+from nanobot.utils.token_bucket import TokenBucket
+
+
+class Priority(IntEnum):
+    """Admission priority; lower values are admitted first."""
+
+    INTERACTIVE = 0  # user-facing turns
+    SUBAGENT = 1  # spawned background agents
+    BACKGROUND = 2  # consolidation, Dream, heartbeat, evaluator
+
+
+_current_priority: ContextVar[Priority] = ContextVar("llm_priority", default=Priority.INTERACTIVE)
+
+
+def current_priority() -> Priority:
+    return _current_priority.get()
+
+
+@contextmanager
+def llm_priority(priority: Priority) -> Iterator[None]:
+    """Run LLM calls made inside this block (in the current task) at *priority*."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def _per_minute(limit: float) -> TokenBucket:
+    """A bucket sized to one minute of budget."""
+    return TokenBucket(limit / 60.0, limit)
+
+
+@dataclass
+class RateLimiterStats:
+    """Admission counters and queue-wait metrics for one :class:`RateLimiter`."""
+
+    admitted: dict[str, int] = field(default_factory=dict)
+    delayed: int = 0  # admissions that had to queue
+    total_wait_s: dict[str, float] = field(default_factory=dict)
+    max_wait_s: float = 0.0
+    queued: int = 0  # currently waiting
+    throttled: int = 0  # 429 responses observed
+    learned_rpm: int | None = None
+    learned_tpm: int | None = None
+
+    def mean_wait_s(self, priority: Priority | None = None) -> float:
+        if priority is not None:
+            n = self.admitted.get(priority.name.lower(), 0)
+            return self.total_wait_s.get(priority.name.lower(), 0.0) / n if n else 0.0
+        n = sum(self.admitted.values())
+        return sum(self.total_wait_s.values()) / n if n else 0.0
+
+
+# (limit header, remaining header) per dimension, OpenAI first then Anthropic.
+_REQUEST_HEADERS = (
+    ("x-ratelimit-limit-requests", "x-ratelimit-remaining-requests"),
+    ("anthropic-ratelimit-requests-limit", "anthropic-ratelimit-requests-remaining"),
+)
+_TOKEN_HEADERS = (
+    ("x-ratelimit-limit-tokens", "x-ratelimit-remaining-tokens"),
+    ("anthropic-ratelimit-input-tokens-limit", "anthropic-ratelimit-input-tokens-remaining"),
+    ("anthropic-ratelimit-tokens-limit", "anthropic-ratelimit-tokens-remaining"),
+)
+
+
+def _header_int(headers: Mapping[str, Any], name: str) -> int | None:
+    value = headers.get(name)
+    try:
+        return int(float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute admission control.
+
+    Callers :meth:`acquire` before sending a request, with the estimated
+    prompt tokens as its cost.  Waiters are admitted strictly in
+    (priority, arrival) order, so an interactive turn that arrives while a
+    Dream run is queued goes first.  Limits left unset stay unlimited until
+    learned from response headers via :meth:`observe`.
+    """
+
+    def __init__(self, rpm: int | None = None, tpm: int | None = None):
+        self._configured = (rpm, tpm)
+        self._requests = _per_minute(rpm) if rpm else None
+        self._tokens = _per_minute(tpm) if tpm else None
+        self._paused_until = 0.0
+        self._waiters: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._changed = asyncio.Event()
+        self.stats = RateLimiterStats()
+
+    @property
+    def counts_tokens(self) -> bool:
+        return self._tokens is not None
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _wait_time(self, cost: float, now: float) -> float:
+        wait = max(0.0, self._paused_until - now)
+        if self._requests is not None:
+            wait = max(wait, self._requests.wait_time(now))
+        if self._tokens is not None:
+            wait = max(wait, self._tokens.wait_time(now, min(cost, self._tokens.capacity)))
+        return wait
+
+    def _admit(self, cost: float, priority: Priority, waited: float) -> None:
+        if self._requests is not None:
+            self._requests.take()
+        if self._tokens is not None:
+            self._tokens.take(min(cost, self._tokens.capacity))
+        key = priority.name.lower()
+        self.stats.admitted[key] = self.stats.admitted.get(key, 0) + 1
+        self.stats.total_wait_s[key] = self.stats.total_wait_s.get(key, 0.0) + waited
+        if waited > 0:
+            self.stats.delayed += 1
+            self.stats.max_wait_s = max(self.stats.max_wait_s, waited)
+
+    async def acquire(self, tokens: int = 0, priority: Priority | None = None) -> float:
+        """Wait until a request costing *tokens* may be sent; return seconds waited."""
+        priority = current_priority() if priority is None else priority
+        started = time.monotonic()
+        if not self._waiters and self._wait_time(tokens, started) <= 0:
+            self._admit(tokens, priority, 0.0)
+            return 0.0
+
+        entry = (int(priority), next(self._seq))
+        heapq.heappush(self._waiters, entry)
+        self.stats.queued += 1
+        try:
+            while True:
+                timeout: float | None = None
+                if self._waiters[0] == entry:
+                    now = time.monotonic()
+                    timeout = self._wait_time(tokens, now)
+                    if timeout <= 0:
+                        waited = now - started
+                        self._admit(tokens, priority, waited)
+                        return waited
+                changed = self._changed
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+            self.stats.queued -= 1
+            self._notify()
+
+    def settle(self, estimated: int, actual: int | None) -> None:
+        """Correct the token bucket once real usage is known."""
+        if self._tokens is None or not actual:
+            return
+        self._tokens.level -= actual - min(estimated, self._tokens.capacity)
+        self._notify()
+
+    def pause(self, seconds: float) -> None:
+        """Hold all admissions for *seconds* (e.g. after a 429)."""
+        self.stats.throttled += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._notify()
+
+    def _learn(self, bucket: TokenBucket | None, configured: int | None, limit: int | None,
+               remaining: int | None) -> TokenBucket | None:
+        now = time.monotonic()
+        if limit and limit > 0:
+            per_minute = min(limit, configured) if configured else limit
+            if bucket is None:
+                bucket = _per_minute(per_minute)
+            elif bucket.capacity != per_minute:
+                bucket.resize(per_minute / 60.0, per_minute, now)
+        if bucket is not None and remaining is not None:
+            bucket.sync(remaining, now)
+        return bucket
+
+    def observe(self, headers: Mapping[str, Any] | None) -> None:
+        """Learn limits and remaining budget from provider rate-limit headers."""
+        if not headers:
+            return
+        lowered = {str(k).lower(): v for k, v in headers.items()}
+        rpm, tpm = self._configured
+        for limit_name, remaining_name in _REQUEST_HEADERS:
+            limit = _header_int(lowered, limit_name)
+            remaining = _header_int(lowered, remaining_name)
+            if limit is not None or remaining is not None:
+                self._requests = self._learn(self._requests, rpm, limit, remaining)
+                self.stats.learned_rpm = limit or self.stats.learned_rpm
+                break
+        for limit_name, remaining_name in _TOKEN_HEADERS:
+            limit = _header_int(lowered, limit_name)
+            remaining = _header_int(lowered, remaining_name)
+            if limit is not None or remaining is not None:
+                self._tokens = self._learn(self._tokens, tpm, limit, remaining)
+                self.stats.learned_tpm = limit or self.stats.learned_tpm
+                break
+        self._notify()
+
+
+class ProviderRateLimits:
+    """Per-model :class:`RateLimiter` instances sharing one provider's limits."""
+
+    def __init__(self, rpm: int | None = None, tpm: int | None = None):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._limiters: dict[str, RateLimiter] = {}
+
+    def for_model(self, model: str | None) -> RateLimiter:
+        key = model or ""
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = self._limiters[key] = RateLimiter(self.rpm, self.tpm)
+        return limiter
+
+    @property
+    def stats(self) -> dict[str, RateLimiterStats]:
+        return {model: limiter.stats for model, limiter in self._limiters.items()}
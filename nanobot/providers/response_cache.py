@@ -0,0 +1,170 @@
+"""Opt-in on-disk cache of LLM responses for deterministic, repeatable calls."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from nanobot.providers.base import LLMResponse
+
+
+@dataclass
+class ResponseCacheStats:
+    """Hit/miss counters for one :class:`ResponseCache`."""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    expired: int = 0
+    evictions: int = 0
+    tokens_saved: int = 0  # prompt + completion tokens served from cache
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def response_cache_key(namespace: str, request: dict[str, Any]) -> str:
+    """Stable hash of a provider *namespace* plus the full request payload."""
+    blob = json.dumps(
+        {"ns": namespace, **request}, sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Successful :class:`LLMResponse` objects stored as one JSON file per key.
+
+    Entries older than *ttl_s* are ignored and removed (``ttl_s=0`` keeps them
+    forever, which turns the directory into a record/replay fixture).  When
+    the directory grows past *max_bytes*, least recently used entries (by
+    mtime, refreshed on every hit) are evicted.
+
+    Only call sites that opt in (``chat_with_retry(..., cache=True)``) use
+    the cache; with *interactive* set, calls that don't say either way are
+    cached too.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        ttl_s: float = 86_400,
+        max_bytes: int = 64 * 1024 * 1024,
+        interactive: bool = False,
+    ):
+        self.directory = Path(directory)
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.interactive = interactive
+        self.stats = ResponseCacheStats()
+        self._size: int | None = None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    @property
+    def size_bytes(self) -> int:
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        return self._size
+
+    def get(self, key: str) -> LLMResponse | None:
+        """Return the cached response for *key*, or None on miss/expiry."""
+        from nanobot.providers.base import LLMResponse, ToolCallRequest
+
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.stats.misses += 1
+            return None
+        if self.ttl_s and time.time() - entry.get("created", 0) > self.ttl_s:
+            self._discard(path)
+            self.stats.expired += 1
+            self.stats.misses += 1
+            return None
+        try:
+            data = dict(entry["response"])
+            tool_calls = [ToolCallRequest(**tc) for tc in data.pop("tool_calls", [])]
+            response = LLMResponse(**data, tool_calls=tool_calls)
+        except (KeyError, TypeError):
+            logger.warning("Discarding unreadable LLM cache entry {}", path.name)
+            self._discard(path)
+            self.stats.misses += 1
+            return None
+        try:
+            os.utime(path)  # mtime tracks last use for LRU eviction
+        except OSError:
+            pass
+        self.stats.hits += 1
+        usage = response.usage or {}
+        self.stats.tokens_saved += usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0)
+        return response
+
+    def put(self, key: str, response: LLMResponse) -> None:
+        """Store a successful *response* under *key*; errors are never cached."""
+        if response.finish_reason == "error":
+            return
+        data = asdict(response)
+        data["rate_limit_headers"] = None
+        data["call_metrics"] = None
+        payload = json.dumps(
+            {"created": time.time(), "response": data}, ensure_ascii=False, default=str
+        )
+        encoded = payload.encode("utf-8")
+        path = self._path(key)
+        try:
+            previous = path.stat().st_size if path.exists() else 0
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(encoded)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("Failed to write LLM cache entry: {}", e)
+            return
+        self.stats.stores += 1
+        if self._size is not None:
+            self._size += len(encoded) - previous
+        if self.size_bytes > self.max_bytes:
+            self._evict()
+
+    def _discard(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        if self._size is not None:
+            self._size -= size
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.stats.evictions += 1
+        self._size = total
@@ -0,0 +1,341 @@
+"""Route LLM calls across several providers / API keys with failover and hedging."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse
+
+
+def _percentile(samples: deque[float], q: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+
+
+@dataclass
+class BackendStats:
+    """Latency and error counters for one routed backend."""
+
+    requests: int = 0
+    successes: int = 0
+    errors: int = 0
+    failovers: int = 0  # transient errors that moved the call to another backend
+    hedges: int = 0  # hedged requests started on this backend
+    hedge_wins: int = 0
+    cancelled: int = 0  # lost a hedge race
+    consecutive_errors: int = 0
+    cooldown_until: float = 0.0  # monotonic deadline; skipped until then
+    ewma_latency_s: float | None = None
+    last_error: str | None = None
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=128), repr=False)
+    first_token_latencies: deque[float] = field(
+        default_factory=lambda: deque(maxlen=128), repr=False
+    )
+
+    _EWMA_ALPHA = 0.2
+
+    @property
+    def p95_latency_s(self) -> float | None:
+        return _percentile(self.latencies, 0.95)
+
+    @property
+    def p95_first_token_s(self) -> float | None:
+        return _percentile(self.first_token_latencies, 0.95)
+
+    def healthy(self, now: float | None = None) -> bool:
+        return (now if now is not None else time.monotonic()) >= self.cooldown_until
+
+    def record_success(self, latency: float, first_token: float | None = None) -> None:
+        self.successes += 1
+        self.consecutive_errors = 0
+        self.cooldown_until = 0.0
+        self.latencies.append(latency)
+        if first_token is not None:
+            self.first_token_latencies.append(first_token)
+        if self.ewma_latency_s is None:
+            self.ewma_latency_s = latency
+        else:
+            self.ewma_latency_s += self._EWMA_ALPHA * (latency - self.ewma_latency_s)
+
+    def record_error(self, message: str | None, cooldown: float) -> None:
+        self.errors += 1
+        self.consecutive_errors += 1
+        self.last_error = (message or "")[:200] or None
+        self.cooldown_until = time.monotonic() + cooldown
+
+
+@dataclass
+class _Backend:
+    name: str
+    provider: LLMProvider
+    stats: BackendStats = field(default_factory=BackendStats)
+
+
+def routing_backends(config: Any) -> list[tuple[str, str, str | None]]:
+    """List ``(label, model, api_key)`` backends for *config*.
+
+    The primary model comes first, then ``agents.defaults.fallback_models``;
+    a provider with ``api_keys`` contributes one backend per key.
+    """
+    defaults = config.agents.defaults
+    backends: list[tuple[str, str, str | None]] = []
+    for model in dict.fromkeys([defaults.model, *defaults.fallback_models]):
+        p = config.get_provider(model)
+        name = config.get_provider_name(model) or "custom"
+        keys = list(dict.fromkeys(k for k in [p.api_key, *p.api_keys] if k)) if p else []
+        if len(keys) <= 1:
+            backends.append((f"{name}:{model}", model, keys[0] if keys else None))
+            continue
+        for i, key in enumerate(keys, 1):
+            backends.append((f"{name}:{model}#{i}", model, key))
+    return backends
+
+
+class _Race:
+    """Book-keeping for one routed call: which attempt owns the output stream."""
+
+    def __init__(self, on_content_delta: Callable[[str], Awaitable[None]] | None):
+        self.on_content_delta = on_content_delta
+        self.winner: str | None = None
+        self.first_token: dict[str, float] = {}
+        self.tasks: dict[asyncio.Task, _Backend] = {}
+
+    def delta_sink(self, backend: _Backend, started: float) -> Callable[[str], Awaitable[None]]:
+        async def _sink(delta: str) -> None:
+            if self.winner is None:
+                # First backend to stream text owns the output; the others
+                # are cancelled so the user never sees interleaved answers.
+                self.winner = backend.name
+                self.first_token[backend.name] = time.monotonic() - started
+                for task, other in self.tasks.items():
+                    if other is not backend:
+                        task.cancel()
+            if self.winner == backend.name and self.on_content_delta is not None:
+                await self.on_content_delta(delta)
+
+        return _sink
+
+
+class RoutingProvider(LLMProvider):
+    """An :class:`LLMProvider` that spreads calls over several backends.
+
+    Backends are (label, provider) pairs — different providers, or the same
+    provider with different API keys.  Each call goes to the healthiest,
+    fastest backend first; a transient error (see
+    :meth:`LLMProvider._is_transient_response`) puts that backend in a short
+    cooldown and the call moves on to the next backend immediately instead of
+    sleeping.  Only when every backend fails does the usual
+    ``chat_with_retry`` back-off apply.
+
+    With *hedge* enabled, a second backend is started if the first has not
+    answered (or, when streaming, produced its first token) within its p95
+    latency; the first to succeed wins and the other is cancelled.
+    """
+
+    _records_calls = False  # each backend records its own attempts
+
+    def __init__(
+        self,
+        backends: list[tuple[str, LLMProvider]],
+        *,
+        hedge: bool = False,
+        hedge_delay: float = 2.0,
+        hedge_min_delay: float = 0.25,
+        cooldown_base: float = 5.0,
+        cooldown_max: float = 120.0,
+    ):
+        if not backends:
+            raise ValueError("RoutingProvider needs at least one backend")
+        primary = backends[0][1]
+        super().__init__(api_key=primary.api_key, api_base=primary.api_base)
+        self.generation = primary.generation
+        self.image_limits = primary.image_limits
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.hedge_min_delay = hedge_min_delay
+        self.cooldown_base = cooldown_base
+        self.cooldown_max = cooldown_max
+        self._backends = [_Backend(name, provider) for name, provider in backends]
+
+    @property
+    def stats(self) -> dict[str, BackendStats]:
+        return {b.name: b.stats for b in self._backends}
+
+    def get_default_model(self) -> str:
+        return self._backends[0].provider.get_default_model()
+
+    def _ranked(self) -> list[_Backend]:
+        now = time.monotonic()
+
+        def score(b: _Backend) -> tuple[bool, float]:
+            latency = b.stats.ewma_latency_s or 0.0
+            return (not b.stats.healthy(now), latency * (1 + b.stats.consecutive_errors))
+
+        # sorted() is stable, so configuration order breaks ties.
+        return sorted(self._backends, key=score)
+
+    def _hedge_after(self, backend: _Backend, streaming: bool) -> float:
+        p95 = backend.stats.p95_first_token_s if streaming else backend.stats.p95_latency_s
+        samples = backend.stats.first_token_latencies if streaming else backend.stats.latencies
+        if p95 is None or len(samples) < 5:
+            return self.hedge_delay
+        return max(self.hedge_min_delay, p95)
+
+    def _cooldown(self, backend: _Backend, response: LLMResponse) -> float:
+        hinted = self._extract_retry_after_from_response(response)
+        if hinted:
+            return min(hinted, self.cooldown_max)
+        exp = self.cooldown_base * 2 ** max(0, backend.stats.consecutive_errors)
+        return min(exp, self.cooldown_max)
+
+    def _backend_kwargs(self, kw: dict[str, Any]) -> dict[str, Any]:
+        # Callers pass the router's default model; let every backend fall back
+        # to its own configured model instead.
+        if kw.get("model") in (None, self.get_default_model()):
+            return {**kw, "model": None}
+        return kw
+
+    async def _route(
+        self,
+        kw: dict[str, Any],
+        on_content_delta: Callable[[str], Awaitable[None]] | None,
+        streaming: bool,
+    ) -> LLMResponse:
+        order = self._ranked()
+        race = _Race(on_content_delta)
+        started_at: dict[str, float] = {}
+        hedged: _Backend | None = None
+        last_error: LLMResponse | None = None
+        backend_kw = self._backend_kwargs(kw)
+
+        def launch(backend: _Backend) -> None:
+            started = time.monotonic()
+            started_at[backend.name] = started
+            backend.stats.requests += 1
+            if streaming:
+                call = backend.provider._safe_chat_stream(
+                    **backend_kw, on_content_delta=race.delta_sink(backend, started)
+                )
+            else:
+                call = backend.provider._safe_chat(**backend_kw)
+            race.tasks[asyncio.create_task(call)] = backend
+
+        async def finish(result: LLMResponse) -> LLMResponse:
+            for task in race.tasks:
+                task.cancel()
+            await asyncio.gather(*race.tasks, return_exceptions=True)
+            return result
+
+        launch(order[0])
+        next_idx = 1
+        try:
+            while True:
+                pending = [t for t in race.tasks if not t.done()]
+                if not pending:
+                    break
+                timeout = None
+                if self.hedge and hedged is None and race.winner is None and next_idx < len(order):
+                    first = race.tasks[pending[0]]
+                    elapsed = time.monotonic() - started_at[first.name]
+                    timeout = max(0.0, self._hedge_after(first, streaming) - elapsed)
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    hedged = order[next_idx]
+                    next_idx += 1
+                    hedged.stats.hedges += 1
+                    logger.debug("Hedging LLM request on backend '{}'", hedged.name)
+                    launch(hedged)
+                    continue
+
+                for task in done:
+                    backend = race.tasks.pop(task)
+                    if task.cancelled():
+                        backend.stats.cancelled += 1
+                        continue
+                    response = task.result()
+                    latency = time.monotonic() - started_at[backend.name]
+                    if response.finish_reason != "error":
+                        if race.winner not in (None, backend.name):
+                            # Another backend already streamed text; discard.
+                            continue
+                        backend.stats.record_success(latency, race.first_token.get(backend.name))
+                        if backend is hedged:
+                            backend.stats.hedge_wins += 1
+                        for other_task, other in race.tasks.items():
+                            if not other_task.done():
+                                other.stats.cancelled += 1
+                        return await finish(response)
+
+                    last_error = response
+                    transient = self._is_transient_response(response)
+                    backend.stats.record_error(
+                        response.content, self._cooldown(backend, response) if transient else 0.0
+                    )
+                    if not transient or race.winner == backend.name:
+                        # Permanent errors (bad request, auth) would fail
+                        # everywhere; a stream that already emitted text
+                        # cannot be replayed on another backend.
+                        return await finish(response)
+                    if next_idx < len(order):
+                        backend.stats.failovers += 1
+                        nxt = order[next_idx]
+                        next_idx += 1
+                        logger.warning(
+                            "LLM backend '{}' failed ({}), failing over to '{}'",
+                            backend.name,
+                            (response.content or "")[:120].lower(),
+                            nxt.name,
+                        )
+                        launch(nxt)
+        finally:
+            for task in race.tasks:
+                task.cancel()
+
+        return last_error or LLMResponse(content="Error calling LLM: no backend", finish_reason="error")
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        reasoning_effort: str | None = None,
+        tool_choice: str | dict[str, Any] | None = None,
+    ) -> LLMResponse:
+        kw = dict(
+            messages=messages, tools=tools, model=model,
+            max_tokens=max_tokens, temperature=temperature,
+            reasoning_effort=reasoning_effort, tool_choice=tool_choice,
+        )
+        return await self._route(kw, None, streaming=False)
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        reasoning_effort: str | None = None,
+        tool_choice: str | dict[str, Any] | None = None,
+        on_content_delta: Callable[[str], Awaitable[None]] | None = None,
+    ) -> LLMResponse:
+        kw = dict(
+            messages=messages, tools=tools, model=model,
+            max_tokens=max_tokens, temperature=temperature,
+            reasoning_effort=reasoning_effort, tool_choice=tool_choice,
+        )
+        return await self._route(kw, on_content_delta, streaming=True)
@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
+import bisect
 import ipaddress
 import re
 import socket
+import threading
+import time
+from typing import Any, Iterable
 from urllib.parse import urlparse
 
+from nanobot.utils.inflight import InflightTasks
+
+_IPAddress = ipaddress.IPv4Address | ipaddress.IPv6Address
+_IPNetwork = ipaddress.IPv4Network | ipaddress.IPv6Network
+
 _BLOCKED_NETWORKS = [
     ipaddress.ip_network("0.0.0.0/8"),
     ipaddress.ip_network("10.0.0.0/8"),
@@ -22,12 +32,52 @@ _BLOCKED_NETWORKS = [
 
 _URL_RE = re.compile(r"https?://[^\s\"'`;|<>]+", re.IGNORECASE)
 
-_allowed_networks: list[ipaddress.IPv4Network | ipaddress.IPv6Network] = []
+_allowed_networks: list[_IPNetwork] = []
+
+
+class _NetworkSet:
+    """Pre-compiled network membership: merged, sorted integer intervals per IP version.
+
+    Lookup is a binary search instead of a linear ``addr in net`` scan.
+    """
+
+    def __init__(self, networks: Iterable[_IPNetwork]):
+        by_version: dict[int, list[tuple[int, int]]] = {4: [], 6: []}
+        for net in networks:
+            by_version[net.version].append(
+                (int(net.network_address), int(net.broadcast_address))
+            )
+        self._starts: dict[int, list[int]] = {}
+        self._ends: dict[int, list[int]] = {}
+        for version, spans in by_version.items():
+            merged: list[list[int]] = []
+            for start, end in sorted(spans):
+                if merged and start <= merged[-1][1] + 1:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            self._starts[version] = [s for s, _ in merged]
+            self._ends[version] = [e for _, e in merged]
+
+    def __bool__(self) -> bool:
+        return any(self._starts.values())
+
+    def __contains__(self, addr: _IPAddress) -> bool:
+        if isinstance(addr, ipaddress.IPv6Address) and addr.ipv4_mapped is not None:
+            addr = addr.ipv4_mapped
+        starts = self._starts[addr.version]
+        value = int(addr)
+        i = bisect.bisect_right(starts, value) - 1
+        return i >= 0 and value <= self._ends[addr.version][i]
+
+
+_blocked_set = _NetworkSet(_BLOCKED_NETWORKS)
+_allowed_set = _NetworkSet([])
 
 
 def configure_ssrf_whitelist(cidrs: list[str]) -> None:
     """Allow specific CIDR ranges to bypass SSRF blocking (e.g. Tailscale's 100.64.0.0/10)."""
-    global _allowed_networks
+    global _allowed_networks, _allowed_set
     nets = []
     for cidr in cidrs:
         try:
@@ -35,49 +85,168 @@ def configure_ssrf_whitelist(cidrs: list[str]) -> None:
         except ValueError:
             pass
     _allowed_networks = nets
+    _allowed_set = _NetworkSet(nets)
 
 
-def _is_private(addr: ipaddress.IPv4Address | ipaddress.IPv6Address) -> bool:
-    if _allowed_networks and any(addr in net for net in _allowed_networks):
+def _is_private(addr: _IPAddress) -> bool:
+    if _allowed_set and addr in _allowed_set:
         return False
-    return any(addr in net for net in _BLOCKED_NETWORKS)
+    return addr in _blocked_set
 
 
-def validate_url_target(url: str) -> tuple[bool, str]:
-    """Validate a URL is safe to fetch: scheme, hostname, and resolved IPs.
+# ---------------------------------------------------------------------------
+# DNS resolution with a positive/negative TTL cache
+# ---------------------------------------------------------------------------
 
-    Returns (ok, error_message).  When ok is True, error_message is empty.
+
+class DNSCache:
+    """Hostname → IP cache shared by the sync and async SSRF checks.
+
+    Successful lookups are kept for *ttl* seconds and failures for
+    *negative_ttl* seconds.  The async path resolves in a worker thread
+    and coalesces concurrent lookups of the same host, so a slow resolver
+    never blocks the event loop.
     """
+
+    def __init__(self, ttl: float = 60.0, negative_ttl: float = 10.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._entries: dict[str, tuple[float, tuple[str, ...] | None]] = {}
+        self._inflight: InflightTasks[str, tuple[str, ...] | None] = InflightTasks(
+            keep_alive=True,
+        )
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, host: str) -> tuple[bool, tuple[str, ...] | None]:
+        """Return ``(hit, addresses)``; ``addresses`` is None for a cached failure."""
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is None:
+                return False, None
+            if entry[0] < time.monotonic():
+                del self._entries[host]
+                return False, None
+            return True, entry[1]
+
+    def _put(self, host: str, addresses: tuple[str, ...] | None) -> None:
+        ttl = self.ttl if addresses else self.negative_ttl
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                now = time.monotonic()
+                for key in [k for k, (exp, _) in self._entries.items() if exp < now]:
+                    del self._entries[key]
+                if len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[host] = (time.monotonic() + ttl, addresses)
+
+    def _lookup(self, host: str) -> tuple[str, ...] | None:
+        try:
+            infos = socket.getaddrinfo(host, None, socket.AF_UNSPEC, socket.SOCK_STREAM)
+        except socket.gaierror:
+            addresses = None
+        else:
+            seen: dict[str, None] = {}
+            for info in infos:
+                seen.setdefault(str(info[4][0]), None)
+            addresses = tuple(seen) or None
+        self._put(host, addresses)
+        return addresses
+
+    def resolve(self, host: str) -> tuple[str, ...] | None:
+        """Blocking resolve through the cache. Returns None if the host does not resolve."""
+        hit, addresses = self.get(host)
+        if hit:
+            return addresses
+        return self._lookup(host)
+
+    async def aresolve(self, host: str) -> tuple[str, ...] | None:
+        """Non-blocking :meth:`resolve`."""
+        hit, addresses = self.get(host)
+        if hit:
+            return addresses
+        # The lookup finishes and fills the cache even if every caller gave up.
+        return await self._inflight.run(host, lambda: asyncio.to_thread(self._lookup, host))
+
+
+dns_cache = DNSCache()
+
+
+def _parse_target(url: str) -> tuple[str | None, str]:
+    """Return ``(hostname, error)`` after the scheme/domain checks."""
     try:
         p = urlparse(url)
     except Exception as e:
-        return False, str(e)
+        return None, str(e)
 
     if p.scheme not in ("http", "https"):
-        return False, f"Only http/https allowed, got '{p.scheme or 'none'}'"
+        return None, f"Only http/https allowed, got '{p.scheme or 'none'}'"
     if not p.netloc:
-        return False, "Missing domain"
+        return None, "Missing domain"
 
     hostname = p.hostname
     if not hostname:
-        return False, "Missing hostname"
+        return None, "Missing hostname"
+    return hostname, ""
 
+
+def _literal_ip(hostname: str) -> _IPAddress | None:
     try:
-        infos = socket.getaddrinfo(hostname, None, socket.AF_UNSPEC, socket.SOCK_STREAM)
-    except socket.gaierror:
-        return False, f"Cannot resolve hostname: {hostname}"
+        return ipaddress.ip_address(hostname)
+    except ValueError:
+        return None
+
 
-    for info in infos:
+def _check_addresses(
+    hostname: str, addresses: Iterable[str], template: str,
+) -> tuple[bool, str]:
+    for raw in addresses:
         try:
-            addr = ipaddress.ip_address(info[4][0])
+            addr = ipaddress.ip_address(raw.split("%", 1)[0])
         except ValueError:
             continue
         if _is_private(addr):
-            return False, f"Blocked: {hostname} resolves to private/internal address {addr}"
-
+            return False, template.format(host=hostname, addr=addr)
     return True, ""
 
 
+_TARGET_BLOCKED = "Blocked: {host} resolves to private/internal address {addr}"
+
+
+def _vet(hostname: str, addresses: tuple[str, ...] | None) -> tuple[bool, str]:
+    if addresses is None:
+        return False, f"Cannot resolve hostname: {hostname}"
+    return _check_addresses(hostname, addresses, _TARGET_BLOCKED)
+
+
+def validate_url_target(url: str) -> tuple[bool, str]:
+    """Validate a URL is safe to fetch: scheme, hostname, and resolved IPs.
+
+    Returns (ok, error_message).  When ok is True, error_message is empty.
+    Prefer :func:`avalidate_url_target` from async code.
+    """
+    hostname, err = _parse_target(url)
+    if hostname is None:
+        return False, err
+    if (addr := _literal_ip(hostname)) is not None:
+        return _vet(hostname, (str(addr),))
+    return _vet(hostname, dns_cache.resolve(hostname))
+
+
+async def avalidate_url_target(url: str) -> tuple[bool, str]:
+    """Async :func:`validate_url_target`: DNS runs off the event loop and is cached."""
+    hostname, err = _parse_target(url)
+    if hostname is None:
+        return False, err
+    if (addr := _literal_ip(hostname)) is not None:
+        return _vet(hostname, (str(addr),))
+    return _vet(hostname, await dns_cache.aresolve(hostname))
+
+
 def validate_resolved_url(url: str) -> tuple[bool, str]:
     """Validate an already-fetched URL (e.g. after redirect). Only checks the IP, skips DNS."""
     try:
@@ -89,25 +258,40 @@ def validate_resolved_url(url: str) -> tuple[bool, str]:
     if not hostname:
         return True, ""
 
-    try:
-        addr = ipaddress.ip_address(hostname)
+    if (addr := _literal_ip(hostname)) is not None:
         if _is_private(addr):
             return False, f"Redirect target is a private address: {addr}"
-    except ValueError:
-        # hostname is a domain name, resolve it
+        return True, ""
+    # hostname is a domain name, resolve it (served from the cache when the
+    # connection already vetted it)
+    addresses = dns_cache.resolve(hostname)
+    if addresses is None:
+        return True, ""
+    return _check_addresses(
+        hostname, addresses, "Redirect target {host} resolves to private address {addr}",
+    )
+
+
+def _command_hosts(command: str) -> set[str]:
+    hosts: set[str] = set()
+    for m in _URL_RE.finditer(command):
         try:
-            infos = socket.getaddrinfo(hostname, None, socket.AF_UNSPEC, socket.SOCK_STREAM)
-        except socket.gaierror:
-            return True, ""
-        for info in infos:
-            try:
-                addr = ipaddress.ip_address(info[4][0])
-            except ValueError:
-                continue
-            if _is_private(addr):
-                return False, f"Redirect target {hostname} resolves to private address {addr}"
+            host = urlparse(m.group(0)).hostname
+        except ValueError:
+            continue
+        if host and _literal_ip(host) is None:
+            hosts.add(host)
+    return hosts
 
-    return True, ""
+
+async def prefetch_command_hosts(command: str) -> None:
+    """Resolve every URL host in *command* concurrently, off the event loop.
+
+    Call before :func:`contains_internal_url` so its lookups are cache hits.
+    """
+    hosts = _command_hosts(command)
+    if hosts:
+        await asyncio.gather(*(dns_cache.aresolve(h) for h in hosts))
 
 
 def contains_internal_url(command: str) -> bool:
@@ -118,3 +302,71 @@ def contains_internal_url(command: str) -> bool:
         if not ok:
             return True
     return False
+
+
+# ---------------------------------------------------------------------------
+# IP pinning for outbound HTTP
+# ---------------------------------------------------------------------------
+
+
+class SSRFSafeNetworkBackend:
+    """httpcore network backend that connects only to vetted addresses.
+
+    Every TCP connect — including ones made while following redirects —
+    resolves the host through :data:`dns_cache`, refuses private targets
+    and dials the vetted IP directly, so the address that was checked is
+    the one that is used (no second lookup, no DNS-rebinding window).
+    TLS still uses the original hostname for SNI and certificate checks.
+    """
+
+    def __init__(self, inner: Any | None = None):
+        import httpcore
+
+        self._inner = inner or httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Any = None,
+    ) -> Any:
+        import httpcore
+
+        if (addr := _literal_ip(host)) is not None:
+            addresses: tuple[str, ...] | None = (str(addr),)
+        else:
+            addresses = await dns_cache.aresolve(host)
+        ok, err = _vet(host, addresses)
+        if not ok:
+            raise httpcore.ConnectError(err)
+        last_exc: Exception | None = None
+        for ip in addresses or ():
+            try:
+                return await self._inner.connect_tcp(
+                    ip, port, timeout=timeout,
+                    local_address=local_address, socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_exc = e
+        raise last_exc or httpcore.ConnectError(f"Cannot connect to {host}")
+
+    async def connect_unix_socket(self, *args: Any, **kwargs: Any) -> Any:
+        import httpcore
+
+        raise httpcore.ConnectError("Unix sockets are not allowed")
+
+    async def sleep(self, seconds: float) -> None:
+        await self._inner.sleep(seconds)
+
+
+def pinned_transport(**kwargs: Any) -> Any:
+    """Return an ``httpx.AsyncHTTPTransport`` that dials only vetted IPs."""
+    import httpx
+
+    transport = httpx.AsyncHTTPTransport(**kwargs)
+    pool = getattr(transport, "_pool", None)
+    if pool is not None and hasattr(pool, "_network_backend"):
+        pool._network_backend = SSRFSafeNetworkBackend()
+    return transport
@@ -1,31 +1,44 @@
 """Document text extraction utilities for nanobot."""
 
+import asyncio
+import hashlib
+import importlib
+import importlib.util
+import json
 import mimetypes
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from typing import Callable
 
 from loguru import logger
 
-from nanobot.utils.helpers import detect_image_mime
+from nanobot.utils.helpers import detect_image_mime, ensure_dir
+from nanobot.utils.inflight import InflightTasks
+
+# Parser libraries are heavy (openpyxl and python-pptx alone take a few hundred
+# milliseconds), so they are imported on first use instead of with this module.
+_LIBRARIES: dict[str, tuple[str, str, str]] = {
+    # kind: (module, attribute, distribution name)
+    "pdf": ("pypdf", "PdfReader", "pypdf"),
+    "docx": ("docx", "Document", "python-docx"),
+    "xlsx": ("openpyxl", "load_workbook", "openpyxl"),
+    "pptx": ("pptx", "Presentation", "python-pptx"),
+}
 
-try:
-    from pypdf import PdfReader
-except ImportError:
-    PdfReader = None  # type: ignore
 
-try:
-    from docx import Document as DocxDocument
-except ImportError:
-    DocxDocument = None  # type: ignore
+def _library(kind: str) -> Callable:
+    module, attr, _ = _LIBRARIES[kind]
+    return getattr(importlib.import_module(module), attr)
 
-try:
-    from openpyxl import load_workbook
-except ImportError:
-    load_workbook = None  # type: ignore
 
-try:
-    from pptx import Presentation as PptxPresentation
-except ImportError:
-    PptxPresentation = None  # type: ignore
+def _missing_library(kind: str) -> str | None:
+    """Distribution name to install when the parser for *kind* is unavailable."""
+    module, _, dist = _LIBRARIES[kind]
+    return None if importlib.util.find_spec(module) else dist
 
 
 # Supported file extensions for text extraction
@@ -80,20 +93,20 @@ def extract_text(path: Path) -> str | None:
 
     # Document formats
     if ext == ".pdf":
-        if PdfReader is None:
-            return "[error: pypdf not installed]"
+        if missing := _missing_library("pdf"):
+            return f"[error: {missing} not installed]"
         return _extract_pdf(path)
     elif ext == ".docx":
-        if DocxDocument is None:
-            return "[error: python-docx not installed]"
+        if missing := _missing_library("docx"):
+            return f"[error: {missing} not installed]"
         return _extract_docx(path)
     elif ext == ".xlsx":
-        if load_workbook is None:
-            return "[error: openpyxl not installed]"
+        if missing := _missing_library("xlsx"):
+            return f"[error: {missing} not installed]"
         return _extract_xlsx(path)
     elif ext == ".pptx":
-        if PptxPresentation is None:
-            return "[error: python-pptx not installed]"
+        if missing := _missing_library("pptx"):
+            return f"[error: {missing} not installed]"
         return _extract_pptx(path)
     elif _is_text_extension(ext):
         return _extract_text_file(path)
@@ -108,12 +121,7 @@ def extract_text(path: Path) -> str | None:
 def _extract_pdf(path: Path) -> str:
     """Extract text from PDF using pypdf."""
     try:
-        reader = PdfReader(path)
-        pages: list[str] = []
-        for i, page in enumerate(reader.pages, 1):
-            text = page.extract_text() or ""
-            pages.append(f"--- Page {i} ---\n{text}")
-        return _truncate("\n\n".join(pages), _MAX_TEXT_LENGTH)
+        return _truncate("\n\n".join(_pdf_blocks(path)), _MAX_TEXT_LENGTH)
     except Exception as e:
         logger.error("Failed to extract PDF {}: {}", path, e)
         return f"[error: failed to extract PDF: {e!s}]"
@@ -122,9 +130,7 @@ def _extract_pdf(path: Path) -> str:
 def _extract_docx(path: Path) -> str:
     """Extract text from DOCX using python-docx."""
     try:
-        doc = DocxDocument(path)
-        paragraphs: list[str] = [p.text for p in doc.paragraphs if p.text.strip()]
-        return _truncate("\n\n".join(paragraphs), _MAX_TEXT_LENGTH)
+        return _truncate("\n\n".join(_docx_blocks(path)), _MAX_TEXT_LENGTH)
     except Exception as e:
         logger.error("Failed to extract DOCX {}: {}", path, e)
         return f"[error: failed to extract DOCX: {e!s}]"
@@ -133,7 +139,56 @@ def _extract_docx(path: Path) -> str:
 def _extract_xlsx(path: Path) -> str:
     """Extract text from XLSX using openpyxl."""
     try:
-        wb = load_workbook(path, read_only=True, data_only=True)
+        return _truncate("\n\n".join(_xlsx_blocks(path)), _MAX_TEXT_LENGTH)
+    except Exception as e:
+        logger.error("Failed to extract XLSX {}: {}", path, e)
+        return f"[error: failed to extract XLSX: {e!s}]"
+
+
+def _extract_pptx(path: Path) -> str:
+    """Extract text from PPTX using python-pptx."""
+    try:
+        return _truncate("\n\n".join(_pptx_blocks(path)), _MAX_TEXT_LENGTH)
+    except Exception as e:
+        logger.error("Failed to extract PPTX {}: {}", path, e)
+        return f"[error: failed to extract PPTX: {e!s}]"
+
+
+# ---------------------------------------------------------------------------
+# Segment parsers
+#
+# Each parser returns a list of text blocks (one per page, sheet, slide or
+# paragraph).  They are module-level so they can be pickled into a process
+# pool, and their output is what the on-disk cache stores.
+# ---------------------------------------------------------------------------
+
+
+def _pdf_blocks(path: Path) -> list[str]:
+    reader = _library("pdf")(path)
+    return [
+        f"--- Page {i} ---\n{page.extract_text() or ''}"
+        for i, page in enumerate(reader.pages, 1)
+    ]
+
+
+def _pdf_pages(path: Path) -> list[str]:
+    """Per-page plain text using pymupdf (used by ``read_file``)."""
+    import fitz  # pymupdf
+
+    with fitz.open(str(path)) as doc:
+        return [page.get_text().strip() for page in doc]
+
+
+def _docx_blocks(path: Path) -> list[str]:
+    doc = _library("docx")(path)
+    return [p.text for p in doc.paragraphs if p.text.strip()]
+
+
+def _xlsx_blocks(path: Path) -> list[str]:
+    # read_only streams rows from the XML instead of building the whole
+    # worksheet model in memory.
+    wb = _library("xlsx")(path, read_only=True, data_only=True)
+    try:
         sheets: list[str] = []
         for sheet_name in wb.sheetnames:
             ws = wb[sheet_name]
@@ -144,29 +199,22 @@ def _extract_xlsx(path: Path) -> str:
                     rows.append(row_text)
             if rows:
                 sheets.append(f"--- Sheet: {sheet_name} ---\n" + "\n".join(rows))
+        return sheets
+    finally:
         wb.close()
-        return _truncate("\n\n".join(sheets), _MAX_TEXT_LENGTH)
-    except Exception as e:
-        logger.error("Failed to extract XLSX {}: {}", path, e)
-        return f"[error: failed to extract XLSX: {e!s}]"
 
 
-def _extract_pptx(path: Path) -> str:
-    """Extract text from PPTX using python-pptx."""
-    try:
-        prs = PptxPresentation(path)
-        slides: list[str] = []
-        for i, slide in enumerate(prs.slides, 1):
-            slide_text: list[str] = []
-            for shape in slide.shapes:
-                if hasattr(shape, "text") and shape.text:
-                    slide_text.append(shape.text)
-            if slide_text:
-                slides.append(f"--- Slide {i} ---\n" + "\n".join(slide_text))
-        return _truncate("\n\n".join(slides), _MAX_TEXT_LENGTH)
-    except Exception as e:
-        logger.error("Failed to extract PPTX {}: {}", path, e)
-        return f"[error: failed to extract PPTX: {e!s}]"
+def _pptx_blocks(path: Path) -> list[str]:
+    prs = _library("pptx")(path)
+    slides: list[str] = []
+    for i, slide in enumerate(prs.slides, 1):
+        slide_text: list[str] = []
+        for shape in slide.shapes:
+            if hasattr(shape, "text") and shape.text:
+                slide_text.append(shape.text)
+        if slide_text:
+            slides.append(f"--- Slide {i} ---\n" + "\n".join(slide_text))
+    return slides
 
 
 def _extract_text_file(path: Path) -> str:
@@ -216,25 +264,9 @@ def _is_text_extension(ext: str) -> bool:
 _MAX_EXTRACT_FILE_SIZE = 50 * 1024 * 1024  # 50 MB
 
 
-def extract_documents(
-    text: str,
-    media_paths: list[str],
-    *,
-    max_file_size: int = _MAX_EXTRACT_FILE_SIZE,
-) -> tuple[str, list[str]]:
-    """Separate images from documents in *media_paths*.
-
-    Documents (PDF, DOCX, XLSX, PPTX, plain-text, …) have their text
-    extracted and appended to *text*.  Only image paths are kept in the
-    returned list so that downstream layers only need to handle vision
-    blocks.
-
-    Files larger than *max_file_size* bytes are skipped with a warning
-    to avoid unbounded memory / CPU usage.
-    """
-    image_paths: list[str] = []
-    doc_texts: list[str] = []
-
+def _classify_media(media_paths: list[str], max_file_size: int) -> list[tuple[str, bool]]:
+    """Return ``(path, is_image)`` for every readable file within the size limit."""
+    result: list[tuple[str, bool]] = []
     for path_str in media_paths:
         p = Path(path_str)
         if not p.is_file():
@@ -254,14 +286,314 @@ def extract_documents(
         with open(p, "rb") as f:
             header = f.read(16)
         mime = detect_image_mime(header) or mimetypes.guess_type(path_str)[0]
-        if mime and mime.startswith("image/"):
+        result.append((path_str, bool(mime and mime.startswith("image/"))))
+    return result
+
+
+def extract_documents(
+    text: str,
+    media_paths: list[str],
+    *,
+    max_file_size: int = _MAX_EXTRACT_FILE_SIZE,
+) -> tuple[str, list[str]]:
+    """Separate images from documents in *media_paths*.
+
+    Documents (PDF, DOCX, XLSX, PPTX, plain-text, …) have their text
+    extracted and appended to *text*.  Only image paths are kept in the
+    returned list so that downstream layers only need to handle vision
+    blocks.
+
+    Files larger than *max_file_size* bytes are skipped with a warning
+    to avoid unbounded memory / CPU usage.
+    """
+    image_paths: list[str] = []
+    doc_texts: list[str] = []
+
+    for path_str, is_image in _classify_media(media_paths, max_file_size):
+        if is_image:
             image_paths.append(path_str)
-        else:
-            extracted = extract_text(p)
-            if extracted and not extracted.startswith("[error:"):
-                doc_texts.append(f"[File: {p.name}]\n{extracted}")
+            continue
+        p = Path(path_str)
+        extracted = extract_text(p)
+        if extracted and not extracted.startswith("[error:"):
+            doc_texts.append(f"[File: {p.name}]\n{extracted}")
 
     if doc_texts:
         text = text + "\n\n" + "\n\n".join(doc_texts)
 
     return text, image_paths
+
+
+# ---------------------------------------------------------------------------
+# Async extraction service: off-loop parsing + on-disk segment cache
+# ---------------------------------------------------------------------------
+
+_PARSERS: dict[str, tuple[Callable[[Path], list[str]], str]] = {
+    # kind -> (parser, label used in error messages)
+    "pdf": (_pdf_blocks, "PDF"),
+    "pdf_pages": (_pdf_pages, "PDF"),
+    "docx": (_docx_blocks, "DOCX"),
+    "xlsx": (_xlsx_blocks, "XLSX"),
+    "pptx": (_pptx_blocks, "PPTX"),
+}
+
+_KIND_BY_EXTENSION = {".pdf": "pdf", ".docx": "docx", ".xlsx": "xlsx", ".pptx": "pptx"}
+
+_HASH_CHUNK = 1024 * 1024
+_MAX_CACHED_DIGESTS = 1024
+
+
+def _hash_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class DocumentExtractor:
+    """Parse documents off the event loop and cache their segments on disk.
+
+    Parsers run in a process pool (or a thread pool when *use_processes* is
+    False) with a per-document timeout.  The parsed segments — pages,
+    sheets, slides or paragraphs — are cached as JSON under *cache_dir*,
+    keyed by the SHA-256 of the file content, so re-reading a document or
+    requesting another page range skips parsing entirely.  Recently used
+    segments are also kept in memory, up to *max_memory_bytes* of text.
+
+    A timed-out parse cannot be interrupted, so its process pool is torn
+    down; other parses that were running in that pool are resubmitted to the
+    replacement pool instead of failing with ``BrokenProcessPool``.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        *,
+        timeout: float = 120.0,
+        max_workers: int = 2,
+        use_processes: bool = True,
+        max_cache_entries: int = 512,
+        max_memory_bytes: int = 32 * 1024 * 1024,
+    ):
+        self._cache_dir = cache_dir
+        self.timeout = timeout
+        self._max_workers = max_workers
+        self._use_processes = use_processes
+        self._max_cache_entries = max_cache_entries
+        self._max_memory_bytes = max_memory_bytes
+        self._pool: Executor | None = None
+        # (path, size, mtime_ns) -> content hash, so unchanged files are not re-hashed.
+        self._digests: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+        # "digest.kind" -> (segments, text size), least recently used first.
+        self._memory: OrderedDict[str, tuple[list[str], int]] = OrderedDict()
+        self._memory_bytes = 0
+        self._inflight: InflightTasks[str, list[str]] = InflightTasks()
+
+    @property
+    def cache_dir(self) -> Path:
+        if self._cache_dir is None:
+            from nanobot.config.paths import get_cache_dir
+
+            self._cache_dir = get_cache_dir("documents")
+        return ensure_dir(self._cache_dir)
+
+    def _executor(self) -> Executor:
+        if self._pool is None:
+            if self._use_processes:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="nanobot-doc",
+                )
+        return self._pool
+
+    def _kill_pool(self, pool: Executor) -> None:
+        """Drop *pool*, whose worker is stuck on a parse that timed out.
+
+        Worker processes are terminated, which fails the other parses running
+        in them with ``BrokenProcessPool``; :meth:`_parse` resubmits those.
+        A thread pool is only abandoned: its queued work still completes.
+        """
+        if self._pool is pool:
+            self._pool = None
+        if isinstance(pool, ProcessPoolExecutor):
+            for proc in list((getattr(pool, "_processes", None) or {}).values()):
+                proc.terminate()
+        pool.shutdown(wait=False)
+
+    async def _parse(self, parser: Callable[[Path], list[str]], path: Path) -> list[str]:
+        loop = asyncio.get_running_loop()
+        while True:
+            pool = self._executor()
+            run = loop.run_in_executor(pool, parser, path)
+            try:
+                return await asyncio.wait_for(run, timeout=self.timeout)
+            except asyncio.TimeoutError:
+                self._kill_pool(pool)
+                raise TimeoutError(f"parsing took longer than {self.timeout:.0f}s") from None
+            except BrokenProcessPool:
+                if self._pool is pool:
+                    # The pool broke on its own (a worker crashed): fail this parse.
+                    self._pool = None
+                    raise
+                logger.debug("Resubmitting parse of {} after a pool restart", path)
+
+    def close(self) -> None:
+        """Shut down worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _digest(self, path: Path) -> str:
+        st = path.stat()
+        key = (str(path), st.st_size, st.st_mtime_ns)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = await asyncio.to_thread(_hash_file, path)
+            self._digests[key] = digest
+            while len(self._digests) > _MAX_CACHED_DIGESTS:
+                self._digests.popitem(last=False)
+        self._digests.move_to_end(key)
+        return digest
+
+    def _cache_path(self, digest: str, kind: str) -> Path:
+        return self.cache_dir / f"{digest}.{kind}.json"
+
+    def _remember(self, mem_key: str, segments: list[str]) -> None:
+        size = sum(len(s) for s in segments)
+        if (old := self._memory.pop(mem_key, None)) is not None:
+            self._memory_bytes -= old[1]
+        self._memory[mem_key] = (segments, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self._max_memory_bytes and len(self._memory) > 1:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted
+
+    def _load_cached(self, digest: str, kind: str) -> list[str] | None:
+        mem_key = f"{digest}.{kind}"
+        if (hit := self._memory.get(mem_key)) is not None:
+            self._memory.move_to_end(mem_key)
+            return hit[0]
+        path = self._cache_path(digest, kind)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        segments = data.get("segments") if isinstance(data, dict) else None
+        if not isinstance(segments, list):
+            return None
+        self._remember(mem_key, segments)
+        return segments
+
+    def _store(self, digest: str, kind: str, segments: list[str]) -> None:
+        path = self._cache_path(digest, kind)
+        try:
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"segments": segments}, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(path)
+        except OSError as e:
+            logger.warning("Failed to write document cache {}: {}", path, e)
+            return
+        self._prune()
+
+    def _prune(self) -> None:
+        try:
+            entries = [e for e in os.scandir(self.cache_dir) if e.name.endswith(".json")]
+        except OSError:
+            return
+        excess = len(entries) - self._max_cache_entries
+        if excess <= 0:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[:excess]:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+    async def segments(self, path: Path, kind: str) -> list[str]:
+        """Return the cached or freshly parsed segments of *path*.
+
+        Raises the parser's exception, or :class:`TimeoutError` when parsing
+        takes longer than :attr:`timeout`.  Concurrent calls for the same
+        document share one parse; cancelling a caller only stops its wait.
+        """
+        parser, _ = _PARSERS[kind]
+        digest = await self._digest(path)
+        cached = self._load_cached(digest, kind)
+        if cached is not None:
+            return cached
+
+        key = f"{digest}.{kind}"
+
+        async def _parse_and_store() -> list[str]:
+            segments = await self._parse(parser, path)
+            self._remember(key, segments)
+            await asyncio.to_thread(self._store, digest, kind, segments)
+            return segments
+
+        return await self._inflight.run(key, _parse_and_store)
+
+    async def extract_text(self, path: Path) -> str | None:
+        """Async counterpart of :func:`extract_text` backed by the cache."""
+        if not isinstance(path, Path):
+            path = Path(path)
+        if not path.exists():
+            return f"[error: file not found: {path}]"
+
+        ext = path.suffix.lower()
+        kind = _KIND_BY_EXTENSION.get(ext)
+        if kind is None:
+            if _is_text_extension(ext):
+                return await asyncio.to_thread(_extract_text_file, path)
+            return extract_text(path)
+
+        if missing := _missing_library(kind):
+            return f"[error: {missing} not installed]"
+
+        label = _PARSERS[kind][1]
+        try:
+            blocks = await self.segments(path, kind)
+        except Exception as e:
+            logger.error("Failed to extract {} {}: {}", label, path, e)
+            return f"[error: failed to extract {label}: {e!s}]"
+        return _truncate("\n\n".join(blocks), _MAX_TEXT_LENGTH)
+
+    async def extract_documents(
+        self,
+        text: str,
+        media_paths: list[str],
+        *,
+        max_file_size: int = _MAX_EXTRACT_FILE_SIZE,
+    ) -> tuple[str, list[str]]:
+        """Async counterpart of :func:`extract_documents`.
+
+        Documents in one message are parsed concurrently.
+        """
+        kinds = await asyncio.to_thread(_classify_media, media_paths, max_file_size)
+        image_paths = [p for p, is_image in kinds if is_image]
+        docs = [Path(p) for p, is_image in kinds if not is_image]
+        extracted = await asyncio.gather(*(self.extract_text(p) for p in docs))
+        doc_texts = [
+            f"[File: {p.name}]\n{body}"
+            for p, body in zip(docs, extracted)
+            if body and not body.startswith("[error:")
+        ]
+        if doc_texts:
+            text = text + "\n\n" + "\n\n".join(doc_texts)
+        return text, image_paths
+
+
+_default_extractor: DocumentExtractor | None = None
+
+
+def get_document_extractor() -> DocumentExtractor:
+    """Return the process-wide :class:`DocumentExtractor`."""
+    global _default_extractor
+    if _default_extractor is None:
+        _default_extractor = DocumentExtractor()
+    return _default_extractor
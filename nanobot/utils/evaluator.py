@@ -10,6 +10,7 @@ from typing import TYPE_CHECKING
 
 from loguru import logger
 
+from nanobot.providers.ratelimit import Priority, llm_priority
 from nanobot.utils.prompt_templates import render_template
 
 if TYPE_CHECKING:
@@ -52,21 +53,23 @@ async def evaluate_response(
     that important messages are never silently dropped.
     """
     try:
-        llm_response = await provider.chat_with_retry(
-            messages=[
-                {"role": "system", "content": render_template("agent/evaluator.md", part="system")},
-                {"role": "user", "content": render_template(
-                    "agent/evaluator.md",
-                    part="user",
-                    task_context=task_context,
-                    response=response,
-                )},
-            ],
-            tools=_EVALUATE_TOOL,
-            model=model,
-            max_tokens=256,
-            temperature=0.0,
-        )
+        with llm_priority(Priority.BACKGROUND):
+            llm_response = await provider.chat_with_retry(
+                messages=[
+                    {"role": "system", "content": render_template("agent/evaluator.md", part="system")},
+                    {"role": "user", "content": render_template(
+                        "agent/evaluator.md",
+                        part="user",
+                        task_context=task_context,
+                        response=response,
+                    )},
+                ],
+                tools=_EVALUATE_TOOL,
+                model=model,
+                max_tokens=256,
+                temperature=0.0,
+                cache=True,
+            )
 
         if not llm_response.has_tool_calls:
             logger.warning("evaluate_response: no tool call returned, defaulting to notify")
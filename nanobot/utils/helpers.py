@@ -24,6 +24,135 @@ def strip_think(text: str) -> str:
     return text.strip()
 
 
+class _BlockRemover:
+    r"""``re.sub(open + r"[\s\S]*?" + close, "", text)``, fed in pieces."""
+
+    def __init__(self, open_tag: str, close_tag: str):
+        self._open = open_tag
+        self._close = close_tag
+        self._pending = ""  # a possible start of the open tag
+        self._block: list[str] | None = None  # open block, kept in case it never closes
+        self._tail = ""  # last characters of the open block, for a split close tag
+
+    def feed(self, text: str) -> str:
+        out: list[str] = []
+        text = self._pending + text
+        self._pending = ""
+        while text:
+            if self._block is not None:
+                window = self._tail + text
+                end = window.find(self._close)
+                if end < 0:
+                    self._block.append(text)
+                    self._tail = window[-(len(self._close) - 1):]
+                    break
+                self._block = None
+                text = window[end + len(self._close):]
+                continue
+            start = text.find(self._open)
+            if start < 0:
+                # Tags start with "<" and contain no other "<".
+                partial = text.rfind("<", max(0, len(text) - len(self._open) + 1))
+                if partial >= 0 and self._open.startswith(text[partial:]):
+                    self._pending = text[partial:]
+                    text = text[:partial]
+                out.append(text)
+                break
+            out.append(text[:start])
+            self._block, self._tail = [self._open], ""
+            text = text[start + len(self._open):]
+        return "".join(out)
+
+    def flush(self) -> str:
+        rest = self._pending if self._block is None else "".join(self._block)
+        self._pending, self._block, self._tail = "", None, ""
+        return rest
+
+
+class _LeadingBlockDropper:
+    r"""``re.sub(r"^\s*" + open + r"[\s\S]*$", "", text)``, fed in pieces."""
+
+    def __init__(self, open_tag: str):
+        self._open = open_tag
+        self._held: str | None = ""  # None once the start is decided
+        self._dropping = False
+
+    def feed(self, text: str) -> str:
+        if self._dropping:
+            return ""
+        if self._held is None:
+            return text
+        text = self._held + text
+        rest = text.lstrip()
+        if rest.startswith(self._open):
+            self._dropping, self._held = True, None
+            return ""
+        if self._open.startswith(rest):
+            self._held = text
+            return ""
+        self._held = None
+        return text
+
+    def flush(self) -> str:
+        rest = self._held or ""
+        self._held, self._dropping = "", False
+        return rest
+
+
+class _Stripper:
+    """``str.strip`` for text fed in pieces: trailing whitespace waits for more text."""
+
+    def __init__(self):
+        self._started = False
+        self._space = ""
+
+    def feed(self, text: str) -> str:
+        if not self._started:
+            text = text.lstrip()
+            if not text:
+                return ""
+            self._started = True
+        text = self._space + text
+        end = len(text.rstrip())
+        self._space = text[end:]
+        return text[:end]
+
+    def flush(self) -> str:
+        self._started, self._space = False, ""
+        return ""
+
+
+class ThinkStripper:
+    """:func:`strip_think` for streamed text, in time proportional to each delta.
+
+    :meth:`feed` returns the clean text that can be shown so far and holds
+    back only what is still undecided: a partial tag, an unclosed thinking
+    block or trailing whitespace.  Feeding every delta and then calling
+    :meth:`flush` gives ``strip_think`` of the whole text, however it was
+    split; the stripper can then be reused for the next text.
+    """
+
+    def __init__(self):
+        self._stages = (
+            _BlockRemover("<think>", "</think>"),
+            _LeadingBlockDropper("<think>"),
+            _BlockRemover("<thought>", "</thought>"),
+            _LeadingBlockDropper("<thought>"),
+            _Stripper(),
+        )
+
+    def feed(self, delta: str) -> str:
+        for stage in self._stages:
+            delta = stage.feed(delta)
+        return delta
+
+    def flush(self) -> str:
+        rest = ""
+        for stage in self._stages:
+            rest = stage.feed(rest) + stage.flush()
+        return rest
+
+
 def detect_image_mime(data: bytes) -> str | None:
     """Detect image MIME type from magic bytes, ignoring file extension."""
     if data[:8] == b"\x89PNG\r\n\x1a\n":
@@ -401,6 +530,8 @@ def build_status_content(
     context_tokens_estimate: int,
     search_usage_text: str | None = None,
     active_task_count: int = 0,
+    llm_metrics_lines: list[str] | None = None,
+    extra_lines: list[str] | None = None,
 ) -> str:
     """Build a human-readable runtime status snapshot.
     
@@ -408,6 +539,10 @@ def build_status_content(
         search_usage_text: Optional pre-formatted web search usage string
                            (produced by SearchUsageInfo.format()). When provided
                            it is appended as an extra section.
+        llm_metrics_lines: Optional latency/throughput lines
+                           (produced by ProviderMetrics.status_lines()).
+        extra_lines: Optional pre-formatted lines from other subsystems
+                     (MCP servers, message bursts), appended as they are.
     """
     uptime_s = int(time.time() - start_time)
     uptime = (
@@ -434,6 +569,9 @@ def build_status_content(
         f"\u23f1 Uptime: {uptime}",
         f"\u26a1 Tasks: {active_task_count} active",
     ]
+    for line in llm_metrics_lines or []:
+        lines.append(f"\U0001f4e1 LLM {line}")
+    lines.extend(extra_lines or [])
     if search_usage_text:
         lines.append(search_usage_text)
     return "\n".join(lines)    
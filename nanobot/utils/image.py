@@ -0,0 +1,256 @@
+"""Image ingestion: decode once, optionally downscale, cache the encoded data URL."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import io
+import mimetypes
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.utils.helpers import detect_image_mime
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None  # type: ignore
+    ImageOps = None  # type: ignore
+
+
+@dataclass(frozen=True)
+class ImageLimits:
+    """Per-provider budget for images sent to the model.
+
+    ``None`` disables the corresponding limit; with both unset images are
+    sent unchanged.
+    """
+
+    max_dimension: int | None = None  # longest edge in pixels
+    max_bytes: int | None = None  # encoded size before base64
+    quality: int = 85  # initial JPEG quality when re-encoding
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.max_dimension or self.max_bytes)
+
+
+@dataclass
+class ImagePipelineStats:
+    """Counters for :class:`ImagePipeline`."""
+
+    encoded: int = 0
+    cache_hits: int = 0
+    resized: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return max(0, self.bytes_in - self.bytes_out)
+
+
+_QUALITY_STEPS = (0, 15, 30, 45)  # subtracted from ImageLimits.quality
+_MIN_EDGE = 256
+_MAX_CACHED_PATHS = 1024
+
+
+def _fit(raw: bytes, mime: str, limits: ImageLimits) -> tuple[bytes, str, bool]:
+    """Downscale / recompress *raw* to fit *limits*. Returns (data, mime, changed)."""
+    if Image is None or not limits.enabled:
+        return raw, mime, False
+    try:
+        img = Image.open(io.BytesIO(raw))
+        if getattr(img, "n_frames", 1) > 1:
+            return raw, mime, False  # keep animations intact
+        img = ImageOps.exif_transpose(img)
+    except Exception as e:
+        logger.debug("Image decode failed, sending original: {}", e)
+        return raw, mime, False
+
+    too_big = limits.max_bytes is not None and len(raw) > limits.max_bytes
+    too_wide = limits.max_dimension is not None and max(img.size) > limits.max_dimension
+    if not (too_big or too_wide):
+        return raw, mime, False
+
+    if too_wide:
+        img.thumbnail((limits.max_dimension, limits.max_dimension), Image.LANCZOS)
+
+    has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+    out_mime = "image/png" if has_alpha else "image/jpeg"
+    if not has_alpha and img.mode != "RGB":
+        img = img.convert("RGB")
+
+    def _encode(image: Any, quality: int) -> bytes:
+        buf = io.BytesIO()
+        if out_mime == "image/png":
+            image.save(buf, format="PNG", optimize=True)
+        else:
+            image.save(buf, format="JPEG", quality=quality, optimize=True)
+        return buf.getvalue()
+
+    data = _encode(img, limits.quality)
+    if limits.max_bytes is not None:
+        steps = iter(_QUALITY_STEPS[1:] if out_mime == "image/jpeg" else ())
+        while len(data) > limits.max_bytes:
+            step = next(steps, None)
+            if step is not None:
+                data = _encode(img, max(20, limits.quality - step))
+                continue
+            if min(img.size) // 2 < _MIN_EDGE:
+                break
+            img = img.resize((img.width // 2, img.height // 2), Image.LANCZOS)
+            data = _encode(img, max(20, limits.quality - _QUALITY_STEPS[-1]))
+
+    if len(data) >= len(raw) and not too_wide:
+        return raw, mime, False
+    return data, out_mime, True
+
+
+class ImagePipeline:
+    """Turn image files into ``image_url`` content blocks, once per content hash.
+
+    Encoded data URLs are kept in an LRU bounded by *max_cache_bytes*, keyed
+    by the SHA-256 of the original bytes, so the same photo attached again,
+    re-injected mid-turn or re-read by a tool is not decoded or base64
+    encoded twice.  :meth:`prepare` does the CPU work in a worker thread.
+    """
+
+    def __init__(self, limits: ImageLimits | None = None, *, max_cache_bytes: int = 64 * 1024 * 1024):
+        self.limits = limits or ImageLimits()
+        self.stats = ImagePipelineStats()
+        self._max_cache_bytes = max_cache_bytes
+        self._cache: OrderedDict[str, tuple[str, str]] = OrderedDict()
+        self._cache_bytes = 0
+        # (path, size, mtime_ns) -> cache key, so unchanged files are not re-read.
+        self._paths: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def status_line(self) -> str | None:
+        if not self.stats.encoded:
+            return None
+        s = self.stats
+        return (
+            f"\U0001f5bc Images: {s.encoded} encoded ({s.resized} resized), "
+            f"{s.cache_hits} cache hit(s), {s.bytes_saved // 1024} KB saved"
+        )
+
+    def _lookup(self, key: str) -> tuple[str, str] | None:
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                self.stats.cache_hits += 1
+            return hit
+
+    def _remember(self, key: str, value: tuple[str, str]) -> None:
+        with self._lock:
+            if key in self._cache:
+                return
+            self._cache[key] = value
+            self._cache_bytes += len(value[1])
+            while self._cache_bytes > self._max_cache_bytes and len(self._cache) > 1:
+                _, (_, url) = self._cache.popitem(last=False)
+                self._cache_bytes -= len(url)
+
+    def _key(self, raw: bytes) -> str:
+        return f"{hashlib.sha256(raw).hexdigest()}:{self.limits}"
+
+    def encode(self, raw: bytes, mime: str) -> tuple[str, str]:
+        """Return ``(mime, data_url)`` for *raw*, downscaled to :attr:`limits`."""
+        return self._encode_keyed(self._key(raw), raw, mime)
+
+    def _encode_keyed(self, key: str, raw: bytes, mime: str) -> tuple[str, str]:
+        if (hit := self._lookup(key)) is not None:
+            return hit
+        data, out_mime, changed = _fit(raw, mime, self.limits)
+        url = f"data:{out_mime};base64,{base64.b64encode(data).decode()}"
+        with self._lock:
+            self.stats.encoded += 1
+            self.stats.resized += int(changed)
+            self.stats.bytes_in += len(raw)
+            self.stats.bytes_out += len(data)
+        if changed:
+            logger.debug(
+                "Image recompressed {} -> {} bytes ({})", len(raw), len(data), out_mime,
+            )
+        self._remember(key, (out_mime, url))
+        return out_mime, url
+
+    def _encode_path(self, path: str) -> tuple[str, str] | None:
+        p = Path(path)
+        try:
+            st = p.stat()
+        except OSError:
+            return None
+        stat_key = (str(p), st.st_size, st.st_mtime_ns)
+        with self._lock:
+            key = self._paths.get(stat_key)
+            if key is not None:
+                self._paths.move_to_end(stat_key)
+        if key is not None and (hit := self._lookup(key)) is not None:
+            return hit
+        raw = p.read_bytes()
+        mime = detect_image_mime(raw) or mimetypes.guess_type(path)[0]
+        if not mime or not mime.startswith("image/"):
+            return None
+        key = self._key(raw)
+        with self._lock:
+            self._paths[stat_key] = key
+            self._paths.move_to_end(stat_key)
+            while len(self._paths) > _MAX_CACHED_PATHS:
+                self._paths.popitem(last=False)
+        return self._encode_keyed(key, raw, mime)
+
+    def image_block(self, path: str) -> dict[str, Any] | None:
+        """Build an ``image_url`` block for *path*, or None if it is not an image."""
+        if not Path(path).is_file():
+            return None
+        encoded = self._encode_path(path)
+        if encoded is None:
+            return None
+        return {
+            "type": "image_url",
+            "image_url": {"url": encoded[1]},
+            "_meta": {"path": str(Path(path))},
+        }
+
+    def content_blocks(self, raw: bytes, mime: str, path: str, label: str) -> list[dict[str, Any]]:
+        """Cached equivalent of :func:`nanobot.utils.helpers.build_image_content_blocks`."""
+        _, url = self.encode(raw, mime)
+        return [
+            {"type": "image_url", "image_url": {"url": url}, "_meta": {"path": path}},
+            {"type": "text", "text": label},
+        ]
+
+    async def prepare(self, paths: list[str] | None) -> None:
+        """Encode *paths* in a worker thread so later :meth:`image_block` calls hit the cache."""
+        if not paths:
+            return
+
+        def _warm() -> None:
+            for path in paths:
+                try:
+                    if Path(path).is_file():
+                        self._encode_path(path)
+                except Exception as e:
+                    logger.debug("Image prepare failed for {}: {}", path, e)
+
+        await asyncio.to_thread(_warm)
+
+
+_default_pipeline: ImagePipeline | None = None
+
+
+def get_image_pipeline() -> ImagePipeline:
+    """Return the shared pipeline used when no provider-specific one is given."""
+    global _default_pipeline
+    if _default_pipeline is None:
+        _default_pipeline = ImagePipeline()
+    return _default_pipeline
@@ -0,0 +1,60 @@
+"""One shared task per key for concurrent callers that want the same result."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class _Entry(Generic[V]):
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Future[V]):
+        self.task = task
+        self.waiters = 0
+
+
+class InflightTasks(Generic[K, V]):
+    """Deduplicate concurrent work by key.
+
+    The first :meth:`run` for a key starts the work as a task; later calls
+    for the same key join it.  Every caller, the first included, waits
+    through :func:`asyncio.shield`, so a cancelled caller only stops waiting.
+    The work itself is cancelled when its last waiter is, unless
+    *keep_alive* is set, in which case it runs to completion (e.g. to fill a
+    cache for the next caller).
+    """
+
+    def __init__(self, *, keep_alive: bool = False):
+        self.keep_alive = keep_alive
+        self._entries: dict[K, _Entry[V]] = {}
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def run(self, key: K, work: Callable[[], Awaitable[V]]) -> V:
+        """Return the result of the work for *key*, starting it with *work* if needed."""
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry(asyncio.ensure_future(work()))
+            entry.task.add_done_callback(lambda task: self._finished(key, entry))
+        entry.waiters += 1
+        try:
+            return await asyncio.shield(entry.task)
+        finally:
+            entry.waiters -= 1
+            if not entry.waiters and not entry.task.done() and not self.keep_alive:
+                entry.task.cancel()
+
+    def _finished(self, key: K, entry: _Entry[V]) -> None:
+        if self._entries.get(key) is entry:
+            del self._entries[key]
+        if not entry.task.cancelled():
+            entry.task.exception()  # retrieved: waiters re-raise it, or nobody was left
@@ -0,0 +1,106 @@
+"""Incremental rendering of a growing markdown answer.
+
+Streaming channels edit one message as the answer grows, and re-rendering
+the whole buffer for every edit costs O(n²) over a long answer.
+:class:`IncrementalRenderer` splits the text at stable block boundaries and
+caches the rendered blocks, so each edit only renders the text after the
+last boundary.  A boundary is a run of blank lines outside code fences
+where rendering the text before it does not depend on what follows.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Callable
+
+_FENCES = ("```", "~~~")
+_BLANK_RUN = re.compile(r"\n(?:[ \t]*\n)+")
+# A link reference definition changes how earlier text renders.
+_REF_DEFINITION = re.compile(r"^ {0,3}\[[^\]\n]+\]:", re.MULTILINE)
+
+
+class IncrementalRenderer:
+    """Render successive versions of a growing text with *render*.
+
+    *render* must satisfy ``render(a + b) == render(a) + render(b)`` wherever
+    no construct of *a* reaches into *b*.  Each candidate boundary is checked
+    against the line after it (which catches list items, indented code and
+    the like continuing past a blank line) and against *probe*, text that
+    closes anything *a* may have left open, such as an inline code span.
+
+    One renderer serves one stream; :meth:`render` also accepts a shorter
+    or rewritten text and drops the cached blocks it no longer starts with.
+    """
+
+    def __init__(self, render: Callable[[str], str], probe: str = ""):
+        self._render = render
+        self._probe = probe
+        self._cuts: list[int] = []  # end offset of each cached block
+        self._blocks: list[str] = []  # rendered output of each cached block
+        self._source = ""  # the text the cached blocks were rendered from
+        self._head = ""  # "".join(self._blocks)
+        self._scanned = 0  # boundaries before this offset have been decided
+        self._refs_scanned = 0
+        self._cacheable = True
+        self.rendered_chars = 0  # characters passed to *render* so far
+
+    @property
+    def cached_chars(self) -> int:
+        """Length of the prefix whose rendering is cached."""
+        return len(self._source)
+
+    def render(self, text: str) -> str:
+        """Rendered *text*, reusing the blocks cached for its unchanged prefix."""
+        if not text.startswith(self._source):
+            self._rewind(len(os.path.commonprefix([text, self._source])))
+        if self._cacheable:
+            self._advance(text)
+        return self._head + self._call(text[len(self._source):])
+
+    def _call(self, text: str) -> str:
+        self.rendered_chars += len(text)
+        return self._render(text)
+
+    def _rewind(self, keep: int) -> None:
+        """Forget cached blocks that end after offset *keep*."""
+        while self._cuts and self._cuts[-1] > keep:
+            self._cuts.pop()
+            self._blocks.pop()
+        end = self._cuts[-1] if self._cuts else 0
+        self._source = self._source[:end]
+        self._head = "".join(self._blocks)
+        self._scanned = end
+        self._refs_scanned = min(self._refs_scanned, keep)
+
+    def _advance(self, text: str) -> None:
+        """Cache every block of *text* that has become stable."""
+        line_start = text.rfind("\n", 0, self._refs_scanned) + 1
+        self._refs_scanned = len(text)
+        if _REF_DEFINITION.search(text, line_start):
+            self._cacheable = False
+            self._rewind(0)
+            return
+
+        for m in _BLANK_RUN.finditer(text, max(self._scanned, len(self._source))):
+            cut = m.end()
+            eol = text.find("\n", cut)
+            if eol < 0:
+                break  # the line after the boundary is still being written
+            self._scanned = cut
+            block = self._stable(text[len(self._source):cut], text[cut:eol])
+            if block is not None:
+                self._cuts.append(cut)
+                self._blocks.append(block)
+                self._source = text[:cut]
+                self._head += block
+
+    def _stable(self, block: str, next_line: str) -> str | None:
+        """Rendered *block* if it renders the same whatever follows, else None."""
+        if any(block.count(fence) % 2 for fence in _FENCES):
+            return None
+        rendered = self._call(block)
+        for follower in (next_line, self._probe):
+            if follower and self._call(block + follower) != rendered + self._call(follower):
+                return None
+        return rendered
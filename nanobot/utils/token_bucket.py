@@ -0,0 +1,46 @@
+"""Continuous-refill token bucket shared by the LLM and channel rate limiters."""
+
+from __future__ import annotations
+
+import time
+
+
+class TokenBucket:
+    """Token bucket refilled at *rate* per second, holding at most *capacity*.
+
+    Callers pass the clock reading so a limiter can use one ``now`` for all
+    of its buckets (and tests can drive a fake clock).
+    """
+
+    __slots__ = ("rate", "capacity", "level", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float | None = None):
+        self.rate = float(rate)
+        self.capacity = max(float(capacity), 1.0)
+        self.level = self.capacity
+        self.updated = time.monotonic() if now is None else now
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float, cost: float = 1.0) -> float:
+        """Seconds until *cost* tokens are available (0 when they are now)."""
+        self.refill(now)
+        if self.level >= cost:
+            return 0.0
+        return (cost - self.level) / self.rate
+
+    def take(self, cost: float = 1.0) -> None:
+        self.level -= cost
+
+    def sync(self, remaining: float, now: float) -> None:
+        """Lower the level to a *remaining* budget reported by the server."""
+        self.refill(now)
+        self.level = min(self.level, remaining)
+
+    def resize(self, rate: float, capacity: float, now: float) -> None:
+        self.refill(now)
+        self.capacity = max(float(capacity), 1.0)
+        self.level = min(self.level, self.capacity)
+        self.rate = float(rate)
@@ -0,0 +1,167 @@
+"""Debounced inbound bursts: merging, adaptive windows and AgentLoop integration."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from nanobot.agent.burst import BurstCoalescer, merge_messages
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.config.schema import ChannelsConfig
+
+
+def _in(
+    content: str, channel: str = "telegram", sender_id: str = "u1", chat_id: str = "c1", **kwargs,
+) -> InboundMessage:
+    return InboundMessage(
+        channel=channel, sender_id=sender_id, chat_id=chat_id, content=content, **kwargs,
+    )
+
+
+def test_merge_keeps_order_media_and_last_metadata():
+    merged = merge_messages([
+        _in("hey", media=["a.png"], metadata={"message_id": 1}),
+        _in("check the logs", media=["b.png"], metadata={"message_id": 2}),
+    ])
+    assert merged.content == "hey\ncheck the logs"
+    assert merged.media == ["a.png", "b.png"]
+    assert merged.metadata == {"message_id": 2, "_coalesced": 2}
+
+
+@pytest.mark.asyncio
+async def test_burst_flushes_once_after_quiet_window():
+    seen: list[list[str]] = []
+    bursts = BurstCoalescer(0.05, 1.0, lambda msgs, _key: seen.append([m.content for m in msgs]))
+    for text in ("hey", "can you", "check the logs"):
+        bursts.offer("s", _in(text))
+        await asyncio.sleep(0.01)
+    assert seen == []
+    await asyncio.sleep(0.1)
+    assert seen == [["hey", "can you", "check the logs"]]
+    assert bursts.snapshot()["llm_calls_saved"] == 2
+
+
+@pytest.mark.asyncio
+async def test_messages_from_other_senders_or_chats_are_not_merged():
+    seen: list[list[tuple[str, str, str]]] = []
+    bursts = BurstCoalescer(
+        0.05, 1.0, lambda msgs, _key: seen.append([(m.sender_id, m.chat_id, m.content) for m in msgs]),
+    )
+    # A group chat: two people typing at once in one session.
+    bursts.offer("group", _in("hi all", sender_id="alice"))
+    bursts.offer("group", _in("one sec", sender_id="alice"))
+    bursts.offer("group", _in("hello", sender_id="bob"))
+    # A unified session: the same person in two chats.
+    bursts.offer("unified", _in("from telegram", chat_id="t1"))
+    bursts.offer("unified", _in("from discord", channel="discord", chat_id="d1"))
+    await asyncio.sleep(0.15)
+
+    assert sorted(seen) == [
+        [("alice", "c1", "hi all"), ("alice", "c1", "one sec")],
+        [("bob", "c1", "hello")],
+        [("u1", "d1", "from discord")],
+        [("u1", "t1", "from telegram")],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_max_wait_caps_a_never_ending_burst():
+    seen: list[int] = []
+    bursts = BurstCoalescer(0.05, 0.12, lambda msgs, _key: seen.append(len(msgs)))
+    for _ in range(10):
+        bursts.offer("s", _in("more"))
+        await asyncio.sleep(0.03)
+    await asyncio.sleep(0.1)
+    assert len(seen) >= 2 and sum(seen) == 10
+
+
+@pytest.mark.asyncio
+async def test_window_adapts_to_the_channels_typing_rhythm():
+    bursts = BurstCoalescer(1.0, 2.0, lambda *_: None)
+    assert bursts.window("telegram") == 1.0
+    for _ in range(5):
+        bursts.offer("s", _in("x"))
+        await asyncio.sleep(0.02)
+    assert 0.25 <= bursts.window("telegram") < 1.0  # fast typist: floor at a quarter
+    assert bursts.window("discord") == 1.0
+    bursts.discard("s")
+
+
+def _loop(tmp_path, debounce_ms: int, bus: MessageBus | None = None):
+    from nanobot.agent.loop import AgentLoop
+
+    provider = MagicMock()
+    provider.get_default_model.return_value = "test-model"
+    channels = ChannelsConfig(debounce_ms=debounce_ms, debounce_max_wait_ms=1000)
+    return AgentLoop(
+        bus=bus or MessageBus(), provider=provider, workspace=tmp_path, channels_config=channels,
+    )
+
+
+@pytest.mark.asyncio
+async def test_agent_loop_runs_one_turn_per_burst(tmp_path):
+    loop = _loop(tmp_path, debounce_ms=50)
+    turns: list[str] = []
+
+    async def _process(msg, **_kwargs):
+        turns.append(msg.content)
+        return None
+
+    loop._process_message = _process
+    loop._connect_mcp = MagicMock(side_effect=lambda: asyncio.sleep(0))
+    runner = asyncio.create_task(loop.run())
+    for text in ("hey", "can you", "check the logs"):
+        await loop.bus.publish_inbound(_in(text))
+    await asyncio.sleep(0.3)
+    loop.stop()
+    await runner
+
+    assert turns == ["hey\ncan you\ncheck the logs"]
+    assert "LLM call(s) saved" in loop.bursts.status_line()
+
+
+@pytest.mark.asyncio
+async def test_agent_loop_replies_to_each_sender_of_a_group_burst(tmp_path):
+    loop = _loop(tmp_path, debounce_ms=50)
+    turns: list[tuple[str, str]] = []
+
+    async def _process(msg, **_kwargs):
+        turns.append((msg.sender_id, msg.content))
+        return None
+
+    loop._process_message = _process
+    loop._connect_mcp = MagicMock(side_effect=lambda: asyncio.sleep(0))
+    runner = asyncio.create_task(loop.run())
+    for sender, text in (("alice", "hey"), ("alice", "bot?"), ("bob", "me too")):
+        await loop.bus.publish_inbound(_in(text, sender_id=sender))
+    await asyncio.sleep(0.3)
+    loop.stop()
+    await runner
+
+    assert sorted(turns) == [("alice", "hey\nbot?"), ("bob", "me too")]
+
+
+@pytest.mark.asyncio
+async def test_debounce_is_off_by_default_and_for_system_messages(tmp_path):
+    loop = _loop(tmp_path, debounce_ms=0)
+    assert not loop.bursts.enabled("telegram")
+    loop = _loop(tmp_path, debounce_ms=500)
+    assert loop.bursts.enabled("telegram")
+    assert not loop.bursts.enabled("system")
+
+
+@pytest.mark.asyncio
+async def test_stop_drops_buffered_messages(tmp_path):
+    from nanobot.command.builtin import cmd_stop
+    from nanobot.command.router import CommandContext
+
+    loop = _loop(tmp_path, debounce_ms=5000)
+    msg = _in("hey")
+    loop.bursts.offer(msg.session_key, msg)
+    stop = _in("/stop")
+    out = await cmd_stop(CommandContext(msg=stop, session=None, key=stop.session_key, raw="/stop", loop=loop))
+    assert msg.session_key not in loop.bursts
+    assert "Stopped 1 task" in out.content
@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -8,7 +9,7 @@ from nanobot.bus.queue import MessageBus
 from nanobot.providers.base import LLMResponse
 
 
-def _make_loop(tmp_path, *, estimated_tokens: int, context_window_tokens: int) -> AgentLoop:
+def _make_loop(tmp_path, *, estimated_tokens: int, context_window_tokens: int | None) -> AgentLoop:
     from nanobot.providers.base import GenerationSettings
     provider = MagicMock()
     provider.get_default_model.return_value = "test-model"
@@ -40,6 +41,21 @@ async def test_prompt_below_threshold_does_not_consolidate(tmp_path) -> None:
     loop.consolidator.archive.assert_not_awaited()
 
 
+@pytest.mark.asyncio
+async def test_default_context_window_reaches_the_consolidator(tmp_path) -> None:
+    # Regression: AgentLoop used to hand the raw None to Consolidator, so every
+    # token-based check raised TypeError when the window was left unset.
+    loop = _make_loop(tmp_path, estimated_tokens=100, context_window_tokens=None)
+    loop.consolidator.archive = AsyncMock(return_value=True)  # type: ignore[method-assign]
+    session = loop.sessions.get_or_create("cli:test")
+    session.messages = [{"role": "user", "content": "u1", "timestamp": "2026-01-01T00:00:00"}]
+
+    await loop.consolidator.maybe_consolidate_by_tokens(session)
+
+    assert loop.consolidator.context_window_tokens == loop.context_window_tokens > 0
+    loop.consolidator.archive.assert_not_awaited()
+
+
 @pytest.mark.asyncio
 async def test_prompt_above_threshold_triggers_consolidation(tmp_path, monkeypatch) -> None:
     loop = _make_loop(tmp_path, estimated_tokens=1000, context_window_tokens=200)
@@ -194,3 +210,22 @@ async def test_preflight_consolidation_before_llm_call(tmp_path, monkeypatch) ->
     assert "consolidate" in order
     assert "llm" in order
     assert order.index("consolidate") < order.index("llm")
+
+
+@pytest.mark.asyncio
+async def test_consolidation_runs_outside_the_metrics_session(tmp_path) -> None:
+    from nanobot.providers.metrics import current_session, metrics_session
+
+    loop = _make_loop(tmp_path, estimated_tokens=100, context_window_tokens=200)
+    seen: list[str | None] = []
+
+    async def _record(session) -> None:
+        seen.append(current_session())
+
+    loop.consolidator.maybe_consolidate_by_tokens = _record  # type: ignore[method-assign]
+
+    with metrics_session("cli:test"):
+        await loop.process_direct("hello", session_key="cli:test")
+    await asyncio.gather(*loop._background_tasks)
+
+    assert seen and set(seen) == {None}
@@ -25,20 +25,40 @@ def _make_loop(tmp_path, *, mcp_servers: dict | None = None) -> AgentLoop:
 
 
 @pytest.mark.asyncio
-async def test_connect_mcp_retries_when_no_servers_connect(tmp_path, monkeypatch: pytest.MonkeyPatch):
+async def test_connect_mcp_starts_manager_once_and_close_stops_it(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+):
     loop = _make_loop(tmp_path)
-    attempts = 0
+    events: list[str] = []
 
-    async def _fake_connect(_servers, _registry):
-        nonlocal attempts
-        attempts += 1
-        return {}
+    class _FakeManager:
+        def __init__(self, servers, registry) -> None:
+            assert registry is loop.tools
+            events.append("init")
 
-    monkeypatch.setattr("nanobot.agent.tools.mcp.connect_mcp_servers", _fake_connect)
+        @property
+        def connected(self) -> list[str]:
+            return []
+
+        @property
+        def stats(self) -> dict:
+            return {"test": "stats"}
+
+        async def start(self) -> None:
+            events.append("start")
+
+        async def close(self) -> None:
+            events.append("close")
+
+    monkeypatch.setattr("nanobot.agent.tools.mcp.MCPConnectionManager", _FakeManager)
 
     await loop._connect_mcp()
+    # Failed servers are retried by the manager in the background, so a
+    # second message must not spin up another manager.
     await loop._connect_mcp()
+    assert events == ["init", "start"]
+    assert loop.mcp_stats == {"test": "stats"}
 
-    assert attempts == 2
-    assert loop._mcp_connected is False
-    assert loop._mcp_stacks == {}
+    await loop.close_mcp()
+    assert events == ["init", "start", "close"]
+    assert loop.mcp_stats == {}
@@ -0,0 +1,157 @@
+"""Durable bus: journaling, acknowledgement, idempotency and replay."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.journal import BusJournal
+from nanobot.bus.queue import MessageBus
+
+
+def _in(content: str, message_id: str | None = None, **kwargs) -> InboundMessage:
+    metadata = {"message_id": message_id} if message_id else {}
+    return InboundMessage(
+        channel="telegram", sender_id="u1", chat_id="c1", content=content,
+        metadata=metadata, **kwargs,
+    )
+
+
+def _out(content: str, **metadata) -> OutboundMessage:
+    return OutboundMessage(channel="telegram", chat_id="c1", content=content, metadata=metadata)
+
+
+def _bus(path, **kwargs) -> MessageBus:
+    return MessageBus(journal=BusJournal(path / "journal.sqlite3"), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_unacked_messages_are_replayed_after_restart(tmp_path):
+    bus = _bus(tmp_path)
+    stamp = datetime(2026, 1, 2, 3, 4, 5)
+    await bus.publish_inbound(_in("handled", "1"))
+    await bus.publish_inbound(_in("pending", "2", timestamp=stamp, media=["/tmp/a.png"]))
+    await bus.publish_outbound(_out("reply"))
+    bus.ack(await bus.consume_inbound())
+    await bus.close()  # crash: "pending" and "reply" were never acknowledged
+
+    restarted = _bus(tmp_path)
+    assert await restarted.replay() == (1, 1)
+    msg = await restarted.consume_inbound()
+    assert (msg.content, msg.timestamp, msg.media) == ("pending", stamp, ["/tmp/a.png"])
+    assert msg.metadata == {"message_id": "2"}
+    assert (await restarted.consume_outbound()).content == "reply"
+    await restarted.close()
+
+
+@pytest.mark.asyncio
+async def test_acknowledged_messages_are_not_replayed(tmp_path):
+    bus = _bus(tmp_path)
+    await bus.publish_inbound(_in("a", "1"))
+    await bus.publish_outbound(_out("b"))
+    bus.ack(await bus.consume_inbound())
+    bus.ack(await bus.consume_outbound())
+    await bus.close()
+
+    restarted = _bus(tmp_path)
+    assert await restarted.replay() == (0, 0)
+    await restarted.close()
+
+
+@pytest.mark.asyncio
+async def test_channel_message_id_deduplicates_redeliveries(tmp_path):
+    bus = _bus(tmp_path)
+    assert await bus.publish_inbound(_in("hi", "42"))
+    bus.ack(await bus.consume_inbound())
+    # A channel redelivering the same update after a reconnect or restart.
+    assert not await bus.publish_inbound(_in("hi", "42"))
+    assert await bus.publish_inbound(_in("hi again"))  # no id: never deduplicated
+    assert await bus.publish_inbound(_in("hi again"))
+    assert bus.inbound_size == 2
+    assert bus.snapshot()["journal"]["duplicates"] == 1
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_rejected_message_frees_its_idempotency_key(tmp_path):
+    bus = _bus(tmp_path, inbound_capacity=1)
+    assert await bus.publish_inbound(_in("first", "1"))
+    assert not await bus.publish_inbound(_in("second", "2"))
+    bus.ack(await bus.consume_inbound())
+    assert await bus.publish_inbound(_in("second", "2"))  # the user's retry is accepted
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_transient_and_control_messages_are_not_journaled(tmp_path):
+    bus = _bus(tmp_path)
+    await bus.publish_inbound(_in("/stop"))
+    await bus.publish_outbound(_out("de", _stream_delta=True))
+    await bus.publish_outbound(_out("", _stream_end=True))
+    await bus.publish_outbound(_out("thinking", _progress=True))
+    await bus.close()
+
+    assert bus.journal.appended == 0
+
+
+@pytest.mark.asyncio
+async def test_close_during_a_slow_commit_drains_it(tmp_path):
+    import time
+
+    journal = BusJournal(tmp_path / "journal.sqlite3")
+    first = await journal.append("outbound", _out("first"))
+    run = journal._run
+
+    async def _slow_run(fn):
+        def _slow(conn):
+            time.sleep(0.1)
+            return fn(conn)
+
+        return await run(_slow)
+
+    journal._run = _slow_run  # type: ignore[method-assign]
+    journal.ack(first)
+    publish = asyncio.create_task(journal.append("outbound", _out("second")))
+    await asyncio.sleep(0.05)  # the writer is inside the commit
+    await asyncio.wait_for(journal.close(), 2)
+
+    second = await asyncio.wait_for(publish, 1)
+    assert second is not None
+    reopened = BusJournal(tmp_path / "journal.sqlite3")
+    assert [row_id for row_id, _ in await reopened.unacked("outbound")] == [second]
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_publishes_share_commits(tmp_path):
+    bus = _bus(tmp_path)
+    await asyncio.gather(*(bus.publish_inbound(_in(f"m{i}", str(i))) for i in range(200)))
+    assert bus.journal.appended == 200
+    assert bus.journal.commits < 20
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_agent_loop_acknowledges_handled_messages(tmp_path):
+    from unittest.mock import MagicMock
+
+    from nanobot.agent.loop import AgentLoop
+
+    provider = MagicMock()
+    provider.get_default_model.return_value = "test-model"
+    bus = _bus(tmp_path)
+    loop = AgentLoop(bus=bus, provider=provider, workspace=tmp_path, model="test-model")
+
+    async def _reply(msg, **_kwargs):
+        return _out(f"re: {msg.content}")
+
+    loop._process_message = _reply
+    await bus.publish_inbound(_in("hello", "1"))
+    await loop._dispatch(await bus.consume_inbound())
+    bus.ack(await bus.consume_outbound())
+    await bus.close()
+
+    restarted = _bus(tmp_path)
+    assert await restarted.replay() == (0, 0)
+    await restarted.close()
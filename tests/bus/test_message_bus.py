@@ -0,0 +1,149 @@
+"""Priority lanes, fairness and overflow handling of MessageBus."""
+
+import asyncio
+
+import pytest
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import Lane, MessageBus
+from nanobot.config.schema import BusConfig
+
+
+def _in(content: str, sender: str = "u1", channel: str = "telegram", **metadata) -> InboundMessage:
+    return InboundMessage(
+        channel=channel, sender_id=sender, chat_id=f"chat-{sender}", content=content,
+        metadata=metadata,
+    )
+
+
+def _drain(bus: MessageBus) -> list[str]:
+    out = []
+    while not bus.inbound.empty():
+        out.append(bus.inbound.get_nowait().content)
+    return out
+
+
+@pytest.mark.asyncio
+async def test_control_commands_jump_the_backlog():
+    bus = MessageBus()
+    for i in range(5):
+        await bus.publish_inbound(_in(f"m{i}"))
+    await bus.publish_inbound(_in(" /STOP "))
+
+    assert (await bus.consume_inbound()).content == " /STOP "
+    assert _drain(bus) == [f"m{i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_custom_control_predicate():
+    bus = MessageBus()
+    bus.is_control = lambda text: text == "/urgent"
+    await bus.publish_inbound(_in("hello"))
+    await bus.publish_inbound(_in("/stop"))
+    await bus.publish_inbound(_in("/urgent"))
+
+    assert _drain(bus) == ["/urgent", "hello", "/stop"]
+
+
+@pytest.mark.asyncio
+async def test_senders_and_channels_are_served_round_robin():
+    bus = MessageBus()
+    for i in range(3):
+        await bus.publish_inbound(_in(f"flood{i}", sender="busy"))
+    await bus.publish_inbound(_in("quiet", sender="other"))
+    await bus.publish_inbound(_in("mail", sender="x", channel="email"))
+
+    # Channels alternate first, then senders within a channel; each sender stays FIFO.
+    assert _drain(bus) == ["flood0", "mail", "quiet", "flood1", "flood2"]
+
+
+@pytest.mark.asyncio
+async def test_background_work_waits_for_interactive_messages():
+    bus = MessageBus()
+    await bus.publish_inbound(_in("announce", channel="system", sender="subagent"))
+    await bus.publish_inbound(_in("cron", _lane="background"))
+    await bus.publish_inbound(_in("hi", sender="u2"))
+
+    assert _drain(bus) == ["hi", "announce", "cron"]
+
+
+@pytest.mark.asyncio
+async def test_outbound_keeps_chat_order_while_prioritising_other_chats():
+    bus = MessageBus()
+    delta = {"_stream_delta": True}
+    await bus.publish_outbound(OutboundMessage(channel="t", chat_id="a", content="d1", metadata=delta))
+    await bus.publish_outbound(OutboundMessage(channel="t", chat_id="a", content="final-a"))
+    await bus.publish_outbound(OutboundMessage(channel="t", chat_id="b", content="final-b"))
+
+    order = [bus.outbound.get_nowait().content for _ in range(3)]
+    assert order == ["final-b", "d1", "final-a"]
+    assert bus.outbound.snapshot()["lanes"]["stream"]["served"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reject_policy_notifies_sender_once():
+    bus = MessageBus(inbound_capacity=2, inbound_overflow="reject")
+    assert await bus.publish_inbound(_in("a"))
+    assert await bus.publish_inbound(_in("b"))
+    assert not await bus.publish_inbound(_in("c"))
+    assert not await bus.publish_inbound(_in("d"))
+    # Control commands are never refused.
+    assert await bus.publish_inbound(_in("/stop"))
+
+    notices = [bus.outbound.get_nowait() for _ in range(bus.outbound_size)]
+    assert len(notices) == 1 and notices[0].chat_id == "chat-u1"
+    assert "too many messages" in notices[0].content
+    assert bus.inbound.rejected == 2
+    assert _drain(bus) == ["/stop", "a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_evicts_least_urgent_first():
+    bus = MessageBus(inbound_capacity=2, inbound_overflow="drop_oldest")
+    await bus.publish_inbound(_in("bg", _lane="background"))
+    await bus.publish_inbound(_in("old"))
+    await bus.publish_inbound(_in("new"))
+    # A background message cannot evict interactive ones.
+    assert not await bus.publish_inbound(_in("bg2", _lane="background"))
+
+    assert bus.inbound.dropped == 2
+    assert _drain(bus) == ["old", "new"]
+
+
+@pytest.mark.asyncio
+async def test_block_policy_waits_for_space():
+    bus = MessageBus(outbound_capacity=1)
+    await bus.publish_outbound(OutboundMessage(channel="t", chat_id="a", content="1"))
+    blocked = asyncio.create_task(
+        bus.publish_outbound(OutboundMessage(channel="t", chat_id="a", content="2"))
+    )
+    await asyncio.sleep(0)
+    assert not blocked.done()
+
+    assert (await bus.consume_outbound()).content == "1"
+    assert await asyncio.wait_for(blocked, 1.0)
+    assert (await bus.consume_outbound()).content == "2"
+
+
+@pytest.mark.asyncio
+async def test_requeue_ignores_capacity():
+    bus = MessageBus(inbound_capacity=1)
+    await bus.publish_inbound(_in("a"))
+    await bus.requeue_inbound(_in("b"))
+
+    assert bus.inbound_size == 2
+
+
+@pytest.mark.asyncio
+async def test_metrics_report_depth_and_wait():
+    bus = MessageBus(**BusConfig().model_dump())
+    await bus.publish_inbound(_in("a"))
+    assert bus.inbound.depth[Lane.INTERACTIVE] == 1
+    await bus.consume_inbound()
+
+    snap = bus.snapshot()["inbound"]
+    assert snap["capacity"] == 1000
+    assert snap["lanes"]["interactive"]["served"] == 1
+    text = bus.render_prometheus()
+    assert 'nanobot_bus_queue_depth{queue="inbound",lane="interactive"} 0' in text
+    assert 'nanobot_bus_wait_seconds_count{queue="inbound",lane="interactive"} 1' in text
@@ -0,0 +1,26 @@
+"""Helpers shared by the ChannelManager outbound tests::
+
+    from outbound_test_utils import make_manager, wait_for
+"""
+
+import asyncio
+
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.manager import ChannelManager
+from nanobot.config.schema import Config
+
+_sleep = asyncio.sleep  # some tests patch asyncio.sleep itself
+
+
+def make_manager(**channels_cfg) -> tuple[ChannelManager, MessageBus]:
+    bus = MessageBus()
+    config = Config.model_validate({"channels": channels_cfg})
+    return ChannelManager(config, bus), bus
+
+
+async def wait_for(predicate, timeout: float = 2.0) -> None:
+    async def _poll():
+        while not predicate():
+            await _sleep(0.005)
+
+    await asyncio.wait_for(_poll(), timeout)
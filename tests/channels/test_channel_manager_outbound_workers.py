@@ -0,0 +1,220 @@
+"""Per-channel, per-chat outbound workers in ChannelManager."""
+
+import asyncio
+
+import pytest
+from outbound_test_utils import make_manager, wait_for
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.channels.base import BaseChannel
+from nanobot.channels.manager import ChannelManager
+
+_sleep = asyncio.sleep  # the retry test patches asyncio.sleep itself
+
+
+class _RecordingChannel(BaseChannel):
+    name = "rec"
+    display_name = "Recording"
+
+    def __init__(self, config, bus, *, block_chat: str | None = None):
+        super().__init__(config, bus)
+        self.sent: list[tuple[str, str]] = []
+        self.deltas: list[tuple[str, str, dict]] = []
+        self.block_chat = block_chat
+        self.release = asyncio.Event()
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def send(self, msg):
+        if msg.chat_id == self.block_chat:
+            await self.release.wait()
+        self.sent.append((msg.chat_id, msg.content))
+
+    async def send_delta(self, chat_id, delta, metadata=None):
+        self.deltas.append((chat_id, delta, dict(metadata or {})))
+
+
+async def _run(manager: ChannelManager):
+    task = asyncio.create_task(manager._dispatch_outbound())
+    await _sleep(0)
+    return task
+
+
+async def _stop(task: asyncio.Task) -> None:
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_blocked_chat_does_not_delay_other_chats():
+    manager, bus = make_manager()
+    channel = manager.channels["rec"] = _RecordingChannel({}, bus, block_chat="slow")
+    task = await _run(manager)
+
+    await bus.publish_outbound(OutboundMessage(channel="rec", chat_id="slow", content="1"))
+    await bus.publish_outbound(OutboundMessage(channel="rec", chat_id="slow", content="2"))
+    await bus.publish_outbound(OutboundMessage(channel="rec", chat_id="fast", content="a"))
+    await wait_for(lambda: ("fast", "a") in channel.sent)
+
+    assert channel.sent == [("fast", "a")]
+    assert manager.get_status()["rec"]["outbound"]["queued"] == 1
+
+    channel.release.set()
+    await wait_for(lambda: len(channel.sent) == 3)
+    # Per-chat order is preserved.
+    assert [c for chat, c in channel.sent if chat == "slow"] == ["1", "2"]
+    await _stop(task)
+
+
+@pytest.mark.asyncio
+async def test_retry_backoff_only_holds_up_its_chat(monkeypatch):
+    manager, bus = make_manager(sendMaxRetries=3)
+    channel = manager.channels["rec"] = _RecordingChannel({}, bus)
+    attempts = 0
+    original = channel.send
+
+    async def _flaky(msg):
+        nonlocal attempts
+        if msg.chat_id == "flaky":
+            attempts += 1
+            raise RuntimeError("rate limited")
+        await original(msg)
+
+    channel.send = _flaky
+    gate = asyncio.Event()
+
+    async def _backoff(delay):
+        await gate.wait()
+
+    monkeypatch.setattr("nanobot.channels.manager.asyncio.sleep", _backoff)
+    task = await _run(manager)
+
+    await bus.publish_outbound(OutboundMessage(channel="rec", chat_id="flaky", content="x"))
+    await bus.publish_outbound(OutboundMessage(channel="rec", chat_id="ok", content="y"))
+    await wait_for(lambda: channel.sent == [("ok", "y")])
+    assert attempts == 1
+
+    gate.set()
+    await wait_for(lambda: manager.get_status()["rec"]["outbound"]["failed"] == 1)
+    assert attempts == 3
+    assert manager.get_status()["rec"]["outbound"]["delivered"] == 1
+    await _stop(task)
+
+
+@pytest.mark.asyncio
+async def test_stream_deltas_coalesce_within_a_chat_queue():
+    manager, bus = make_manager(sendConcurrency=1)
+    channel = manager.channels["rec"] = _RecordingChannel({}, bus, block_chat="c1")
+    task = await _run(manager)
+
+    # Occupy the only worker so the deltas pile up in c2's queue, interleaved
+    # with another chat's messages on the bus.
+    await bus.publish_outbound(OutboundMessage(channel="rec", chat_id="c1", content="hold"))
+    await wait_for(lambda: manager.get_status()["rec"]["outbound"]["in_flight"] == 1)
+    for i, text in enumerate(("Hel", "lo", " world")):
+        await bus.publish_outbound(OutboundMessage(
+            channel="rec", chat_id="c2", content=text,
+            metadata={"_stream_delta": True, "_stream_end": i == 2},
+        ))
+        await bus.publish_outbound(OutboundMessage(channel="rec", chat_id="c3", content=str(i)))
+    await wait_for(lambda: bus.outbound_size == 0)
+    await _sleep(0.01)
+
+    channel.release.set()
+    await wait_for(lambda: len(channel.deltas) == 1 and len(channel.sent) == 4)
+    assert channel.deltas == [("c2", "Hello world", {"_stream_delta": True, "_stream_end": True})]
+    assert [c for chat, c in channel.sent if chat == "c3"] == ["0", "1", "2"]
+    await _stop(task)
+
+
+@pytest.mark.asyncio
+async def test_full_chat_queue_drops_oldest_progress_update():
+    manager, bus = make_manager(sendQueueSize=2)
+    channel = manager.channels["rec"] = _RecordingChannel({}, bus, block_chat="c")
+    task = await _run(manager)
+
+    await bus.publish_outbound(OutboundMessage(channel="rec", chat_id="c", content="hold"))
+    await wait_for(lambda: manager.get_status()["rec"]["outbound"]["in_flight"] == 1)
+    for content, meta in (("p1", {"_progress": True}), ("final", {}), ("p2", {"_progress": True})):
+        await bus.publish_outbound(
+            OutboundMessage(channel="rec", chat_id="c", content=content, metadata=meta)
+        )
+    await wait_for(lambda: manager.get_status()["rec"]["outbound"]["dropped"] == 1)
+
+    channel.release.set()
+    await wait_for(lambda: len(channel.sent) == 3)
+    assert channel.sent == [("c", "hold"), ("c", "final"), ("c", "p2")]
+    await _stop(task)
+
+
+@pytest.mark.asyncio
+async def test_full_chat_queue_rejects_for_that_chat_without_stalling_others():
+    manager, bus = make_manager(sendQueueSize=1)
+    channel = manager.channels["rec"] = _RecordingChannel({}, bus, block_chat="c")
+    task = await _run(manager)
+
+    await bus.publish_outbound(OutboundMessage(channel="rec", chat_id="c", content="hold"))
+    await wait_for(lambda: manager.get_status()["rec"]["outbound"]["in_flight"] == 1)
+    for content, meta in (("queued", {}), ("overflow", {"_progress": True}), ("reply", {})):
+        await bus.publish_outbound(
+            OutboundMessage(channel="rec", chat_id="c", content=content, metadata=meta)
+        )
+    await bus.publish_outbound(OutboundMessage(channel="rec", chat_id="d", content="other chat"))
+
+    await wait_for(lambda: ("d", "other chat") in channel.sent)
+    assert manager.get_status()["rec"]["outbound"]["rejected"] == 1
+
+    channel.release.set()
+    await wait_for(lambda: len(channel.sent) == 4)
+    # Only the progress update is shed; replies are queued past the limit.
+    assert [c for chat, c in channel.sent if chat == "c"] == ["hold", "queued", "reply"]
+    await _stop(task)
+
+
+@pytest.mark.asyncio
+async def test_stream_into_a_stuck_chat_is_merged_and_finalized():
+    manager, bus = make_manager(sendQueueSize=50)
+    channel = manager.channels["rec"] = _RecordingChannel({}, bus, block_chat="c")
+    task = await _run(manager)
+
+    await bus.publish_outbound(OutboundMessage(channel="rec", chat_id="c", content="hold"))
+    await wait_for(lambda: manager.get_status()["rec"]["outbound"]["in_flight"] == 1)
+    for _ in range(100):
+        await bus.publish_outbound(OutboundMessage(
+            channel="rec", chat_id="c", content="x",
+            metadata={"_stream_delta": True, "_stream_id": "s1"},
+        ))
+    await bus.publish_outbound(OutboundMessage(
+        channel="rec", chat_id="c", content="", metadata={"_stream_end": True, "_stream_id": "s1"},
+    ))
+    await wait_for(lambda: bus.outbound_size == 0)
+    assert manager.get_status()["rec"]["outbound"]["queued"] == 1
+
+    channel.release.set()
+    await wait_for(lambda: any(meta.get("_stream_end") for _, _, meta in channel.deltas))
+    assert "".join(delta for _, delta, _ in channel.deltas) == "x" * 100
+    assert manager.get_status()["rec"]["outbound"]["rejected"] == 0
+    await _stop(task)
+
+
+@pytest.mark.asyncio
+async def test_send_concurrency_per_channel_and_prometheus_output():
+    manager, bus = make_manager(sendConcurrency=2, rec={"sendConcurrency": 3})
+    manager.channels["rec"] = _RecordingChannel({}, bus)
+    manager.channels["other"] = _RecordingChannel({}, bus)
+    task = await _run(manager)
+
+    await bus.publish_outbound(OutboundMessage(channel="rec", chat_id="c", content="x"))
+    await wait_for(lambda: manager.get_status()["rec"]["outbound"]["delivered"] == 1)
+    assert manager._send_concurrency("rec") == 3
+    assert manager._send_concurrency("other") == 2
+
+    text = manager.render_prometheus()
+    assert 'nanobot_channel_delivered_total{channel="rec"} 1' in text
+    assert 'nanobot_channel_delivery_latency_seconds_count{channel="rec"} 1' in text
+    await _stop(task)
+    assert manager.get_status()["rec"].get("outbound") is None
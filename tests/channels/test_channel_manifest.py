@@ -0,0 +1,63 @@
+"""The static channel manifest must describe the channel modules it stands in for."""
+
+from __future__ import annotations
+
+import pkgutil
+
+import pytest
+
+import nanobot.channels as channels_pkg
+from nanobot.channels.base import BaseChannel
+from nanobot.channels.manifest import BUILTIN_CHANNELS
+from nanobot.channels.registry import channel_catalog, load_channel_class
+
+
+def test_manifest_lists_every_channel_module():
+    modules = {
+        name
+        for _, name, ispkg in pkgutil.iter_modules(channels_pkg.__path__)
+        if not ispkg and name not in {"base", "manager", "manifest", "media", "ratelimit", "registry"}
+    }
+
+    assert set(BUILTIN_CHANNELS) == modules
+
+
+@pytest.mark.parametrize("name", sorted(BUILTIN_CHANNELS))
+def test_manifest_entry_matches_channel_class(name):
+    try:
+        cls = load_channel_class(name)
+    except ImportError as e:
+        pytest.skip(f"{name} dependencies not installed: {e}")
+    info = BUILTIN_CHANNELS[name]
+
+    assert (cls.__module__, cls.__name__) == (info.module, info.class_name)
+    assert cls.name == name
+    assert cls.display_name == info.display_name
+    assert cls.default_config() == info.default_config()
+
+
+def test_default_config_is_a_fresh_copy():
+    info = BUILTIN_CHANNELS["telegram"]
+    info.default_config()["allowFrom"].append("someone")
+
+    assert info.default_config()["allowFrom"] == []
+
+
+def test_catalog_includes_plugins_without_shadowing_builtins(monkeypatch):
+    class _Plugin(BaseChannel):
+        name = "fakeplugin"
+        display_name = "Fake Plugin"
+
+    class _Telegram(_Plugin):
+        name = "telegram"
+
+    monkeypatch.setattr(
+        "nanobot.channels.registry.discover_plugins",
+        lambda names=None: {"fakeplugin": _Plugin, "telegram": _Telegram},
+    )
+
+    catalog = channel_catalog()
+
+    assert catalog["fakeplugin"].display_name == "Fake Plugin"
+    assert catalog["fakeplugin"].default_config() == {"enabled": False}
+    assert catalog["telegram"] is BUILTIN_CHANNELS["telegram"]
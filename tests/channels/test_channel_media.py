@@ -0,0 +1,221 @@
+"""Shared attachment downloads: streaming, size limits, dedup, file-id cache and retention."""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel
+from nanobot.channels.manager import ChannelManager
+from nanobot.channels.media import MediaError, MediaService, MediaTooLargeError, media_store
+from nanobot.config.schema import Config
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+class _StreamingClient:
+    def __init__(self, body: bytes, status: int = 200, length: int | None = None):
+        self.body = body
+        self.status = status
+        self.length = len(body) if length is None else length
+        self.requests = 0
+        self.read = 0
+
+    @asynccontextmanager
+    async def stream(self, method, url, **kwargs):
+        self.requests += 1
+
+        async def aiter_bytes(chunk_size=None):
+            for i in range(0, len(self.body), 4):
+                self.read += 4
+                yield self.body[i:i + 4]
+
+        yield SimpleNamespace(
+            status_code=self.status,
+            headers={"content-length": str(self.length)},
+            aiter_bytes=aiter_bytes,
+        )
+
+
+@pytest.mark.asyncio
+async def test_streams_chunks_to_disk_without_leftovers(tmp_path):
+    media = MediaService()
+
+    path = await media.fetch(tmp_path, "id1", "a.txt", _chunks(b"he", b"llo"))
+
+    assert path == tmp_path / "a.txt" and path.read_bytes() == b"hello"
+    assert not list(tmp_path.glob("*.part"))
+
+
+@pytest.mark.asyncio
+async def test_size_limit_from_declared_size_and_while_streaming(tmp_path):
+    media = MediaService(max_bytes=8)
+    called = False
+
+    async def _never(path):
+        nonlocal called
+        called = True
+
+    with pytest.raises(MediaTooLargeError):
+        await media.fetch(tmp_path, "big", "big.bin", _never, size=9)
+    assert not called
+
+    with pytest.raises(MediaTooLargeError):
+        await media.fetch(tmp_path, "big", "big.bin", _chunks(b"12345", b"67890"))
+    assert list(tmp_path.iterdir()) == []
+
+    with pytest.raises(MediaTooLargeError):
+        await media.fetch(tmp_path, None, "c.bin", b"1234", max_bytes=3)
+
+
+@pytest.mark.asyncio
+async def test_file_id_cache_and_concurrent_requests_download_once(tmp_path):
+    media = MediaService()
+    calls = 0
+    gate = asyncio.Event()
+
+    async def _download(path):
+        nonlocal calls
+        calls += 1
+        await gate.wait()
+        return b"payload"
+
+    pending = [
+        asyncio.create_task(media.fetch(tmp_path, "fid", "f.bin", _download)) for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    gate.set()
+    paths = await asyncio.gather(*pending)
+    again = await media.fetch(tmp_path, "fid", "other-name.bin", _download)
+
+    assert calls == 1
+    assert set(paths) == {again} == {tmp_path / "f.bin"}
+    assert media.downloads == 1 and media.reused == 3
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_first_fetch_keeps_the_shared_download(tmp_path):
+    media = MediaService()
+    gate = asyncio.Event()
+
+    async def _download(path):
+        await gate.wait()
+        return b"payload"
+
+    first = asyncio.create_task(media.fetch(tmp_path, "fid", "f.bin", _download))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(media.fetch(tmp_path, "fid", "f.bin", _download))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    gate.set()
+
+    assert (await second).read_bytes() == b"payload"
+    assert first.cancelled()
+    assert media.cached("fid") == tmp_path / "f.bin"
+
+
+@pytest.mark.asyncio
+async def test_same_content_is_stored_once(tmp_path):
+    media = MediaService()
+
+    first = await media.fetch(tmp_path, "a", "first.png", b"same bytes")
+    second = await media.fetch(tmp_path, "b", "second.png", b"same bytes")
+    # The index survives a restart.
+    media_store(tmp_path)._digests = None
+    third = await MediaService().fetch(tmp_path, "c", "third.png", b"same bytes")
+
+    assert first == second == third == tmp_path / "first.png"
+    assert sorted(p.name for p in tmp_path.iterdir() if not p.name.startswith(".")) == [
+        "first.png"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_source_that_saves_the_file_itself(tmp_path):
+    media = MediaService(max_bytes=4)
+
+    async def _save(path):
+        path.write_bytes(b"abc")
+
+    async def _save_too_much(path):
+        path.write_bytes(b"abcdef")
+
+    assert (await media.fetch(tmp_path, "s", "s.bin", _save)).read_bytes() == b"abc"
+    with pytest.raises(MediaTooLargeError):
+        await media.fetch(tmp_path, "t", "t.bin", _save_too_much)
+    assert not (tmp_path / "t.bin").exists()
+
+
+@pytest.mark.asyncio
+async def test_download_checks_content_length_before_reading(tmp_path):
+    media = MediaService(max_bytes=10)
+
+    client = _StreamingClient(b"x" * 20)
+    with pytest.raises(MediaTooLargeError):
+        await media.download(tmp_path, client, "https://h/big", "big.bin")
+    assert client.read == 0
+
+    client = _StreamingClient(b"x" * 20, length=5)  # lying header: stopped mid-stream
+    with pytest.raises(MediaTooLargeError):
+        await media.download(tmp_path, client, "https://h/liar", "liar.bin")
+    assert client.read < 20
+
+    with pytest.raises(MediaError):
+        await media.download(tmp_path, _StreamingClient(b"", status=404), "https://h/x", "x.bin")
+
+    client = _StreamingClient(b"small")
+    path = await media.download(tmp_path, client, "https://h/ok", "ok.bin")
+    await media.download(tmp_path, client, "https://h/ok", "ok.bin")
+    assert path.read_bytes() == b"small" and client.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_retention_and_directory_cap(tmp_path):
+    media = MediaService(retention_s=3600, quota_bytes=10)
+    old = tmp_path / "old.bin"
+    old.write_bytes(b"old")
+    week_ago = time.time() - 7 * 86400
+    os.utime(old, (week_ago, week_ago))
+    older_kept = tmp_path / "kept.bin"
+    older_kept.write_bytes(b"123456")
+    os.utime(older_kept, (time.time() - 60, time.time() - 60))
+
+    await media.fetch(tmp_path, "n", "new.bin", b"7890abcd")
+
+    assert not old.exists()
+    # Over the 10-byte cap: the oldest remaining file goes first.
+    assert not older_kept.exists()
+    assert (tmp_path / "new.bin").exists()
+
+
+def test_manager_applies_media_limits_from_config():
+    class _Channel(BaseChannel):
+        name = "dummy"
+
+        async def start(self):
+            pass
+
+        async def stop(self):
+            pass
+
+        async def send(self, msg):
+            pass
+
+    config = Config.model_validate(
+        {"channels": {"mediaMaxMb": 5, "mediaRetentionDays": 2, "mediaDirMaxMb": 100}}
+    )
+    manager = ChannelManager(config, MessageBus())
+    channel = _Channel({}, MessageBus())
+    manager._configure_media(channel)
+
+    assert channel.media.max_bytes == 5 * 1024 * 1024
+    assert channel.media.retention_s == 2 * 86400
+    assert channel.media.quota_bytes == 100 * 1024 * 1024
@@ -211,8 +211,8 @@ def test_channels_login_uses_discovered_plugin_class(monkeypatch):
 
     monkeypatch.setattr("nanobot.config.loader.load_config", lambda config_path=None: Config())
     monkeypatch.setattr(
-        "nanobot.channels.registry.discover_all",
-        lambda: {"fakeplugin": _LoginPlugin},
+        "nanobot.channels.registry.discover_plugins",
+        lambda names=None: {"fakeplugin": _LoginPlugin},
     )
 
     result = runner.invoke(app, ["channels", "login", "fakeplugin", "--force"])
@@ -240,8 +240,8 @@ def test_channels_login_sets_custom_config_path(monkeypatch, tmp_path):
         lambda path: seen.__setitem__("config_path", path),
     )
     monkeypatch.setattr(
-        "nanobot.channels.registry.discover_all",
-        lambda: {"fakeplugin": _LoginPlugin},
+        "nanobot.channels.registry.discover_plugins",
+        lambda names=None: {"fakeplugin": _LoginPlugin},
     )
 
     result = runner.invoke(app, ["channels", "login", "fakeplugin", "--config", str(config_path)])
@@ -264,7 +264,7 @@ def test_channels_status_sets_custom_config_path(monkeypatch, tmp_path):
         "nanobot.config.loader.set_config_path",
         lambda path: seen.__setitem__("config_path", path),
     )
-    monkeypatch.setattr("nanobot.channels.registry.discover_all", lambda: {})
+    monkeypatch.setattr("nanobot.channels.registry.channel_catalog", lambda: {})
 
     result = runner.invoke(app, ["channels", "status", "--config", str(config_path)])
 
@@ -768,6 +768,7 @@ async def test_get_status_returns_running_state():
     ch = _StartableChannel(fake_config, mgr.bus)
     mgr.channels = {"startable": ch}
     mgr._dispatch_task = None
+    mgr._outboxes = {}
 
     status = mgr.get_status()
 
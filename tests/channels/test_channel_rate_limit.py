@@ -0,0 +1,152 @@
+"""Outbound rate limiting: token buckets, Retry-After pauses and the outbox scheduler."""
+
+import asyncio
+
+import pytest
+from outbound_test_utils import make_manager, wait_for
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.channels.base import BaseChannel
+from nanobot.channels.ratelimit import OutboundLimiter, RateLimits
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class _LimitedChannel(BaseChannel):
+    name = "lim"
+    display_name = "Limited"
+    rate_limits = RateLimits(chat_per_second=20)
+
+    def __init__(self, config, bus):
+        super().__init__(config, bus)
+        self.sent: list[tuple[str, str]] = []
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def send(self, msg):
+        self.sent.append((msg.chat_id, msg.content))
+
+
+class _FloodError(Exception):
+    retry_after = 0.05
+
+
+def test_chat_burst_then_steady_rate():
+    clock = _Clock()
+    limiter = OutboundLimiter(RateLimits(chat_per_second=1, chat_burst=2), clock)
+
+    assert limiter.try_acquire("a") == 0
+    assert limiter.try_acquire("a") == 0
+    assert limiter.try_acquire("a") == pytest.approx(1.0)
+    # Other chats have their own budget.
+    assert limiter.try_acquire("b") == 0
+
+    clock.now += 1.0
+    assert limiter.try_acquire("a") == 0
+    assert limiter.snapshot() == {"admitted": 4, "delayed": 1, "wait_s": 1.0, "throttled": 0}
+
+
+def test_global_and_method_budgets_are_shared():
+    clock = _Clock()
+    limiter = OutboundLimiter(RateLimits(per_second=2, methods={"edit": 1}), clock)
+
+    assert limiter.try_acquire("a", "edit") == 0
+    assert limiter.delay("b", "edit") == pytest.approx(1.0)
+    assert limiter.try_acquire("b") == 0
+    assert limiter.delay("c") == pytest.approx(0.5)
+
+
+def test_pause_holds_one_chat_or_the_whole_channel():
+    clock = _Clock()
+    limiter = OutboundLimiter(RateLimits(), clock)
+
+    limiter.pause(3.0, "a")
+    assert limiter.delay("a") == pytest.approx(3.0)
+    assert limiter.delay("b") == 0
+
+    limiter.pause(1.0)
+    assert limiter.delay("b") == pytest.approx(1.0)
+    clock.now += 3.0
+    assert limiter.delay("a") == 0
+    assert limiter.throttled == 2
+
+
+def test_section_override_merges_or_disables():
+    base = RateLimits(per_second=30, chat_per_second=1, chat_burst=3)
+
+    assert base.merged(None) is base
+    assert base.merged(False) is None
+    assert base.merged({"chatPerSecond": 0.5, "chat_burst": 1}) == RateLimits(
+        per_second=30, chat_per_second=0.5, chat_burst=1,
+    )
+
+
+def test_manager_applies_rate_limit_override():
+    manager, bus = make_manager()
+    channel = _LimitedChannel({}, bus)
+    assert manager._rate_limiter("lim", channel) is channel.rate_limiter
+
+    manager, _ = make_manager(lim={"rateLimit": False})
+    assert manager._rate_limiter("lim", channel) is None
+
+    manager, _ = make_manager(lim={"rateLimit": {"perSecond": 5}})
+    limiter = manager._rate_limiter("lim", channel)
+    assert limiter.limits == RateLimits(per_second=5, chat_per_second=20)
+
+
+@pytest.mark.asyncio
+async def test_chat_over_quota_does_not_hold_up_other_chats():
+    manager, bus = make_manager(sendConcurrency=1)
+    channel = manager.channels["lim"] = _LimitedChannel({}, bus)
+    task = asyncio.create_task(manager._dispatch_outbound())
+
+    for chat_id, content in (("a", "1"), ("a", "2"), ("a", "3"), ("b", "x"), ("c", "y")):
+        await bus.publish_outbound(OutboundMessage(channel="lim", chat_id=chat_id, content=content))
+    await wait_for(lambda: len(channel.sent) == 5)
+
+    # With one worker, "a" waits out its per-chat spacing while b and c go out.
+    assert channel.sent.index(("b", "x")) < channel.sent.index(("a", "2"))
+    assert channel.sent.index(("c", "y")) < channel.sent.index(("a", "2"))
+    assert [c for chat, c in channel.sent if chat == "a"] == ["1", "2", "3"]
+    status = manager.get_status()["lim"]["rate_limit"]
+    assert status["admitted"] == 5 and status["delayed"] >= 2
+    assert 'nanobot_channel_rate_limited_total{channel="lim"}' in manager.render_prometheus()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_retry_after_from_a_send_pauses_the_chat(monkeypatch):
+    manager, bus = make_manager(sendMaxRetries=2)
+    channel = manager.channels["lim"] = _LimitedChannel({}, bus)
+    original = channel.send
+    calls = 0
+
+    async def _flood_once(msg):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise _FloodError()
+        await original(msg)
+
+    async def _no_sleep(delay):
+        pass
+
+    channel.send = _flood_once
+    monkeypatch.setattr("nanobot.channels.manager.asyncio.sleep", _no_sleep)
+    delivered = await manager._send_with_retry(
+        channel, OutboundMessage(channel="lim", chat_id="a", content="hi"),
+    )
+
+    assert delivered and channel.sent == [("a", "hi")]
+    assert channel.rate_limiter.throttled == 1
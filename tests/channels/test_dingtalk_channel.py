@@ -1,5 +1,6 @@
 import asyncio
 import zipfile
+from contextlib import asynccontextmanager
 from io import BytesIO
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
@@ -34,6 +35,9 @@ class _FakeResponse:
     def json(self) -> dict:
         return self._json_body
 
+    async def aiter_bytes(self, chunk_size: int | None = None):
+        yield self.content
+
 
 class _FakeHttp:
     def __init__(self, responses: list[_FakeResponse] | None = None) -> None:
@@ -53,6 +57,11 @@ class _FakeHttp:
         self.calls.append({"method": "GET", "url": url})
         return self._next_response()
 
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs):
+        self.calls.append({"method": method, "url": url})
+        yield self._next_response()
+
 
 class _NetworkErrorHttp:
     """HTTP client stub that raises httpx.TransportError on every request."""
@@ -470,7 +470,7 @@ async def test_send_delta_streams_by_editing_message(monkeypatch) -> None:
     client.channels[123] = target
 
     times = iter([1.0, 3.0, 5.0])
-    monkeypatch.setattr("nanobot.channels.discord.time.monotonic", lambda: next(times, 5.0))
+    monkeypatch.setattr("nanobot.channels.base.time.monotonic", lambda: next(times, 5.0))
 
     await owner.send_delta("123", "hel", {"_stream_delta": True, "_stream_id": "s1"})
     await owner.send_delta("123", "lo", {"_stream_delta": True, "_stream_id": "s1"})
@@ -497,7 +497,7 @@ async def test_send_delta_stream_end_splits_oversized_reply(monkeypatch) -> None
     assert len(chunks) == 2
 
     times = iter([1.0, 3.0])
-    monkeypatch.setattr("nanobot.channels.discord.time.monotonic", lambda: next(times, 3.0))
+    monkeypatch.setattr("nanobot.channels.base.time.monotonic", lambda: next(times, 3.0))
 
     await owner.send_delta("123", prefix, {"_stream_delta": True, "_stream_id": "s1"})
     await owner.send_delta("123", suffix, {"_stream_delta": True, "_stream_id": "s1"})
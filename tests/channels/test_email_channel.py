@@ -872,3 +872,305 @@ def test_extract_attachments_sanitizes_filename(tmp_path, monkeypatch) -> None:
     saved_path = Path(items[0]["media"][0])
     # File must be inside the media dir, not escaped via path traversal
     assert saved_path.parent == tmp_path
+
+
+# ---------------------------------------------------------------------------
+# Push mode against a local IMAP stand-in, and SMTP connection reuse
+# ---------------------------------------------------------------------------
+
+
+class _LocalIMAPServer:
+    """A tiny IMAP4rev1 server on 127.0.0.1: LOGIN, SELECT, UID SEARCH/FETCH/STORE and IDLE."""
+
+    def __init__(self, *, idle: bool = True, uid_validity: int = 7) -> None:
+        import socketserver
+        import threading
+
+        self.idle = idle
+        self.uid_validity = uid_validity
+        self.messages: list[dict] = []  # {"uid", "raw", "seen"}
+        self.commands: list[str] = []
+        self.logins = 0
+        self._idlers: list = []
+        self._lock = threading.Lock()
+        server = self
+
+        class _Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                server._serve(self)
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def add(self, raw: bytes, *, seen: bool = False) -> int:
+        with self._lock:
+            uid = (self.messages[-1]["uid"] if self.messages else 0) + 1
+            self.messages.append({"uid": uid, "raw": raw, "seen": seen})
+            for handler in self._idlers:
+                handler.wfile.write(b"* %d EXISTS\r\n" % len(self.messages))
+                handler.reported = len(self.messages)
+        return uid
+
+    def drop_connections(self) -> None:
+        import socket
+
+        with self._lock:
+            idlers, self._idlers = self._idlers, []
+        for handler in idlers:
+            handler.connection.shutdown(socket.SHUT_RDWR)
+
+    def close(self) -> None:
+        self.drop_connections()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _serve(self, h) -> None:
+        caps = b"IMAP4rev1 IDLE" if self.idle else b"IMAP4rev1"
+        h.wfile.write(b"* OK stand-in ready\r\n")
+        while line := h.rfile.readline():
+            tag, _, rest = line.decode().strip().partition(" ")
+            command = rest.upper()
+            self.commands.append(rest)
+            reply = f"{tag} OK done\r\n".encode()
+            if command.startswith("CAPABILITY"):
+                h.wfile.write(b"* CAPABILITY " + caps + b"\r\n")
+            elif command.startswith("LOGIN"):
+                self.logins += 1
+            elif command.startswith("SELECT"):
+                h.reported = len(self.messages)
+                uid_next = (self.messages[-1]["uid"] if self.messages else 0) + 1
+                h.wfile.write(
+                    b"* %d EXISTS\r\n* OK [UIDVALIDITY %d] ok\r\n* OK [UIDNEXT %d] ok\r\n"
+                    % (len(self.messages), self.uid_validity, uid_next)
+                )
+            elif command.startswith(("SEARCH", "UID SEARCH")):
+                h.wfile.write(self._search(command))
+            elif command.startswith("UID FETCH"):
+                self._fetch(h, command.split()[2])
+            elif command.startswith("FETCH"):
+                self._fetch(h, command.split()[1], by_uid=False)
+            elif command.startswith(("UID STORE", "STORE")):
+                wanted = {int(n) for n in command.split()[-3].split(",")}
+                for seq, msg in enumerate(self.messages, 1):
+                    if (msg["uid"] if command.startswith("UID") else seq) in wanted:
+                        msg["seen"] = True
+            elif command == "IDLE":
+                h.wfile.write(b"+ idling\r\n")
+                with self._lock:
+                    # Like real servers, report mail that arrived since the last command.
+                    if h.reported != len(self.messages):
+                        h.wfile.write(b"* %d EXISTS\r\n" % len(self.messages))
+                        h.reported = len(self.messages)
+                    self._idlers.append(h)
+                done = h.rfile.readline()
+                with self._lock:
+                    if h in self._idlers:
+                        self._idlers.remove(h)
+                if not done:
+                    return
+            elif command == "LOGOUT":
+                h.wfile.write(b"* BYE logging out\r\n" + reply)
+                return
+            h.wfile.write(reply)
+
+    def _search(self, command: str) -> bytes:
+        words = command.split()
+        by_uid = words[0] == "UID"
+        low = 0
+        if "UID" in words[1:]:
+            low = int(words[words.index("UID", 1) + 1].split(":")[0])
+        hits = []
+        for seq, msg in enumerate(self.messages, 1):
+            if "UNSEEN" in words and msg["seen"]:
+                continue
+            # "n:*" also matches the last message, as real servers do.
+            if msg["uid"] >= low or msg is self.messages[-1]:
+                hits.append(msg["uid"] if by_uid else seq)
+        return b"* SEARCH " + " ".join(map(str, hits)).encode() + b"\r\n"
+
+    def _fetch(self, h, wanted: str, *, by_uid: bool = True) -> None:
+        numbers = {int(n) for n in wanted.split(",")}
+        for seq, msg in enumerate(self.messages, 1):
+            if (msg["uid"] if by_uid else seq) in numbers:
+                head = b"* %d FETCH (UID %d BODY[] {%d}\r\n" % (seq, msg["uid"], len(msg["raw"]))
+                h.wfile.write(head + msg["raw"] + b")\r\n")
+
+
+@pytest.fixture
+def imap_server():
+    servers: list[_LocalIMAPServer] = []
+
+    def _start(**kwargs) -> _LocalIMAPServer:
+        servers.append(_LocalIMAPServer(**kwargs))
+        return servers[-1]
+
+    yield _start
+    for server in servers:
+        server.close()
+
+
+def _local_config(server: _LocalIMAPServer, **overrides) -> EmailConfig:
+    return _make_config(
+        imap_host="127.0.0.1",
+        imap_port=server.port,
+        imap_use_ssl=False,
+        allow_from=["*"],
+        **overrides,
+    )
+
+
+async def _next_inbound(bus: MessageBus, timeout: float = 5.0):
+    import asyncio
+
+    return await asyncio.wait_for(bus.consume_inbound(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_idle_push_fetches_only_new_uids_on_one_connection(imap_server) -> None:
+    import asyncio
+
+    server = imap_server()
+    server.add(_make_raw_email(subject="Old"), seen=True)
+    server.add(_make_raw_email(subject="Unread"))
+    bus = MessageBus()
+    channel = EmailChannel(_local_config(server), bus)
+    task = asyncio.create_task(channel.start())
+
+    first = await _next_inbound(bus)
+    assert first.metadata["subject"] == "Unread" and first.metadata["uid"] == "2"
+
+    server.add(_make_raw_email(subject="Pushed"))
+    pushed = await _next_inbound(bus)
+    assert pushed.metadata["subject"] == "Pushed" and pushed.metadata["uid"] == "3"
+
+    await channel.stop()
+    await asyncio.wait_for(task, 5)
+    assert server.logins == 1
+    assert "UID SEARCH UID 3:* UNSEEN" in server.commands
+    assert not any(c.upper().startswith("SEARCH") for c in server.commands)
+    assert [m["seen"] for m in server.messages] == [True, True, True]
+    assert server.commands[-1].upper() == "LOGOUT"
+
+
+@pytest.mark.asyncio
+async def test_idle_reconnects_and_resumes_after_last_uid(imap_server) -> None:
+    import asyncio
+
+    server = imap_server()
+    server.add(_make_raw_email(subject="Before"))
+    bus = MessageBus()
+    channel = EmailChannel(_local_config(server), bus)
+    task = asyncio.create_task(channel.start())
+    assert (await _next_inbound(bus)).metadata["subject"] == "Before"
+
+    while not server._idlers:
+        await asyncio.sleep(0.01)
+    server.drop_connections()
+    server.add(_make_raw_email(subject="While away"))
+
+    resumed = await _next_inbound(bus)
+    assert resumed.metadata["subject"] == "While away"
+    assert server.logins == 2
+    assert "UID SEARCH UID 2:* UNSEEN" in server.commands
+
+    await channel.stop()
+    await asyncio.wait_for(task, 5)
+
+
+@pytest.mark.asyncio
+async def test_uidvalidity_change_resyncs_unread_mail(imap_server) -> None:
+    import asyncio
+
+    server = imap_server()
+    server.add(_make_raw_email(subject="First"))
+    channel = EmailChannel(_local_config(server), MessageBus())
+    loop = asyncio.get_running_loop()
+    channel._running = True
+
+    items: list[dict] = []
+    assert await loop.run_in_executor(None, channel._idle_cycle, items)
+    assert [i["subject"] for i in items] == ["First"] and channel._last_uid == 1
+    channel._close_imap()
+
+    # The mailbox was rebuilt: same UID, different message.
+    server.uid_validity += 1
+    server.messages[0].update(raw=_make_raw_email(subject="Rebuilt"), seen=False)
+    items = []
+    await loop.run_in_executor(None, channel._idle_cycle, items)
+    channel._close_imap()
+
+    assert [i["subject"] for i in items] == ["Rebuilt"]
+
+
+@pytest.mark.asyncio
+async def test_server_without_idle_falls_back_to_polling(imap_server) -> None:
+    import asyncio
+
+    server = imap_server(idle=False)
+    server.add(_make_raw_email(subject="Polled"))
+    bus = MessageBus()
+    channel = EmailChannel(_local_config(server), bus)
+    task = asyncio.create_task(channel.start())
+
+    assert (await _next_inbound(bus)).metadata["subject"] == "Polled"
+    assert "SEARCH UNSEEN" in server.commands
+    assert "IDLE" not in server.commands
+
+    await channel.stop()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_smtp_connections_are_reused_and_replaced_when_stale(monkeypatch) -> None:
+    class FakeSMTP:
+        def __init__(self) -> None:
+            self.logins = 0
+            self.sent: list[EmailMessage] = []
+            self.alive = True
+            self.quit_called = False
+
+        def starttls(self, context=None):
+            return None
+
+        def login(self, _user: str, _pw: str):
+            self.logins += 1
+
+        def noop(self):
+            if not self.alive:
+                raise OSError("connection reset")
+            return 250, b"OK"
+
+        def send_message(self, msg: EmailMessage):
+            self.sent.append(msg)
+
+        def quit(self):
+            self.quit_called = True
+
+    instances: list[FakeSMTP] = []
+
+    def _smtp_factory(_host: str, _port: int, timeout: int = 30):
+        instances.append(FakeSMTP())
+        return instances[-1]
+
+    monkeypatch.setattr("nanobot.channels.email.smtplib.SMTP", _smtp_factory)
+    channel = EmailChannel(_make_config(), MessageBus())
+
+    async def _send(content: str) -> None:
+        await channel.send(
+            OutboundMessage(channel="email", chat_id="bob@example.com", content=content)
+        )
+
+    await _send("one")
+    await _send("two")
+    assert len(instances) == 1 and instances[0].logins == 1 and len(instances[0].sent) == 2
+
+    instances[0].alive = False
+    await _send("three")
+    assert len(instances) == 2 and instances[0].quit_called
+    assert [m.get_content().strip() for m in instances[1].sent] == ["three"]
+
+    await channel.stop()
+    assert instances[1].quit_called
@@ -0,0 +1,121 @@
+"""BaseChannel streaming engine: trailing flush, backlog flush and rate-limit backoff."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel, StreamBuffer
+
+
+class _RateLimitError(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__("slow down")
+        self.retry_after = retry_after
+
+
+class _EditingChannel(BaseChannel):
+    """Implements only the three streaming primitives."""
+
+    name = "fake"
+    stream_edit_interval = 0.05
+    stream_max_interval = 0.5
+
+    def __init__(self, fail_with: list[Exception] | None = None):
+        super().__init__({"streaming": True, "allow_from": ["*"]}, MessageBus())
+        self.created: list[str] = []
+        self.edits: list[str] = []
+        self.finals: list[str] = []
+        self._fail_with = list(fail_with or [])
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def send(self, msg) -> None:
+        pass
+
+    async def _stream_create(self, chat_id: str, buf: StreamBuffer, meta: dict[str, Any]) -> Any:
+        self.created.append(buf.text)
+        return len(self.created)
+
+    async def _stream_update(self, chat_id: str, buf: StreamBuffer, meta: dict[str, Any]) -> None:
+        if self._fail_with:
+            raise self._fail_with.pop(0)
+        self.edits.append(buf.text)
+
+    async def _stream_finalize(self, chat_id: str, buf: StreamBuffer, meta: dict[str, Any]) -> None:
+        self.finals.append(buf.text)
+
+
+async def _delta(channel: BaseChannel, text: str, **meta) -> None:
+    await channel.send_delta("c1", text, {"_stream_delta": True, "_stream_id": "s1", **meta})
+
+
+def test_primitives_alone_enable_streaming():
+    assert _EditingChannel().supports_streaming is True
+
+
+@pytest.mark.asyncio
+async def test_update_without_create_does_not_enable_the_engine():
+    class _UpdateOnly(_EditingChannel):
+        _stream_create = BaseChannel._stream_create
+
+    channel = _UpdateOnly()
+    assert channel.supports_streaming is False
+    await _delta(channel, "hello")
+    assert channel._stream_bufs == {}
+
+
+@pytest.mark.asyncio
+async def test_trailing_edge_flushes_the_last_delta_without_waiting_for_more():
+    channel = _EditingChannel()
+    await _delta(channel, "Hello")
+    await _delta(channel, ", world")  # inside the interval: deferred, not dropped
+    assert channel.edits == []
+    await asyncio.sleep(0.1)
+    assert channel.created == ["Hello"]
+    assert channel.edits == ["Hello, world"]
+
+
+@pytest.mark.asyncio
+async def test_large_backlog_flushes_after_half_an_interval():
+    channel = _EditingChannel()
+    channel.stream_edit_interval = 10.0
+    await _delta(channel, "a")
+    await _delta(channel, "b" * 500)
+    assert channel.edits == []
+    channel._stream_bufs["c1"].last_edit -= 6.0
+    await _delta(channel, "c")
+    assert channel.edits == ["a" + "b" * 500 + "c"]
+    channel._cancel_stream_timer(channel._stream_bufs["c1"])
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_backs_off_and_retries_from_a_timer():
+    channel = _EditingChannel(fail_with=[_RateLimitError(0.2)])
+    await _delta(channel, "one")
+    await asyncio.sleep(0.06)
+    await _delta(channel, " two")  # edit is rate limited; must not raise
+    assert channel._stream_backoff == pytest.approx(0.2)
+    assert channel._stream_interval() == pytest.approx(0.2)
+    await asyncio.sleep(0.3)
+    assert channel.edits == ["one two"]
+    assert channel._stream_backoff < 0.2
+
+
+@pytest.mark.asyncio
+async def test_stream_end_finalizes_once_and_drops_the_buffer():
+    channel = _EditingChannel()
+    await _delta(channel, "Hi")
+    await _delta(channel, " there")
+    await channel.send_delta("c1", "!", {"_stream_end": True, "_stream_id": "s1"})
+    await asyncio.sleep(0.1)  # a cancelled trailing timer must not edit afterwards
+    assert channel.finals == ["Hi there!"]
+    assert channel.edits == []
+    assert channel._stream_bufs == {}
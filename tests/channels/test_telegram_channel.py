@@ -13,7 +13,12 @@ except ImportError:
 
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.channels.telegram import TELEGRAM_REPLY_CONTEXT_MAX_LEN, TelegramChannel, _StreamBuf
+from nanobot.channels.telegram import (
+    TELEGRAM_REPLY_CONTEXT_MAX_LEN,
+    TelegramChannel,
+    _markdown_to_telegram_html,
+    _StreamBuf,
+)
 from nanobot.channels.telegram import TelegramConfig
 
 
@@ -530,6 +535,25 @@ async def test_send_delta_incremental_edit_treats_not_modified_as_success() -> N
     assert channel._stream_bufs["123"].last_edit > 0.0
 
 
+@pytest.mark.asyncio
+async def test_send_delta_incremental_edit_renders_html_from_cached_blocks() -> None:
+    channel = TelegramChannel(
+        TelegramConfig(enabled=True, token="123:abc", allow_from=["*"]),
+        MessageBus(),
+    )
+    channel._app = _FakeApp(lambda: None)
+    channel._app.bot.edit_message_text = AsyncMock()
+    text = "**done** step one\n\nnow `step` two\n"
+    channel._stream_bufs["123"] = _StreamBuf(text=text, message_id=7, last_edit=0.0, stream_id="s:0")
+
+    await channel.send_delta("123", "more", {"_stream_delta": True, "_stream_id": "s:0"})
+
+    kwargs = channel._app.bot.edit_message_text.call_args.kwargs
+    assert kwargs["parse_mode"] == "HTML"
+    assert kwargs["text"] == _markdown_to_telegram_html(text + "more")
+    assert channel._stream_bufs["123"].renderer.cached_chars == len("**done** step one\n\n")
+
+
 @pytest.mark.asyncio
 async def test_send_delta_initial_send_keeps_message_in_thread() -> None:
     channel = TelegramChannel(
@@ -3,7 +3,7 @@
 Surrogate characters in CLI input must not crash history file writes.
 """
 
-from nanobot.cli.commands import SafeFileHistory
+from nanobot.cli.history import SafeFileHistory
 
 
 class TestSafeFileHistory:
@@ -0,0 +1,109 @@
+"""Import budgets for CLI startup.
+
+Each check runs in a fresh interpreter so modules imported by other tests do
+not hide a regression.  Time is measured with ``python -X importtime``; which
+modules got loaded is read from ``sys.modules``, since modules imported
+through ``importlib.import_module`` do not show up in ``-X importtime``.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import subprocess
+import sys
+
+import pytest
+
+# Heavy modules that must stay off the import path until actually used:
+# channel SDKs, provider SDKs, document parsers and prompt_toolkit.
+_DEFERRED = (
+    "anthropic",
+    "dingtalk_stream",
+    "discord",
+    "docx",
+    "lark_oapi",
+    "langfuse",
+    "openai",
+    "openpyxl",
+    "pptx",
+    "prompt_toolkit",
+    "pypdf",
+    "slack_sdk",
+    "socketio",
+    "telegram",
+    "nanobot.agent.loop",
+    "nanobot.channels.feishu",
+)
+
+# Cumulative ``-X importtime`` of ``nanobot.cli.commands``.  It measures about
+# 0.4s on a laptop; pulling in one of the SDKs above costs more than the headroom.
+_CLI_IMPORT_BUDGET_US = 1_000_000
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def _importtime(code: str) -> dict[str, int]:
+    """Cumulative import time in microseconds for each module *code* imports."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    return {
+        m.group(4): int(m.group(2))
+        for line in result.stderr.splitlines()
+        if (m := _LINE.match(line))
+    }
+
+
+def _loaded(code: str) -> set[str]:
+    """Names in ``sys.modules`` after running *code*, plus their top-level packages."""
+    code += "\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    modules = json.loads(result.stdout.splitlines()[-1])
+    return {name.split(".")[0] for name in modules} | set(modules)
+
+
+def test_cli_import_defers_heavy_modules():
+    assert not _loaded("import nanobot.cli.commands") & set(_DEFERRED)
+
+
+def test_cli_import_time_budget():
+    modules = _importtime("import nanobot.cli.commands")
+
+    assert modules["nanobot.cli.commands"] <= _CLI_IMPORT_BUDGET_US, (
+        f"importing nanobot.cli.commands took {modules['nanobot.cli.commands'] / 1000:.0f}ms"
+    )
+
+
+def test_discover_all_imports_only_requested_channels():
+    modules = _loaded(
+        "from nanobot.channels.registry import channel_catalog, discover_all\n"
+        "assert len(channel_catalog()) >= 10\n"
+        "assert set(discover_all(['websocket'])) == {'websocket'}"
+    )
+
+    assert "nanobot.channels.websocket" in modules
+    loaded = {name for name in modules if name.startswith("nanobot.channels.")}
+    assert loaded <= {
+        "nanobot.channels.base",
+        "nanobot.channels.manager",
+        "nanobot.channels.manifest",
+        "nanobot.channels.media",
+        "nanobot.channels.ratelimit",
+        "nanobot.channels.registry",
+        "nanobot.channels.websocket",
+    }
+
+
+@pytest.mark.parametrize("module", ["nanobot", "nanobot.providers"])
+def test_package_import_is_lazy(module):
+    modules = _loaded(f"import {module}")
+
+    assert not {"nanobot.agent.loop", "openai", "anthropic"} & modules
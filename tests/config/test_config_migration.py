@@ -116,7 +116,7 @@ def test_onboard_refresh_backfills_missing_channel_fields(tmp_path, monkeypatch)
     monkeypatch.setattr("nanobot.config.loader.get_config_path", lambda: config_path)
     monkeypatch.setattr("nanobot.cli.commands.get_workspace_path", lambda _workspace=None: workspace)
     monkeypatch.setattr(
-        "nanobot.channels.registry.discover_all",
+        "nanobot.channels.registry.channel_catalog",
         lambda: {
             "qq": SimpleNamespace(
                 default_config=lambda: {
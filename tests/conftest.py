@@ -0,0 +1,13 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+from nanobot.security.network import dns_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_dns_cache():
+    """Tests patch ``socket.getaddrinfo`` per case; never serve another test's answer."""
+    dns_cache.clear()
+    yield
+    dns_cache.clear()
@@ -30,6 +30,16 @@ def _fake_chat_response(content: str = "ok") -> SimpleNamespace:
     return SimpleNamespace(choices=[choice], usage=usage)
 
 
+def _raw_response(create: AsyncMock, headers: dict[str, str] | None = None) -> AsyncMock:
+    """Serve *create*'s result the way ``with_raw_response.create`` does."""
+
+    async def _create(**kwargs):
+        parsed = await create(**kwargs)
+        return SimpleNamespace(parse=lambda: parsed, headers=headers or {})
+
+    return AsyncMock(side_effect=_create)
+
+
 def _fake_tool_call_response() -> SimpleNamespace:
     """Build a minimal chat response that includes Gemini-style extra_content."""
     function = SimpleNamespace(
@@ -168,7 +178,7 @@ async def test_openrouter_keeps_model_name_intact() -> None:
 
     with patch("nanobot.providers.openai_compat_provider.AsyncOpenAI") as MockClient:
         client_instance = MockClient.return_value
-        client_instance.chat.completions.create = mock_create
+        client_instance.chat.completions.with_raw_response.create = _raw_response(mock_create)
 
         provider = OpenAICompatProvider(
             api_key="sk-or-test-key",
@@ -193,7 +203,7 @@ async def test_aihubmix_strips_model_prefix() -> None:
 
     with patch("nanobot.providers.openai_compat_provider.AsyncOpenAI") as MockClient:
         client_instance = MockClient.return_value
-        client_instance.chat.completions.create = mock_create
+        client_instance.chat.completions.with_raw_response.create = _raw_response(mock_create)
 
         provider = OpenAICompatProvider(
             api_key="sk-aihub-test-key",
@@ -218,7 +228,7 @@ async def test_standard_provider_passes_model_through() -> None:
 
     with patch("nanobot.providers.openai_compat_provider.AsyncOpenAI") as MockClient:
         client_instance = MockClient.return_value
-        client_instance.chat.completions.create = mock_create
+        client_instance.chat.completions.with_raw_response.create = _raw_response(mock_create)
 
         provider = OpenAICompatProvider(
             api_key="sk-deepseek-test-key",
@@ -242,7 +252,7 @@ async def test_openai_compat_preserves_extra_content_on_tool_calls() -> None:
 
     with patch("nanobot.providers.openai_compat_provider.AsyncOpenAI") as MockClient:
         client_instance = MockClient.return_value
-        client_instance.chat.completions.create = mock_create
+        client_instance.chat.completions.with_raw_response.create = _raw_response(mock_create)
 
         provider = OpenAICompatProvider(
             api_key="test-key",
@@ -285,7 +295,7 @@ async def test_direct_openai_gpt5_uses_responses_api() -> None:
 
     with patch("nanobot.providers.openai_compat_provider.AsyncOpenAI") as MockClient:
         client_instance = MockClient.return_value
-        client_instance.chat.completions.create = mock_chat
+        client_instance.chat.completions.with_raw_response.create = _raw_response(mock_chat)
         client_instance.responses.create = mock_responses
 
         provider = OpenAICompatProvider(
@@ -316,7 +326,7 @@ async def test_direct_openai_reasoning_prefers_responses_api() -> None:
 
     with patch("nanobot.providers.openai_compat_provider.AsyncOpenAI") as MockClient:
         client_instance = MockClient.return_value
-        client_instance.chat.completions.create = mock_chat
+        client_instance.chat.completions.with_raw_response.create = _raw_response(mock_chat)
         client_instance.responses.create = mock_responses
 
         provider = OpenAICompatProvider(
@@ -345,7 +355,7 @@ async def test_direct_openai_gpt4o_stays_on_chat_completions() -> None:
 
     with patch("nanobot.providers.openai_compat_provider.AsyncOpenAI") as MockClient:
         client_instance = MockClient.return_value
-        client_instance.chat.completions.create = mock_chat
+        client_instance.chat.completions.with_raw_response.create = _raw_response(mock_chat)
         client_instance.responses.create = mock_responses
 
         provider = OpenAICompatProvider(
@@ -370,7 +380,7 @@ async def test_openrouter_gpt5_stays_on_chat_completions() -> None:
 
     with patch("nanobot.providers.openai_compat_provider.AsyncOpenAI") as MockClient:
         client_instance = MockClient.return_value
-        client_instance.chat.completions.create = mock_chat
+        client_instance.chat.completions.with_raw_response.create = _raw_response(mock_chat)
         client_instance.responses.create = mock_responses
 
         provider = OpenAICompatProvider(
@@ -423,7 +433,7 @@ async def test_direct_openai_responses_404_falls_back_to_chat_completions() -> N
 
     with patch("nanobot.providers.openai_compat_provider.AsyncOpenAI") as MockClient:
         client_instance = MockClient.return_value
-        client_instance.chat.completions.create = mock_chat
+        client_instance.chat.completions.with_raw_response.create = _raw_response(mock_chat)
         client_instance.responses.create = mock_responses
 
         provider = OpenAICompatProvider(
@@ -477,7 +487,7 @@ async def test_direct_openai_responses_rate_limit_does_not_fallback() -> None:
 
     with patch("nanobot.providers.openai_compat_provider.AsyncOpenAI") as MockClient:
         client_instance = MockClient.return_value
-        client_instance.chat.completions.create = mock_chat
+        client_instance.chat.completions.with_raw_response.create = _raw_response(mock_chat)
         client_instance.responses.create = mock_responses
 
         provider = OpenAICompatProvider(
@@ -0,0 +1,104 @@
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from nanobot.config.schema import Config
+from nanobot.providers.mock_provider import MockProvider
+from nanobot.providers.registry import find_by_name
+
+_SCRIPT = [
+    {"content": "checking", "tool_calls": [{"name": "list_dir", "arguments": {"path": "."}}]},
+    {"content": "all done", "usage": {"prompt_tokens": 100, "completion_tokens": 20}},
+]
+
+
+def test_registered_and_selected_by_prefix() -> None:
+    assert find_by_name("mock").backend == "mock"
+    config = Config()
+    config.agents.defaults.model = "mock/echo"
+    assert config.get_provider_name() == "mock"
+
+
+@pytest.mark.asyncio
+async def test_echo_without_script_estimates_usage() -> None:
+    provider = MockProvider()
+    response = await provider.chat(messages=[{"role": "user", "content": "hello world!"}])
+
+    assert response.content == "mock: hello world!"
+    assert response.usage == {"prompt_tokens": 3, "completion_tokens": 4, "total_tokens": 7}
+
+
+@pytest.mark.asyncio
+async def test_runner_replays_tool_call_script() -> None:
+    from nanobot.agent.runner import AgentRunner, AgentRunSpec
+
+    tools = MagicMock()
+    tools.get_definitions.return_value = []
+    tools.execute = AsyncMock(return_value="a.txt")
+    result = await AgentRunner(MockProvider(script=_SCRIPT)).run(AgentRunSpec(
+        initial_messages=[{"role": "user", "content": "what is here?"}],
+        tools=tools,
+        model="mock",
+        max_iterations=3,
+        max_tool_result_chars=1000,
+    ))
+
+    assert result.final_content == "all done"
+    assert result.tools_used == ["list_dir"]
+    assert result.usage["prompt_tokens"] >= 100
+
+
+@pytest.mark.asyncio
+async def test_stream_is_paced_by_ttft_and_token_rate() -> None:
+    provider = MockProvider(script=[{"content": "x" * 64}], ttft_s=0.05, tokens_per_s=800)
+    deltas: list[tuple[float, str]] = []
+
+    async def _on_delta(text: str) -> None:
+        deltas.append((time.monotonic(), text))
+
+    started = time.monotonic()
+    response = await provider.chat_stream(messages=[], on_content_delta=_on_delta)
+
+    assert "".join(d for _, d in deltas) == response.content
+    assert len(deltas) == 4  # 16 tokens in chunks of 4
+    assert deltas[0][0] - started >= 0.05
+    assert time.monotonic() - started >= 0.05 + 16 / 800 * 0.75
+
+
+@pytest.mark.asyncio
+async def test_error_injection_is_seeded() -> None:
+    async def _outcomes(seed: int) -> list[int | None]:
+        provider = MockProvider(error_rate=0.3, rate_limit_rate=0.2, seed=seed)
+        return [
+            (await provider.chat(messages=[])).error_status_code for _ in range(50)
+        ]
+
+    first = await _outcomes(7)
+    assert first == await _outcomes(7)
+    assert {429, 500, None} == set(first)
+
+    limited = await MockProvider(rate_limit_rate=1.0, retry_after_s=2).chat(messages=[])
+    assert MockProvider._is_transient_response(limited)
+    assert MockProvider._extract_retry_after_from_response(limited) == 2
+
+
+def test_loads_recorded_session_and_cache_entries(tmp_path) -> None:
+    session = tmp_path / "session.jsonl"
+    session.write_text("\n".join(json.dumps(r) for r in [
+        {"_type": "metadata", "key": "cli:direct"},
+        {"role": "user", "content": "hi"},
+        {"role": "assistant", "content": None, "tool_calls": [
+            {"id": "c1", "type": "function",
+             "function": {"name": "read_file", "arguments": "{\"path\": \"a\"}"}},
+        ]},
+        {"role": "tool", "tool_call_id": "c1", "content": "data"},
+        {"created": 1.0, "response": {"content": "cached answer", "tool_calls": []}},
+    ]))
+
+    provider = MockProvider(script=session)
+
+    assert [t["content"] for t in provider.script] == [None, "cached answer"]
+    assert provider.script[0]["tool_calls"][0].arguments == {"path": "a"}
+    assert provider.script[0]["finish_reason"] == "tool_calls"
@@ -0,0 +1,187 @@
+"""Session-aware cache breakpoint placement for the Anthropic provider."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from nanobot.providers.anthropic_provider import AnthropicProvider
+from nanobot.providers.metrics import metrics_session
+from nanobot.providers.prompt_cache import (
+    MAX_BREAKPOINTS,
+    CachePlan,
+    PromptCacheOptimizer,
+    flatten_request,
+)
+
+_BIG = "x" * 8000  # ~2000 tokens, above the minimum cacheable prefix
+_SYSTEM = "You are nanobot. " + _BIG
+_TOOLS = [
+    {"type": "function", "function": {"name": "read_file", "description": _BIG,
+                                      "parameters": {"type": "object", "properties": {}}}},
+    {"type": "function", "function": {"name": "mcp_search", "description": "search",
+                                      "parameters": {"type": "object", "properties": {}}}},
+]
+
+
+def _marked(kwargs: dict[str, Any]) -> list[tuple[str, int, int]]:
+    found = []
+    for i, tool in enumerate(kwargs.get("tools") or []):
+        if "cache_control" in tool:
+            found.append(("tools", i, -1))
+    system = kwargs.get("system")
+    if isinstance(system, list):
+        found += [("system", 0, j) for j, b in enumerate(system) if "cache_control" in b]
+    for m, msg in enumerate(kwargs["messages"]):
+        content = msg["content"]
+        if isinstance(content, list):
+            found += [
+                ("messages", m, b) for b, block in enumerate(content)
+                if isinstance(block, dict) and "cache_control" in block
+            ]
+    return found
+
+
+def _build(
+    provider: AnthropicProvider, messages: list[dict[str, Any]],
+) -> tuple[dict[str, Any], CachePlan | None]:
+    return provider._build_request(
+        [{"role": "system", "content": _SYSTEM}, *messages], _TOOLS, None, 1024, 0.5, None, None,
+    )
+
+
+def _turn(n: int) -> list[dict[str, Any]]:
+    return [
+        {"role": "user", "content": f"question {n} " + _BIG},
+        {"role": "assistant", "content": f"answer {n}"},
+    ]
+
+
+def _usage(read: int = 0, written: int = 0) -> dict[str, int]:
+    return {"cache_read_input_tokens": read, "cache_creation_input_tokens": written}
+
+
+def test_without_session_placement_matches_fixed_rules():
+    provider = AnthropicProvider(api_key="sk-test")
+    messages = [*_turn(1), {"role": "user", "content": "next"}]
+
+    planned, plan = _build(provider, messages)
+    system, msgs, tools = provider._apply_cache_control(
+        *provider._prepare_messages([{"role": "system", "content": _SYSTEM}, *messages]),
+        provider._convert_tools(_TOOLS),
+    )
+
+    assert planned["system"] == system
+    assert planned["messages"] == msgs
+    assert planned["tools"] == tools
+    assert plan is None
+
+
+def test_session_marks_tail_then_reads_it_on_the_next_iteration():
+    provider = AnthropicProvider(api_key="sk-test")
+    first = [*_turn(1), {"role": "user", "content": "hi " + _BIG}]
+
+    with metrics_session("s1"):
+        kwargs, plan = _build(provider, first)
+        tail = ("messages", len(kwargs["messages"]) - 1, 0)
+        assert tail in _marked(kwargs)
+        provider.prompt_cache.observe(plan, _usage(written=4000))
+
+        second = [*first, {"role": "assistant", "content": "tool time"}]
+        second.append({"role": "user", "content": "more"})
+        kwargs, plan = _build(provider, second)
+
+    # The previous tail is still marked so the cache written there is read.
+    assert tail in _marked(kwargs)
+    assert plan.expected_read_tokens > 0
+    assert len(_marked(kwargs)) <= MAX_BREAKPOINTS
+
+
+def test_stripped_runtime_context_keeps_prefix_before_the_turn_cached():
+    provider = AnthropicProvider(api_key="sk-test")
+    history = _turn(1)
+    with metrics_session("s1"):
+        kwargs, plan = _build(
+            provider, [*history, {"role": "user", "content": "[ctx]\nnow " + _BIG}],
+        )
+        # The end of the history before the new user message is a breakpoint...
+        turn_start = ("messages", len(history) - 1, 0)
+        assert turn_start in _marked(kwargs)
+        provider.prompt_cache.observe(plan, _usage(written=4000))
+
+        # ...so the next turn, where that message lost its runtime context, reads it.
+        nxt = [*history, {"role": "user", "content": "now " + _BIG},
+               {"role": "assistant", "content": "done"}, {"role": "user", "content": "again"}]
+        kwargs, plan = _build(provider, nxt)
+
+    assert turn_start in _marked(kwargs)
+    assert plan.expected_read_tokens > 0
+
+
+def test_failed_request_does_not_mark_prefix_as_written():
+    provider = AnthropicProvider(api_key="sk-test")
+    messages = [*_turn(1), {"role": "user", "content": "hi"}]
+    with metrics_session("s1"):
+        _, plan = _build(provider, messages)
+        provider.prompt_cache.observe(plan, None, failed=True)
+        _, plan = _build(provider, messages)
+
+    assert plan.expected_read_tokens == 0
+
+
+def test_observe_accumulates_session_stats():
+    optimizer = PromptCacheOptimizer()
+    prefix = flatten_request(_SYSTEM, [{"role": "user", "content": _BIG}], None)
+    with metrics_session("s1"):
+        optimizer.observe(optimizer.plan(prefix, []), _usage(written=2000))
+        plan = optimizer.plan(prefix, [])
+        optimizer.observe(plan, _usage(read=2000))
+
+    assert plan.expected_read_tokens > 0
+    assert optimizer.stats("s1") == {
+        "requests": 2, "cache_read_tokens": 2000, "cache_write_tokens": 2000,
+        "expected_read_tokens": plan.expected_read_tokens,
+    }
+    assert optimizer.stats("unknown") == {}
+
+
+def test_short_prefixes_and_thinking_blocks_are_not_marked():
+    optimizer = PromptCacheOptimizer()
+    messages = [
+        {"role": "user", "content": _BIG},
+        {"role": "assistant", "content": [
+            {"type": "text", "text": "ok"},
+            {"type": "thinking", "thinking": "hmm", "signature": "s"},
+        ]},
+    ]
+    with metrics_session("s1"):
+        plan = optimizer.plan(flatten_request("short", messages, None), [("system", 0, 0)])
+
+    # The tail is a thinking block, so the marker falls back to the text before it;
+    # the short system prompt is below the cacheable minimum.
+    assert plan.locations == [("messages", 1, 0)]
+
+
+def test_session_state_is_bounded():
+    optimizer = PromptCacheOptimizer(max_sessions=2)
+    prefix = flatten_request(_SYSTEM, [], None)
+    for key in ("a", "b", "c"):
+        with metrics_session(key):
+            optimizer.plan(prefix, [])
+
+    assert list(optimizer._sessions) == ["b", "c"]
+
+
+def test_interleaved_requests_are_observed_with_their_own_plan():
+    optimizer = PromptCacheOptimizer()
+    main = flatten_request(_SYSTEM, [{"role": "user", "content": _BIG}], None)
+    other = flatten_request("other " + _BIG, [{"role": "user", "content": "summarize"}], None)
+    with metrics_session("s1"):
+        first = optimizer.plan(main, [])
+        second = optimizer.plan(other, [])
+        # The responses arrive out of order; each is credited to its own plan.
+        optimizer.observe(second, _usage(), failed=True)
+        optimizer.observe(first, _usage(written=2000))
+        plan = optimizer.plan(main, [])
+
+    assert plan.expected_read_tokens > 0
+    assert optimizer.stats("s1")["requests"] == 1
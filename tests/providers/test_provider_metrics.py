@@ -0,0 +1,214 @@
+import asyncio
+import json
+
+import pytest
+
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.metrics import (
+    Histogram,
+    LLMCallMetrics,
+    ProviderMetrics,
+    metric_header,
+    metrics_session,
+    payload_size,
+    render_histogram,
+)
+from nanobot.providers.routing import RoutingProvider
+
+
+class _Provider(LLMProvider):
+    def __init__(self, responses: list[LLMResponse], deltas: tuple[str, ...] = ()):
+        super().__init__()
+        self.responses = list(responses)
+        self.deltas = deltas
+
+    async def chat(self, *args, **kwargs) -> LLMResponse:
+        return self.responses.pop(0)
+
+    async def chat_stream(self, *args, on_content_delta=None, **kwargs) -> LLMResponse:
+        for i, delta in enumerate(self.deltas):
+            await asyncio.sleep(0.05 if i == 2 else 0)
+            await on_content_delta(delta)
+        return self.responses.pop(0)
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+_MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def _ok(tokens: int = 10) -> LLMResponse:
+    return LLMResponse(content="hello", usage={"prompt_tokens": 5, "completion_tokens": tokens})
+
+
+@pytest.mark.asyncio
+async def test_stream_records_ttft_gap_and_session() -> None:
+    provider = _Provider([_ok()], deltas=("a", "b", "c"))
+    provider.metrics = ProviderMetrics()
+    provider.metrics_label = "test"
+    seen: list[LLMCallMetrics] = []
+    provider.metrics.subscribe(seen.append)
+    received: list[str] = []
+
+    async def _on_delta(text: str) -> None:
+        received.append(text)
+
+    with metrics_session("cli:direct"):
+        response = await provider.chat_stream_with_retry(
+            messages=_MESSAGES, on_content_delta=_on_delta,
+        )
+
+    call = response.call_metrics
+    assert received == ["a", "b", "c"]
+    assert seen == [call]
+    assert (call.provider, call.model, call.session) == ("test", "test-model", "cli:direct")
+    assert call.streaming and call.stream_deltas == 3
+    assert call.ttft_s is not None and call.ttft_s < call.latency_s
+    assert call.max_gap_s >= 0.04
+    assert call.output_tokens == 10 and call.tokens_per_s > 0
+    assert call.payload_bytes > 0
+
+    snap = provider.metrics.snapshot()
+    assert snap["series"][0]["calls"] == 1
+    assert snap["series"][0]["ttft_seconds"]["count"] == 1
+    assert snap["sessions"]["cli:direct"]["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_record_errors_and_wait(monkeypatch) -> None:
+    provider = _Provider([
+        LLMResponse(content="429 rate limit", finish_reason="error", error_status_code=429),
+        _ok(),
+    ])
+    provider.metrics = ProviderMetrics()
+
+    async def _no_sleep(*args, **kwargs) -> None:
+        return None
+
+    monkeypatch.setattr(provider, "_sleep_with_heartbeat", _no_sleep)
+    with metrics_session("s1"):
+        response = await provider.chat_with_retry(messages=_MESSAGES)
+
+    assert response.finish_reason == "stop"
+    series = provider.metrics._series[("_Provider", "test-model")]
+    assert (series.calls, series.errors) == (2, 1)
+    assert series.histograms["retry_wait_seconds"].count == 1
+    totals = provider.metrics.snapshot()["sessions"]["s1"]
+    assert totals["errors"] == 1 and totals["retry_wait_s"] > 0
+
+
+@pytest.mark.asyncio
+async def test_router_records_each_backend_once() -> None:
+    metrics = ProviderMetrics()
+    first = _Provider([LLMResponse(content="503 overloaded", finish_reason="error",
+                                   error_status_code=503)])
+    second = _Provider([_ok()])
+    for label, backend in (("a", first), ("b", second)):
+        backend.metrics, backend.metrics_label = metrics, label
+    router = RoutingProvider([("a", first), ("b", second)])
+    router.metrics = metrics
+
+    response = await router.chat_with_retry(messages=_MESSAGES)
+
+    assert response.call_metrics.provider == "b"
+    assert sorted((p, s.calls, s.errors) for (p, _), s in metrics._series.items()) == [
+        ("a", 1, 1), ("b", 1, 0),
+    ]
+
+
+def test_histogram_quantiles_and_prometheus_text() -> None:
+    hist = Histogram((1.0, 2.0, 4.0))
+    for value in (0.5, 1.5, 1.5, 3.0, 10.0):
+        hist.observe(value)
+    assert hist.counts == [1, 2, 1, 1]
+    assert hist.quantile(0.5) == pytest.approx(1.75)
+    assert hist.quantile(1.0) == 4.0
+
+    metrics = ProviderMetrics()
+    metrics.record(LLMCallMetrics(provider="openai", model='m"1', streaming=False, latency_s=0.3))
+    text = metrics.render_prometheus()
+    assert '# TYPE nanobot_llm_latency_seconds histogram' in text
+    assert 'nanobot_llm_latency_seconds_bucket{provider="openai",model="m\\"1",le="0.5"} 1' in text
+    assert 'nanobot_llm_latency_seconds_bucket{provider="openai",model="m\\"1",le="+Inf"} 1' in text
+    assert 'nanobot_llm_requests_total{provider="openai",model="m\\"1"} 1' in text
+
+
+def test_session_totals_are_bounded_and_status_lines_render() -> None:
+    metrics = ProviderMetrics(max_sessions=2)
+    for key in ("s1", "s2", "s3"):
+        metrics.record(LLMCallMetrics(
+            provider="p", model="m", streaming=True, latency_s=2.0, ttft_s=0.5,
+            output_tokens=30, session=key,
+        ))
+
+    assert list(metrics.snapshot()["sessions"]) == ["s2", "s3"]
+    lines = metrics.status_lines(session="s3")
+    assert lines[0].startswith("p/m: 3 calls, TTFT p50 ")
+    assert "tok/s" in lines[0]
+    assert lines[1] == "this session: 1 calls, 2.0s avg"
+
+
+def test_failing_listener_does_not_break_recording() -> None:
+    metrics = ProviderMetrics()
+
+    def _boom(call: LLMCallMetrics) -> None:
+        raise RuntimeError("boom")
+
+    metrics.subscribe(_boom)
+    metrics.record(LLMCallMetrics(provider="p", model="m", streaming=False, latency_s=1.0))
+    assert metrics.snapshot()["series"][0]["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_tokens_are_recorded_per_series_and_session() -> None:
+    usage = {
+        "prompt_tokens": 1000, "completion_tokens": 5,
+        "cache_read_input_tokens": 600, "cache_creation_input_tokens": 300,
+    }
+    provider = _Provider([LLMResponse(content="ok", usage=usage)])
+    provider.metrics = ProviderMetrics()
+
+    with metrics_session("s1"):
+        response = await provider.chat_with_retry(messages=_MESSAGES)
+
+    call = response.call_metrics
+    assert (call.prompt_tokens, call.cache_read_tokens, call.cache_write_tokens) == (1000, 600, 300)
+    assert provider.metrics.snapshot()["sessions"]["s1"]["cache_read_tokens"] == 600
+    lines = provider.metrics.status_lines(session="s1")
+    assert "cache 60% read, 30% written" in lines[0]
+    assert lines[1].endswith("cache 60% read, 30% written")
+    text = provider.metrics.render_prometheus()
+    assert 'nanobot_llm_cache_read_tokens_total{provider="_Provider",model="test-model"} 600' in text
+
+
+def test_payload_size_tracks_json_length_without_serializing() -> None:
+    image = "data:image/png;base64," + "A" * 200_000
+    messages = [
+        {"role": "user", "content": [{"type": "image_url", "image_url": {"url": image}}]},
+        {"role": "assistant", "content": None, "tool_calls": [{"id": "c1", "index": 0}]},
+    ]
+
+    exact = len(json.dumps(messages))
+    assert 0.9 * exact <= payload_size(messages) <= 1.1 * exact
+    assert payload_size(None) == 4 and payload_size([]) == 2
+
+
+def test_shared_prometheus_helpers_render_cumulative_buckets() -> None:
+    hist = Histogram((1.0, 5.0))
+    for value in (0.5, 2.0, 9.0):
+        hist.observe(value)
+    out: list[str] = []
+
+    metric = metric_header(out, "nanobot_x_seconds", "histogram", "Test")
+    out.extend(render_histogram(metric, 'queue="in"', hist))
+
+    assert out == [
+        "# HELP nanobot_x_seconds Test",
+        "# TYPE nanobot_x_seconds histogram",
+        'nanobot_x_seconds_bucket{queue="in",le="1"} 1',
+        'nanobot_x_seconds_bucket{queue="in",le="5"} 2',
+        'nanobot_x_seconds_bucket{queue="in",le="+Inf"} 3',
+        'nanobot_x_seconds_sum{queue="in"} 11.5',
+        'nanobot_x_seconds_count{queue="in"} 3',
+    ]
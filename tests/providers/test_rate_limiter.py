@@ -0,0 +1,236 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from nanobot.providers.anthropic_provider import AnthropicProvider
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.openai_compat_provider import OpenAICompatProvider
+from nanobot.providers.ratelimit import (
+    Priority,
+    ProviderRateLimits,
+    RateLimiter,
+    current_priority,
+    llm_priority,
+)
+
+
+class _Provider(LLMProvider):
+    def __init__(self, responses):
+        super().__init__()
+        self._responses = list(responses)
+        self.calls = 0
+
+    async def chat(self, *args, **kwargs) -> LLMResponse:
+        self.calls += 1
+        return self._responses.pop(0) if len(self._responses) > 1 else self._responses[0]
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+_MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+@pytest.mark.asyncio
+async def test_unlimited_limiter_admits_immediately() -> None:
+    limiter = RateLimiter()
+
+    for _ in range(100):
+        assert await limiter.acquire(10_000) == 0.0
+
+    assert limiter.stats.admitted == {"interactive": 100}
+    assert limiter.stats.delayed == 0
+
+
+@pytest.mark.asyncio
+async def test_rpm_bucket_delays_requests_over_budget() -> None:
+    limiter = RateLimiter(rpm=600)  # refills one request every 0.1s
+    limiter._requests.level = 1
+
+    assert await limiter.acquire() == 0.0
+    waited = await limiter.acquire()
+
+    assert 0.05 <= waited < 0.5
+    assert limiter.stats.delayed == 1
+
+
+@pytest.mark.asyncio
+async def test_tpm_bucket_charges_estimated_tokens() -> None:
+    limiter = RateLimiter(tpm=60_000)  # 1000 tokens/s
+    limiter._tokens.level = 100
+
+    assert await limiter.acquire(100) == 0.0
+    waited = await limiter.acquire(100)
+
+    assert 0.05 <= waited < 0.5
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_admitted_by_priority_then_arrival() -> None:
+    limiter = RateLimiter(rpm=600)
+    limiter._requests.level = 0
+    order: list[str] = []
+
+    async def _call(label: str, priority: Priority) -> None:
+        await limiter.acquire(priority=priority)
+        order.append(label)
+
+    tasks = [asyncio.create_task(_call("dream", Priority.BACKGROUND))]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(_call("subagent", Priority.SUBAGENT)))
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(_call("user-1", Priority.INTERACTIVE)))
+    tasks.append(asyncio.create_task(_call("user-2", Priority.INTERACTIVE)))
+
+    async with asyncio.timeout(2):
+        await asyncio.gather(*tasks)
+
+    assert order == ["user-1", "user-2", "subagent", "dream"]
+    assert limiter.stats.queued == 0
+    assert limiter.stats.mean_wait_s(Priority.BACKGROUND) > limiter.stats.mean_wait_s(Priority.INTERACTIVE)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_block_queue() -> None:
+    limiter = RateLimiter(rpm=600)
+    limiter._requests.level = 0
+
+    first = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    second = asyncio.create_task(limiter.acquire(priority=Priority.BACKGROUND))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    async with asyncio.timeout(1):
+        await second
+    assert limiter.stats.queued == 0
+
+
+def test_llm_priority_is_scoped() -> None:
+    assert current_priority() is Priority.INTERACTIVE
+    with llm_priority(Priority.BACKGROUND):
+        assert current_priority() is Priority.BACKGROUND
+    assert current_priority() is Priority.INTERACTIVE
+
+
+def test_observe_learns_limits_from_headers() -> None:
+    limiter = RateLimiter(tpm=1_000_000)
+
+    limiter.observe({
+        "x-ratelimit-limit-requests": "500",
+        "x-ratelimit-remaining-requests": "3",
+        "x-ratelimit-limit-tokens": "30000",
+        "x-ratelimit-remaining-tokens": "1200",
+    })
+
+    assert limiter._requests.capacity == 500
+    assert limiter._requests.level <= 3.1
+    # A lower server limit wins over the configured one.
+    assert limiter._tokens.capacity == 30_000
+    assert limiter._tokens.level <= 1200.1
+    assert (limiter.stats.learned_rpm, limiter.stats.learned_tpm) == (500, 30_000)
+
+
+def test_observe_reads_anthropic_headers() -> None:
+    limiter = RateLimiter()
+
+    limiter.observe({
+        "anthropic-ratelimit-requests-limit": "50",
+        "anthropic-ratelimit-requests-remaining": "49",
+        "anthropic-ratelimit-input-tokens-limit": "40000",
+    })
+
+    assert limiter._requests.capacity == 50
+    assert limiter._tokens.capacity == 40_000
+
+
+def test_settle_corrects_token_estimate() -> None:
+    limiter = RateLimiter(tpm=10_000)
+    limiter._tokens.take(1000)
+
+    limiter.settle(1000, 3000)
+
+    assert limiter._tokens.level == pytest.approx(7000, abs=5)
+
+
+@pytest.mark.asyncio
+async def test_safe_chat_pauses_after_429_and_learns_headers() -> None:
+    provider = _Provider([
+        LLMResponse(
+            content="429 rate limit",
+            finish_reason="error",
+            error_status_code=429,
+            error_retry_after_s=0.2,
+            rate_limit_headers={"x-ratelimit-limit-requests": "60"},
+        ),
+        LLMResponse(content="ok", usage={"prompt_tokens": 5, "completion_tokens": 2}),
+    ])
+    provider.rate_limits = ProviderRateLimits()
+
+    first = await provider._safe_chat(messages=_MESSAGES)
+    started = time.monotonic()
+    second = await provider._safe_chat(messages=_MESSAGES)
+
+    assert first.finish_reason == "error"
+    assert second.content == "ok"
+    assert time.monotonic() - started >= 0.15
+    stats = provider.rate_limits.stats["test-model"]
+    assert stats.throttled == 1
+    assert stats.learned_rpm == 60
+
+
+@pytest.mark.asyncio
+async def test_limiters_are_per_model() -> None:
+    limits = ProviderRateLimits(rpm=10)
+
+    assert limits.for_model("a") is limits.for_model("a")
+    assert limits.for_model("a") is not limits.for_model("b")
+
+
+def _raw(parsed, headers: dict[str, str]) -> MagicMock:
+    raw = MagicMock(headers=headers)
+    raw.parse.return_value = parsed
+    return raw
+
+
+@pytest.mark.asyncio
+async def test_openai_chat_keeps_rate_limit_headers_of_a_success() -> None:
+    completion = SimpleNamespace(
+        choices=[SimpleNamespace(
+            message=SimpleNamespace(content="ok", tool_calls=None, reasoning_content=None),
+            finish_reason="stop",
+        )],
+        usage=SimpleNamespace(prompt_tokens=3, completion_tokens=1, total_tokens=4),
+    )
+    headers = {"x-ratelimit-limit-requests": "60", "content-type": "application/json"}
+    with patch("nanobot.providers.openai_compat_provider.AsyncOpenAI") as client:
+        create = client.return_value.chat.completions.with_raw_response.create
+        create.side_effect = AsyncMock(return_value=_raw(completion, headers))
+        provider = OpenAICompatProvider(api_key="sk-test", default_model="gpt-4o")
+        response = await provider.chat(messages=_MESSAGES)
+
+    assert response.content == "ok"
+    assert response.rate_limit_headers == {"x-ratelimit-limit-requests": "60"}
+
+
+@pytest.mark.asyncio
+async def test_anthropic_chat_keeps_rate_limit_headers_of_a_success() -> None:
+    message = SimpleNamespace(
+        content=[SimpleNamespace(type="text", text="ok")],
+        stop_reason="end_turn",
+        usage=SimpleNamespace(input_tokens=3, output_tokens=1),
+    )
+    headers = {"anthropic-ratelimit-requests-limit": "50", "request-id": "req_1"}
+    provider = AnthropicProvider(api_key="sk-test")
+    provider._client = MagicMock()
+    provider._client.messages.with_raw_response.create = AsyncMock(
+        return_value=_raw(message, headers),
+    )
+
+    response = await provider.chat(messages=_MESSAGES)
+
+    assert response.content == "ok"
+    assert response.rate_limit_headers == {"anthropic-ratelimit-requests-limit": "50"}
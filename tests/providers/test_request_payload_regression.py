@@ -0,0 +1,98 @@
+"""Request payloads must stay byte-identical with memoized message conversion.
+
+``fixtures/request_payloads.json`` was recorded from the un-memoized
+conversion pipeline; every case is replayed cold, warm and with fresh
+message dicts (as ``Session.get_history`` hands out each turn).
+"""
+
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from nanobot.providers.anthropic_provider import AnthropicProvider
+from nanobot.providers.openai_compat_provider import OpenAICompatProvider
+from nanobot.providers.registry import find_by_name
+
+_CASES = json.loads(
+    (Path(__file__).parent / "fixtures" / "request_payloads.json").read_text(encoding="utf-8")
+)
+
+
+def _providers() -> dict:
+    return {
+        "openai": OpenAICompatProvider(default_model="gpt-4o"),
+        "openrouter_claude": OpenAICompatProvider(
+            default_model="anthropic/claude-sonnet-4", spec=find_by_name("openrouter"),
+        ),
+        "anthropic": AnthropicProvider(api_key="sk-test", default_model="claude-sonnet-4-5"),
+    }
+
+
+def _payload(provider, messages, tools) -> str:
+    kw = provider._build_kwargs(messages, tools, None, 1024, 0.5, None, None)
+    return json.dumps(
+        {k: kw[k] for k in ("messages", "system", "tools") if k in kw}, ensure_ascii=False,
+    )
+
+
+@pytest.mark.parametrize("case", _CASES, ids=[c["name"] for c in _CASES])
+def test_payloads_match_recorded_fixtures(case) -> None:
+    messages = copy.deepcopy(case["messages"])
+    snapshot = copy.deepcopy(messages)
+
+    for name, provider in _providers().items():
+        expected = json.dumps(case["expected"][name], ensure_ascii=False)
+        assert _payload(provider, messages, case["tools"]) == expected, name
+        assert _payload(provider, messages, case["tools"]) == expected, name
+        fresh = [dict(m) for m in messages]
+        assert _payload(provider, fresh, case["tools"]) == expected, name
+
+    assert messages == snapshot
+
+
+def test_history_conversions_are_reused_across_calls() -> None:
+    provider = OpenAICompatProvider(default_model="gpt-4o")
+    history = copy.deepcopy(_CASES[1]["messages"])
+
+    provider._prepare_messages(history)
+    misses = provider._message_conversions.stats.misses
+    provider._prepare_messages([dict(m) for m in history] + [{"role": "user", "content": "more"}])
+
+    assert provider._message_conversions.stats.misses == misses + 1
+
+
+def test_replaced_content_block_is_converted_again() -> None:
+    provider = AnthropicProvider(api_key="sk-test")
+    messages = [
+        {"role": "user", "content": [
+            {"type": "text", "text": "see"},
+            {"type": "image_url", "image_url": {"url": "https://example.com/a.png"}},
+        ]},
+    ]
+    _, before = provider._prepare_messages(messages)
+    assert before[0]["content"][1]["type"] == "image"
+
+    assert provider._strip_image_content_inplace(messages)
+    _, after = provider._prepare_messages(messages)
+
+    assert [b["type"] for b in after[0]["content"]] == ["text", "text"]
+
+
+def test_assembly_does_not_mutate_memoized_conversions() -> None:
+    provider = AnthropicProvider(api_key="sk-test")
+    messages = [
+        {"role": "user", "content": [{"type": "text", "text": "go"}]},
+        {"role": "assistant", "content": None, "tool_calls": [
+            {"id": "t1", "type": "function", "function": {"name": "f", "arguments": "{}"}},
+        ]},
+        {"role": "tool", "tool_call_id": "t1", "content": "done"},
+        {"role": "user", "content": [{"type": "text", "text": "next"}]},
+    ]
+
+    first = provider._prepare_messages(messages)
+    second = provider._prepare_messages(messages)
+
+    assert first == second
+    assert len(second[1][2]["content"]) == 2  # tool result + "next", merged once
@@ -0,0 +1,132 @@
+import os
+import time
+
+import pytest
+
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.response_cache import ResponseCache
+
+
+class _Provider(LLMProvider):
+    def __init__(self, response: LLMResponse):
+        super().__init__()
+        self.response = response
+        self.calls = 0
+
+    async def chat(self, *args, **kwargs) -> LLMResponse:
+        self.calls += 1
+        return self.response
+
+    async def chat_stream(self, *args, on_content_delta=None, **kwargs) -> LLMResponse:
+        self.calls += 1
+        if on_content_delta and self.response.content:
+            await on_content_delta(self.response.content)
+        return self.response
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+_MESSAGES = [{"role": "user", "content": "summarize"}]
+
+
+def _response() -> LLMResponse:
+    return LLMResponse(
+        content="summary",
+        tool_calls=[ToolCallRequest(id="c1", name="save", arguments={"text": "x"})],
+        usage={"prompt_tokens": 30, "completion_tokens": 5},
+    )
+
+
+@pytest.mark.asyncio
+async def test_opted_in_calls_are_served_from_disk(tmp_path) -> None:
+    provider = _Provider(_response())
+    provider.response_cache = ResponseCache(tmp_path)
+
+    first = await provider.chat_with_retry(messages=_MESSAGES, cache=True)
+    # A fresh cache instance (e.g. after a restart) reads the same entry.
+    provider.response_cache = ResponseCache(tmp_path)
+    second = await provider.chat_with_retry(messages=_MESSAGES, cache=True)
+
+    assert provider.calls == 1
+    assert second == first
+    stats = provider.response_cache.stats
+    assert (stats.hits, stats.misses, stats.tokens_saved) == (1, 0, 35)
+
+
+@pytest.mark.asyncio
+async def test_interactive_calls_bypass_cache_unless_configured(tmp_path) -> None:
+    provider = _Provider(_response())
+    provider.response_cache = ResponseCache(tmp_path)
+
+    await provider.chat_with_retry(messages=_MESSAGES)
+    await provider.chat_with_retry(messages=_MESSAGES)
+    assert provider.calls == 2
+
+    provider.response_cache = ResponseCache(tmp_path, interactive=True)
+    deltas: list[str] = []
+
+    async def _on_delta(text: str) -> None:
+        deltas.append(text)
+
+    await provider.chat_stream_with_retry(messages=_MESSAGES, on_content_delta=_on_delta)
+    await provider.chat_stream_with_retry(messages=_MESSAGES, on_content_delta=_on_delta)
+    await provider.chat_stream_with_retry(messages=_MESSAGES, cache=False)
+
+    assert provider.calls == 4
+    assert deltas == ["summary", "summary"]
+
+
+@pytest.mark.asyncio
+async def test_key_covers_model_and_generation_settings(tmp_path) -> None:
+    provider = _Provider(_response())
+    provider.response_cache = ResponseCache(tmp_path)
+
+    await provider.chat_with_retry(messages=_MESSAGES, cache=True)
+    await provider.chat_with_retry(messages=_MESSAGES, cache=True, model="test-model")
+    await provider.chat_with_retry(messages=_MESSAGES, cache=True, temperature=0.9)
+    await provider.chat_with_retry(messages=_MESSAGES, cache=True, model="other")
+
+    assert provider.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached(tmp_path) -> None:
+    provider = _Provider(LLMResponse(content="400 bad request", finish_reason="error"))
+    provider.response_cache = ResponseCache(tmp_path)
+
+    await provider.chat_with_retry(messages=_MESSAGES, cache=True)
+    await provider.chat_with_retry(messages=_MESSAGES, cache=True)
+
+    assert provider.calls == 2
+    assert provider.response_cache.stats.stores == 0
+
+
+def test_expired_entries_are_dropped(tmp_path) -> None:
+    cache = ResponseCache(tmp_path, ttl_s=60)
+    cache.put("ab" * 32, _response())
+    path = cache._path("ab" * 32)
+    path.write_text(path.read_text().replace('"created": ', '"created": 1, "_": '))
+
+    assert cache.get("ab" * 32) is None
+    assert cache.stats.expired == 1
+    assert not path.exists()
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path) -> None:
+    cache = ResponseCache(tmp_path)
+    keys = [f"{i:02d}" * 32 for i in range(4)]
+    for i, key in enumerate(keys[:3]):
+        cache.put(key, _response())
+        os.utime(cache._path(key), (time.time() - 100 + i, time.time() - 100 + i))
+    assert cache.get(keys[0]) is not None  # refreshes keys[0]
+
+    cache.max_bytes = cache.size_bytes
+    cache.put(keys[3], _response())
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[3]) is not None
+    assert cache.stats.evictions == 2
+    assert cache.size_bytes <= cache.max_bytes
@@ -0,0 +1,214 @@
+import asyncio
+
+import pytest
+
+from nanobot.config.schema import Config
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.routing import RoutingProvider, routing_backends
+
+
+class MockProvider(LLMProvider):
+    """Local provider that replays scripted responses after an optional delay."""
+
+    def __init__(self, name, responses, *, delay: float = 0.0, chunks=None):
+        super().__init__()
+        self.name = name
+        self._responses = list(responses)
+        self.delay = delay
+        self.chunks = chunks
+        self.calls = 0
+        self.cancelled = 0
+        self.models: list[str | None] = []
+
+    async def chat(self, *args, **kwargs) -> LLMResponse:
+        self.calls += 1
+        self.models.append(kwargs.get("model"))
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        response = self._responses.pop(0) if len(self._responses) > 1 else self._responses[0]
+        if isinstance(response, BaseException):
+            raise response
+        return response
+
+    async def chat_stream(self, *args, on_content_delta=None, **kwargs) -> LLMResponse:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+            for chunk in self.chunks or []:
+                await on_content_delta(chunk)
+                await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return LLMResponse(content="".join(self.chunks or []))
+
+    def get_default_model(self) -> str:
+        return f"{self.name}-model"
+
+
+_MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def _ok(text: str) -> LLMResponse:
+    return LLMResponse(content=text)
+
+
+def _rate_limited() -> LLMResponse:
+    return LLMResponse(content="429 rate limit", finish_reason="error", error_status_code=429)
+
+
+@pytest.mark.asyncio
+async def test_transient_error_fails_over_without_sleeping() -> None:
+    a = MockProvider("a", [_rate_limited()])
+    b = MockProvider("b", [_ok("from b")])
+    router = RoutingProvider([("a", a), ("b", b)])
+
+    # A plain provider would sleep _CHAT_RETRY_DELAYS[0] (1s) before retrying.
+    async with asyncio.timeout(0.5):
+        response = await router.chat_with_retry(messages=_MESSAGES)
+
+    assert response.content == "from b"
+    stats = router.stats
+    assert (stats["a"].errors, stats["a"].failovers) == (1, 1)
+    assert not stats["a"].healthy()
+    assert stats["b"].successes == 1
+
+    # "a" is cooling down, so the next call goes straight to "b".
+    await router.chat_with_retry(messages=_MESSAGES)
+    assert (a.calls, b.calls) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_non_transient_error_is_not_failed_over() -> None:
+    a = MockProvider("a", [LLMResponse(content="400 bad request", finish_reason="error")])
+    b = MockProvider("b", [_ok("unused")])
+    router = RoutingProvider([("a", a), ("b", b)])
+
+    response = await router.chat(messages=_MESSAGES)
+
+    assert response.finish_reason == "error"
+    assert b.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_all_backends_failing_returns_last_error() -> None:
+    router = RoutingProvider([
+        ("a", MockProvider("a", [_rate_limited()])),
+        ("b", MockProvider("b", [LLMResponse(content="503 overloaded", finish_reason="error")])),
+    ])
+
+    response = await router.chat(messages=_MESSAGES)
+
+    assert response.finish_reason == "error"
+    assert response.content == "503 overloaded"
+
+
+@pytest.mark.asyncio
+async def test_exceptions_are_treated_as_backend_errors() -> None:
+    a = MockProvider("a", [ConnectionError("connection reset")])
+    b = MockProvider("b", [_ok("fine")])
+    router = RoutingProvider([("a", a), ("b", b)])
+
+    assert (await router.chat(messages=_MESSAGES)).content == "fine"
+
+
+@pytest.mark.asyncio
+async def test_hedge_starts_second_backend_and_cancels_loser() -> None:
+    slow = MockProvider("slow", [_ok("slow")], delay=5)
+    fast = MockProvider("fast", [_ok("fast")])
+    router = RoutingProvider([("slow", slow), ("fast", fast)], hedge=True, hedge_delay=0.05)
+
+    async with asyncio.timeout(2):
+        response = await router.chat(messages=_MESSAGES)
+
+    assert response.content == "fast"
+    assert slow.cancelled == 1
+    assert router.stats["fast"].hedge_wins == 1
+    assert router.stats["slow"].cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_delay_follows_observed_p95() -> None:
+    backend = MockProvider("a", [_ok("a")])
+    router = RoutingProvider(
+        [("a", backend), ("b", MockProvider("b", [_ok("b")]))],
+        hedge=True,
+        hedge_delay=9.0,
+        hedge_min_delay=0.01,
+    )
+    for latency in (0.1, 0.2, 0.3, 0.4, 1.0):
+        router.stats["a"].record_success(latency)
+
+    assert router._hedge_after(router._backends[0], streaming=False) == 1.0
+    assert router._hedge_after(router._backends[0], streaming=True) == 9.0
+
+
+@pytest.mark.asyncio
+async def test_stream_hedge_forwards_only_winner_deltas() -> None:
+    slow = MockProvider("slow", [], delay=5, chunks=["never"])
+    fast = MockProvider("fast", [], chunks=["he", "llo"])
+    router = RoutingProvider([("slow", slow), ("fast", fast)], hedge=True, hedge_delay=0.05)
+    deltas: list[str] = []
+
+    async def _on_delta(text: str) -> None:
+        deltas.append(text)
+
+    async with asyncio.timeout(2):
+        response = await router.chat_stream(messages=_MESSAGES, on_content_delta=_on_delta)
+
+    assert response.content == "hello"
+    assert deltas == ["he", "llo"]
+    assert slow.cancelled == 1
+    assert router.stats["fast"].first_token_latencies
+
+
+@pytest.mark.asyncio
+async def test_backends_use_their_own_default_model() -> None:
+    a = MockProvider("a", [_rate_limited()])
+    b = MockProvider("b", [_ok("b")])
+    router = RoutingProvider([("a", a), ("b", b)])
+
+    await router.chat_with_retry(messages=_MESSAGES, model=router.get_default_model())
+    await router.chat(messages=_MESSAGES, model="explicit")
+
+    assert a.models == [None]
+    assert b.models == [None, "explicit"]
+
+
+def test_routing_backends_pool_keys_and_fallback_models() -> None:
+    config = Config.model_validate({
+        "agents": {"defaults": {
+            "model": "deepseek-chat",
+            "fallbackModels": ["openrouter/anthropic/claude-sonnet-4"],
+        }},
+        "providers": {
+            "deepseek": {"apiKey": "k1", "apiKeys": ["k2", "k1"]},
+            "openrouter": {"apiKey": "or"},
+        },
+    })
+
+    assert routing_backends(config) == [
+        ("deepseek:deepseek-chat#1", "deepseek-chat", "k1"),
+        ("deepseek:deepseek-chat#2", "deepseek-chat", "k2"),
+        ("openrouter:openrouter/anthropic/claude-sonnet-4", "openrouter/anthropic/claude-sonnet-4", "or"),
+    ]
+
+
+def test_make_provider_wraps_key_pool_in_router() -> None:
+    from nanobot.cli.commands import _make_provider
+
+    config = Config.model_validate({
+        "agents": {"defaults": {"provider": "custom", "model": "gpt-4o-mini", "hedgeRequests": True}},
+        "providers": {"custom": {"apiKey": "a", "apiKeys": ["b"], "apiBase": "https://example.com/v1"}},
+    })
+
+    provider = _make_provider(config)
+
+    assert isinstance(provider, RoutingProvider)
+    assert provider.hedge is True
+    assert [b.provider.api_key for b in provider._backends] == ["a", "b"]
+    assert provider.get_default_model() == "gpt-4o-mini"
@@ -0,0 +1,84 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from nanobot.providers.openai_compat_provider import ChatStreamAssembler, OpenAICompatProvider
+
+
+def _tc_chunk(index: int, arguments: str, *, name: str | None = None, tc_id: str | None = None):
+    fn = SimpleNamespace(name=name, arguments=arguments)
+    tc = SimpleNamespace(index=index, id=tc_id, function=fn)
+    delta = SimpleNamespace(content=None, reasoning_content=None, reasoning=None, tool_calls=[tc])
+    return SimpleNamespace(choices=[SimpleNamespace(finish_reason=None, delta=delta)], usage=None)
+
+
+def _text_chunk(text: str, finish: str | None = None):
+    delta = SimpleNamespace(content=text, reasoning_content=None, reasoning=None, tool_calls=None)
+    return SimpleNamespace(choices=[SimpleNamespace(finish_reason=finish, delta=delta)], usage=None)
+
+
+_ARGS = json.dumps({
+    "path": "C:\\tmp\\\"quoted\" {brace}",
+    "items": [1, {"nested": "]"}],
+    "text": "line\nbreak \\",
+})
+
+
+@pytest.mark.parametrize("split", range(1, len(_ARGS)))
+def test_tool_call_completion_is_detected_across_any_split(split: int) -> None:
+    assembler = ChatStreamAssembler()
+
+    assembler.feed(_tc_chunk(0, _ARGS[:split], name="write", tc_id="call_1"))
+    assert not assembler.tool_call_complete(0)
+    assembler.feed(_tc_chunk(0, _ARGS[split:]))
+
+    assert assembler.tool_call_complete(0)
+    assert assembler.completed == [0]
+    assert assembler.result().tool_calls[0].arguments == json.loads(_ARGS)
+
+
+def test_completion_reported_per_tool_call_in_order() -> None:
+    assembler = ChatStreamAssembler()
+
+    assembler.feed(_tc_chunk(0, '{"a": ', name="first", tc_id="c0"))
+    assembler.feed(_tc_chunk(1, '{"b": 2}', name="second", tc_id="c1"))
+    assert assembler.completed == [1]
+    assembler.feed(_tc_chunk(0, "1}"))
+
+    assert assembler.completed == [1, 0]
+    calls = assembler.result().tool_calls
+    assert [(c.name, c.arguments) for c in calls] == [("first", {"a": 1}), ("second", {"b": 2})]
+
+
+def test_feed_returns_visible_text_delta() -> None:
+    assembler = ChatStreamAssembler()
+
+    assert assembler.feed(_text_chunk("hel")) == "hel"
+    assert assembler.feed(_tc_chunk(0, "{}", name="noop")) is None
+    assert assembler.feed({"choices": [{"delta": {"content": "lo"}, "finish_reason": "stop"}]}) == "lo"
+    assert assembler.feed(SimpleNamespace(choices=[], usage=None)) is None
+
+    result = assembler.result()
+    assert result.content == "hello"
+    assert result.finish_reason == "stop"
+
+
+def test_parse_chunks_matches_incremental_assembly() -> None:
+    chunks = [
+        _text_chunk("Let me check. "),
+        _tc_chunk(0, '{"query": "nano', name="search", tc_id="call_a"),
+        _tc_chunk(0, 'bot"}'),
+        _text_chunk("", finish="tool_calls"),
+        {"choices": [], "usage": {"prompt_tokens": 10, "completion_tokens": 4, "total_tokens": 14}},
+    ]
+    assembler = ChatStreamAssembler()
+    for chunk in chunks:
+        assembler.feed(chunk)
+
+    incremental = assembler.result()
+    batch = OpenAICompatProvider._parse_chunks(chunks)
+
+    assert incremental == batch
+    assert batch.tool_calls[0].arguments == {"query": "nanobot"}
+    assert batch.usage["total_tokens"] == 14
@@ -143,3 +143,155 @@ def test_whitelist_invalid_cidr_ignored():
             assert ok
     finally:
         configure_ssrf_whitelist([])
+
+
+# ---------------------------------------------------------------------------
+# Pre-compiled membership check
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("ip", [
+    "0.0.0.0", "9.255.255.255", "10.0.0.0", "10.255.255.255", "11.0.0.0",
+    "100.63.255.255", "100.64.0.0", "100.127.255.255", "100.128.0.0",
+    "172.15.255.255", "172.16.0.0", "172.31.255.255", "172.32.0.0",
+    "8.8.8.8", "::1", "::2", "fc00::1", "fdff::1", "fe00::1", "fe80::1", "2001:db8::1",
+])
+def test_network_set_matches_linear_scan(ip: str):
+    import ipaddress
+
+    from nanobot.security.network import _BLOCKED_NETWORKS, _is_private
+
+    addr = ipaddress.ip_address(ip)
+    assert _is_private(addr) == any(addr in net for net in _BLOCKED_NETWORKS)
+
+
+def test_blocks_ipv4_mapped_ipv6():
+    with patch("nanobot.security.network.socket.getaddrinfo", _fake_resolve("evil.com", ["::ffff:127.0.0.1"])):
+        ok, _ = validate_url_target("http://evil.com/")
+    assert not ok
+
+
+# ---------------------------------------------------------------------------
+# DNS cache
+# ---------------------------------------------------------------------------
+
+def _counting_resolver(results: dict[str, list[str]]):
+    calls: list[str] = []
+
+    def _resolver(hostname, port, family=0, type_=0):
+        calls.append(hostname)
+        if hostname in results:
+            return [(socket.AF_INET, socket.SOCK_STREAM, 0, "", (ip, 0)) for ip in results[hostname]]
+        raise socket.gaierror(f"cannot resolve {hostname}")
+
+    return _resolver, calls
+
+
+def test_dns_cache_serves_repeat_lookups():
+    resolver, calls = _counting_resolver({"example.com": ["93.184.216.34"]})
+    with patch("nanobot.security.network.socket.getaddrinfo", resolver):
+        assert not contains_internal_url("curl https://example.com/a && curl https://example.com/b")
+        assert validate_url_target("https://example.com/c")[0]
+    assert calls == ["example.com"]
+
+
+def test_dns_cache_caches_failures_briefly(monkeypatch):
+    from nanobot.security import network
+
+    resolver, calls = _counting_resolver({})
+    with patch("nanobot.security.network.socket.getaddrinfo", resolver):
+        assert not validate_url_target("http://nx.example/")[0]
+        assert not validate_url_target("http://nx.example/")[0]
+        assert calls == ["nx.example"]
+
+        now = network.time.monotonic()
+        monkeypatch.setattr(network.time, "monotonic", lambda: now + network.dns_cache.negative_ttl + 1)
+        validate_url_target("http://nx.example/")
+    assert calls == ["nx.example", "nx.example"]
+
+
+def test_literal_ip_skips_dns():
+    resolver, calls = _counting_resolver({})
+    with patch("nanobot.security.network.socket.getaddrinfo", resolver):
+        ok, _ = validate_url_target("http://93.184.216.34/")
+    assert ok
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_async_validate_coalesces_concurrent_lookups():
+    import asyncio
+
+    from nanobot.security.network import avalidate_url_target
+
+    resolver, calls = _counting_resolver({"ts.local": ["100.100.1.1"]})
+    with patch("nanobot.security.network.socket.getaddrinfo", resolver):
+        results = await asyncio.gather(*(avalidate_url_target("http://ts.local/") for _ in range(5)))
+    assert all(not ok for ok, _ in results)
+    assert calls == ["ts.local"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_lookup_caller_does_not_fail_the_others():
+    import asyncio
+    import threading
+
+    from nanobot.security.network import DNSCache
+
+    release = threading.Event()
+    resolver, calls = _counting_resolver({"slow.example": ["93.184.216.34"]})
+
+    def _slow(*args, **kwargs):
+        release.wait(2)
+        return resolver(*args, **kwargs)
+
+    cache = DNSCache()
+    with patch("nanobot.security.network.socket.getaddrinfo", _slow):
+        first = asyncio.create_task(cache.aresolve("slow.example"))
+        second = asyncio.create_task(cache.aresolve("slow.example"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        assert await second == ("93.184.216.34",)
+    assert first.cancelled()
+    assert calls == ["slow.example"]
+    assert cache.get("slow.example") == (True, ("93.184.216.34",))
+
+
+# ---------------------------------------------------------------------------
+# IP pinning
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_pinned_backend_dials_vetted_ip():
+    from nanobot.security.network import SSRFSafeNetworkBackend
+
+    dialed: list[str] = []
+
+    class _Inner:
+        async def connect_tcp(self, host, port, **kwargs):
+            dialed.append(host)
+            return "stream"
+
+    resolver, calls = _counting_resolver({"example.com": ["93.184.216.34"]})
+    backend = SSRFSafeNetworkBackend(_Inner())
+    with patch("nanobot.security.network.socket.getaddrinfo", resolver):
+        assert validate_url_target("https://example.com/")[0]
+        assert await backend.connect_tcp("example.com", 443) == "stream"
+    assert dialed == ["93.184.216.34"]
+    assert calls == ["example.com"]
+
+
+@pytest.mark.asyncio
+async def test_pinned_backend_refuses_private_target():
+    import httpcore
+
+    from nanobot.security.network import SSRFSafeNetworkBackend
+
+    class _Inner:
+        async def connect_tcp(self, host, port, **kwargs):
+            raise AssertionError("must not dial a private address")
+
+    with patch("nanobot.security.network.socket.getaddrinfo", _fake_resolve("rebind.example", ["10.0.0.5"])):
+        with pytest.raises(httpcore.ConnectError):
+            await SSRFSafeNetworkBackend(_Inner()).connect_tcp("rebind.example", 80)
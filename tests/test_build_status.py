@@ -59,3 +59,17 @@ def test_status_100_percent_cached():
         context_tokens_estimate=3000,
     )
     assert "100% cached" in content
+
+
+def test_status_includes_llm_metrics_lines():
+    content = build_status_content(
+        version="0.1.0",
+        model="glm-4-plus",
+        start_time=1000000.0,
+        last_usage={},
+        context_window_tokens=128000,
+        session_msg_count=5,
+        context_tokens_estimate=3000,
+        llm_metrics_lines=["zhipu/glm-4-plus: 3 calls, TTFT p50 0.4s"],
+    )
+    assert content.splitlines()[-1] == "\U0001f4e1 LLM zhipu/glm-4-plus: 3 calls, TTFT p50 0.4s"
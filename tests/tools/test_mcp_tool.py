@@ -8,7 +8,9 @@ from types import ModuleType, SimpleNamespace
 import pytest
 
 from nanobot.agent.tools.mcp import (
+    MCPConnectionManager,
     MCPResourceWrapper,
+    MCPServerStats,
     MCPPromptWrapper,
     MCPToolWrapper,
     connect_mcp_servers,
@@ -661,3 +663,281 @@ async def test_connect_registers_resources_and_prompts(
     assert "mcp_test_tool_a" in registry.tool_names
     assert "mcp_test_resource_res_b" in registry.tool_names
     assert "mcp_test_prompt_prompt_c" in registry.tool_names
+
+
+# ---------------------------------------------------------------------------
+# MCPConnectionManager
+# ---------------------------------------------------------------------------
+
+
+def _make_live_session(tool_names: list[str]) -> SimpleNamespace:
+    session = _make_fake_session(tool_names)
+    session.alive = True
+    session.calls = 0
+
+    async def send_ping() -> None:
+        if not session.alive:
+            raise ConnectionError("closed")
+
+    async def call_tool(_name: str, arguments: dict) -> object:
+        session.calls += 1
+        if not session.alive:
+            raise ConnectionError("closed")
+        return SimpleNamespace(content=[_FakeTextContent("ok")])
+
+    session.send_ping = send_ping
+    session.call_tool = call_tool
+    return session
+
+
+async def _wait_until(predicate, timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_manager_slow_server_does_not_block_others(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    sessions = {"good": _make_live_session(["demo"])}
+
+    class _SelectiveClientSession:
+        def __init__(self, read: object, _write: object) -> None:
+            self._session = sessions[read]
+
+        async def __aenter__(self) -> object:
+            return self._session
+
+        async def __aexit__(self, exc_type, exc, tb) -> bool:
+            return False
+
+    @asynccontextmanager
+    async def _selective_stdio_client(params: object):
+        if params.command == "hang":
+            await asyncio.sleep(3600)
+        yield params.command, object()
+
+    monkeypatch.setattr(sys.modules["mcp"], "ClientSession", _SelectiveClientSession)
+    monkeypatch.setattr(sys.modules["mcp.client.stdio"], "stdio_client", _selective_stdio_client)
+
+    registry = ToolRegistry()
+    manager = MCPConnectionManager(
+        {
+            "good": MCPServerConfig(command="good"),
+            "slow": MCPServerConfig(command="hang", connect_timeout=0.1),
+        },
+        registry,
+        backoff_base=60,
+    )
+    try:
+        async with asyncio.timeout(2):
+            await manager.start()
+        assert registry.tool_names == ["mcp_good_demo"]
+        assert manager.connected == ["good"]
+        assert manager.stats["good"].connect_latency_ms is not None
+        assert manager.stats["slow"].connect_failures == 1
+        assert "timed out" in manager.stats["slow"].last_error
+    finally:
+        await manager.close()
+    assert manager.connected == []
+
+
+@pytest.mark.asyncio
+async def test_manager_reconnects_and_rebinds_wrappers(
+    fake_mcp_runtime: dict[str, object | None],
+) -> None:
+    first = _make_live_session(["demo"])
+    fake_mcp_runtime["session"] = first
+    registry = ToolRegistry()
+    manager = MCPConnectionManager(
+        {"test": MCPServerConfig(command="fake", health_check_interval=0)},
+        registry,
+        backoff_base=0.01,
+    )
+    try:
+        await manager.start()
+        wrapper = registry.get("mcp_test_demo")
+        assert await wrapper.execute() == "ok"
+
+        second = _make_live_session(["demo"])
+        fake_mcp_runtime["session"] = second
+        first.alive = False
+        # The failed call wakes the health check, which triggers a reconnect.
+        assert await wrapper.execute() == "(MCP tool call failed: ConnectionError)"
+        await _wait_until(lambda: manager.stats["test"].reconnects == 1)
+
+        assert registry.get("mcp_test_demo") is wrapper
+        assert await wrapper.execute() == "ok"
+        assert second.calls == 1
+        stats = manager.stats["test"]
+        assert (stats.calls, stats.errors, stats.health_failures) == (3, 1, 1)
+        assert stats.connected and stats.avg_latency_ms is not None
+
+        (line,) = manager.status_lines()
+        assert line.startswith("test: connected, 3 calls, 1 errors (0 timeouts), avg ")
+        assert line.endswith(", 1 reconnects")
+        text = manager.render_prometheus()
+        assert "# TYPE nanobot_mcp_calls_total counter" in text
+        assert 'nanobot_mcp_calls_total{server="test"} 3' in text
+        assert 'nanobot_mcp_errors_total{server="test"} 1' in text
+        assert 'nanobot_mcp_connected{server="test"} 1' in text
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_manager_reconnect_updates_changed_tool_set(
+    fake_mcp_runtime: dict[str, object | None],
+) -> None:
+    first = _make_live_session(["keep", "drop"])
+    fake_mcp_runtime["session"] = first
+    registry = ToolRegistry()
+    manager = MCPConnectionManager(
+        {"test": MCPServerConfig(command="fake", health_check_interval=0)},
+        registry,
+        backoff_base=0.01,
+    )
+    try:
+        await manager.start()
+        kept = registry.get("mcp_test_keep")
+        fake_mcp_runtime["session"] = _make_live_session(["keep", "new"])
+        first.alive = False
+        manager.stats["test"].suspect.set()
+        await _wait_until(lambda: manager.stats["test"].reconnects == 1)
+
+        assert sorted(registry.tool_names) == ["mcp_test_keep", "mcp_test_new"]
+        assert registry.get("mcp_test_keep") is kept
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_manager_reconnects_when_monitor_returns(
+    fake_mcp_runtime: dict[str, object | None],
+) -> None:
+    fake_mcp_runtime["session"] = _make_live_session(["demo"])
+    manager = MCPConnectionManager(
+        {"test": MCPServerConfig(command="fake")}, ToolRegistry(), backoff_base=0.01,
+    )
+    monitors = 0
+
+    async def _monitor(state, session) -> None:
+        nonlocal monitors
+        monitors += 1
+        if monitors > 1:
+            await asyncio.sleep(3600)
+
+    manager._monitor = _monitor
+    try:
+        await manager.start()
+        await _wait_until(lambda: manager.stats["test"].reconnects == 1)
+        assert manager.connected == ["test"]
+    finally:
+        await manager.close()
+
+
+def test_manager_prometheus_escapes_server_names() -> None:
+    manager = MCPConnectionManager(
+        {'we"ird\\name': MCPServerConfig(command="fake")}, ToolRegistry(),
+    )
+
+    text = manager.render_prometheus()
+
+    assert 'nanobot_mcp_connected{server="we\\"ird\\\\name"} 0' in text
+
+
+# ---------------------------------------------------------------------------
+# Concurrency flags and per-server in-flight limit
+# ---------------------------------------------------------------------------
+
+
+def _annotated_tool_def(name: str, **hints: bool) -> SimpleNamespace:
+    tool_def = _make_tool_def(name)
+    tool_def.annotations = SimpleNamespace(
+        readOnlyHint=hints.get("read_only"),
+        idempotentHint=hints.get("idempotent"),
+        destructiveHint=hints.get("destructive"),
+    )
+    return tool_def
+
+
+def test_wrapper_maps_tool_annotations_to_concurrency_flags() -> None:
+    plain = MCPToolWrapper(None, "s", _make_tool_def("plain"))
+    reader = MCPToolWrapper(None, "s", _annotated_tool_def("read", read_only=True))
+    idempotent = MCPToolWrapper(
+        None, "s", _annotated_tool_def("put", idempotent=True, destructive=False)
+    )
+    # A missing destructiveHint means destructive (the MCP default).
+    unhinted = MCPToolWrapper(None, "s", _annotated_tool_def("write", idempotent=True))
+    destructive = MCPToolWrapper(
+        None, "s", _annotated_tool_def("rm", idempotent=True, destructive=True)
+    )
+
+    assert (plain.read_only, plain.concurrency_safe) == (False, False)
+    assert (reader.read_only, reader.concurrency_safe) == (True, True)
+    assert (idempotent.read_only, idempotent.concurrency_safe) == (False, True)
+    assert (unhinted.read_only, unhinted.concurrency_safe) == (False, False)
+    assert (destructive.read_only, destructive.concurrency_safe) == (False, False)
+
+
+@pytest.mark.asyncio
+async def test_connect_applies_per_server_concurrency_overrides(
+    fake_mcp_runtime: dict[str, object | None],
+) -> None:
+    session = _make_fake_session([])
+
+    async def list_tools() -> SimpleNamespace:
+        return SimpleNamespace(
+            tools=[
+                _make_tool_def("lookup"),
+                _annotated_tool_def("search", read_only=True),
+            ]
+        )
+
+    session.list_tools = list_tools
+    fake_mcp_runtime["session"] = session
+    registry = ToolRegistry()
+    stacks = await connect_mcp_servers(
+        {
+            "s": MCPServerConfig(
+                command="fake", read_only_tools=["lookup"], serial_tools=["mcp_s_search"]
+            )
+        },
+        registry,
+    )
+    for stack in stacks.values():
+        await stack.aclose()
+
+    assert registry.get("mcp_s_lookup").concurrency_safe is True
+    assert registry.get("mcp_s_search").read_only is True
+    assert registry.get("mcp_s_search").concurrency_safe is False
+
+
+@pytest.mark.asyncio
+async def test_wrappers_share_per_server_in_flight_limit() -> None:
+    active = peak = 0
+
+    async def call_tool(_name: str, arguments: dict) -> object:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.02)
+        active -= 1
+        return SimpleNamespace(content=[_FakeTextContent("ok")])
+
+    session = SimpleNamespace(call_tool=call_tool)
+    stats = MCPServerStats()
+    limiter = asyncio.Semaphore(2)
+    wrappers = [
+        MCPToolWrapper(session, "s", _make_tool_def(f"t{i}"), stats=stats, limiter=limiter)
+        for i in range(3)
+    ]
+
+    results = await asyncio.gather(*(w.execute() for w in wrappers for _ in range(2)))
+
+    assert results == ["ok"] * 6
+    assert peak == 2
+    assert stats.peak_in_flight == 2
+    assert stats.in_flight == 0
+    assert stats.calls == 6
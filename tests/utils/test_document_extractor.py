@@ -0,0 +1,229 @@
+"""Tests for the cached, off-loop DocumentExtractor."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from nanobot.utils import document
+from nanobot.utils.document import DocumentExtractor, extract_text
+
+
+def _make_xlsx(path: Path) -> None:
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    ws["A1"] = "Name"
+    ws["A2"] = "Alice"
+    wb.save(path)
+    wb.close()
+
+
+@pytest.fixture()
+def extractor(tmp_path: Path):
+    ex = DocumentExtractor(tmp_path / "cache", use_processes=False)
+    yield ex
+    ex.close()
+
+
+@pytest.mark.asyncio
+async def test_async_extract_matches_sync_output(extractor, tmp_path: Path) -> None:
+    xlsx = tmp_path / "book.xlsx"
+    _make_xlsx(xlsx)
+
+    assert await extractor.extract_text(xlsx) == extract_text(xlsx)
+
+
+@pytest.mark.asyncio
+async def test_segments_are_cached_on_disk_by_content_hash(
+    extractor, tmp_path: Path, monkeypatch
+) -> None:
+    xlsx = tmp_path / "book.xlsx"
+    _make_xlsx(xlsx)
+    first = await extractor.segments(xlsx, "xlsx")
+    assert list((tmp_path / "cache").glob("*.xlsx.json"))
+
+    # A fresh extractor (e.g. after restart) must hit the disk cache and
+    # never call the parser again — even for a copy under another name.
+    calls = 0
+
+    def _boom(path: Path) -> list[str]:
+        nonlocal calls
+        calls += 1
+        raise AssertionError("parser should not run on a cache hit")
+
+    monkeypatch.setitem(document._PARSERS, "xlsx", (_boom, "XLSX"))
+    copy = tmp_path / "copy.xlsx"
+    copy.write_bytes(xlsx.read_bytes())
+    fresh = DocumentExtractor(tmp_path / "cache", use_processes=False)
+    assert await fresh.segments(copy, "xlsx") == first
+    assert calls == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_parse(extractor, tmp_path: Path, monkeypatch) -> None:
+    xlsx = tmp_path / "book.xlsx"
+    _make_xlsx(xlsx)
+    calls = 0
+    real = document._xlsx_blocks
+
+    def _counting(path: Path) -> list[str]:
+        nonlocal calls
+        calls += 1
+        return real(path)
+
+    monkeypatch.setitem(document._PARSERS, "xlsx", (_counting, "XLSX"))
+    results = await asyncio.gather(*(extractor.segments(xlsx, "xlsx") for _ in range(5)))
+    assert calls == 1
+    assert all(r == results[0] for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_abort_a_shared_parse(
+    extractor, tmp_path: Path, monkeypatch
+) -> None:
+    import time
+
+    def _slow(path: Path) -> list[str]:
+        time.sleep(0.2)
+        return ["parsed"]
+
+    monkeypatch.setitem(document._PARSERS, "docx", (_slow, "DOCX"))
+    doc = tmp_path / "shared.docx"
+    doc.write_bytes(b"shared")
+    first = asyncio.create_task(extractor.segments(doc, "docx"))
+    second = asyncio.create_task(extractor.segments(doc, "docx"))
+    await asyncio.sleep(0.05)
+
+    first.cancel()  # e.g. /stop in one session
+    assert await second == ["parsed"]
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_parse_timeout_returns_error(tmp_path: Path, monkeypatch) -> None:
+    import time
+
+    def _slow(path: Path) -> list[str]:
+        time.sleep(0.5)
+        return ["late"]
+
+    monkeypatch.setitem(document._PARSERS, "docx", (_slow, "DOCX"))
+    slow_file = tmp_path / "slow.docx"
+    slow_file.write_bytes(b"not really a docx")
+    ex = DocumentExtractor(tmp_path / "cache", use_processes=False, timeout=0.05)
+    try:
+        result = await ex.extract_text(slow_file)
+    finally:
+        ex.close()
+    assert result.startswith("[error: failed to extract DOCX:")
+    assert not list((tmp_path / "cache").glob("*.json"))
+
+
+@pytest.mark.asyncio
+async def test_parse_broken_by_another_timeout_is_resubmitted(tmp_path: Path, monkeypatch) -> None:
+    import threading
+    import time
+    from concurrent.futures.process import BrokenProcessPool
+
+    killed = threading.Event()
+    attempts = 0
+
+    def _slow(path: Path) -> list[str]:
+        time.sleep(0.5)
+        return ["late"]
+
+    def _victim(path: Path) -> list[str]:
+        # Stands in for a worker terminated when the other parse's pool is torn down.
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            killed.wait(2)
+            raise BrokenProcessPool("worker terminated")
+        return ["ok"]
+
+    monkeypatch.setitem(document._PARSERS, "docx", (_slow, "DOCX"))
+    monkeypatch.setitem(document._PARSERS, "xlsx", (_victim, "XLSX"))
+    slow_file, other = tmp_path / "slow.docx", tmp_path / "other.xlsx"
+    slow_file.write_bytes(b"slow")
+    other.write_bytes(b"other")
+    ex = DocumentExtractor(tmp_path / "cache", use_processes=False, timeout=0.2)
+    real_kill = ex._kill_pool
+
+    def _kill(pool) -> None:
+        real_kill(pool)
+        killed.set()
+
+    async def _later() -> list[str]:
+        await asyncio.sleep(0.1)  # still running when the slow parse times out
+        return await ex.segments(other, "xlsx")
+
+    ex._kill_pool = _kill  # type: ignore[method-assign]
+    try:
+        timed_out, segments = await asyncio.gather(
+            ex.segments(slow_file, "docx"), _later(), return_exceptions=True,
+        )
+    finally:
+        ex.close()
+    assert isinstance(timed_out, TimeoutError)
+    assert segments == ["ok"]
+    assert attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_is_bounded_by_bytes(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setitem(document._PARSERS, "docx", (lambda p: [p.read_text() * 10], "DOCX"))
+    ex = DocumentExtractor(tmp_path / "cache", use_processes=False, max_memory_bytes=25)
+    try:
+        for name in ("a", "b", "c"):
+            (tmp_path / f"{name}.docx").write_text(name)
+            await ex.segments(tmp_path / f"{name}.docx", "docx")
+    finally:
+        ex.close()
+    assert [segments for segments, _ in ex._memory.values()] == [["b" * 10], ["c" * 10]]
+    assert ex._memory_bytes == 20
+
+
+@pytest.mark.asyncio
+async def test_parse_errors_are_not_cached(extractor, tmp_path: Path) -> None:
+    broken = tmp_path / "broken.xlsx"
+    broken.write_bytes(b"garbage")
+
+    result = await extractor.extract_text(broken)
+    assert result.startswith("[error: failed to extract XLSX:")
+    assert not list((tmp_path / "cache").glob("*.json"))
+
+
+@pytest.mark.asyncio
+async def test_extract_documents_keeps_images(extractor, tmp_path: Path) -> None:
+    png = tmp_path / "photo.png"
+    png.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 32)
+    xlsx = tmp_path / "book.xlsx"
+    _make_xlsx(xlsx)
+
+    text, images = await extractor.extract_documents("look", [str(png), str(xlsx)])
+    assert images == [str(png)]
+    assert "[File: book.xlsx]" in text
+    assert "Alice" in text
+
+
+@pytest.mark.asyncio
+async def test_process_pool_pdf_pages(tmp_path: Path) -> None:
+    fitz = pytest.importorskip("fitz")
+    pdf = tmp_path / "doc.pdf"
+    doc = fitz.open()
+    for i in range(3):
+        doc.new_page().insert_text((72, 72), f"Page {i + 1} body")
+    doc.save(str(pdf))
+    doc.close()
+
+    ex = DocumentExtractor(tmp_path / "cache")
+    try:
+        pages = await ex.segments(pdf, "pdf_pages")
+    finally:
+        ex.close()
+    assert pages == ["Page 1 body", "Page 2 body", "Page 3 body"]
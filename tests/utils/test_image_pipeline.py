@@ -0,0 +1,118 @@
+"""Tests for the image ingestion pipeline."""
+
+from __future__ import annotations
+
+import base64
+import io
+from pathlib import Path
+
+import pytest
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.utils.image import ImageLimits, ImagePipeline
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _jpeg(path: Path, size: tuple[int, int] = (3000, 2000)) -> bytes:
+    buf = io.BytesIO()
+    Image.effect_noise(size, 64).convert("RGB").save(buf, format="JPEG", quality=95)
+    path.write_bytes(buf.getvalue())
+    return buf.getvalue()
+
+
+def _decode(url: str) -> tuple[str, bytes]:
+    header, b64 = url.split(",", 1)
+    return header[len("data:"):].split(";")[0], base64.b64decode(b64)
+
+
+def test_no_limits_sends_original_bytes(tmp_path: Path) -> None:
+    raw = _jpeg(tmp_path / "a.jpg", (64, 64))
+    pipeline = ImagePipeline()
+
+    block = pipeline.image_block(str(tmp_path / "a.jpg"))
+
+    assert block is not None
+    mime, data = _decode(block["image_url"]["url"])
+    assert mime == "image/jpeg"
+    assert data == raw
+    assert block["_meta"] == {"path": str(tmp_path / "a.jpg")}
+
+
+def test_downscales_to_max_dimension(tmp_path: Path) -> None:
+    raw = _jpeg(tmp_path / "big.jpg")
+    pipeline = ImagePipeline(ImageLimits(max_dimension=512))
+
+    block = pipeline.image_block(str(tmp_path / "big.jpg"))
+
+    _, data = _decode(block["image_url"]["url"])
+    assert max(Image.open(io.BytesIO(data)).size) == 512
+    assert pipeline.stats.resized == 1
+    assert pipeline.stats.bytes_in == len(raw)
+    assert pipeline.stats.bytes_saved == len(raw) - len(data) > 0
+    assert pipeline.status_line().endswith(f"{pipeline.stats.bytes_saved // 1024} KB saved")
+
+
+def test_byte_budget_is_respected(tmp_path: Path) -> None:
+    _jpeg(tmp_path / "big.jpg")
+    pipeline = ImagePipeline(ImageLimits(max_bytes=150_000))
+
+    _, data = _decode(pipeline.image_block(str(tmp_path / "big.jpg"))["image_url"]["url"])
+
+    assert len(data) <= 150_000
+
+
+def test_encoded_url_is_cached_by_content_hash(tmp_path: Path) -> None:
+    raw = _jpeg(tmp_path / "a.jpg", (64, 64))
+    (tmp_path / "copy.jpg").write_bytes(raw)
+    pipeline = ImagePipeline()
+
+    first = pipeline.image_block(str(tmp_path / "a.jpg"))
+    second = pipeline.image_block(str(tmp_path / "copy.jpg"))
+    third = pipeline.image_block(str(tmp_path / "a.jpg"))
+
+    assert first["image_url"] == second["image_url"] == third["image_url"]
+    assert pipeline.stats.encoded == 1
+    assert pipeline.stats.cache_hits == 2
+
+
+def test_cache_is_bounded(tmp_path: Path) -> None:
+    pipeline = ImagePipeline(max_cache_bytes=1)
+    for i in range(3):
+        _jpeg(tmp_path / f"{i}.jpg", (32, 32 + i))
+        pipeline.image_block(str(tmp_path / f"{i}.jpg"))
+    assert len(pipeline._cache) == 1
+
+
+def test_path_index_is_bounded(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("nanobot.utils.image._MAX_CACHED_PATHS", 2)
+    pipeline = ImagePipeline()
+    assert pipeline.status_line() is None
+    for i in range(3):
+        _jpeg(tmp_path / f"{i}.jpg", (32, 32 + i))
+        pipeline.image_block(str(tmp_path / f"{i}.jpg"))
+
+    assert [path for path, _, _ in pipeline._paths] == [
+        str(tmp_path / "1.jpg"), str(tmp_path / "2.jpg"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_prepare_warms_context_builder(tmp_path: Path) -> None:
+    _jpeg(tmp_path / "a.jpg", (64, 64))
+    pipeline = ImagePipeline()
+    builder = ContextBuilder(workspace=tmp_path, timezone="UTC", images=pipeline)
+
+    await pipeline.prepare([str(tmp_path / "a.jpg"), str(tmp_path / "missing.jpg")])
+    content = builder._build_user_content("look", [str(tmp_path / "a.jpg")])
+
+    assert content[0]["type"] == "image_url"
+    assert pipeline.stats.encoded == 1
+    assert pipeline.stats.cache_hits == 1
+
+
+def test_provider_config_accepts_image_limits() -> None:
+    from nanobot.config.schema import ProviderConfig
+
+    cfg = ProviderConfig.model_validate({"imageMaxDimension": 1568, "imageMaxBytes": 500_000})
+    assert (cfg.image_max_dimension, cfg.image_max_bytes) == (1568, 500_000)
@@ -0,0 +1,76 @@
+"""Tests for the shared in-flight task helper."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from nanobot.utils.inflight import InflightTasks
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_run() -> None:
+    inflight: InflightTasks[str, int] = InflightTasks()
+    calls = 0
+
+    async def _work() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    assert await asyncio.gather(*(inflight.run("k", _work) for _ in range(3))) == [42, 42, 42]
+    assert calls == 1
+    assert "k" not in inflight
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_detaches_and_last_one_cancels_the_work() -> None:
+    inflight: InflightTasks[str, str] = InflightTasks()
+    release = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def _work() -> str:
+        try:
+            await release.wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "done"
+
+    first = asyncio.create_task(inflight.run("k", _work))
+    second = asyncio.create_task(inflight.run("k", _work))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    assert not cancelled.is_set()
+
+    release.set()
+    assert await second == "done"
+
+    release.clear()
+    only = asyncio.create_task(inflight.run("k", _work))
+    await asyncio.sleep(0)
+    only.cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await asyncio.sleep(0)
+    assert "k" not in inflight
+
+
+@pytest.mark.asyncio
+async def test_keep_alive_finishes_the_work_without_waiters() -> None:
+    inflight: InflightTasks[str, str] = InflightTasks(keep_alive=True)
+    finished = asyncio.Event()
+
+    async def _work() -> str:
+        await asyncio.sleep(0.01)
+        finished.set()
+        raise RuntimeError("nobody is listening")
+
+    caller = asyncio.create_task(inflight.run("k", _work))
+    await asyncio.sleep(0)
+    caller.cancel()
+    await asyncio.wait_for(finished.wait(), 1)
+    await asyncio.sleep(0)
+    assert "k" not in inflight
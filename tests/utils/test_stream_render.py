@@ -0,0 +1,82 @@
+"""IncrementalRenderer: same output as a full render, for every way of streaming the text."""
+
+import random
+
+import pytest
+
+from nanobot.channels.telegram import _HTML_RENDER_PROBE, _markdown_to_telegram_html
+from nanobot.utils.stream_render import IncrementalRenderer
+
+_BLOCKS = [
+    "Intro with **bold**, `code` and a [link](http://x.y/a_b).\n\n",
+    "1. first\n2. second\n\n3. third, loose\n\n",
+    "- a\n- b\n\n  continued\n\n- c\n\n",
+    "```python\ndef f():\n\n    return 1\n```\n\n",
+    "| a | b |\n|---|---|\n| 1 | 2 |\n\n",
+    "# Heading\n\n",
+    "#\n\nlast line of a header\n\n",
+    "> quote\n> more\n\n",
+    "an _italic that\n\nends later_ here\n\n",
+    "a stray ` backtick\n\nand ` its partner\n\n",
+    "[link text\n\nacross blocks](http://u)\n\n",
+    "    indented code\n\n    more indented code\n\n",
+    "snake_case and __init__ names\n\n",
+    "plain line\n   \nafter a whitespace-only line\n\n",
+]
+
+
+def _documents(seed: int, count: int):
+    rng = random.Random(seed)
+    for _ in range(count):
+        doc = "".join(rng.choice(_BLOCKS) for _ in range(rng.randint(1, 10)))
+        yield rng, doc.rstrip() if rng.random() < 0.5 else doc
+
+
+def _stream(renderer: IncrementalRenderer, doc: str, rng: random.Random):
+    end = 0
+    while end < len(doc):
+        end = min(len(doc), end + rng.randint(1, 40))
+        yield doc[:end], renderer.render(doc[:end])
+
+
+def test_telegram_html_matches_full_render_for_any_chunking():
+    for rng, doc in _documents(seed=7, count=150):
+        renderer = IncrementalRenderer(_markdown_to_telegram_html, _HTML_RENDER_PROBE)
+        for text, html in _stream(renderer, doc, rng):
+            assert html == _markdown_to_telegram_html(text), text
+
+
+def test_mistune_html_matches_full_render_for_any_chunking():
+    mistune = pytest.importorskip("mistune")
+    render = mistune.create_markdown(
+        escape=True, plugins=["table", "strikethrough", "url", "superscript", "subscript"],
+    )
+    for rng, doc in _documents(seed=11, count=150):
+        renderer = IncrementalRenderer(render)
+        for text, html in _stream(renderer, doc, rng):
+            assert html == render(text), text
+
+
+def test_only_the_unfinished_tail_is_rendered_again():
+    renderer = IncrementalRenderer(_markdown_to_telegram_html, _HTML_RENDER_PROBE)
+    text = "".join(f"Paragraph {i} with **bold** text.\n\n" for i in range(200))
+    renderer.render(text + "tail\n")
+    assert renderer.cached_chars == len(text)
+    before = renderer.rendered_chars
+    renderer.render(text + "tail grows")
+    assert renderer.rendered_chars - before == len("tail grows")
+
+
+def test_shorter_or_rewritten_text_drops_stale_blocks():
+    renderer = IncrementalRenderer(_markdown_to_telegram_html, _HTML_RENDER_PROBE)
+    renderer.render("one\n\ntwo\n\nthree")
+    assert renderer.render("one\n\nTWO") == _markdown_to_telegram_html("one\n\nTWO")
+    assert renderer.render("one") == "one"
+
+
+def test_reference_definitions_disable_caching():
+    renderer = IncrementalRenderer(lambda s: s.upper())
+    renderer.render("a\n\nb\n\nc")
+    assert renderer.cached_chars > 0
+    renderer.render("a\n\nb\n\nc\n\n[x]: http://example.com\n")
+    assert renderer.cached_chars == 0
@@ -1,6 +1,9 @@
+import itertools
+import random
+
 import pytest
 
-from nanobot.utils.helpers import strip_think
+from nanobot.utils.helpers import ThinkStripper, strip_think
 
 
 class TestStripThinkTag:
@@ -63,3 +66,72 @@ class TestStripThinkFalsePositive:
 
     def test_prefix_unclosed_thought_still_stripped(self):
         assert strip_think("<thought>reasoning without closing") == ""
+
+
+def _stream(text: str, cuts: list[int]) -> str:
+    stripper = ThinkStripper()
+    bounds = [0, *cuts, len(text)]
+    out = [stripper.feed(text[a:b]) for a, b in zip(bounds, bounds[1:])]
+    return "".join(out) + stripper.flush()
+
+
+class TestThinkStripper:
+    """Streaming stripper: same result as strip_think for every chunking."""
+
+    _TOKENS = [
+        "<think>", "</think>", "<thought>", "</thought>", "<", "think>", "<thi", "nk>",
+        "<th", "ought>", "/", "a", "b c", " ", "\n", "`",
+    ]
+
+    def test_every_chunking_matches_strip_think(self):
+        rng = random.Random(0)
+        for _ in range(1500):
+            text = "".join(rng.choice(self._TOKENS) for _ in range(rng.randint(0, 8)))
+            expected = strip_think(text)
+            if len(text) <= 10:
+                splits = [
+                    list(cuts)
+                    for n in range(len(text))
+                    for cuts in itertools.combinations(range(1, len(text)), n)
+                ]
+            else:
+                splits = [
+                    sorted(rng.sample(range(1, len(text)), rng.randint(0, len(text) - 1)))
+                    for _ in range(20)
+                ]
+            for cuts in splits:
+                assert _stream(text, cuts) == expected, (text, cuts)
+
+    def test_holds_back_only_undecided_text(self):
+        stripper = ThinkStripper()
+        assert stripper.feed("<think>plan") == ""
+        assert stripper.feed("ning</think>Hello") == "Hello"
+        assert stripper.feed(" wor") == " wor"
+        assert stripper.feed("ld <th") == "ld"  # "<th" may still become "<think>"
+        assert stripper.feed("!\n") == " <th!"  # the newline waits for more text
+        assert stripper.flush() == ""
+
+    def test_reusable_after_flush(self):
+        stripper = ThinkStripper()
+        stripper.feed("<think>never closed")
+        assert stripper.flush() == ""
+        assert stripper.feed("  fresh") == "fresh"
+
+
+@pytest.mark.asyncio
+async def test_loop_hook_streams_clean_text_and_flushes_held_tail():
+    from unittest.mock import MagicMock
+
+    from nanobot.agent.loop import _LoopHook
+
+    sent: list[str] = []
+
+    async def on_stream(delta: str) -> None:
+        sent.append(delta)
+
+    hook = _LoopHook(MagicMock(), on_stream=on_stream)
+    for delta in ("<think>", "hidden", "</think>", "Answer: a", " <", "b"):
+        await hook.on_stream(MagicMock(), delta)
+    await hook.on_stream_end(MagicMock(), resuming=False)
+    assert "".join(sent) == "Answer: a <b"
+    assert "hidden" not in "".join(sent)
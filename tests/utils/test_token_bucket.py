@@ -0,0 +1,31 @@
+"""Tests for the token bucket shared by the LLM and channel rate limiters."""
+
+from __future__ import annotations
+
+import pytest
+
+from nanobot.utils.token_bucket import TokenBucket
+
+
+def test_wait_time_refills_continuously() -> None:
+    bucket = TokenBucket(rate=2.0, capacity=2, now=0.0)
+    bucket.take()
+    bucket.take()
+
+    assert bucket.wait_time(0.0) == pytest.approx(0.5)
+    assert bucket.wait_time(0.25, cost=0.5) == 0.0
+    assert bucket.wait_time(10.0) == 0.0
+    assert bucket.level == 2  # never above capacity
+
+
+def test_sync_and_resize_only_lower_the_level() -> None:
+    bucket = TokenBucket(rate=1.0, capacity=60, now=0.0)
+    bucket.sync(10, now=0.0)
+    assert bucket.level == 10
+
+    bucket.resize(rate=0.5, capacity=5, now=0.0)
+    assert (bucket.capacity, bucket.level, bucket.rate) == (5, 5, 0.5)
+
+
+def test_capacity_holds_at_least_one_call() -> None:
+    assert TokenBucket(rate=0.5, capacity=0, now=0.0).wait_time(0.0) == 0.0